@@ -0,0 +1,517 @@
+"""
+Model backends behind run_claude — the `claude -p` CLI or the Messages API.
+
+A backend executes one call: (model, system prompt, user prompt) in, a
+Completion out. Concurrency, rate limits, retries and caching stay with the
+caller; failures are raised as ClaudeError with a message retries.py can
+classify.
+
+The CLI backend is the default: it needs no API key, only a logged-in
+`claude`. The API backend talks to the Messages API over one pooled httpx
+client — connections are kept alive across calls and, over TLS, multiplexed
+with HTTP/2 — so a call costs a request instead of a subprocess, a Node boot
+and a TLS handshake. It needs ANTHROPIC_API_KEY and `httpx[http2]`. The
+fake backend (fake_backend.py) simulates calls offline for load tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from retries import CONFIG, MALFORMED, TIMEOUT, TRUNCATED, ClaudeError
+from worker_pool import WarmProcessPool, kill_process, spawn_claude
+
+try:
+    import httpx
+except ImportError:  # optional: only the API backend needs it
+    httpx = None
+
+CLI = "cli"
+API = "api"
+FAKE = "fake"  # simulated, for offline load tests (fake_backend.py)
+BACKENDS = (CLI, API, FAKE)
+DEFAULT_BACKEND = CLI
+
+DEFAULT_API_URL = "https://api.anthropic.com"
+API_VERSION = "2023-06-01"
+DEFAULT_API_MAX_TOKENS = 8192
+DEFAULT_API_MAX_CONNECTIONS = 32
+
+# CLI model aliases → Messages API model IDs; other names are sent unchanged
+API_MODEL_IDS = {
+    "opus": "claude-opus-4-1",
+    "sonnet": "claude-sonnet-4-5",
+    "haiku": "claude-haiku-4-5",
+}
+
+
+@dataclass
+class Completion:
+    """One model answer. usage_tokens (input + output) settles rate-limit permits."""
+
+    response: str
+    cost_info: str
+    usage_tokens: int | None = None
+
+
+def _cost_info(data: dict) -> str:
+    """'input=N, output=M', plus prompt-cache reads/writes and the USD cost
+    (the CLI's total_cost_usd) when reported."""
+    usage = data.get("usage") or data
+    info = f"input={usage.get('input_tokens', '?')}, output={usage.get('output_tokens', '?')}"
+    if "cache_read_input_tokens" in usage or "cache_creation_input_tokens" in usage:
+        info += (
+            f", cache_read={usage.get('cache_read_input_tokens') or 0}"
+            f", cache_write={usage.get('cache_creation_input_tokens') or 0}"
+        )
+    if isinstance(data.get("total_cost_usd"), (int, float)):
+        info += f", cost_usd={data['total_cost_usd']:.6f}"
+    return info
+
+
+def _usage_tokens(data: dict) -> int | None:
+    """Total input+output tokens from a CLI result or an API usage block."""
+    usage = data.get("usage") or data
+    try:
+        return int(usage["input_tokens"]) + int(usage["output_tokens"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+# --- Streaming ---
+
+
+@dataclass
+class StreamMonitor:
+    """Hooks for a streamed call, and the timings it records.
+
+    on_progress(monitor) is called at most every progress_interval_s while text
+    arrives; abort_check(text_so_far) is called every abort_check_chars of
+    text and returns a reason to give up early (the call is stopped and a
+    MALFORMED ClaudeError raised) or None.
+    """
+
+    on_progress: Callable[[StreamMonitor], None] | None = None
+    abort_check: Callable[[str], str | None] | None = None
+    progress_interval_s: float = 1.0
+    abort_check_chars: int = 1000
+    ttft_s: float | None = None
+    generation_s: float | None = None
+    chars: int = 0
+    _parts: list[str] = field(default_factory=list, init=False, repr=False)
+    _start: float = field(default=0.0, init=False, repr=False)
+    _first_token: float | None = field(default=None, init=False, repr=False)
+    _last_progress: float = field(default=0.0, init=False, repr=False)
+    _next_check: int = field(default=0, init=False, repr=False)
+
+    def begin(self, start: float) -> None:
+        """Reset for a new attempt that was started at `start` (monotonic)."""
+        self.ttft_s = self.generation_s = None
+        self.chars = 0
+        self._parts = []
+        self._start = start
+        self._first_token = None
+        self._last_progress = 0.0
+        self._next_check = self.abort_check_chars
+
+    def feed(self, chunk: str) -> None:
+        """Record a chunk of generated text; raises ClaudeError to abort."""
+        if not chunk:
+            return
+        now = time.monotonic()
+        if self._first_token is None:
+            self._first_token = now
+            self.ttft_s = now - self._start
+        self._parts.append(chunk)
+        self.chars += len(chunk)
+        if self.abort_check is not None and self.chars >= self._next_check:
+            self._next_check = self.chars + self.abort_check_chars
+            text = "".join(self._parts)
+            self._parts = [text]
+            reason = self.abort_check(text)
+            if reason:
+                raise ClaudeError(f"aborted stream: {reason}", MALFORMED)
+        if self.on_progress and now - self._last_progress >= self.progress_interval_s:
+            self._last_progress = now
+            self.on_progress(self)
+
+    def end(self) -> None:
+        if self._first_token is not None:
+            self.generation_s = time.monotonic() - self._first_token
+
+
+# --- Backends ---
+
+
+class Backend:
+    """Executes single model calls. Subclasses implement complete()."""
+
+    name = ""
+
+    async def complete(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        timeout_s: float | None = None,
+        stream: StreamMonitor | None = None,
+    ) -> Completion:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Release pooled resources (processes, connections)."""
+
+
+def _cli_stream_text(event: dict, partial_seen: bool) -> str:
+    """Text carried by one stream-json event.
+
+    Token deltas (--include-partial-messages) are preferred; whole assistant
+    messages are only used when the CLI sends no deltas.
+    """
+    etype = event.get("type")
+    if etype == "stream_event":
+        delta = event.get("event", {}).get("delta", {})
+        if delta.get("type") == "text_delta":
+            return delta.get("text", "")
+    elif etype == "assistant" and not partial_seen:
+        return "".join(
+            block.get("text", "")
+            for block in event.get("message", {}).get("content", [])
+            if block.get("type") == "text"
+        )
+    return ""
+
+
+async def _read_cli_stream(
+    proc: asyncio.subprocess.Process, user_prompt: str, monitor: StreamMonitor
+) -> tuple[bytes, bytes]:
+    """Feed the prompt and consume stream-json events as they arrive.
+
+    Returns (final result event line, stderr) — the result event has the same
+    shape as `--output-format json` output, so callers parse it the same way.
+    """
+    proc.stdin.write(user_prompt.encode())
+    await proc.stdin.drain()
+    proc.stdin.close()
+    stderr_task = asyncio.create_task(proc.stderr.read())
+    try:
+        result_line = b""
+        partial_seen = False
+        async for line in proc.stdout:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("type") == "result":
+                result_line = line
+                continue
+            partial_seen = partial_seen or event.get("type") == "stream_event"
+            monitor.feed(_cli_stream_text(event, partial_seen))
+
+        await proc.wait()
+        monitor.end()
+        return result_line, await stderr_task
+    finally:
+        if not stderr_task.done():
+            stderr_task.cancel()
+
+
+# System prompts handed to `claude -p` as files: with the SKILL.md in it
+# (cache-aware layout, comparative scoring) a prompt can outgrow the 128 KiB
+# limit on a single argv string. Removed when the interpreter exits.
+_prompt_dir: tempfile.TemporaryDirectory | None = None
+
+
+def system_prompt_file(system_prompt: str) -> str:
+    """Path of a file holding system_prompt; the same prompt maps to the same
+    path, so warm-pool command lines stay shared between calls."""
+    global _prompt_dir
+    if _prompt_dir is None:
+        _prompt_dir = tempfile.TemporaryDirectory(prefix="skill-checker-prompts-")
+    digest = hashlib.sha256(system_prompt.encode()).hexdigest()
+    path = Path(_prompt_dir.name) / f"{digest}.md"
+    if not path.exists():
+        path.write_text(system_prompt)
+    return str(path)
+
+
+class CliBackend(Backend):
+    """`claude -p` subprocesses, optionally taken from a WarmProcessPool."""
+
+    name = CLI
+
+    def __init__(self, pool: WarmProcessPool | None = None):
+        self.pool = pool
+
+    async def aclose(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+
+    async def complete(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        timeout_s: float | None = None,
+        stream: StreamMonitor | None = None,
+    ) -> Completion:
+        """Run one claude -p process.
+
+        After timeout_s the process group is killed and a TIMEOUT ClaudeError
+        is raised; on cancellation it is killed before CancelledError
+        propagates. With a StreamMonitor the call uses stream-json output.
+        """
+        cmd = [
+            "claude",
+            "-p",
+            "--model",
+            model,
+            "--system-prompt-file",
+            system_prompt_file(system_prompt),
+            "--output-format",
+            "json" if stream is None else "stream-json",
+            "--no-session-persistence",
+        ]
+        if stream is not None:
+            cmd += ["--verbose", "--include-partial-messages"]
+            stream.begin(time.monotonic())
+
+        if self.pool is not None:
+            proc = await self.pool.acquire(cmd)
+        else:
+            proc = await spawn_claude(cmd)
+        try:
+            if stream is None:
+                io = proc.communicate(user_prompt.encode())
+            else:
+                io = _read_cli_stream(proc, user_prompt, stream)
+            stdout, stderr = await asyncio.wait_for(io, timeout_s)
+        except asyncio.TimeoutError:
+            await kill_process(proc)
+            raise ClaudeError(
+                f"claude -p timed out after {timeout_s:g}s", TIMEOUT
+            ) from None
+        except BaseException:
+            # Cancellation or an aborted stream
+            await kill_process(proc)
+            raise
+
+        if proc.returncode != 0:
+            detail = stderr.decode().strip() or stdout.decode().strip()
+            raise ClaudeError(
+                f"claude -p exited with {proc.returncode}: {detail[:500]}"
+            )
+        if stream is not None and not stdout:
+            raise ClaudeError("claude -p stream ended without a result event", TRUNCATED)
+
+        raw = stdout.decode()
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            if raw.lstrip().startswith("{"):
+                raise ClaudeError(
+                    f"claude -p returned truncated JSON ({len(raw)} bytes)", TRUNCATED
+                ) from None
+            return Completion(raw, "unknown (non-JSON output)")
+
+        response = data.get("result", raw)
+        if data.get("is_error"):
+            # API errors (429/529, auth, ...) come back as a result with is_error
+            raise ClaudeError(f"claude -p returned an error: {str(response)[:500]}")
+        return Completion(response, _cost_info(data), _usage_tokens(data))
+
+
+class ApiBackend(Backend):
+    """Messages API over a shared, keep-alive httpx.AsyncClient.
+
+    The client is created on first use and reused by every call until
+    aclose(); HTTP/2 is used when the `h2` package is installed.
+    """
+
+    name = API
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = DEFAULT_API_URL,
+        max_tokens: int = DEFAULT_API_MAX_TOKENS,
+        max_connections: int = DEFAULT_API_MAX_CONNECTIONS,
+        http2: bool = True,
+    ):
+        if httpx is None:
+            raise ClaudeError(
+                "the api backend needs httpx: pip install 'httpx[http2]'", CONFIG
+            )
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.max_tokens = max_tokens
+        self.max_connections = max_connections
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self._client: httpx.AsyncClient | None = None
+
+    @classmethod
+    def from_env(cls) -> ApiBackend:
+        """Configure from ANTHROPIC_API_KEY / ANTHROPIC_BASE_URL."""
+        api_key = os.environ.get("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ClaudeError("the api backend needs ANTHROPIC_API_KEY", CONFIG)
+        return cls(api_key, os.environ.get("ANTHROPIC_BASE_URL") or DEFAULT_API_URL)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=self.http2,
+                headers={
+                    "x-api-key": self.api_key,
+                    "anthropic-version": API_VERSION,
+                    "content-type": "application/json",
+                },
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60.0,
+                ),
+                # Deadlines come from timeout_s; only bound the connect phase
+                timeout=httpx.Timeout(None, connect=30.0),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def complete(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        timeout_s: float | None = None,
+        stream: StreamMonitor | None = None,
+    ) -> Completion:
+        body = {
+            "model": API_MODEL_IDS.get(model, model),
+            "max_tokens": self.max_tokens,
+            # The system prompt is the stable prefix: cache it provider-side
+            "system": [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+            "messages": [{"role": "user", "content": user_prompt}],
+        }
+        if stream is not None:
+            body["stream"] = True
+            stream.begin(time.monotonic())
+            call = self._post_stream(body, stream)
+        else:
+            call = self._post(body)
+        try:
+            return await asyncio.wait_for(call, timeout_s)
+        except asyncio.TimeoutError:
+            raise ClaudeError(f"API call timed out after {timeout_s:g}s", TIMEOUT) from None
+        except httpx.TimeoutException as exc:
+            raise ClaudeError(f"API call timed out: {exc!r}", TIMEOUT) from None
+        except httpx.HTTPError as exc:
+            raise ClaudeError(f"API request failed: {exc!r}") from None
+
+    async def _post(self, body: dict) -> Completion:
+        resp = await self.client.post("/v1/messages", json=body)
+        if resp.status_code >= 400:
+            raise self._http_error(resp.status_code, resp.content)
+        try:
+            data = resp.json()
+        except json.JSONDecodeError:
+            raise ClaudeError(
+                f"API returned truncated JSON ({len(resp.content)} bytes)", TRUNCATED
+            ) from None
+        text = "".join(
+            block.get("text", "")
+            for block in data.get("content", [])
+            if block.get("type") == "text"
+        )
+        usage = data.get("usage") or {}
+        return Completion(text, _cost_info(usage), _usage_tokens(usage))
+
+    async def _post_stream(self, body: dict, monitor: StreamMonitor) -> Completion:
+        """Consume the Messages API server-sent events."""
+        parts: list[str] = []
+        usage: dict = {}
+        stopped = False
+        async with self.client.stream("POST", "/v1/messages", json=body) as resp:
+            if resp.status_code >= 400:
+                raise self._http_error(resp.status_code, await resp.aread())
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                try:
+                    event = json.loads(line[5:])
+                except json.JSONDecodeError:
+                    continue
+                etype = event.get("type")
+                if etype == "message_start":
+                    usage.update(event.get("message", {}).get("usage") or {})
+                elif etype == "content_block_delta":
+                    delta = event.get("delta", {})
+                    if delta.get("type") == "text_delta":
+                        parts.append(delta.get("text", ""))
+                        monitor.feed(parts[-1])
+                elif etype == "message_delta":
+                    usage.update(event.get("usage") or {})
+                elif etype == "message_stop":
+                    stopped = True
+                elif etype == "error":
+                    raise self._error_from_body(event, "stream")
+        if not stopped:
+            raise ClaudeError("API stream ended without message_stop", TRUNCATED)
+        monitor.end()
+        return Completion("".join(parts), _cost_info(usage), _usage_tokens(usage))
+
+    @classmethod
+    def _http_error(cls, status: int, content: bytes) -> ClaudeError:
+        try:
+            data = json.loads(content)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            data = {"error": {"message": content.decode(errors="replace")}}
+        return cls._error_from_body(data, status)
+
+    @staticmethod
+    def _error_from_body(data: dict, where: int | str) -> ClaudeError:
+        # e.g. "API error 529: overloaded_error: Overloaded" — classified like CLI errors
+        error = data.get("error") or {}
+        return ClaudeError(
+            f"API error {where}: {error.get('type', 'error')}: "
+            f"{str(error.get('message', ''))[:500]}"
+        )
+
+
+def make_backend(
+    name: str, pool: WarmProcessPool | None = None, fake_config: str | None = None
+) -> Backend:
+    """Backend by name; `pool` is used by the CLI backend, `fake_config` (a
+    FakeConfig spec, FAKE_BACKEND when None) by the simulated one."""
+    if name == CLI:
+        return CliBackend(pool)
+    if name == API:
+        return ApiBackend.from_env()
+    if name == FAKE:
+        from fake_backend import FakeBackend  # imports this module
+
+        try:
+            return FakeBackend.from_env(fake_config)
+        except ValueError as e:
+            raise ClaudeError(str(e), CONFIG) from None
+    raise ValueError(f"unknown backend {name!r} (choose from {', '.join(BACKENDS)})")
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Orchestrator benchmark — throughput, overhead, memory and save cost of a run,
+on the fake backend (no network, no `claude`).
+
+Usage:
+    python bench.py                                # all targets at 100 / 1k / 10k cells
+    python bench.py --sizes 100,1000 --targets runner
+    python bench.py --latency 0.05 --concurrency 8 # simulated 50ms calls
+    python bench.py --baseline reports/bench_20260101_120000.json
+
+Targets:
+    sim-scored    sim.py --scored (domain heatmap cells, one model)
+    sim-standard  sim.py standard mode (scenario × model)
+    runner        RunManager, as started by POST /api/heatmap/run
+
+Each (target, size) runs in a fresh subprocess so peak RSS is its own,
+against a synthetic workspace (manifest, SKILL.md files, scenario YAMLs and
+reports directory in a temp dir). Per run it reports:
+
+    wall_s, tasks_per_s      end-to-end, from loading the plan to the saved report
+    overhead_ms_per_task     wall time not explained by simulated call latency
+                             (with the default latency=0, all of it)
+    schedule_ms_per_task     planning + scheduling the cells
+    save_*                   result saves: count, total, mean and last (the
+                             runner appends each result to its journal and
+                             compacts it into the report at the end, which
+                             is `last`; sim.py saves once)
+    sse_latency_ms           runner only: queue-to-consumer delay of the SSE
+                             events, p50 / p95 / max
+    peak_rss_mb              high-water resident memory of the subprocess
+
+Results are written as JSON (default reports/bench_<timestamp>.json) with the
+git revision, so runs of different commits can be compared with --baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+import yaml
+
+ROOT = Path(__file__).parent
+
+SIM_SCORED = "sim-scored"
+SIM_STANDARD = "sim-standard"
+RUNNER = "runner"
+TARGETS = (SIM_SCORED, SIM_STANDARD, RUNNER)
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT_S = 1800.0
+
+SCENARIOS_PER_DOMAIN = 25
+GENERALISTS = ("apify-mcpc", "apify-ultimate-scraper")  # see get_target_skills
+MODEL = "sonnet"
+
+
+# --- Synthetic workspace ---
+
+
+def make_workspace(root: Path, target: str, cells: int) -> int:
+    """Write a manifest, SKILL.md files and scenario YAMLs for ~`cells` cells.
+
+    Scored targets get domain YAMLs (3 cells per scenario: specialist + the
+    two generalists), sim-standard one category YAML (1 cell per scenario).
+    Returns the exact number of cells.
+    """
+    skills_dir, scenarios_dir = root / "skills", root / "scenarios"
+    skills_dir.mkdir(parents=True)
+    scenarios_dir.mkdir()
+    (root / "reports").mkdir()
+
+    scored = target != SIM_STANDARD
+    scenario_count = math.ceil(cells / 3) if scored else cells
+    domains = math.ceil(scenario_count / SCENARIOS_PER_DOMAIN)
+    skill_names = [f"bench-skill-{d:03d}" for d in range(domains)] + list(GENERALISTS)
+
+    manifest = {}
+    for name in skill_names:
+        path = skills_dir / f"{name}.md"
+        steps = "".join(f"{i}. Step {i} of the {name} workflow.\n" for i in range(1, 120))
+        path.write_text(f"# {name}\n\n## Workflow\n{steps}")
+        manifest[name] = {"path": str(path), "category": "dispatcher"}
+    (root / "skills_manifest.yaml").write_text(yaml.safe_dump({"skills": manifest}))
+
+    ids = iter(range(scenario_count))
+    for d in range(domains):
+        scenarios = [
+            {"id": f"bench-{i}", "name": f"Bench scenario {i}", "prompt": f"Scrape site {i}."}
+            for _, i in zip(range(SCENARIOS_PER_DOMAIN), ids)
+        ]
+        data = {"target_skill": skill_names[d], "scenarios": scenarios}
+        if scored:
+            data["domain"] = f"bench-{d:03d}"
+        else:
+            data["category"] = "WF"
+        (scenarios_dir / f"bench_{d:03d}.yaml").write_text(yaml.safe_dump(data))
+    return scenario_count * 3 if scored else scenario_count
+
+
+@contextlib.contextmanager
+def use_workspace(root: Path) -> Iterator[None]:
+    """Point sim_core's manifest, scenarios and reports paths at `root`."""
+    import sim_core
+
+    saved = {
+        name: getattr(sim_core, name)
+        for name in ("MANIFEST_PATH", "SCENARIOS_DIR", "REPORTS_DIR")
+    }
+    sim_core.MANIFEST_PATH = root / "skills_manifest.yaml"
+    sim_core.SCENARIOS_DIR = root / "scenarios"
+    sim_core.REPORTS_DIR = root / "reports"
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(sim_core, name, value)
+
+
+# --- Instrumentation ---
+
+
+class _Timed:
+    """Wraps a function and records how long each call took."""
+
+    def __init__(self, fn: Callable):
+        self.fn = fn
+        self.durations: list[float] = []
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.fn(*args, **kwargs)
+        finally:
+            self.durations.append(time.perf_counter() - start)
+
+
+@contextlib.contextmanager
+def _patched(module, name: str, value) -> Iterator[None]:
+    saved = getattr(module, name)
+    setattr(module, name, value)
+    try:
+        yield
+    finally:
+        setattr(module, name, saved)
+
+
+@contextlib.contextmanager
+def _env(name: str, value: str) -> Iterator[None]:
+    saved = os.environ.get(name)
+    os.environ[name] = value
+    try:
+        yield
+    finally:
+        if saved is None:
+            del os.environ[name]
+        else:
+            os.environ[name] = saved
+
+
+class _TimedQueue(asyncio.Queue):
+    """asyncio.Queue that stamps each item with the time it was put."""
+
+    def _put(self, item) -> None:
+        super()._put((time.perf_counter(), item))
+
+    def _get(self):
+        stamp, item = super()._get()
+        self.last_wait_s = time.perf_counter() - stamp
+        return item
+
+
+def _rss_mb() -> float:
+    """Peak resident set size of this process so far (MB)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _percentiles_ms(values: list[float]) -> dict | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "p50": round(statistics.median(ordered) * 1000, 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+# --- Targets ---
+
+
+def _fake_spec(latency: float, seed: int) -> str:
+    return f"seed={seed},latency={latency},jitter=0"
+
+
+async def _run_sim(target: str, latency: float, concurrency: int, seed: int) -> dict:
+    import sim
+
+    argv = [
+        "sim.py",
+        "--backend",
+        "fake",
+        "--fake-config",
+        _fake_spec(latency, seed),
+        "-m",
+        MODEL,
+        "--concurrency",
+        str(concurrency),
+        "--max-concurrency",
+        str(concurrency),
+    ]
+    if target == SIM_SCORED:
+        argv.append("--scored")
+    backends = []
+    original_make_backend = sim.make_backend
+
+    def make_backend(*args, **kwargs):
+        backends.append(original_make_backend(*args, **kwargs))
+        return backends[-1]
+
+    save_name = "save_scored_report" if target == SIM_SCORED else "save_reports"
+    save = _Timed(getattr(sim, save_name))
+    schedule_name = "schedule_scored_tasks" if target == SIM_SCORED else "schedule_standard_tasks"
+    schedule = _Timed(getattr(sim, schedule_name))
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(_patched(sys, "argv", argv))
+        stack.enter_context(_patched(sim, "make_backend", make_backend))
+        stack.enter_context(_patched(sim, save_name, save))
+        stack.enter_context(_patched(sim, schedule_name, schedule))
+        stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        start = time.perf_counter()
+        await sim.main()
+        wall = time.perf_counter() - start
+    return {
+        "wall_s": wall,
+        "simulated_s": sum(b.simulated_s for b in backends),
+        "schedule_s": sum(schedule.durations),
+        "saves": save.durations,
+        "sse": [],
+    }
+
+
+async def _run_runner(latency: float, concurrency: int, seed: int) -> dict:
+    from server.services import runner
+
+    manager = runner.RunManager()
+    journals = []
+    start_journal = runner.start_run_journal
+
+    def timed_journal(*args, **kwargs):
+        journal = start_journal(*args, **kwargs)
+        journal.append = _Timed(journal.append)
+        journals.append(journal)
+        return journal
+
+    compact = _Timed(runner.compact_scored_run)
+    schedule = _Timed(runner.schedule_scored_tasks)
+    sse: list[float] = []
+    with _patched(runner, "start_run_journal", timed_journal), _patched(
+        runner, "compact_scored_run", compact
+    ), _patched(runner, "schedule_scored_tasks", schedule), _env(
+        "FAKE_BACKEND", _fake_spec(latency, seed)
+    ):
+        start = time.perf_counter()
+        run_id = manager.start_scored_run(
+            domains=None,
+            models=[MODEL],
+            concurrency=concurrency,
+            max_concurrency=concurrency,
+            use_cache=False,
+            backend="fake",
+        )
+        state = manager.get_scored_run(run_id)
+        state.queue = _TimedQueue()  # before the run task first runs
+        # Consume events as the SSE endpoint does
+        while (await state.queue.get()) is not None:
+            sse.append(state.queue.last_wait_s)
+        wall = time.perf_counter() - start
+    if state.error:
+        raise RuntimeError(f"run failed: {state.error}")
+    return {
+        "wall_s": wall,
+        "simulated_s": manager.backend("fake").simulated_s,
+        "schedule_s": sum(schedule.durations),
+        "saves": [d for j in journals for d in j.append.durations] + compact.durations,
+        "sse": sse,
+    }
+
+
+def run_benchmark(
+    target: str,
+    cells: int,
+    latency: float = 0.0,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    seed: int = 1,
+) -> dict:
+    """Run one target at ~`cells` cells in a temp workspace; returns its metrics."""
+    if target not in TARGETS:
+        raise ValueError(f"unknown target {target!r} (choose from {', '.join(TARGETS)})")
+    with tempfile.TemporaryDirectory(prefix="skill-checker-bench-") as tmp:
+        root = Path(tmp)
+        cells = make_workspace(root, target, cells)
+        baseline_rss = _rss_mb()
+        with use_workspace(root):
+            if target == RUNNER:
+                raw = asyncio.run(_run_runner(latency, concurrency, seed))
+            else:
+                raw = asyncio.run(_run_sim(target, latency, concurrency, seed))
+
+    wall, saves = raw["wall_s"], raw["saves"]
+    return {
+        "target": target,
+        "cells": cells,
+        "wall_s": round(wall, 3),
+        "tasks_per_s": round(cells / wall, 1),
+        "overhead_ms_per_task": round(
+            max(0.0, wall - raw["simulated_s"] / concurrency) / cells * 1000, 3
+        ),
+        "schedule_ms_per_task": round(raw["schedule_s"] / cells * 1000, 4),
+        "saves": len(saves),
+        "save_total_s": round(sum(saves), 3),
+        "save_mean_ms": round(statistics.mean(saves) * 1000, 3) if saves else None,
+        "save_last_ms": round(saves[-1] * 1000, 3) if saves else None,
+        "sse_events": len(raw["sse"]),
+        "sse_latency_ms": _percentiles_ms(raw["sse"]),
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "peak_rss_mb": round(_rss_mb(), 1),
+    }
+
+
+# --- Driver ---
+
+
+def _run_child(args: argparse.Namespace, target: str, cells: int) -> dict:
+    """run_benchmark in a fresh interpreter (so peak RSS is its own)."""
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--child",
+        target,
+        str(cells),
+        "--latency",
+        str(args.latency),
+        "--concurrency",
+        str(args.concurrency),
+        "--seed",
+        str(args.seed),
+    ]
+    try:
+        proc = subprocess.run(
+            command, cwd=ROOT, capture_output=True, text=True, timeout=args.timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {"target": target, "cells": cells, "error": f"timed out after {args.timeout:g}s"}
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["no output"]
+        return {"target": target, "cells": cells, "error": tail[0]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _format_row(r: dict) -> str:
+    if "error" in r:
+        return f"{r['target']:<13} {r['cells']:>6}  ERROR: {r['error']}"
+    sse = f"{r['sse_latency_ms']['p95']:.3f}" if r["sse_latency_ms"] else "-"
+    return (
+        f"{r['target']:<13} {r['cells']:>6} {r['wall_s']:>8.2f} {r['tasks_per_s']:>9.1f} "
+        f"{r['overhead_ms_per_task']:>9.3f} {r['save_mean_ms'] or 0:>9.3f} "
+        f"{sse:>9} {r['peak_rss_mb']:>8.1f}"
+    )
+
+
+def _compare(results: list[dict], baseline: dict) -> list[str]:
+    """One line per (target, cells) measured in both: throughput and memory change."""
+    old = {(r["target"], r["cells"]): r for r in baseline["results"] if "error" not in r}
+    lines = []
+    for r in results:
+        before = old.get((r["target"], r["cells"]))
+        if before is None or "error" in r:
+            continue
+        speed = r["tasks_per_s"] / before["tasks_per_s"] - 1
+        memory = r["peak_rss_mb"] / before["peak_rss_mb"] - 1
+        lines.append(
+            f"{r['target']:<13} {r['cells']:>6}  tasks/s {speed:+.0%}  peak RSS {memory:+.0%}"
+        )
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the orchestrator on the fake backend"
+    )
+    parser.add_argument(
+        "--targets",
+        default=",".join(TARGETS),
+        help=f"Comma-separated targets (default: all of {', '.join(TARGETS)})",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(map(str, DEFAULT_SIZES)),
+        help="Comma-separated cell counts (default: 100,1000,10000)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated call latency in seconds (default: 0, pure orchestrator overhead)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Concurrent calls (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Fake backend seed")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT_S,
+        help="Give up on one (target, size) after this many seconds (default: 1800)",
+    )
+    parser.add_argument(
+        "--output",
+        help="Where to write the JSON results (default: reports/bench_<timestamp>.json)",
+    )
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--child", nargs=2, metavar=("TARGET", "CELLS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        target, cells = args.child
+        metrics = run_benchmark(target, int(cells), args.latency, args.concurrency, args.seed)
+        print(json.dumps(metrics))
+        return
+
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+    try:
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    except ValueError:
+        parser.error("--sizes must be comma-separated integers")
+
+    print(
+        f"{'target':<13} {'cells':>6} {'wall s':>8} {'tasks/s':>9} {'ovh ms':>9} "
+        f"{'save ms':>9} {'sse p95':>9} {'RSS MB':>8}"
+    )
+    results = []
+    for target in targets:
+        for size in sizes:
+            result = _run_child(args, target, size)
+            results.append(result)
+            print(_format_row(result), flush=True)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "latency": args.latency,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        path = Path(args.output)
+    else:
+        path = ROOT / "reports" / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nResults saved: {path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        print(f"\nAgainst {args.baseline} ({baseline.get('git_revision') or 'unknown revision'}):")
+        for line in _compare(results, baseline):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Heatmap assembly micro-benchmark — report scans vs the results store.
+
+Before the results store, every heatmap request loaded all scored reports,
+merged them into a newest-per-cell index and looked up each check with a
+linear `next(c for c in run.checks if c.check_id == ...)` inside the
+scenario × check × model loops. This builds a synthetic set of domains
+(bench.py's workspace) with several overlapping scored reports, then times:
+
+    scan      that algorithm, kept here as the reference
+    store     the /domain/{id} and /detail/... endpoints, uncached
+    cached    the same endpoints served from the query cache
+
+Both paths must return the same matrices and details; a mismatch aborts the
+run.
+
+Usage:
+    python bench_heatmap.py                        # 50 domains, 4 reports, 2 models
+    python bench_heatmap.py --domains 10 --reports 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from bench import (
+    GENERALISTS,
+    SCENARIOS_PER_DOMAIN,
+    SIM_SCORED,
+    _patched,
+    make_workspace,
+    use_workspace,
+)
+
+DEFAULT_DOMAINS = 50
+DEFAULT_REPORTS = 4
+DEFAULT_MODELS = ("sonnet", "opus")
+COVERAGE = 0.6  # share of the cells each report has a result for
+DETAIL_SAMPLES = 25
+
+
+def write_reports(reports: int, models: tuple[str, ...], seed: int) -> int:
+    """Scored reports over the workspace's domains; returns results written."""
+    from sim_core import (
+        CATEGORY_GROUPS,
+        CheckResult,
+        ScoredRun,
+        get_target_skills,
+        load_domain_scenarios,
+        load_manifest,
+        save_scored_report_incremental,
+    )
+
+    rng = random.Random(seed)
+    manifest = load_manifest()
+    check_ids = [c for group in CATEGORY_GROUPS.values() for c in group["categories"]]
+    cells = [
+        (scenario.id, skill, model)
+        for scenarios in load_domain_scenarios().values()
+        for scenario in scenarios
+        for skill in get_target_skills(scenario, manifest)
+        for model in models
+    ]
+    written = 0
+    for n in range(reports):
+        runs = [
+            ScoredRun(
+                scenario_id=scenario_id,
+                skill=skill,
+                model=model,
+                checks=[
+                    CheckResult(
+                        check_id=check_id,
+                        result=rng.choice(("pass", "pass", "fail", "unclear", "n/a")),
+                        evidence=f"evidence {n}",
+                        summary=f"summary {n}",
+                    )
+                    # Answers do not always cover every check
+                    for check_id in check_ids
+                    if rng.random() < 0.9
+                ],
+                risk_level="LOW",
+                markdown_response=f"Answer from report {n}.",
+                duration_s=1.0,
+                cost_info="",
+            )
+            for scenario_id, skill, model in rng.sample(cells, int(len(cells) * COVERAGE))
+        ]
+        save_scored_report_incremental(f"bench{n:03d}", runs, {"models": list(models)})
+        written += len(runs)
+    return written
+
+
+# --- Reference: the report-scanning assembly ---
+
+
+def _scan_check(run, check_id: str):
+    if run is None:
+        return None
+    return next((c for c in run.checks if c.check_id == check_id), None)
+
+
+def scan_domain_matrix(domain_id: str) -> dict:
+    from server.routers.heatmap import DOMAIN_SKILL_MAP
+    from sim_core import (
+        CATEGORY_GROUPS,
+        DEV_DOMAINS,
+        load_all_scored_reports,
+        load_domain_scenarios,
+        merge_scored_runs,
+    )
+
+    scenarios = load_domain_scenarios()[domain_id]
+    specialist = DOMAIN_SKILL_MAP.get(domain_id, "")
+    is_dev = domain_id in DEV_DOMAINS
+    check_ids = [
+        c for key in ("WF", "DK", "APF", "SEC") for c in CATEGORY_GROUPS[key]["categories"]
+    ]
+    sorted_models, run_index = merge_scored_runs(load_all_scored_reports())
+
+    matrix: dict = {}
+    if run_index:
+        for scenario in scenarios:
+            matrix[scenario.id] = {}
+            for check_id in check_ids:
+                model_cells = {}
+                for model in sorted_models:
+                    cell = {}
+                    for side, skill in (("specialist", specialist), ("mcpc", "apify-mcpc")):
+                        check = _scan_check(run_index.get((scenario.id, skill, model)), check_id)
+                        cell[side] = (
+                            {"result": check.result, "evidence": check.evidence, "summary": check.summary}
+                            if check and not (side == "mcpc" and is_dev)
+                            else None
+                        )
+                    model_cells[model] = cell
+                matrix[scenario.id][check_id] = model_cells
+    return {"models": sorted_models, "matrix": matrix}
+
+
+def scan_cell_detail(scenario_id: str, check_id: str) -> dict:
+    from server.routers.heatmap import DOMAIN_SKILL_MAP
+    from sim_core import DEV_DOMAINS, load_all_scored_reports, load_domain_scenarios, merge_scored_runs
+
+    domain_id = next(
+        d
+        for d, scenarios in load_domain_scenarios().items()
+        if any(s.id == scenario_id for s in scenarios)
+    )
+    specialist = DOMAIN_SKILL_MAP.get(domain_id, "")
+    sides = [("specialist", specialist)] + ([] if domain_id in DEV_DOMAINS else [("mcpc", "apify-mcpc")])
+    sorted_models, run_index = merge_scored_runs(load_all_scored_reports())
+
+    models: dict = {}
+    for model in sorted_models:
+        data: dict = {"specialist": None, "mcpc": None}
+        for side, skill in sides:
+            run = run_index.get((scenario_id, skill, model))
+            if run is None:
+                continue
+            check = _scan_check(run, check_id)
+            data[side] = {
+                "skill": run.skill,
+                "result": check.result if check else "unclear",
+                "evidence": check.evidence if check else "",
+                "summary": check.summary if check else "",
+                "markdown_response": run.markdown_response,
+            }
+        if data["specialist"] is not None or data["mcpc"] is not None:
+            models[model] = data
+    return models
+
+
+# --- Timing ---
+
+
+def _time_ms(fn: Callable, args: list[tuple]) -> tuple[float, list]:
+    """Mean milliseconds per call over `args`, and the results."""
+    results = []
+    start = time.perf_counter()
+    for a in args:
+        results.append(fn(*a))
+    return (time.perf_counter() - start) * 1000 / len(args), results
+
+
+def run_benchmark(domains: int, reports: int, models: tuple[str, ...], seed: int) -> dict:
+    """Build the workspace, time both paths, check they agree. Returns the timings."""
+    from results_store import open_store
+    from server.routers import heatmap
+    from sim_core import CATEGORY_GROUPS, load_domain_scenarios
+
+    with tempfile.TemporaryDirectory(prefix="bench_heatmap_") as tmp:
+        root = Path(tmp)
+        make_workspace(root, SIM_SCORED, domains * SCENARIOS_PER_DOMAIN * 3)
+        skill_map = {f"bench-{d:03d}": f"bench-skill-{d:03d}" for d in range(domains)}
+        with use_workspace(root), _patched(heatmap, "DOMAIN_SKILL_MAP", skill_map):
+            results = write_reports(reports, models, seed)
+            start = time.perf_counter()
+            open_store()
+            import_s = time.perf_counter() - start
+
+            rng = random.Random(seed)
+            domain_args = [(d,) for d in sorted(load_domain_scenarios())]
+            scenario_ids = [s.id for ss in load_domain_scenarios().values() for s in ss]
+            check_ids = [c for group in CATEGORY_GROUPS.values() for c in group["categories"]]
+            detail_args = [
+                (rng.choice(scenario_ids), rng.choice(check_ids)) for _ in range(DETAIL_SAMPLES)
+            ]
+
+            timings = {}
+            for name, scan, endpoint, args in (
+                ("domain", scan_domain_matrix, heatmap.get_domain_heatmap, domain_args),
+                ("detail", scan_cell_detail, heatmap.get_cell_detail, detail_args),
+            ):
+                uncached = getattr(endpoint, "__wrapped__", None)
+                scan_ms, expected = _time_ms(scan, args)
+                store_ms, actual = _time_ms(uncached or endpoint, args)
+                cached_ms = None
+                if uncached is not None:
+                    endpoint(*args[0])
+                    cached_ms = round(_time_ms(endpoint, args[:1] * len(args))[0], 2)
+                for a, want, got in zip(args, expected, actual):
+                    if name == "domain":
+                        got = {"models": got["models"], "matrix": got["matrix"]}
+                    else:
+                        got = got["models"]
+                    if want != got:
+                        raise AssertionError(f"{name} {a}: store and scan disagree")
+                timings[name] = {
+                    "requests": len(args),
+                    "scan_ms": round(scan_ms, 2),
+                    "store_ms": round(store_ms, 2),
+                    "cached_ms": cached_ms,
+                    "speedup": round(scan_ms / store_ms, 1),
+                }
+    return {
+        "domains": domains,
+        "reports": reports,
+        "models": list(models),
+        "results": results,
+        "import_s": round(import_s, 2),
+        "timings": timings,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Heatmap assembly micro-benchmark")
+    parser.add_argument("--domains", type=int, default=DEFAULT_DOMAINS, help="Synthetic domains")
+    parser.add_argument("--reports", type=int, default=DEFAULT_REPORTS, help="Overlapping scored reports")
+    parser.add_argument(
+        "--models", default=",".join(DEFAULT_MODELS), help="Comma-separated models per cell"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    r = run_benchmark(args.domains, args.reports, tuple(args.models.split(",")), args.seed)
+    cells = r["domains"] * SCENARIOS_PER_DOMAIN * (1 + len(GENERALISTS)) * len(r["models"])
+    print(
+        f"{r['domains']} domains, {cells} cells, {r['reports']} reports, "
+        f"{r['results']} results (store import {r['import_s']}s)"
+    )
+    print(f"{'endpoint':<10}{'requests':>9}{'scan ms':>10}{'store ms':>10}{'cached ms':>11}{'speedup':>9}")
+    for name, t in r["timings"].items():
+        print(
+            f"{name:<10}{t['requests']:>9}{t['scan_ms']:>10}{t['store_ms']:>10}"
+            f"{t['cached_ms'] if t['cached_ms'] is not None else '-':>11}{t['speedup']:>8}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Run estimates — tokens, cost and wall time before a run starts.
+
+UsageModel learns from earlier scored reports how many prompt tokens a model
+bills per character of prompt (system prompt + SKILL.md + scenario), how many
+tokens it answers with, and what it actually paid relative to list price
+(prompt caching makes that less than 1). Applied to the prompt sizes of the
+planned calls it predicts the run's tokens and cost; the wall time comes from
+the scheduler's expected makespan. Without history, CHARS_PER_TOKEN,
+DEFAULT_RESPONSE_TOKENS and list prices are used.
+"""
+
+from __future__ import annotations
+
+import statistics
+from dataclasses import dataclass, field
+from typing import Iterable, NamedTuple
+
+from limits import estimate_cost_usd
+from scheduling import format_duration
+
+# Prompt characters per billed token without any history
+CHARS_PER_TOKEN = 4.0
+
+# Response tokens per scored cell without any history
+DEFAULT_RESPONSE_TOKENS = {"opus": 1800, "sonnet": 1500, "haiku": 1200}
+FALLBACK_RESPONSE_TOKENS = 1500
+
+
+class UsageSample(NamedTuple):
+    """One earlier call: its prompt size and what it was billed."""
+
+    model: str
+    prompt_chars: int
+    prompt_tokens: int  # input + cache read + cache write
+    output_tokens: int
+    cost_usd: float | None  # as reported by the backend, if it was
+
+
+@dataclass
+class UsageModel:
+    """Per-model medians of tokens per prompt char, response tokens and cost factor."""
+
+    tokens_per_char: dict[str, float] = field(default_factory=dict)
+    response_tokens: dict[str, float] = field(default_factory=dict)
+    cost_factor: dict[str, float] = field(default_factory=dict)
+    samples: int = 0
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[UsageSample]) -> UsageModel:
+        """Build from earlier calls; samples without a prompt size are skipped."""
+        ratios: dict[str, list[float]] = {}
+        responses: dict[str, list[float]] = {}
+        factors: dict[str, list[float]] = {}
+        count = 0
+        for s in samples:
+            if s.prompt_chars <= 0 or s.prompt_tokens <= 0:
+                continue
+            ratios.setdefault(s.model, []).append(s.prompt_tokens / s.prompt_chars)
+            responses.setdefault(s.model, []).append(s.output_tokens)
+            list_price = estimate_cost_usd(s.model, s.prompt_tokens, s.output_tokens)
+            if s.cost_usd is not None and list_price:
+                factors.setdefault(s.model, []).append(s.cost_usd / list_price)
+            count += 1
+        return cls(
+            tokens_per_char={k: statistics.median(v) for k, v in ratios.items()},
+            response_tokens={k: statistics.median(v) for k, v in responses.items()},
+            cost_factor={k: statistics.median(v) for k, v in factors.items()},
+            samples=count,
+        )
+
+    def estimate(
+        self, model: str, prompt_chars: int, cells: int = 1
+    ) -> tuple[int, int, float | None]:
+        """(input tokens, output tokens, cost in USD) of one call scoring `cells` cells."""
+        input_tokens = round(prompt_chars * self.tokens_per_char.get(model, 1 / CHARS_PER_TOKEN))
+        per_cell = self.response_tokens.get(
+            model, DEFAULT_RESPONSE_TOKENS.get(model, FALLBACK_RESPONSE_TOKENS)
+        )
+        output_tokens = round(per_cell * cells)
+        cost = estimate_cost_usd(model, input_tokens, output_tokens)
+        if cost is not None:
+            cost *= self.cost_factor.get(model, 1.0)
+        return input_tokens, output_tokens, cost
+
+
+@dataclass
+class RunEstimate:
+    """Predicted size of a run (no response-cache hits assumed)."""
+
+    cells: int = 0
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    makespan_s: float = 0.0
+    concurrency: int = 1
+    history_samples: int = 0  # calls of earlier runs the estimate is based on
+    by_model: dict[str, dict] = field(default_factory=dict)
+
+    def add_call(
+        self, model: str, cells: int, input_tokens: int, output_tokens: int, cost_usd: float | None
+    ) -> None:
+        self.cells += cells
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cost_usd += cost_usd or 0.0
+        m = self.by_model.setdefault(
+            model, {"cells": 0, "calls": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+        )
+        m["cells"] += cells
+        m["calls"] += 1
+        m["input_tokens"] += input_tokens
+        m["output_tokens"] += output_tokens
+        m["cost_usd"] += cost_usd or 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "cells": self.cells,
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 4),
+            "makespan_s": round(self.makespan_s, 1),
+            "concurrency": self.concurrency,
+            "history_samples": self.history_samples,
+            "by_model": {
+                k: {**v, "cost_usd": round(v["cost_usd"], 4)} for k, v in self.by_model.items()
+            },
+        }
+
+
+def format_estimate(estimate: RunEstimate) -> str:
+    """Human-readable summary of a RunEstimate."""
+    basis = (
+        f"from {estimate.history_samples} earlier calls"
+        if estimate.history_samples
+        else "no history, default rates"
+    )
+    return (
+        f"Estimate: ${estimate.cost_usd:.2f}, {estimate.input_tokens:,} in + "
+        f"{estimate.output_tokens:,} out tokens, ~{format_duration(estimate.makespan_s)} "
+        f"at concurrency {estimate.concurrency} ({estimate.calls} calls, {basis})"
+    )
@@ -0,0 +1,264 @@
+"""
+Simulated model backend for offline load tests — no network, no `claude`.
+
+FakeBackend answers every call locally after a simulated latency, with the
+markdown + JSON layout the scoring prompts ask for: the check IDs are read
+from the prompt's taxonomy, batched calls get one section per `## Scenario`
+and comparative calls one per `## Skill`, other prompts get a plain analysis.
+It reports token usage like the API does (a repeated system prompt is billed
+as a prompt-cache read) and can stream.
+
+Failures are injected at configurable rates: overload (429/529), generic
+errors, hangs that run into the call timeout, and malformed answers (no JSON
+block, or JSON cut off mid-object). Every draw comes from an RNG seeded with
+(seed, model, prompts, attempt number), so a seeded run gives each cell the
+same outcome whatever order the calls run in, and a retry of a failed call
+gets a fresh draw.
+
+Configured from a spec string, e.g.
+`seed=7,latency=0.5,jitter=0.3,overload=0.02,malformed=0.05` (see FakeConfig),
+passed to `sim.py --fake-config` or set as FAKE_BACKEND for the server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import time
+from dataclasses import dataclass, fields
+
+from backends import FAKE, Backend, Completion, StreamMonitor
+from retries import TIMEOUT, ClaudeError
+
+# Relative speed of the simulated models (multiplies `latency`)
+MODEL_SPEED = {"opus": 2.0, "sonnet": 1.0, "haiku": 0.5}
+
+_CHECK_ID_RE = re.compile(r"^- \*\*([A-Z]+-\d+)\*\*", re.MULTILINE)
+_SCENARIO_RE = re.compile(r"^## Scenario `([^`]+)`", re.MULTILINE)
+_SKILL_RE = re.compile(r"^## Skill `([^`]+)`", re.MULTILINE)
+
+_STREAM_CHUNKS = 8
+
+
+@dataclass
+class FakeConfig:
+    """Behaviour of the simulated backend. Rates are probabilities per call."""
+
+    seed: int | None = None  # None: a different run every time
+    latency: float = 1.0  # median call duration (s) for sonnet
+    jitter: float = 0.3  # sigma of the log-normal latency distribution
+    ttft: float = 0.2  # share of the latency before the first token
+    overload: float = 0.0  # 529 overloaded / 429 rate limited
+    errors: float = 0.0  # unexplained (transient) failures
+    hangs: float = 0.0  # calls that never answer (until the call timeout)
+    malformed: float = 0.0  # answers without a usable JSON block
+    output_tokens: int = 1500  # mean response tokens per scored item
+    pass_rate: float = 0.6  # share of checks scored pass
+    fail_rate: float = 0.3  # share scored fail; the rest is unclear
+
+    @classmethod
+    def parse(cls, spec: str) -> FakeConfig:
+        """From 'key=value,...'; raises ValueError for unknown keys or bad values."""
+        types = {f.name: f.type for f in fields(cls)}
+        values: dict = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            key, sep, value = part.partition("=")
+            key = key.strip()
+            if not sep or key not in types:
+                raise ValueError(
+                    f"bad fake backend setting {part!r} (keys: {', '.join(types)})"
+                )
+            cast = int if types[key] in ("int", "int | None") else float
+            try:
+                values[key] = cast(value)
+            except ValueError:
+                raise ValueError(f"bad fake backend value {part!r}") from None
+        config = cls(**values)
+        rates = (config.overload, config.errors, config.hangs, config.malformed)
+        if any(not 0 <= r <= 1 for r in rates) or sum(rates) > 1:
+            raise ValueError("fake backend failure rates must be within 0..1 in total")
+        if config.latency < 0 or config.jitter < 0 or not 0 <= config.ttft <= 1:
+            raise ValueError("fake backend latency and jitter must be >= 0, ttft within 0..1")
+        return config
+
+
+class FakeBackend(Backend):
+    """Simulated backend. `calls` counts every call, failed ones included;
+    `simulated_s` is the time they spent waiting on simulated latency."""
+
+    name = FAKE
+
+    def __init__(self, config: FakeConfig | None = None):
+        self.config = config or FakeConfig()
+        self.calls = 0
+        self.simulated_s = 0.0
+        self._attempts: dict[str, int] = {}
+        self._seen_prefixes: set[str] = set()  # system prompt digests (prompt cache)
+        # Unseeded: salt the per-call RNGs so every run differs
+        self._salt = random.getrandbits(64) if self.config.seed is None else 0
+
+    @classmethod
+    def from_env(cls, spec: str | None = None) -> FakeBackend:
+        """Configure from `spec`, or the FAKE_BACKEND variable; defaults otherwise."""
+        if spec is None:
+            spec = os.environ.get("FAKE_BACKEND", "")
+        return cls(FakeConfig.parse(spec))
+
+    def _rng(self, model: str, system_prompt: str, user_prompt: str) -> random.Random:
+        digest = hashlib.sha256(
+            f"{model}\0{system_prompt}\0{user_prompt}".encode()
+        ).hexdigest()
+        attempt = self._attempts.get(digest, 0)
+        self._attempts[digest] = attempt + 1
+        return random.Random(f"{self.config.seed}:{self._salt}:{digest}:{attempt}")
+
+    async def complete(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        timeout_s: float | None = None,
+        stream: StreamMonitor | None = None,
+    ) -> Completion:
+        cfg = self.config
+        rng = self._rng(model, system_prompt, user_prompt)
+        self.calls += 1
+        latency = cfg.latency * MODEL_SPEED.get(model, 1.0)
+        if latency > 0 and cfg.jitter > 0:
+            latency *= math.exp(rng.gauss(0, cfg.jitter))
+
+        outcome = rng.random()
+        for kind, rate in (
+            ("overload", cfg.overload),
+            ("error", cfg.errors),
+            ("hang", cfg.hangs),
+            ("malformed", cfg.malformed),
+        ):
+            if outcome < rate:
+                break
+            outcome -= rate
+        else:
+            kind = "ok"
+
+        if kind == "hang":
+            latency = math.inf
+        if timeout_s is not None and latency > timeout_s:
+            self.simulated_s += timeout_s
+            await asyncio.sleep(timeout_s)
+            raise ClaudeError(f"fake call timed out after {timeout_s:g}s", TIMEOUT)
+        if math.isinf(latency):
+            raise ClaudeError("fake call hung and no timeout was set", TIMEOUT)
+        if kind in ("overload", "error"):
+            self.simulated_s += latency * cfg.ttft
+            await asyncio.sleep(latency * cfg.ttft)
+        if kind == "overload":
+            raise ClaudeError(
+                rng.choice(["529 overloaded_error: Overloaded", "429 rate_limit_error"])
+            )
+        if kind == "error":
+            raise ClaudeError("fake backend: connection reset by peer")
+
+        response, items = _answer(rng, cfg, system_prompt, user_prompt, kind == "malformed")
+        self.simulated_s += latency
+        await _deliver(response, latency, cfg.ttft, stream)
+
+        prefix_tokens = _tokens(system_prompt)
+        prefix = hashlib.sha256(system_prompt.encode()).hexdigest()
+        cached = prefix in self._seen_prefixes
+        self._seen_prefixes.add(prefix)
+        input_tokens = _tokens(user_prompt) + (0 if cached else prefix_tokens)
+        output_tokens = max(1, round(rng.gauss(cfg.output_tokens, cfg.output_tokens / 5))) * items
+        cost_info = (
+            f"input={input_tokens}, output={output_tokens}, "
+            f"cache_read={prefix_tokens if cached else 0}, "
+            f"cache_write={0 if cached else prefix_tokens}"
+        )
+        return Completion(response, cost_info, input_tokens + output_tokens)
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+async def _deliver(
+    response: str, latency: float, ttft: float, stream: StreamMonitor | None
+) -> None:
+    """Wait out the simulated latency, streaming the response in chunks if asked."""
+    if stream is None:
+        await asyncio.sleep(latency)
+        return
+    stream.begin(time.monotonic())
+    await asyncio.sleep(latency * ttft)
+    size = math.ceil(len(response) / _STREAM_CHUNKS) or 1
+    for i in range(0, len(response), size):
+        stream.feed(response[i : i + size])
+        await asyncio.sleep(latency * (1 - ttft) / _STREAM_CHUNKS)
+    stream.end()
+
+
+def _answer(
+    rng: random.Random,
+    cfg: FakeConfig,
+    system_prompt: str,
+    user_prompt: str,
+    malformed: bool,
+) -> tuple[str, int]:
+    """(response text, number of scored items) in the layout the prompt asks for."""
+    check_ids = _CHECK_ID_RE.findall(system_prompt)
+    if not check_ids:
+        return _analysis(rng), 1
+    text = f"{system_prompt}\n{user_prompt}"
+    if "keyed by scenario ID" in system_prompt:
+        key, names, heading = "scenarios", _SCENARIO_RE.findall(text), "Scenario"
+    elif "keyed by skill name" in system_prompt:
+        key, names, heading = "skills", _SKILL_RE.findall(text), "Skill"
+    else:
+        key, names, heading = None, [""], None
+
+    def scores() -> dict:
+        checks = {}
+        for cid in check_ids:
+            roll = rng.random()
+            result = (
+                "pass"
+                if roll < cfg.pass_rate
+                else "fail" if roll < cfg.pass_rate + cfg.fail_rate else "unclear"
+            )
+            checks[cid] = {
+                "result": result,
+                "evidence": f"Simulated evidence for {cid}",
+                "summary": f"Simulated {result}",
+            }
+        risk = rng.choice(["LOW", "MEDIUM", "HIGH", "CRITICAL"])
+        return {"checks": checks, "risk_level": risk}
+
+    sections = [
+        (f"# {heading} {name}\n\n" if heading else "") + _analysis(rng) for name in names
+    ]
+    if key is None:
+        payload = scores()
+    else:
+        payload = {key: {name: scores() for name in names}}
+    analysis = "\n\n".join(sections)
+    body = json.dumps(payload, indent=2)
+    if malformed:
+        # Either no JSON block at all, or one cut off mid-object
+        if rng.random() < 0.5:
+            return analysis, len(names)
+        return f"{analysis}\n\n```json\n{body[: len(body) // 2]}", len(names)
+    return f"{analysis}\n\n```json\n{body}\n```\n", len(names)
+
+
+def _analysis(rng: random.Random) -> str:
+    risk = rng.choice(["LOW", "MEDIUM", "HIGH"])
+    return (
+        "## Approach\nSimulated walk-through of the SKILL.md for this prompt.\n\n"
+        "## Complexities Identified\nSimulated findings.\n\n"
+        f"## Risk Assessment\n{risk}\n\n"
+        "## Verdict\nSimulated verdict."
+    )
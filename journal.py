@@ -0,0 +1,130 @@
+"""
+Append-only run journal — a crash-safe record of a run in progress.
+
+Reports are written when a run ends, and the server keeps its run state in
+memory; a crash, Ctrl-C or restart loses whatever was not saved. A journal is
+a JSON Lines file written as the run goes: one "plan" record first (the run's
+cells and options), then one "result" record per finished task, each flushed
+and fsynced before the run moves on. A resumed run reads it back and
+schedules only the cells without a result. For server runs the journal is
+also the run's results log; it is compacted into the report once, at the end
+(see sim_core.compact_scored_run).
+
+A process killed mid-write leaves a torn last line; it is ignored when
+reading and cut off when the journal is reopened for appending.
+
+With `sync_interval_s` set, records are still written and flushed one by one
+(a killed process loses nothing) but fsynced at most once per interval and on
+close (a power loss can cost the last interval's records). Appends may come
+from several threads.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+PLAN = "plan"
+RESULT = "result"
+
+
+class RunJournal:
+    """Appends records to a journal file. Use create() or reopen()."""
+
+    def __init__(self, path: Path, fsync: bool = True, sync_interval_s: float = 0.0):
+        self.path = path
+        self.fsync = fsync
+        self.sync_interval_s = sync_interval_s
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._synced_at = 0.0
+        self._unsynced = False
+
+    @classmethod
+    def create(
+        cls, path: Path, plan: dict, fsync: bool = True, sync_interval_s: float = 0.0
+    ) -> RunJournal:
+        """Start a new journal with its plan record. Raises FileExistsError."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            raise FileExistsError(f"journal already exists: {path}")
+        journal = cls(path, fsync, sync_interval_s)
+        journal._write({"type": PLAN, **plan}, sync=True)
+        return journal
+
+    @classmethod
+    def reopen(
+        cls, path: Path, fsync: bool = True, sync_interval_s: float = 0.0
+    ) -> RunJournal:
+        """Continue an existing journal, dropping a torn last line."""
+        data = path.read_bytes()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(path, "r+b") as f:
+                f.truncate(end)
+        return cls(path, fsync, sync_interval_s)
+
+    def append(self, result: dict) -> None:
+        """Record one finished task."""
+        self._write({"type": RESULT, "result": result})
+
+    def _write(self, record: dict, sync: bool = False) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced = True
+            now = time.monotonic()
+            if sync or now - self._synced_at >= self.sync_interval_s:
+                self._sync(now)
+
+    def _sync(self, now: float) -> None:
+        if self.fsync and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._synced_at = now
+        self._unsynced = False
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._sync(time.monotonic())
+                self._file.close()
+
+    def __enter__(self) -> RunJournal:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def remove(self) -> None:
+        """Close and delete the journal (the run finished and was reported)."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def read_journal(path: Path) -> tuple[dict, list[dict]]:
+    """(plan, results) of a journal, results in the order they finished.
+
+    Raises FileNotFoundError, or ValueError if the plan record is missing or a
+    line other than the last one is not valid JSON.
+    """
+    lines = [line for line in path.read_text(encoding="utf-8").split("\n") if line.strip()]
+    plan: dict | None = None
+    results: list[dict] = []
+    for i, line in enumerate(lines):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            if i == len(lines) - 1:
+                break  # torn write of the last record
+            raise ValueError(f"{path.name}: line {i + 1} is not valid JSON") from None
+        if record.get("type") == PLAN and plan is None:
+            plan = {k: v for k, v in record.items() if k != "type"}
+        elif record.get("type") == RESULT:
+            results.append(record["result"])
+    if plan is None:
+        raise ValueError(f"{path.name}: no plan record")
+    return plan, results
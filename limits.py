@@ -0,0 +1,476 @@
+"""
+Execution limits for `claude -p` calls.
+
+AdaptiveLimiter replaces the fixed asyncio.Semaphore with an AIMD controller
+(additive increase, multiplicative decrease), one limit per model:
+
+- after a full window of healthy completions (as many as the current limit,
+  with latency and error rate in range) the limit grows by `increase`
+- a rate-limit / overload error cuts the limit by `decrease` — at most once per
+  window, so a burst of 429s from calls started together counts as one signal
+
+RateLimiter enforces requests-per-minute and tokens-per-minute budgets per
+model with token buckets. One instance is meant to be shared process-wide (the
+server's RunManager holds it) so concurrent runs draw from the same quota;
+waiting requests are served round-robin across owners (runs), so one large run
+cannot starve a small one.
+
+CostBudget caps a run's spend in USD: once reached, no new call is started.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+DEFAULT_MAX_CONCURRENCY = 12
+
+# Expected response size, reserved up front against tokens-per-minute budgets
+DEFAULT_OUTPUT_TOKENS = 2000
+
+# Error text from `claude -p` / the API that means "back off"
+OVERLOAD_PATTERN = re.compile(
+    r"rate.?limit|too many requests|overloaded|\b429\b|\b529\b|capacity",
+    re.IGNORECASE,
+)
+
+_LATENCY_EWMA_ALPHA = 0.3
+_OUTCOME_WINDOW = 20
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """True for rate-limit / overload errors that should shrink the limit."""
+    return bool(OVERLOAD_PATTERN.search(str(exc)))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+# ---------------------------------------------------------------------------
+# Rate limits (RPM / TPM token buckets)
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Per-model budget; None means unlimited."""
+
+    rpm: float | None = None
+    tpm: float | None = None
+
+
+def _parse_budget(spec: str | None, flag: str) -> dict[str, float]:
+    if not spec:
+        return {}
+    budgets: dict[str, float] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        model, sep, value = part.rpartition("=")
+        try:
+            budgets[model.strip() if sep else "*"] = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid {flag} value: {part!r}") from None
+    return budgets
+
+
+def parse_rate_limits(
+    rpm: str | None = None, tpm: str | None = None
+) -> dict[str, RateLimit]:
+    """Parse budgets like '50' (every model) or 'opus=20,sonnet=50,*=40'.
+
+    Returns {model: RateLimit}; the '*' entry applies to unlisted models.
+    """
+    rpms = _parse_budget(rpm, "rpm")
+    tpms = _parse_budget(tpm, "tpm")
+    return {
+        model: RateLimit(rpm=rpms.get(model), tpm=tpms.get(model))
+        for model in sorted(rpms.keys() | tpms.keys())
+    }
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `per_minute` / 60 per second.
+
+    Capacity is one minute's worth, so an idle model can absorb a burst. Tokens
+    may go negative when a reservation is settled above its estimate — the debt
+    is paid back by refill before the next request is admitted.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` (capped at capacity) is available."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate) if self.rate > 0 else 0.0
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.tokens -= amount
+
+    def adjust(self, delta: float) -> None:
+        """Charge (positive) or refund (negative) tokens after the fact."""
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+@dataclass
+class _Waiter:
+    owner: str
+    tokens: int
+    future: asyncio.Future
+
+
+@dataclass
+class _ModelBudget:
+    requests: TokenBucket | None
+    tokens: TokenBucket | None
+    queues: dict[str, deque] = field(default_factory=dict)  # owner → waiters
+    order: deque = field(default_factory=deque)  # owners, round-robin
+    timer: asyncio.TimerHandle | None = None
+    granted: int = 0
+    waited_s: float = 0.0
+
+
+class RatePermit:
+    """Admission for one request; settle() reconciles the token estimate."""
+
+    def __init__(self, budget: _ModelBudget | None, reserved: int):
+        self._budget = budget
+        self.reserved = reserved
+
+    def settle(self, actual_tokens: int) -> None:
+        if self._budget is not None and self._budget.tokens is not None:
+            self._budget.tokens.adjust(actual_tokens - self.reserved)
+        self.reserved = actual_tokens
+
+
+class RateLimiter:
+    """Per-model RPM/TPM budgets with round-robin fair queuing across owners."""
+
+    def __init__(self, limits: dict[str, RateLimit] | None = None):
+        self.limits = dict(limits or {})
+        self._budgets: dict[str, _ModelBudget | None] = {}
+
+    def _budget(self, model: str) -> _ModelBudget | None:
+        if model not in self._budgets:
+            limit = self.limits.get(model) or self.limits.get("*") or RateLimit()
+            if limit.rpm is None and limit.tpm is None:
+                self._budgets[model] = None
+            else:
+                self._budgets[model] = _ModelBudget(
+                    requests=TokenBucket(limit.rpm) if limit.rpm else None,
+                    tokens=TokenBucket(limit.tpm) if limit.tpm else None,
+                )
+        return self._budgets[model]
+
+    async def acquire(
+        self, model: str, tokens: int = 0, owner: str = "default"
+    ) -> RatePermit:
+        """Wait for the owner's turn and for budget; returns a RatePermit."""
+        budget = self._budget(model)
+        if budget is None:
+            return RatePermit(None, tokens)
+
+        waiter = _Waiter(owner, tokens, asyncio.get_running_loop().create_future())
+        if owner not in budget.queues:
+            budget.queues[owner] = deque()
+            budget.order.append(owner)
+        budget.queues[owner].append(waiter)
+        start = time.monotonic()
+        self._dispatch(budget)
+        try:
+            await waiter.future
+        except BaseException:
+            waiter.future.cancel()
+            self._dispatch(budget)  # drop the cancelled waiter
+            raise
+        budget.waited_s += time.monotonic() - start
+        return RatePermit(budget, tokens)
+
+    def _dispatch(self, budget: _ModelBudget) -> None:
+        """Admit waiters round-robin while the buckets allow it."""
+        if budget.timer is not None:
+            budget.timer.cancel()
+            budget.timer = None
+        while budget.order:
+            owner = budget.order[0]
+            queue = budget.queues[owner]
+            while queue and queue[0].future.done():
+                queue.popleft()  # cancelled
+            if not queue:
+                budget.order.popleft()
+                del budget.queues[owner]
+                continue
+
+            waiter = queue[0]
+            now = time.monotonic()
+            wait = 0.0
+            if budget.requests is not None:
+                wait = budget.requests.wait_time(1, now)
+            if budget.tokens is not None:
+                wait = max(wait, budget.tokens.wait_time(waiter.tokens, now))
+            if wait > 0:
+                loop = waiter.future.get_loop()
+                budget.timer = loop.call_later(wait, self._dispatch, budget)
+                return
+
+            if budget.requests is not None:
+                budget.requests.take(1, now)
+            if budget.tokens is not None:
+                budget.tokens.take(waiter.tokens, now)
+            queue.popleft()
+            waiter.future.set_result(None)
+            budget.granted += 1
+            # Next owner's turn
+            budget.order.rotate(-1)
+
+    def pending(self, model: str) -> dict[str, int]:
+        """{owner: waiting requests} for `model`."""
+        budget = self._budgets.get(model)
+        if budget is None:
+            return {}
+        return {
+            owner: sum(not w.future.done() for w in queue)
+            for owner, queue in budget.queues.items()
+        }
+
+    def describe(self, model: str) -> dict | None:
+        """JSON-friendly budget state, or None when the model is unlimited."""
+        budget = self._budget(model)
+        if budget is None:
+            return None
+        limit = self.limits.get(model) or self.limits.get("*")
+        return {
+            "rpm": limit.rpm,
+            "tpm": limit.tpm,
+            "granted": budget.granted,
+            "waited_s": round(budget.waited_s, 1),
+            "pending": sum(self.pending(model).values()),
+        }
+
+
+@dataclass
+class _ModelLimit:
+    limit: float
+    in_flight: int = 0
+    successes: int = 0  # healthy completions since the last change
+    epoch: int = 0  # bumped on every decrease
+    latency_ewma: float | None = None
+    best_latency: float | None = None
+    outcomes: deque = field(default_factory=lambda: deque(maxlen=_OUTCOME_WINDOW))
+    history: list[tuple[float, int, str]] = field(default_factory=list)
+    cond: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+
+class AdaptiveLimiter:
+    """Per-model AIMD concurrency limiter. Use `async with limiter.slot(model):`."""
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int = DEFAULT_MAX_CONCURRENCY,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_factor: float = 3.0,
+        max_error_rate: float = 0.2,
+        rate_limiter: RateLimiter | None = None,
+        owner: str = "default",
+    ):
+        self.initial = max(min_limit, min(initial, max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, self.initial)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.max_error_rate = max_error_rate
+        self.rate_limiter = rate_limiter
+        self.owner = owner
+        self._models: dict[str, _ModelLimit] = {}
+        self._t0 = time.monotonic()
+
+    def _state(self, model: str) -> _ModelLimit:
+        state = self._models.get(model)
+        if state is None:
+            state = _ModelLimit(limit=float(self.initial))
+            state.history.append((0.0, self.initial, "start"))
+            self._models[model] = state
+        return state
+
+    def limit(self, model: str) -> int:
+        return int(self._state(model).limit)
+
+    def history(self, model: str) -> list[tuple[float, int, str]]:
+        """[(seconds since start, limit, reason)] — one entry per change."""
+        return list(self._state(model).history)
+
+    def describe(self, model: str, last: int = 20) -> dict:
+        """JSON-friendly limit state (for SSE progress events)."""
+        state = self._state(model)
+        return {
+            "limit": int(state.limit),
+            "in_flight": state.in_flight,
+            "history": [
+                {"t": round(t, 1), "limit": limit, "reason": reason}
+                for t, limit, reason in state.history[-last:]
+            ],
+        }
+
+    def format_history(self, model: str) -> str:
+        """Compact limit trajectory, e.g. '3 → 4 → 2 → 3'."""
+        return " → ".join(str(limit) for _, limit, _ in self._state(model).history)
+
+    @property
+    def models(self) -> list[str]:
+        return sorted(self._models)
+
+    @asynccontextmanager
+    async def slot(
+        self, model: str, tokens: int = 0
+    ) -> AsyncIterator[RatePermit | None]:
+        """Hold one concurrency slot for `model`; the outcome adjusts the limit.
+
+        With a rate_limiter, the slot also waits for RPM/TPM budget (reserving
+        `tokens`) and yields the RatePermit so the caller can settle real usage.
+        """
+        state = self._state(model)
+        async with state.cond:
+            await state.cond.wait_for(lambda: state.in_flight < int(state.limit))
+            state.in_flight += 1
+        permit: RatePermit | None = None
+        epoch = state.epoch
+        start = time.monotonic()
+        error: BaseException | None = None
+        try:
+            if self.rate_limiter is not None:
+                permit = await self.rate_limiter.acquire(model, tokens, self.owner)
+                start = time.monotonic()  # latency excludes budget waits
+            yield permit
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            async with state.cond:
+                state.in_flight -= 1
+                if not isinstance(error, asyncio.CancelledError):
+                    self._adjust(state, epoch, time.monotonic() - start, error)
+                state.cond.notify_all()
+
+    def _adjust(
+        self,
+        state: _ModelLimit,
+        epoch: int,
+        duration: float,
+        error: BaseException | None,
+    ) -> None:
+        if error is not None and is_overload_error(error):
+            state.outcomes.append(False)
+            if epoch == state.epoch:  # one cut per window
+                state.epoch += 1
+                state.successes = 0
+                new_limit = max(self.min_limit, math.floor(state.limit * self.decrease))
+                self._record(state, new_limit, "overload")
+            return
+
+        state.outcomes.append(error is None)
+        if error is not None:
+            return
+
+        latency_ok = self._observe_latency(state, duration)
+        errors = state.outcomes.count(False)
+        error_rate_ok = errors / len(state.outcomes) <= self.max_error_rate
+        if not (latency_ok and error_rate_ok):
+            return
+
+        state.successes += 1
+        if state.successes >= int(state.limit) and state.limit < self.max_limit:
+            state.successes = 0
+            self._record(state, min(self.max_limit, state.limit + self.increase), "increase")
+
+    def _observe_latency(self, state: _ModelLimit, duration: float) -> bool:
+        """Update the latency EWMA; healthy while within latency_factor × best."""
+        if state.latency_ewma is None:
+            state.latency_ewma = duration
+        else:
+            state.latency_ewma += _LATENCY_EWMA_ALPHA * (duration - state.latency_ewma)
+        if state.best_latency is None or state.latency_ewma < state.best_latency:
+            state.best_latency = state.latency_ewma
+        return state.latency_ewma <= self.latency_factor * state.best_latency
+
+    def _record(self, state: _ModelLimit, new_limit: float, reason: str) -> None:
+        changed = int(new_limit) != int(state.limit)
+        state.limit = float(new_limit)
+        if changed:
+            state.history.append(
+                (time.monotonic() - self._t0, int(new_limit), reason)
+            )
+
+
+# ---------------------------------------------------------------------------
+# Cost budget
+# ---------------------------------------------------------------------------
+
+# USD per million tokens: (input, output). Cache writes cost 1.25× input,
+# cache reads 0.1× input. Used when the backend reports tokens but no cost.
+MODEL_PRICES_USD_PER_MTOK = {
+    "opus": (15.0, 75.0),
+    "sonnet": (3.0, 15.0),
+    "haiku": (1.0, 5.0),
+}
+
+
+def estimate_cost_usd(
+    model: str,
+    input_tokens: int | None,
+    output_tokens: int | None,
+    cache_read_tokens: int | None = None,
+    cache_write_tokens: int | None = None,
+) -> float | None:
+    """List-price cost of a call from its token counts (None for unknown models)."""
+    prices = MODEL_PRICES_USD_PER_MTOK.get(model)
+    if prices is None:
+        return None
+    input_price, output_price = prices
+    return (
+        (input_tokens or 0) * input_price
+        + (output_tokens or 0) * output_price
+        + (cache_write_tokens or 0) * input_price * 1.25
+        + (cache_read_tokens or 0) * input_price * 0.1
+    ) / 1_000_000
+
+
+@dataclass
+class CostBudget:
+    """Run-level spend cap: once spent_usd reaches max_usd, no new call starts.
+
+    Calls already in flight finish (and are paid for), so a run can end a
+    little above the cap.
+    """
+
+    max_usd: float | None = None
+    spent_usd: float = 0.0
+
+    def add(self, cost_usd: float | None) -> None:
+        self.spent_usd += cost_usd or 0.0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.max_usd is not None and self.spent_usd >= self.max_usd
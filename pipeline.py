@@ -0,0 +1,93 @@
+"""
+Bounded, lazily fed worker pool for a run's calls.
+
+Handing every cell's coroutine to `asyncio.gather` / `as_completed` creates
+one Task per cell up front, each parked on the concurrency limiter while
+holding its prompt. Here a producer pulls work items from an iterator into a
+bounded queue and a fixed set of workers takes them off it: at most
+`workers` calls are in flight, at most `queue_size` items wait, and a call's
+coroutine (and prompt) only exists once a worker starts it. When the queue
+is full the producer waits (backpressure), so the rest of the plan is not
+even generated yet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()  # end-of-work marker, one per worker
+
+
+@dataclass
+class PipelineStats:
+    produced: int = 0  # items pulled from the iterator
+    started: int = 0  # items a worker called run() for
+    completed: int = 0  # items whose run() returned
+    max_queued: int = 0  # high-water mark of the queue
+    max_in_flight: int = 0  # high-water mark of concurrent run() calls
+    stopped: bool = False  # stop() ended the run before every item was started
+
+
+async def run_pipeline(
+    items: Iterable[T],
+    run: Callable[[T], Awaitable[R]],
+    workers: int,
+    on_result: Callable[[R], Any] | None = None,
+    queue_size: int | None = None,
+    stats: PipelineStats | None = None,
+    stop: Callable[[], bool] | None = None,
+) -> PipelineStats:
+    """Run `run(item)` for every item with `workers` concurrent workers.
+
+    Items are pulled from `items` only as queue space frees up (queue_size
+    defaults to `workers`). on_result gets each result as it finishes. Once
+    stop() returns True (e.g. a spend budget is used up) no further item is
+    started; calls in flight still finish. If a
+    run() raises, or the caller is cancelled, the other workers are
+    cancelled and the exception propagates; `stats` (pass one in to read it
+    afterwards) says how far the run got.
+    """
+    workers = max(1, workers)
+    stats = stats if stats is not None else PipelineStats()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or workers)
+
+    def stopping() -> bool:
+        if stop is not None and stop():
+            stats.stopped = True
+        return stats.stopped
+
+    async def produce() -> None:
+        for item in items:
+            if stopping():
+                break
+            await queue.put(item)
+            stats.produced += 1
+            stats.max_queued = max(stats.max_queued, queue.qsize())
+        for _ in range(workers):
+            await queue.put(_DONE)
+
+    async def work() -> None:
+        while (item := await queue.get()) is not _DONE:
+            if stopping():
+                continue  # drain the queue without starting anything
+            stats.started += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.started - stats.completed)
+            result = await run(item)
+            stats.completed += 1
+            if on_result is not None:
+                on_result(result)
+
+    tasks = [asyncio.create_task(produce())]
+    tasks += [asyncio.create_task(work()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return stats
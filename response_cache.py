@@ -0,0 +1,139 @@
+"""
+Content-addressed response cache for `claude -p` calls.
+
+An entry is keyed by a SHA-256 of everything that determines the answer: model,
+system prompt (SCORING_SYSTEM_PROMPT / category prompt) and user prompt (SKILL.md
++ scenario prompt). Touching one SKILL.md therefore only invalidates that skill's
+cells. Entries live as one JSON file each under .cache/responses/ and are evicted
+by age and by total size (least recently used first). A file's mtime is when
+the entry was written, the one age both lookups and pruning go by; its atime
+is set on every hit and orders the size eviction.
+
+Lookups and writes block on the file system: call them off the event loop
+(asyncio.to_thread). Counters are safe to update from several threads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent / ".cache" / "responses"
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+DEFAULT_MAX_AGE_S = 30 * 24 * 3600.0
+
+# Bump when the cached payload or key composition changes
+_KEY_VERSION = 1
+_PRUNE_EVERY = 100
+
+
+class ResponseCache:
+    """On-disk cache of successful model responses.
+
+    With refresh=True lookups always miss but fresh responses are still
+    stored — used to re-pay selected cells and overwrite their entries.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+        refresh: bool = False,
+    ):
+        self.directory = directory or CACHE_DIR
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, system_prompt: str, user_prompt: str) -> str:
+        payload = json.dumps(
+            {
+                "v": _KEY_VERSION,
+                "model": model,
+                "system_prompt": system_prompt,
+                "user_prompt": user_prompt,
+            },
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached entry, or None on miss/expiry/refresh."""
+        entry = None if self.refresh else self._read(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def _read(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if time.time() - stat.st_mtime > self.max_age_s:
+                path.unlink(missing_ok=True)
+                return None
+            entry = json.loads(path.read_text())
+            # atime = last use, for LRU eviction; mtime keeps the entry's age
+            os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """Store an entry (atomic write). Prunes periodically."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False))
+        tmp_path.replace(path)
+
+        with self._lock:
+            self._puts += 1
+            prune = self._puts % _PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Evict expired entries, then least recently used ones over max_bytes.
+
+        Returns the number of removed entries.
+        """
+        if not self.directory.exists():
+            return 0
+        now = time.time()
+        removed = 0
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age_s:
+                path.unlink(missing_ok=True)
+                removed += 1
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _last_used, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
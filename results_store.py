@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+SQLite results store — every scored result, indexed by cell and check.
+
+The heatmap used to glob and parse every scored_*.json report on each
+request, then rebuild the newest-wins index in Python. The store keeps the
+same results in reports/results.db (SQLite, WAL mode, stdlib only):
+
+    runs            one row per run (run_id, when, metadata)
+    scored_runs     one row per (scenario, skill, model) result
+    check_results   one row per check of a result
+    latest_cells    the newest result of each (scenario, skill, model)
+
+sim.py --scored and the server write each result as it lands, and move the
+cell's latest_cells entry to it in the same transaction, so heatmap queries
+never rank results per request. Reports added next to the database out of
+band (from before the store, or copied in) are imported when a process opens
+the store and noticed afterwards by a cheap directory fingerprint; deleting a
+report drops its run and rebuilds latest_cells. WAL lets the server read
+while a sim.py run writes.
+
+Usage:
+    python results_store.py import [REPORT ...]   # default: all reports/scored_*.json
+    python results_store.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import sim_core
+from sim_core import (
+    USAGE_FIELD_NAMES,
+    ScoredRun,
+    latest_scored_cells,
+    load_scored_report,
+    scored_run_to_dict,
+)
+
+DB_NAME = "results.db"
+
+# scored_runs columns besides id / run_id / recorded / the cell key
+_RESULT_COLUMNS = (
+    "risk_level",
+    "duration_s",
+    "cost_info",
+    "error",
+    "error_kind",
+    "cached",
+    "retries",
+    "ttft_s",
+    "generation_s",
+    *USAGE_FIELD_NAMES,
+    "markdown_response",
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    generated TEXT NOT NULL,
+    source TEXT,  -- report file it was imported from, or its live run's report
+    metadata TEXT NOT NULL,  -- JSON
+    live INTEGER NOT NULL DEFAULT 0  -- results were written as the run went
+);
+CREATE TABLE IF NOT EXISTS scored_runs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    recorded TEXT NOT NULL,  -- when the result landed; the newest per cell wins
+    scenario_id TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    model TEXT NOT NULL,
+    {", ".join(_RESULT_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS scored_runs_cell
+    ON scored_runs (scenario_id, skill, model, recorded DESC, id DESC);
+CREATE INDEX IF NOT EXISTS scored_runs_run ON scored_runs (run_id);
+CREATE TABLE IF NOT EXISTS check_results (
+    scored_run_id INTEGER NOT NULL REFERENCES scored_runs (id),
+    check_id TEXT NOT NULL,
+    result TEXT NOT NULL,
+    evidence TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (scored_run_id, check_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS check_results_check ON check_results (check_id, result);
+CREATE TABLE IF NOT EXISTS latest_cells (
+    scenario_id TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    model TEXT NOT NULL,
+    scored_run_id INTEGER NOT NULL REFERENCES scored_runs (id),
+    recorded TEXT NOT NULL,
+    PRIMARY KEY (scenario_id, skill, model)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+"""
+
+
+# Bumped when a table or column is added that must be filled from existing rows
+SCHEMA_VERSION = 2
+
+# Newest result per cell (ties: the later insert), for rebuilding latest_cells
+_REBUILD_LATEST = (
+    "DELETE FROM latest_cells",
+    """
+    INSERT INTO latest_cells (scenario_id, skill, model, scored_run_id, recorded)
+    SELECT scenario_id, skill, model, id, recorded FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY scenario_id, skill, model ORDER BY recorded DESC, id DESC
+        ) AS newest
+        FROM scored_runs
+    ) WHERE newest = 1
+    """,
+)
+
+# Move a cell to a new result unless the cell already has a newer one
+_UPDATE_LATEST = """
+INSERT INTO latest_cells (scenario_id, skill, model, scored_run_id, recorded)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (scenario_id, skill, model) DO UPDATE
+SET scored_run_id = excluded.scored_run_id, recorded = excluded.recorded
+WHERE excluded.recorded >= latest_cells.recorded
+"""
+
+
+def _placeholders(values: list) -> str:
+    return ", ".join("?" * len(values))
+
+
+def report_run_id(metadata: dict, path: Path) -> str:
+    """The run a report belongs to (reports from before run IDs: its file name)."""
+    return (
+        metadata.get("run_id")
+        or (metadata.get("snapshot") or {}).get("run_id")
+        or f"report:{path.name}"
+    )
+
+
+class ResultsStore:
+    """One connection per process, shared by threads behind a lock."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()  # held across a snapshot()'s queries
+        # Autocommit; writes open their own transaction (see _transaction)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._reports_fingerprint: frozenset | None = None
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("PRAGMA busy_timeout=5000")
+            self._db.executescript(_SCHEMA)
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            with self._transaction() as db:
+                if version < 1:
+                    # A database from before latest_cells: index what it holds
+                    self._rebuild_latest(db)
+                columns = {row["name"] for row in db.execute("PRAGMA table_info(runs)")}
+                if "live" not in columns:
+                    # Before runs.live, only live runs could lack a source
+                    db.execute("ALTER TABLE runs ADD COLUMN live INTEGER NOT NULL DEFAULT 0")
+                    db.execute("UPDATE runs SET live = 1 WHERE source IS NULL")
+                db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    @contextmanager
+    def snapshot(self) -> Iterator[None]:
+        """Run the queries inside on one read snapshot of the database.
+
+        An endpoint that reads the models and then their check results must
+        not see a result another writer committed in between.
+        """
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                yield
+            finally:
+                self._db.execute("COMMIT")
+
+    def _query(self, sql: str, params: Iterable = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute(sql, tuple(params)).fetchall()
+
+    # --- Writing ---
+
+    def add_run(
+        self,
+        run_id: str,
+        metadata: dict,
+        generated: str | None = None,
+        source: str | None = None,
+    ) -> None:
+        """Record a run whose results are written as it goes; a resumed run
+        keeps its first `generated` time."""
+        with self._transaction() as db:
+            self._insert_run(db, run_id, metadata, generated, source, live=True)
+
+    @staticmethod
+    def _insert_run(db, run_id, metadata, generated, source, live: bool) -> None:
+        db.execute(
+            "INSERT INTO runs (run_id, generated, source, metadata, live) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (run_id) DO UPDATE "
+            "SET metadata = excluded.metadata, live = MAX(live, excluded.live)",
+            (
+                run_id,
+                generated or datetime.now().isoformat(),
+                source,
+                json.dumps(metadata, ensure_ascii=False),
+                live,
+            ),
+        )
+
+    def add_results(
+        self, run_id: str, results: list[ScoredRun], recorded: str | None = None
+    ) -> None:
+        """Record results of a run, in one transaction. `recorded` defaults to now."""
+        with self._transaction() as db:
+            self._insert_results(db, run_id, results, recorded or datetime.now().isoformat())
+
+    def add_result(self, run_id: str, result: ScoredRun) -> None:
+        self.add_results(run_id, [result])
+
+    @staticmethod
+    def _insert_results(db, run_id, results, recorded) -> None:
+        columns = ("run_id", "recorded", "scenario_id", "skill", "model", *_RESULT_COLUMNS)
+        sql = (
+            f"INSERT INTO scored_runs ({', '.join(columns)}) "
+            f"VALUES ({_placeholders(list(columns))})"
+        )
+        for result in results:
+            row = scored_run_to_dict(result)
+            row["retries"] = json.dumps(row["retries"])
+            cursor = db.execute(sql, (run_id, recorded, *(row[c] for c in columns[2:])))
+            db.execute(
+                _UPDATE_LATEST,
+                (result.scenario_id, result.skill, result.model, cursor.lastrowid, recorded),
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO check_results "
+                "(scored_run_id, check_id, result, evidence, summary) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (cursor.lastrowid, c["check_id"], c["result"], c["evidence"], c["summary"])
+                    for c in row["checks"]
+                ],
+            )
+
+    def import_report(self, path: Path) -> int:
+        """Import a scored report file; returns the number of results added.
+
+        A run written live is not imported again (its results are already
+        in, and at least as new); it takes the report as its source. A run
+        imported from this file before is replaced if the file changed since,
+        so a rewritten or corrected report is picked up. Another file with
+        the same run (a copy) is skipped.
+        """
+        metadata, runs = load_scored_report(path)
+        # A report's first result per cell wins, as in latest_scored_cells
+        runs = [run for run, _ in latest_scored_cells([(metadata, runs)]).values()]
+        run_id = report_run_id(metadata, path)
+        generated = metadata.get("generated") or datetime.fromtimestamp(
+            path.stat().st_mtime
+        ).isoformat()
+        mtime = path.stat().st_mtime
+        with self._transaction() as db:
+            imported = db.execute(
+                "SELECT mtime FROM imports WHERE source = ?", (path.name,)
+            ).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO imports (source, mtime) VALUES (?, ?)",
+                (path.name, mtime),
+            )
+            run = db.execute(
+                "SELECT source, live FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            stale: set[tuple] = set()
+            if run is not None:
+                if run["live"]:
+                    db.execute(
+                        "UPDATE runs SET source = ? WHERE run_id = ? AND source IS NULL",
+                        (path.name, run_id),
+                    )
+                    return 0
+                if run["source"] != path.name or (imported and imported["mtime"] == mtime):
+                    return 0
+                stale = self._drop_run(db, run_id)  # the report was rewritten
+            report_metadata = {k: v for k, v in metadata.items() if k != "usage"}
+            self._insert_run(db, run_id, report_metadata, generated, path.name, live=False)
+            self._insert_results(db, run_id, runs, generated)
+            self._refresh_latest(db, stale)
+        return len(runs)
+
+    def import_reports(self, paths: Iterable[Path] | None = None) -> int:
+        """Import reports not imported yet (default: every scored_*.json next
+        to the database); unreadable files are skipped. Returns results added."""
+        if paths is None:
+            paths = sorted(self.path.parent.glob("scored_*.json"))
+        known = {row["source"]: row["mtime"] for row in self._query("SELECT * FROM imports")}
+        added = 0
+        for path in paths:
+            try:
+                if known.get(path.name) == path.stat().st_mtime:
+                    continue
+                added += self.import_report(path)
+            except (OSError, ValueError, KeyError):
+                continue
+        return added
+
+    def remove_source(self, name: str) -> None:
+        """Drop the run imported from (or reported to) a deleted report file."""
+        with self._transaction() as db:
+            run_ids = [
+                row["run_id"]
+                for row in db.execute("SELECT run_id FROM runs WHERE source = ?", (name,))
+            ]
+            cells: set[tuple] = set()
+            for run_id in run_ids:
+                cells |= self._drop_run(db, run_id)
+            db.execute("DELETE FROM imports WHERE source = ?", (name,))
+            # Cells of the dropped run fall back to their next newest result
+            self._refresh_latest(db, cells)
+
+    @staticmethod
+    def _drop_run(db, run_id: str) -> set[tuple]:
+        """Delete a run and its results; returns its (scenario_id, skill, model) cells."""
+        cells = {
+            tuple(row)
+            for row in db.execute(
+                "SELECT DISTINCT scenario_id, skill, model FROM scored_runs WHERE run_id = ?",
+                (run_id,),
+            )
+        }
+        db.execute(
+            "DELETE FROM check_results WHERE scored_run_id IN "
+            "(SELECT id FROM scored_runs WHERE run_id = ?)",
+            (run_id,),
+        )
+        db.execute("DELETE FROM scored_runs WHERE run_id = ?", (run_id,))
+        db.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+        return cells
+
+    @staticmethod
+    def _refresh_latest(db, cells: set[tuple]) -> None:
+        """Recompute the latest_cells entries of these cells."""
+        where = "scenario_id = ? AND skill = ? AND model = ?"
+        db.executemany(f"DELETE FROM latest_cells WHERE {where}", cells)
+        db.executemany(
+            "INSERT INTO latest_cells (scenario_id, skill, model, scored_run_id, recorded) "
+            f"SELECT scenario_id, skill, model, id, recorded FROM scored_runs WHERE {where} "
+            "ORDER BY recorded DESC, id DESC LIMIT 1",
+            cells,
+        )
+
+    @staticmethod
+    def _rebuild_latest(db) -> None:
+        for statement in _REBUILD_LATEST:
+            db.execute(statement)
+
+    def sync_reports(self) -> None:
+        """Catch up with report files added, changed or deleted out of band.
+
+        Costs one directory scan when nothing changed.
+        """
+        reports_dir = self.path.parent
+        with os.scandir(reports_dir) as entries:
+            fingerprint = frozenset(
+                (entry.name, entry.stat().st_mtime)
+                for entry in entries
+                if entry.name.startswith("scored_") and entry.name.endswith(".json")
+            )
+        if fingerprint == self._reports_fingerprint:
+            return
+        present = {name for name, _ in fingerprint}
+        for row in self._query("SELECT source FROM imports"):
+            if row["source"] not in present:
+                self.remove_source(row["source"])
+        self.import_reports(sorted(reports_dir / name for name in present))
+        self._reports_fingerprint = fingerprint
+
+    # --- Queries (newest result per cell, from latest_cells) ---
+
+    def models(self) -> list[str]:
+        return [r["model"] for r in self._query("SELECT DISTINCT model FROM latest_cells ORDER BY model")]
+
+    def skill_models(self) -> list[sqlite3.Row]:
+        """(skill, model) pairs that have results."""
+        return self._query("SELECT DISTINCT skill, model FROM latest_cells ORDER BY skill, model")
+
+    def skill_check_counts(self) -> list[sqlite3.Row]:
+        """(skill, check_id, result, n) over the newest result of every cell."""
+        return self._query(
+            """
+            SELECT l.skill, c.check_id, c.result, COUNT(*) AS n
+            FROM latest_cells l JOIN check_results c ON c.scored_run_id = l.scored_run_id
+            GROUP BY l.skill, c.check_id, c.result
+            """
+        )
+
+    def cell_checks(self, scenario_ids: list[str], skills: list[str]) -> list[sqlite3.Row]:
+        """(scenario_id, skill, model, check_id, result, evidence, summary) of
+        the newest result of each cell of these scenarios and skills."""
+        if not scenario_ids or not skills:
+            return []
+        return self._query(
+            f"""
+            SELECT l.scenario_id, l.skill, l.model, c.check_id, c.result, c.evidence, c.summary
+            FROM latest_cells l JOIN check_results c ON c.scored_run_id = l.scored_run_id
+            WHERE l.scenario_id IN ({_placeholders(scenario_ids)})
+            AND l.skill IN ({_placeholders(skills)})
+            """,
+            [*scenario_ids, *skills],
+        )
+
+    def cell_detail(
+        self, scenario_id: str, check_id: str, skills: list[str]
+    ) -> list[sqlite3.Row]:
+        """(skill, model, markdown_response, result, evidence, summary) of the
+        newest result per skill and model; check columns are NULL when the
+        result has no such check."""
+        return self._query(
+            f"""
+            SELECT l.skill, l.model, s.markdown_response, c.result, c.evidence, c.summary
+            FROM latest_cells l
+            JOIN scored_runs s ON s.id = l.scored_run_id
+            LEFT JOIN check_results c ON c.scored_run_id = l.scored_run_id AND c.check_id = ?
+            WHERE l.scenario_id = ? AND l.skill IN ({_placeholders(skills)})
+            """,
+            [check_id, scenario_id, *skills],
+        )
+
+    def stats(self) -> dict:
+        counts = {
+            table: self._query(f"SELECT COUNT(*) AS n FROM {table}")[0]["n"]
+            for table in ("runs", "scored_runs", "check_results")
+        }
+        counts["cells"] = self._query("SELECT COUNT(*) AS n FROM latest_cells")[0]["n"]
+        return counts
+
+
+class ResultsWriter:
+    """Writes a run's results to the store from an event loop, without blocking it.
+
+    add() only queues; a background task commits the queue in one
+    add_results() transaction, on a worker thread, once `batch_size` results
+    are waiting or `interval_s` after the first one. Create it inside the
+    running loop and aclose() it to commit the rest (this re-raises a failed
+    write).
+    """
+
+    def __init__(
+        self,
+        store: ResultsStore,
+        run_id: str,
+        batch_size: int = 64,
+        interval_s: float = 0.25,
+        on_commit: Callable[[], None] | None = None,
+    ):
+        self.store = store
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.interval_s = interval_s
+        self.on_commit = on_commit
+        self._pending: list[ScoredRun] = []
+        self._wake = asyncio.Event()
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    def add(self, result: ScoredRun) -> None:
+        self._pending.append(result)
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval_s)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            await self._commit()
+        await self._commit()
+
+    async def _commit(self) -> None:
+        batch, self._pending = self._pending, []
+        if batch:
+            await asyncio.to_thread(self.store.add_results, self.run_id, batch)
+            if self.on_commit is not None:
+                self.on_commit()
+
+    @property
+    def closed(self) -> bool:
+        return self._closing
+
+    async def aclose(self) -> None:
+        self._closing = True
+        self._wake.set()
+        await self._task
+
+
+_stores: dict[Path, ResultsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(path: Path | None = None) -> ResultsStore:
+    """The process's store at `path` (default: reports/results.db).
+
+    Opened once per path; every call first syncs with the report files.
+    """
+    path = path or sim_core.REPORTS_DIR / DB_NAME
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = ResultsStore(path)
+        store.sync_reports()
+        return store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Skill Checker results store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    import_parser = sub.add_parser("import", help="Import scored JSON reports")
+    import_parser.add_argument("reports", nargs="*", type=Path, help="default: reports/scored_*.json")
+    sub.add_parser("stats", help="Row counts")
+    args = parser.parse_args()
+
+    store = ResultsStore(sim_core.REPORTS_DIR / DB_NAME)
+    if args.command == "import":
+        added = store.import_reports(args.reports or None)
+        print(f"Imported {added} results into {store.path}")
+    else:
+        json.dump(store.stats(), sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Classified retries for `claude -p` calls.
+
+Errors are sorted into kinds. Transient kinds (timeouts, overload / rate
+limits, truncated or malformed output, unexplained failures) are retried with
+exponential backoff and full jitter; auth and config errors fail fast — and
+trip the whole run, since every later call would fail the same way. Retries
+draw from a per-run budget so a broken backend cannot multiply the bill.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, TypeVar
+
+from limits import OVERLOAD_PATTERN
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Error kinds
+AUTH = "auth"
+CONFIG = "config"
+OVERLOAD = "overload"
+TIMEOUT = "timeout"
+TRUNCATED = "truncated"
+MALFORMED = "malformed"  # streamed output that cannot contain the expected answer
+TRANSIENT = "transient"
+
+FATAL_KINDS = frozenset({AUTH, CONFIG})
+
+_AUTH_PATTERN = re.compile(
+    r"invalid.{0,10}api.?key|authentication|unauthori[sz]ed|\b401\b|\b403\b"
+    r"|not logged in|/login|credit balance|permission_error",
+    re.IGNORECASE,
+)
+_CONFIG_PATTERN = re.compile(
+    r"unknown option|unknown model|invalid model|model.{0,20}not found|not_found_error"
+    r"|invalid_request_error|unrecognized argument",
+    re.IGNORECASE,
+)
+_TIMEOUT_PATTERN = re.compile(r"timed? ?out|timeout", re.IGNORECASE)
+
+
+class ClaudeError(RuntimeError):
+    """A failed model call with its error kind (and, once retried, the attempts)."""
+
+    def __init__(self, message: str, kind: str = TRANSIENT):
+        super().__init__(message)
+        self.kind = kind
+        self.retries: list[dict] = []
+
+
+def classify_error(exc: BaseException) -> str:
+    """Map an exception from a model call to an error kind."""
+    if isinstance(exc, ClaudeError) and exc.kind != TRANSIENT:
+        return exc.kind
+    if isinstance(exc, (FileNotFoundError, PermissionError)):
+        return CONFIG  # `claude` missing or not executable
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return TIMEOUT
+    if isinstance(exc, json.JSONDecodeError):
+        return TRUNCATED
+    text = str(exc)
+    if _AUTH_PATTERN.search(text):
+        return AUTH
+    if OVERLOAD_PATTERN.search(text):
+        return OVERLOAD
+    if _CONFIG_PATTERN.search(text):
+        return CONFIG
+    if _TIMEOUT_PATTERN.search(text):
+        return TIMEOUT
+    return TRANSIENT
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter: sleep U(0, min(max, base·2^n))."""
+
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    base_delay_s: float = 2.0
+    max_delay_s: float = 60.0
+
+    def delay(self, retry: int, rng: random.Random | None = None) -> float:
+        """Backoff before retry number `retry` (0-based)."""
+        cap = min(self.max_delay_s, self.base_delay_s * 2**retry)
+        return (rng or random).uniform(0, cap)
+
+
+def default_retry_budget(total_tasks: int) -> int:
+    """Retries allowed per run: a fifth of the tasks, at least 5."""
+    return max(5, total_tasks // 5)
+
+
+@dataclass
+class Retrier:
+    """Per-run retry state: policy, shared budget, and the fail-fast trip.
+
+    `budget` counts retries (not first attempts) across every task of the run.
+    """
+
+    policy: RetryPolicy = field(default_factory=RetryPolicy)
+    budget: int = 0
+    spent: int = 0
+    fatal: ClaudeError | None = None
+    rng: random.Random = field(default_factory=random.Random)
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.budget - self.spent)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> tuple[T, list[dict]]:
+        """Run fn() with retries. Returns (result, retries).
+
+        Each entry in `retries` records one failed attempt that was retried:
+        {"attempt", "kind", "error", "delay_s"}. On final failure a ClaudeError
+        is raised carrying `.kind` and `.retries`.
+        """
+        retries: list[dict] = []
+        attempt = 1
+        while True:
+            if self.fatal is not None:
+                raise self._failure(self.fatal, self.fatal.kind, retries)
+            try:
+                return await fn(), retries
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                kind = classify_error(exc)
+                if kind in FATAL_KINDS:
+                    self.fatal = self._failure(exc, kind, [])
+                    raise self._failure(exc, kind, retries) from exc
+                if attempt >= self.policy.max_attempts or self.spent >= self.budget:
+                    raise self._failure(exc, kind, retries) from exc
+
+                self.spent += 1
+                delay = self.policy.delay(attempt - 1, self.rng)
+                retries.append(
+                    {
+                        "attempt": attempt,
+                        "kind": kind,
+                        "error": str(exc)[:300],
+                        "delay_s": round(delay, 2),
+                    }
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    @staticmethod
+    def _failure(exc: BaseException, kind: str, retries: list[dict]) -> ClaudeError:
+        error = ClaudeError(str(exc), kind)
+        error.retries = list(retries)
+        return error
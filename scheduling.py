@@ -0,0 +1,170 @@
+"""
+Scheduling policies — the order in which a run starts its cells.
+
+The planner yields cells in cross-product order, so one slow opus cell
+started late can finish last and stretch the whole run. A policy reorders
+the cells before they are started:
+
+- plan:     cross-product order (the default)
+- lpt:      longest expected duration first, using the durations of earlier
+            runs per (model, SKILL.md size); short cells fill in at the end
+- coverage: one cell per (domain, skill) group first, then the second of
+            each, ... — the heatmap fills everywhere early and is useful
+            before the run finishes
+
+With prefix caching, group_together() then runs the cells that share a
+cached prefix back to back: groups start in the order of their first cell
+in the policy's order, so LPT still starts the longest work first.
+
+expected_makespan() replays an order on the run's concurrency slots.
+"""
+
+from __future__ import annotations
+
+import heapq
+import statistics
+from dataclasses import dataclass, field
+from typing import Callable, Hashable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+PLAN = "plan"
+LPT = "lpt"
+COVERAGE = "coverage"
+POLICIES = (PLAN, LPT, COVERAGE)
+DEFAULT_POLICY = PLAN
+
+# Durations (seconds) assumed for a model without any history
+DEFAULT_DURATION_S = {"opus": 90.0, "sonnet": 45.0, "haiku": 20.0}
+FALLBACK_DURATION_S = 45.0
+
+
+def size_bucket(size: int) -> int:
+    """SKILL.md size class: 0 below 1 KiB, then one class per doubling."""
+    return (max(size, 0) >> 10).bit_length()
+
+
+@dataclass
+class DurationModel:
+    """Expected call duration per (model, SKILL.md size class), from history.
+
+    The median of the matching samples is used; a model without samples in
+    that size class falls back to its overall median, then to
+    DEFAULT_DURATION_S.
+    """
+
+    by_bucket: dict[tuple[str, int], float] = field(default_factory=dict)
+    by_model: dict[str, float] = field(default_factory=dict)
+    samples: int = 0
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[tuple[str, int, float]]) -> DurationModel:
+        """Build from (model, skill_size, duration_s) samples."""
+        buckets: dict[tuple[str, int], list[float]] = {}
+        models: dict[str, list[float]] = {}
+        count = 0
+        for model, size, duration in samples:
+            buckets.setdefault((model, size_bucket(size)), []).append(duration)
+            models.setdefault(model, []).append(duration)
+            count += 1
+        return cls(
+            by_bucket={k: statistics.median(v) for k, v in buckets.items()},
+            by_model={k: statistics.median(v) for k, v in models.items()},
+            samples=count,
+        )
+
+    def estimate(self, model: str, skill_size: int) -> float:
+        """Expected duration of one call for `model` on a SKILL.md of skill_size bytes."""
+        duration = self.by_bucket.get((model, size_bucket(skill_size)))
+        if duration is None:
+            duration = self.by_model.get(model)
+        if duration is None:
+            duration = DEFAULT_DURATION_S.get(model, FALLBACK_DURATION_S)
+        return duration
+
+
+def order_lpt(items: Iterable[T], estimate: Callable[[T], float]) -> list[T]:
+    """Longest expected duration first; ties keep their original order."""
+    return sorted(items, key=estimate, reverse=True)
+
+
+def order_coverage(items: Iterable[T], group: Callable[[T], Hashable]) -> list[T]:
+    """Round-robin over groups: the first item of every group, then the second, ...
+
+    Groups take turns in the order they first appear; items keep their order
+    within a group.
+    """
+    groups: dict[Hashable, list[T]] = {}
+    for item in items:
+        groups.setdefault(group(item), []).append(item)
+    ordered: list[T] = []
+    rounds = max((len(g) for g in groups.values()), default=0)
+    for i in range(rounds):
+        ordered.extend(g[i] for g in groups.values() if i < len(g))
+    return ordered
+
+
+def group_together(items: Iterable[T], key: Callable[[T], Hashable]) -> list[T]:
+    """Items with the same key back to back, keeping the order otherwise.
+
+    Groups come in the order of their first item; items keep their order
+    within a group.
+    """
+    groups: dict[Hashable, list[T]] = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return [item for g in groups.values() for item in g]
+
+
+def schedule(
+    items: Iterable[T],
+    policy: str,
+    estimate: Callable[[T], float],
+    group: Callable[[T], Hashable],
+    together: Callable[[T], Hashable] | None = None,
+) -> list[T]:
+    """Order items by `policy` (one of POLICIES).
+
+    With `together`, items sharing that key are then run back to back (see
+    group_together).
+    """
+    if policy == PLAN:
+        ordered = list(items)
+    elif policy == LPT:
+        ordered = order_lpt(items, estimate)
+    elif policy == COVERAGE:
+        ordered = order_coverage(items, group)
+    else:
+        raise ValueError(f"unknown scheduling policy: {policy!r}")
+    return ordered if together is None else group_together(ordered, together)
+
+
+def expected_makespan(
+    items: Iterable[T],
+    estimate: Callable[[T], float],
+    workers: int,
+    lane: Callable[[T], Hashable] = lambda item: None,
+) -> float:
+    """Wall time to run items in this order on `workers` slots per lane.
+
+    Each item starts on the slot that frees up first (list scheduling), as
+    the run does; lanes (e.g. models, which have their own concurrency
+    limits) run side by side.
+    """
+    slots: dict[Hashable, list[float]] = {}
+    for item in items:
+        lane_slots = slots.setdefault(lane(item), [0.0] * max(1, workers))
+        heapq.heapreplace(lane_slots, lane_slots[0] + estimate(item))
+    return max((max(s) for s in slots.values()), default=0.0)
+
+
+def format_duration(seconds: float) -> str:
+    """Human-readable duration: 45s, 12m 05s, 2h 03m."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
@@ -3,6 +3,7 @@ Skill Checker Web — FastAPI application.
 """
 
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -12,12 +13,20 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from server.routers import scenarios, reports, categories, skills, heatmap
+from server.services.runner import run_manager
 
 load_dotenv()
 
 FRONTEND_PORT = os.environ.get("FRONTEND_PORT", "5173")
 
-app = FastAPI(title="Skill Checker", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await run_manager.shutdown()
+
+
+app = FastAPI(title="Skill Checker", version="1.0.0", lifespan=lifespan)
 
 # CORS for Vite dev server
 app.add_middleware(
@@ -3,34 +3,126 @@ Heatmap router — domain/skill health overview + scored run management.
 """
 
 import asyncio
+import functools
 import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Literal
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+import sim_core
+from backends import DEFAULT_BACKEND
+from estimates import RunEstimate
 from bp_linter import run_bp_checks
+from limits import DEFAULT_MAX_CONCURRENCY
+from results_store import open_store
+from retries import DEFAULT_MAX_ATTEMPTS, ClaudeError
+from scheduling import DEFAULT_POLICY
 from sim_core import (
     ALL_CATEGORIES,
     BP_CATEGORIES,
     CATEGORY_GROUPS,
     DEFAULT_CONCURRENCY,
+    DEFAULT_TASK_TIMEOUT_S,
     DEV_DOMAINS,
     DOMAIN_SKILL_MAP,
     LLM_CHECK_IDS,
-    get_target_skills,
+    estimate_scored_run,
+    iter_scored_tasks,
+    list_run_journals,
     load_all_scored_reports,
     load_domain_scenarios,
     load_latest_scored_report,
     load_manifest,
-    merge_scored_runs,
+    plan_incremental_run,
     read_skill,
+    schedule_scored_tasks,
 )
 from server.services.runner import run_manager, ScoredRunStatus
 
 router = APIRouter(prefix="/api/heatmap", tags=["heatmap"])
 
 
+# ---------------------------------------------------------------------------
+# Query cache: a browser refresh re-asks the same aggregations
+# ---------------------------------------------------------------------------
+
+QUERY_CACHE_SIZE = 128  # cached responses (one per endpoint and domain)
+
+
+def _files_fingerprint(directory, prefixes: tuple[str, ...], suffixes: tuple[str, ...]):
+    """(name, mtime_ns, size) of the matching files in a directory."""
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(
+                (entry.name, stat.st_mtime_ns, stat.st_size)
+                for entry in entries
+                if entry.name.startswith(prefixes) and entry.name.endswith(suffixes)
+                for stat in (entry.stat(),)
+            )
+    except FileNotFoundError:
+        return frozenset()
+
+
+def _data_fingerprint() -> tuple:
+    """Changes whenever a cached answer may have: a result recorded by this
+    server, a report or results.db written by anyone (sim.py runs write the
+    store's -wal file), or a scenario file edited."""
+    return (
+        run_manager.results_version,
+        str(sim_core.REPORTS_DIR),
+        _files_fingerprint(sim_core.REPORTS_DIR, ("scored_", "results.db"), ("json", "db", "wal")),
+        _files_fingerprint(sim_core.SCENARIOS_DIR, ("",), (".yaml",)),
+    )
+
+
+class _QueryCache:
+    """LRU of endpoint responses, each valid for the fingerprint it was computed under."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[tuple, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, compute: Callable[[], object]):
+        # Taken before computing: a write during compute() misses next time
+        fingerprint = _data_fingerprint()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                return entry[1]
+        value = compute()
+        with self._lock:
+            self._entries[key] = (fingerprint, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_query_cache = _QueryCache(QUERY_CACHE_SIZE)
+
+
+def _cached(endpoint):
+    """Serve an endpoint from the query cache. Responses are shared: don't mutate."""
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        key = (endpoint.__name__, args, tuple(sorted(kwargs.items())))
+        return _query_cache.get(key, lambda: endpoint(*args, **kwargs))
+
+    return wrapper
+
+
 # ---------------------------------------------------------------------------
 # GET /api/heatmap/domains
 # ---------------------------------------------------------------------------
@@ -59,52 +151,42 @@ def get_domains():
 
 
 @router.get("/skills")
+@_cached
 def get_skills_health():
-    """Return skill health overview from all scored reports (multi-model)."""
-    all_reports = load_all_scored_reports()
-    if not all_reports:
+    """Return skill health overview from all scored results (multi-model)."""
+    store = open_store()
+    with store.snapshot():
+        skill_model_rows = store.skill_models()
+        check_counts = store.skill_check_counts()
+    skill_models: dict[str, set[str]] = {}
+    for row in skill_model_rows:
+        skill_models.setdefault(row["skill"], set()).add(row["model"])
+    if not skill_models:
         return []
 
-    sorted_models, run_index = merge_scored_runs(all_reports)
-
-    # Collect all runs from the merged index
-    all_runs = list(run_index.values())
-
     # Reverse map: skill_name → domain
     skill_to_domain: dict[str, str] = {}
     for domain_id, skill_name in DOMAIN_SKILL_MAP.items():
         skill_to_domain[skill_name] = domain_id
 
-    # Aggregate stats per skill
-    skill_stats: dict[str, dict] = {}
+    # Aggregate check results per skill (newest result of every cell)
+    skill_stats: dict[str, dict] = {
+        skill: {"pass_count": 0, "fail_count": 0, "unclear_count": 0, "na_count": 0}
+        for skill in skill_models
+    }
     # Track per-check failures for top_gaps
-    skill_check_fails: dict[str, dict[str, int]] = {}
-    # Track models per skill
-    skill_models: dict[str, set[str]] = {}
-    for run in all_runs:
-        skill = run.skill
-        if skill not in skill_stats:
-            skill_stats[skill] = {
-                "pass_count": 0,
-                "fail_count": 0,
-                "unclear_count": 0,
-                "na_count": 0,
-            }
-            skill_check_fails[skill] = {}
-            skill_models[skill] = set()
-        skill_models[skill].add(run.model)
-        for check in run.checks:
-            if check.result == "pass":
-                skill_stats[skill]["pass_count"] += 1
-            elif check.result == "fail":
-                skill_stats[skill]["fail_count"] += 1
-                skill_check_fails[skill][check.check_id] = (
-                    skill_check_fails[skill].get(check.check_id, 0) + 1
-                )
-            elif check.result == "unclear":
-                skill_stats[skill]["unclear_count"] += 1
-            else:
-                skill_stats[skill]["na_count"] += 1
+    skill_check_fails: dict[str, dict[str, int]] = {skill: {} for skill in skill_models}
+    for row in check_counts:
+        stats = skill_stats[row["skill"]]
+        if row["result"] == "pass":
+            stats["pass_count"] += row["n"]
+        elif row["result"] == "fail":
+            stats["fail_count"] += row["n"]
+            skill_check_fails[row["skill"]][row["check_id"]] = row["n"]
+        elif row["result"] == "unclear":
+            stats["unclear_count"] += row["n"]
+        else:
+            stats["na_count"] += row["n"]
 
     result = []
     for skill, stats in sorted(skill_stats.items()):
@@ -114,19 +196,16 @@ def get_skills_health():
 
         # Top gaps: check IDs with most failures
         top_gaps = []
-        if skill in skill_check_fails:
-            sorted_fails = sorted(
-                skill_check_fails[skill].items(), key=lambda x: x[1], reverse=True
+        sorted_fails = sorted(skill_check_fails[skill].items(), key=lambda x: (-x[1], x[0]))
+        for check_id, _count in sorted_fails[:5]:
+            check_info = ALL_CATEGORIES.get(check_id, {})
+            top_gaps.append(
+                {
+                    "check_id": check_id,
+                    "name": check_info.get("name", check_id),
+                    "severity": check_info.get("severity", ""),
+                }
             )
-            for check_id, _count in sorted_fails[:5]:
-                check_info = ALL_CATEGORIES.get(check_id, {})
-                top_gaps.append(
-                    {
-                        "check_id": check_id,
-                        "name": check_info.get("name", check_id),
-                        "severity": check_info.get("severity", ""),
-                    }
-                )
 
         result.append(
             {
@@ -139,7 +218,7 @@ def get_skills_health():
                 "unclear_count": stats["unclear_count"],
                 "na_count": stats["na_count"],
                 "top_gaps": top_gaps,
-                "models": sorted(skill_models.get(skill, set())),
+                "models": sorted(skill_models[skill]),
             }
         )
     return result
@@ -151,6 +230,7 @@ def get_skills_health():
 
 
 @router.get("/domain/{domain_id}")
+@_cached
 def get_domain_heatmap(domain_id: str):
     """Return domain heatmap matrix with model dimension (Level 2 data)."""
     domain_scenarios = load_domain_scenarios()
@@ -176,70 +256,36 @@ def get_domain_heatmap(domain_id: str):
                 }
             )
 
-    # Load all scored reports and merge
-    all_reports = load_all_scored_reports()
-    sorted_models, run_index = merge_scored_runs(all_reports)
-
-    # matrix[scenario_id][check_id][model] = {specialist, mcpc}
+    # MCPC results only for non-dev domains
+    sides: dict[str, list[str]] = {specialist: ["specialist"]}
+    if not is_dev:
+        sides.setdefault("apify-mcpc", []).append("mcpc")
+    # One snapshot: a result landing between the queries could add a model
+    store = open_store()
+    with store.snapshot():
+        sorted_models = store.models()
+        cell_checks = store.cell_checks([s.id for s in scenarios], list(sides))
+
+    # matrix[scenario_id][check_id][model] = {specialist, mcpc}: every cell
+    # empty, then one pass over the newest check results of the domain
     matrix: dict[str, dict[str, dict[str, dict]]] = {}
-
-    if run_index:
-        for scenario in scenarios:
-            scenario_matrix: dict[str, dict[str, dict]] = {}
-            for check_info in checks:
-                check_id = check_info["id"]
-                model_cells: dict[str, dict] = {}
-
-                for model in sorted_models:
-                    cell: dict[str, dict | None] = {}
-
-                    # Specialist result
-                    specialist_run = run_index.get((scenario.id, specialist, model))
-                    if specialist_run is not None:
-                        specialist_check = next(
-                            (
-                                c
-                                for c in specialist_run.checks
-                                if c.check_id == check_id
-                            ),
-                            None,
-                        )
-                        if specialist_check:
-                            cell["specialist"] = {
-                                "result": specialist_check.result,
-                                "evidence": specialist_check.evidence,
-                                "summary": specialist_check.summary,
-                            }
-                        else:
-                            cell["specialist"] = None
-                    else:
-                        cell["specialist"] = None
-
-                    # MCPC result (only for non-dev domains)
-                    if not is_dev:
-                        mcpc_run = run_index.get((scenario.id, "apify-mcpc", model))
-                        if mcpc_run is not None:
-                            mcpc_check = next(
-                                (c for c in mcpc_run.checks if c.check_id == check_id),
-                                None,
-                            )
-                            if mcpc_check:
-                                cell["mcpc"] = {
-                                    "result": mcpc_check.result,
-                                    "evidence": mcpc_check.evidence,
-                                    "summary": mcpc_check.summary,
-                                }
-                            else:
-                                cell["mcpc"] = None
-                        else:
-                            cell["mcpc"] = None
-                    else:
-                        cell["mcpc"] = None
-
-                    model_cells[model] = cell
-
-                scenario_matrix[check_id] = model_cells
-            matrix[scenario.id] = scenario_matrix
+    if sorted_models:
+        matrix = {
+            scenario.id: {
+                check_info["id"]: {
+                    model: {"specialist": None, "mcpc": None} for model in sorted_models
+                }
+                for check_info in checks
+            }
+            for scenario in scenarios
+        }
+    for row in cell_checks:
+        model_cells = matrix[row["scenario_id"]].get(row["check_id"])
+        if model_cells is None:
+            continue  # not a heatmap check
+        check = {"result": row["result"], "evidence": row["evidence"], "summary": row["summary"]}
+        for side in sides[row["skill"]]:
+            model_cells[row["model"]][side] = check
 
     return {
         "domain": domain_id,
@@ -332,53 +378,32 @@ def get_cell_detail(scenario_id: str, check_id: str):
     is_dev = found_domain in DEV_DOMAINS
     specialist = DOMAIN_SKILL_MAP.get(found_domain, found_scenario.target_skill)
 
-    all_reports = load_all_scored_reports()
-    sorted_models, run_index = merge_scored_runs(all_reports)
-
-    # Build per-model results
-    models_detail: dict[str, dict] = {}
-
-    for model in sorted_models:
-        model_data: dict[str, dict | None] = {}
+    # Newest result per (skill, model); check columns are NULL if it lacks the check
+    compared = [specialist] if is_dev else [specialist, "apify-mcpc"]
+    cells = {
+        (row["skill"], row["model"]): row
+        for row in open_store().cell_detail(scenario_id, check_id, compared)
+    }
 
-        specialist_run = run_index.get((scenario_id, specialist, model))
-        if specialist_run is not None:
-            specialist_check = next(
-                (c for c in specialist_run.checks if c.check_id == check_id),
-                None,
-            )
-            model_data["specialist"] = {
-                "skill": specialist_run.skill,
-                "result": specialist_check.result if specialist_check else "unclear",
-                "evidence": specialist_check.evidence if specialist_check else "",
-                "summary": specialist_check.summary if specialist_check else "",
-                "markdown_response": specialist_run.markdown_response,
-            }
-        else:
-            model_data["specialist"] = None
-
-        if not is_dev:
-            mcpc_run = run_index.get((scenario_id, "apify-mcpc", model))
-            if mcpc_run is not None:
-                mcpc_check = next(
-                    (c for c in mcpc_run.checks if c.check_id == check_id),
-                    None,
-                )
-                model_data["mcpc"] = {
-                    "skill": mcpc_run.skill,
-                    "result": mcpc_check.result if mcpc_check else "unclear",
-                    "evidence": mcpc_check.evidence if mcpc_check else "",
-                    "summary": mcpc_check.summary if mcpc_check else "",
-                    "markdown_response": mcpc_run.markdown_response,
-                }
-            else:
-                model_data["mcpc"] = None
-        else:
-            model_data["mcpc"] = None
+    def side(skill: str, model: str) -> dict | None:
+        row = cells.get((skill, model))
+        if row is None:
+            return None
+        return {
+            "skill": skill,
+            "result": row["result"] or "unclear",
+            "evidence": row["evidence"] or "",
+            "summary": row["summary"] or "",
+            "markdown_response": row["markdown_response"],
+        }
 
-        # Only include model if it has at least one result
-        if model_data["specialist"] is not None or model_data.get("mcpc") is not None:
-            models_detail[model] = model_data
+    # Build per-model results; only models with at least one result
+    models_detail: dict[str, dict] = {}
+    for model in sorted({model for _skill, model in cells}):
+        models_detail[model] = {
+            "specialist": side(specialist, model),
+            "mcpc": None if is_dev else side("apify-mcpc", model),
+        }
 
     return {
         "scenario_id": scenario_id,
@@ -393,13 +418,10 @@ def get_cell_detail(scenario_id: str, check_id: str):
 
 
 @router.get("/models")
+@_cached
 def get_models():
-    """Return list of models from all scored reports."""
-    all_reports = load_all_scored_reports()
-    if not all_reports:
-        return []
-    sorted_models, _ = merge_scored_runs(all_reports)
-    return sorted_models
+    """Return list of models from all scored results."""
+    return open_store().models()
 
 
 # ---------------------------------------------------------------------------
@@ -413,12 +435,54 @@ VALID_MODELS = {"sonnet", "opus", "haiku"}
 class ScoredRunRequest(BaseModel):
     domains: list[str] | None = None  # None = all domains
     models: list[str] = ["sonnet"]
-    concurrency: int = DEFAULT_CONCURRENCY
+    concurrency: int = DEFAULT_CONCURRENCY  # initial per-model limit (adaptive)
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    use_cache: bool = True  # False = re-pay every cell (fresh answers still cached)
+    incremental: bool = False  # only cells whose skill/scenario changed or errored
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS  # per cell; 1 disables retries
+    retry_budget: int | None = None  # retries per run; None = a fifth of the tasks
+    task_timeout_s: float | None = DEFAULT_TASK_TIMEOUT_S  # per claude -p call
+    run_timeout_s: float | None = None  # whole-run deadline
+    stream: bool = False  # stream responses: "streaming" progress events + TTFT
+    backend: Literal["cli", "api", "fake"] = DEFAULT_BACKEND  # api needs ANTHROPIC_API_KEY
+    prefix_cache: bool = False  # SKILL.md in the cached system prefix, cells grouped by skill
+    batch_size: int = 1  # scenarios of one skill scored per call
+    comparative: bool = False  # all target skills of a scenario scored in one call
+    schedule: Literal["plan", "lpt", "coverage"] = DEFAULT_POLICY  # cell start order
+    max_cost_usd: float | None = None  # no new calls once the run has spent this
+
+
+def _plan_scored_run(
+    body: ScoredRunRequest, tasks: list, manifest: dict
+) -> tuple[int, int, RunEstimate]:
+    """(cells to run, cells skipped, estimate) of a requested run, from report history."""
+    all_reports = load_all_scored_reports()
+    skipped = 0
+    if body.incremental:
+        plan = plan_incremental_run(tasks, manifest, all_reports)
+        tasks, skipped = plan.rerun, plan.skipped
+    scheduled, _ = schedule_scored_tasks(
+        tasks,
+        body.schedule,
+        manifest,
+        all_reports,
+        body.concurrency,
+        prefix_cache=body.prefix_cache,
+    )
+    estimate = estimate_scored_run(
+        scheduled,
+        manifest,
+        all_reports,
+        body.concurrency,
+        batch_size=body.batch_size,
+        comparative=body.comparative,
+    )
+    return len(tasks), skipped, estimate
 
 
 @router.post("/run")
 async def start_scored_run(body: ScoredRunRequest):
-    """Start a scored run. Returns run_id and total task count."""
+    """Start a scored run. Returns run_id, total task count and a cost/time estimate."""
     # Validate models
     if not body.models:
         raise HTTPException(400, "models list must not be empty")
@@ -429,6 +493,18 @@ async def start_scored_run(body: ScoredRunRequest):
             f"Invalid models: {', '.join(sorted(invalid_models))}. "
             f"Allowed: {', '.join(sorted(VALID_MODELS))}",
         )
+    if body.max_attempts < 1:
+        raise HTTPException(400, "max_attempts must be at least 1")
+    if body.batch_size < 1:
+        raise HTTPException(400, "batch_size must be at least 1")
+    if body.comparative and body.batch_size > 1:
+        raise HTTPException(400, "comparative cannot be combined with batch_size")
+    if body.max_cost_usd is not None and body.max_cost_usd <= 0:
+        raise HTTPException(400, "max_cost_usd must be positive")
+    try:
+        run_manager.backend(body.backend)
+    except ClaudeError as e:
+        raise HTTPException(400, str(e))
 
     domain_scenarios = load_domain_scenarios()
 
@@ -446,20 +522,115 @@ async def start_scored_run(body: ScoredRunRequest):
 
     manifest = load_manifest()
 
-    # Count total tasks: scenario × skill × model (matches runner task list exactly)
-    total = 0
-    for domain_id, scenarios in filtered.items():
-        for scenario in scenarios:
-            skills = get_target_skills(scenario, manifest)
-            total += len(skills) * len(body.models)
+    # Build task list: scenario × skill × model (matches runner task list exactly)
+    tasks = list(iter_scored_tasks(filtered, manifest, body.models))
+    # Reads every report and journal: keep it off the event loop
+    total, skipped, estimate = await asyncio.to_thread(_plan_scored_run, body, tasks, manifest)
 
     run_id = run_manager.start_scored_run(
         domains=body.domains,
         models=body.models,
         concurrency=body.concurrency,
+        max_concurrency=body.max_concurrency,
+        use_cache=body.use_cache,
+        incremental=body.incremental,
+        max_attempts=body.max_attempts,
+        retry_budget=body.retry_budget,
+        task_timeout_s=body.task_timeout_s,
+        run_timeout_s=body.run_timeout_s,
+        stream=body.stream,
+        backend=body.backend,
+        prefix_cache=body.prefix_cache,
+        batch_size=body.batch_size,
+        comparative=body.comparative,
+        schedule=body.schedule,
+        max_cost_usd=body.max_cost_usd,
     )
 
-    return {"run_id": run_id, "total": total}
+    return {
+        "run_id": run_id,
+        "total": total,
+        "skipped": skipped,
+        "estimate": estimate.to_dict(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Resumable runs: GET /api/heatmap/runs/resumable, POST /api/heatmap/run/{run_id}/resume
+# ---------------------------------------------------------------------------
+
+
+class ResumeRunRequest(BaseModel):
+    # Cells, models, batching and schedule come from the run's journal
+    concurrency: int = DEFAULT_CONCURRENCY
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    use_cache: bool = True
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    retry_budget: int | None = None
+    task_timeout_s: float | None = DEFAULT_TASK_TIMEOUT_S
+    run_timeout_s: float | None = None
+    stream: bool = False
+    backend: Literal["cli", "api", "fake"] = DEFAULT_BACKEND
+    max_cost_usd: float | None = None
+
+
+@router.get("/runs/resumable")
+def get_resumable_runs():
+    """Runs that were interrupted, stopped or crashed and left a journal behind."""
+    return list_run_journals()
+
+
+@router.post("/run/{run_id}/resume")
+async def resume_scored_run(run_id: str, body: ResumeRunRequest):
+    """Finish an interrupted run: schedule only the cells its journal has no result for."""
+    if body.max_attempts < 1:
+        raise HTTPException(400, "max_attempts must be at least 1")
+    if body.max_cost_usd is not None and body.max_cost_usd <= 0:
+        raise HTTPException(400, "max_cost_usd must be positive")
+    state = run_manager.get_scored_run(run_id)
+    if state and state.status in (ScoredRunStatus.PENDING, ScoredRunStatus.RUNNING):
+        raise HTTPException(409, f"Scored run '{run_id}' is still {state.status.value}")
+    try:
+        resume = run_manager.resume_scored_run(
+            run_id,
+            concurrency=body.concurrency,
+            max_concurrency=body.max_concurrency,
+            use_cache=body.use_cache,
+            max_attempts=body.max_attempts,
+            retry_budget=body.retry_budget,
+            task_timeout_s=body.task_timeout_s,
+            run_timeout_s=body.run_timeout_s,
+            stream=body.stream,
+            backend=body.backend,
+            max_cost_usd=body.max_cost_usd,
+        )
+    except FileNotFoundError:
+        raise HTTPException(404, f"No journal for run '{run_id}'")
+    except (ValueError, ClaudeError) as e:
+        raise HTTPException(400, str(e))
+
+    return {
+        "run_id": run_id,
+        "total": len(resume.remaining),
+        "skipped": len(resume.done),
+        "missing": resume.missing,
+    }
+
+
+# ---------------------------------------------------------------------------
+# POST /api/heatmap/run/{run_id}/cancel
+# ---------------------------------------------------------------------------
+
+
+@router.post("/run/{run_id}/cancel")
+async def cancel_scored_run(run_id: str):
+    """Cancel a running scored run; in-flight claude processes are killed."""
+    state = run_manager.get_scored_run(run_id)
+    if not state:
+        raise HTTPException(404, f"Scored run '{run_id}' not found")
+    if not run_manager.cancel_scored_run(run_id):
+        raise HTTPException(409, f"Scored run '{run_id}' is already {state.status.value}")
+    return {"run_id": run_id, "status": "cancelling"}
 
 
 # ---------------------------------------------------------------------------
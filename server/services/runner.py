@@ -3,21 +3,65 @@ RunManager — manages async scenario execution with SSE progress events.
 """
 
 import asyncio
+import os
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from backends import CLI, DEFAULT_BACKEND, FAKE, Backend, CliBackend, make_backend
+from journal import RunJournal
+from limits import (
+    DEFAULT_MAX_CONCURRENCY,
+    AdaptiveLimiter,
+    CostBudget,
+    RateLimiter,
+    parse_rate_limits,
+)
+from pipeline import run_pipeline
+from response_cache import ResponseCache
+from results_store import ResultsWriter, open_store
+from scheduling import DEFAULT_POLICY
+from retries import (
+    DEFAULT_MAX_ATTEMPTS,
+    TIMEOUT,
+    Retrier,
+    RetryPolicy,
+    default_retry_budget,
+)
 from sim_core import (
     DEFAULT_CONCURRENCY,
+    DEFAULT_TASK_TIMEOUT_S,
+    PrefixGate,
+    ResumePlan,
     Scenario,
     ScoredRun,
-    get_target_skills,
+    StreamMonitor,
+    batch_scored_tasks,
+    comparative_scored_tasks,
+    compact_scored_run,
+    create_run_snapshot,
+    iter_scored_tasks,
+    journal_path,
+    load_all_scored_reports,
     load_domain_scenarios,
     load_manifest,
+    load_resume_plan,
+    plan_incremental_run,
+    run_scored_batch,
+    run_scored_comparative,
     run_scored_scenario,
-    save_scored_report_incremental,
+    schedule_scored_tasks,
+    scored_run_to_dict,
+    snapshot_to_metadata,
+    start_run_journal,
 )
+from worker_pool import WarmProcessPool
+
+
+# Journal fsyncs are grouped: at most one per interval (records are still
+# written and flushed one by one, so a crashed process loses none)
+JOURNAL_SYNC_INTERVAL_S = 0.2
 
 
 class ScoredRunStatus(str, Enum):
@@ -25,6 +69,8 @@ class ScoredRunStatus(str, Enum):
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+    TIMED_OUT = "timed_out"  # run deadline reached
 
 
 @dataclass
@@ -34,6 +80,21 @@ class ScoredRunState:
     models: list[str]
     domains: list[str] | None
     concurrency: int
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    use_cache: bool = True
+    incremental: bool = False
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    retry_budget: int | None = None  # None = default_retry_budget(total)
+    task_timeout_s: float | None = DEFAULT_TASK_TIMEOUT_S
+    run_timeout_s: float | None = None
+    stream: bool = False  # stream-json: partial progress events, TTFT, early abort
+    backend: str = DEFAULT_BACKEND  # "cli" (claude -p) or "api" (Messages API)
+    prefix_cache: bool = False  # SKILL.md in the system prompt, cells grouped by skill
+    batch_size: int = 1  # scenarios of one skill scored per call
+    comparative: bool = False  # all target skills of a scenario scored in one call
+    schedule: str = DEFAULT_POLICY  # order cells start in: "plan", "lpt" or "coverage"
+    expected_makespan_s: float | None = None  # set once the cells are scheduled
+    max_cost_usd: float | None = None  # no new calls once the run has spent this
     # {scenario_id: {skill_name: {model: status}}}
     progress: dict[str, dict[str, dict[str, str]]] = field(default_factory=dict)
     results: list[ScoredRun] = field(default_factory=list)
@@ -42,11 +103,42 @@ class ScoredRunState:
     started_at: str = ""
     completed_at: str = ""
     _save_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    _task: asyncio.Task | None = None
+    _resume: ResumePlan | None = None  # continue this journaled run instead of planning
 
 
 class RunManager:
     def __init__(self):
         self._scored_runs: dict[str, ScoredRunState] = {}
+        # Shared across runs: warm claude processes are keyed by command line,
+        # the API backend keeps one pooled HTTP client (created on first use)
+        self._pool = WarmProcessPool()
+        self._backends: dict[str, Backend] = {CLI: CliBackend(self._pool)}
+        self._cache = ResponseCache()
+        # Bumped when a run's results are committed to the results store;
+        # the heatmap's query cache keys on it
+        self.results_version = 0
+        # Process-wide RPM/TPM budgets, e.g. RATE_LIMIT_RPM="opus=20,sonnet=50".
+        # Every run draws from the same buckets, queued fairly per run_id.
+        self.rate_limiter = RateLimiter(
+            parse_rate_limits(
+                os.environ.get("RATE_LIMIT_RPM"), os.environ.get("RATE_LIMIT_TPM")
+            )
+        )
+
+    async def shutdown(self):
+        """Kill idle warm processes, close HTTP connections (called on app shutdown)."""
+        for backend in self._backends.values():
+            await backend.aclose()
+
+    def backend(self, name: str) -> Backend:
+        """Shared backend by name. Raises ClaudeError if it is not configured."""
+        if name not in self._backends:
+            self._backends[name] = make_backend(name)
+        return self._backends[name]
+
+    def _results_committed(self) -> None:
+        self.results_version += 1
 
     def get_scored_run(self, run_id: str) -> ScoredRunState | None:
         return self._scored_runs.get(run_id)
@@ -56,8 +148,40 @@ class RunManager:
         domains: list[str] | None,
         models: list[str],
         concurrency: int = DEFAULT_CONCURRENCY,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        use_cache: bool = True,
+        incremental: bool = False,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_budget: int | None = None,
+        task_timeout_s: float | None = DEFAULT_TASK_TIMEOUT_S,
+        run_timeout_s: float | None = None,
+        stream: bool = False,
+        backend: str = DEFAULT_BACKEND,
+        prefix_cache: bool = False,
+        batch_size: int = 1,
+        comparative: bool = False,
+        schedule: str = DEFAULT_POLICY,
+        max_cost_usd: float | None = None,
     ) -> str:
-        """Start a scored run. Returns run_id."""
+        """Start a scored run. Returns run_id.
+
+        concurrency is the initial per-model limit; it adapts (AIMD) up to
+        max_concurrency. use_cache=False skips cache lookups; fresh responses still refresh the cache.
+        incremental=True only runs cells whose inputs changed or that errored.
+        Transient failures are retried up to max_attempts per cell, with at most
+        retry_budget retries per run. A claude -p call is killed after
+        task_timeout_s; the whole run is stopped after run_timeout_s.
+        stream=True streams responses and emits "streaming" progress events.
+        backend picks "cli" or "api"; it is resolved up front, so a missing
+        API key raises ClaudeError here instead of failing every cell.
+        prefix_cache=True uses the cache-aware prompt layout (see build_prompts).
+        batch_size > 1 scores up to that many scenarios of a skill per call;
+        comparative=True instead scores all target skills of a scenario per call.
+        schedule picks the order cells start in (see scheduling.py).
+        Once max_cost_usd is spent no new call starts and the run completes
+        with the cells it has.
+        """
+        self.backend(backend)
         run_id = uuid.uuid4().hex[:12]
 
         state = ScoredRunState(
@@ -66,127 +190,411 @@ class RunManager:
             models=models,
             domains=domains,
             concurrency=concurrency,
+            max_concurrency=max_concurrency,
+            use_cache=use_cache,
+            incremental=incremental,
+            max_attempts=max_attempts,
+            retry_budget=retry_budget,
+            task_timeout_s=task_timeout_s,
+            run_timeout_s=run_timeout_s,
+            stream=stream,
+            backend=backend,
+            prefix_cache=prefix_cache,
+            batch_size=batch_size,
+            comparative=comparative,
+            schedule=schedule,
+            max_cost_usd=max_cost_usd,
             started_at=datetime.now().isoformat(),
         )
 
         self._scored_runs[run_id] = state
 
-        asyncio.create_task(self._execute_scored(state))
+        state._task = asyncio.create_task(self._execute_scored(state))
         return run_id
 
+    def resume_scored_run(
+        self,
+        run_id: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        use_cache: bool = True,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_budget: int | None = None,
+        task_timeout_s: float | None = DEFAULT_TASK_TIMEOUT_S,
+        run_timeout_s: float | None = None,
+        stream: bool = False,
+        backend: str = DEFAULT_BACKEND,
+        max_cost_usd: float | None = None,
+    ) -> ResumePlan:
+        """Continue an interrupted run (this server's or sim.py's) from its journal.
+
+        Only the cells without a successful result are scheduled; results
+        already journaled are kept and the run keeps its run_id and report
+        file. Models, domains, batching and schedule come from the journal,
+        the execution options from the arguments (as in start_scored_run).
+        Raises FileNotFoundError if the run has no journal, ValueError if it
+        cannot be resumed here, ClaudeError if the backend is not configured.
+        """
+        self.backend(backend)
+        current = self._scored_runs.get(run_id)
+        if current is not None and current.status in (
+            ScoredRunStatus.PENDING,
+            ScoredRunStatus.RUNNING,
+        ):
+            raise ValueError(f"run {run_id} is still {current.status.value}")
+        resume = load_resume_plan(run_id)
+        if resume.mode != "scored":
+            raise ValueError(f"run {run_id} is a {resume.mode} run, resume it with sim.py")
+        options = resume.options
+
+        state = ScoredRunState(
+            run_id=run_id,
+            status=ScoredRunStatus.PENDING,
+            models=options.get("model") or ["sonnet"],
+            domains=resume.metadata.get("domains"),
+            concurrency=concurrency,
+            max_concurrency=max_concurrency,
+            use_cache=use_cache,
+            max_attempts=max_attempts,
+            retry_budget=retry_budget,
+            task_timeout_s=task_timeout_s,
+            run_timeout_s=run_timeout_s,
+            stream=stream,
+            backend=backend,
+            prefix_cache=options.get("prefix_cache", False),
+            batch_size=options.get("batch_size", 1),
+            comparative=options.get("comparative", False),
+            schedule=options.get("schedule", DEFAULT_POLICY),
+            max_cost_usd=max_cost_usd,
+            started_at=datetime.now().isoformat(),
+            _resume=resume,
+        )
+
+        self._scored_runs[run_id] = state
+
+        state._task = asyncio.create_task(self._execute_scored(state))
+        return resume
+
+    def cancel_scored_run(self, run_id: str) -> bool:
+        """Cancel a pending/running run. Returns False if it already finished.
+
+        In-flight claude processes are killed; finished results stay saved.
+        """
+        state = self._scored_runs.get(run_id)
+        if state is None or state._task is None or state._task.done():
+            return False
+        if state.status not in (ScoredRunStatus.PENDING, ScoredRunStatus.RUNNING):
+            return False
+        if state.status == ScoredRunStatus.PENDING:
+            # Task never started: it will not get to emit its own events
+            state.status = ScoredRunStatus.CANCELLED
+            state.completed_at = datetime.now().isoformat()
+            state.queue.put_nowait(
+                {
+                    "event": "cancelled",
+                    "data": {
+                        "run_id": run_id,
+                        "reason": "cancelled",
+                        "total_results": 0,
+                    },
+                }
+            )
+            state.queue.put_nowait(None)
+        state._task.cancel()
+        return True
+
+    @staticmethod
+    def _cancel_unfinished_cells(state: ScoredRunState) -> None:
+        """Mark cells that never finished as cancelled in the progress grid."""
+        for scenario_progress in state.progress.values():
+            for models in scenario_progress.values():
+                for model, cell_status in models.items():
+                    if cell_status in ("pending", "running"):
+                        models[model] = "cancelled"
+
     async def _execute_scored(self, state: ScoredRunState):
         """Execute a scored run: for each (scenario, skill, model) combination, run scored evaluation."""
         state.status = ScoredRunStatus.RUNNING
+        resume = state._resume
+        journal = None
+        writer = None
 
         try:
             manifest = load_manifest()
-            domain_scenarios = load_domain_scenarios()
-
-            # Filter domains if specified
-            if state.domains is not None:
-                filtered = {
-                    d: domain_scenarios[d]
-                    for d in state.domains
-                    if d in domain_scenarios
-                }
+            # Parses every report and journal: keep it off the event loop
+            all_reports = await asyncio.to_thread(load_all_scored_reports)
+            plan = None
+            if resume is not None:
+                tasks_list = list(resume.remaining)
+                state.results = list(resume.done)
             else:
-                filtered = domain_scenarios
-
-            # Build task list: (scenario, skill_name, model) cross-product
-            tasks_list: list[tuple[Scenario, str, str]] = []
-            for domain_id, scenarios in filtered.items():
-                for scenario in scenarios:
-                    skills = get_target_skills(scenario, manifest)
-                    for skill_name in skills:
-                        for model in state.models:
-                            tasks_list.append((scenario, skill_name, model))
-                            # Init progress grid
-                            if scenario.id not in state.progress:
-                                state.progress[scenario.id] = {}
-                            if skill_name not in state.progress[scenario.id]:
-                                state.progress[scenario.id][skill_name] = {}
-                            state.progress[scenario.id][skill_name][model] = "pending"
+                domain_scenarios = load_domain_scenarios()
+
+                # Filter domains if specified
+                if state.domains is not None:
+                    filtered = {
+                        d: domain_scenarios[d]
+                        for d in state.domains
+                        if d in domain_scenarios
+                    }
+                else:
+                    filtered = domain_scenarios
+
+                # Build task list: (scenario, skill_name, model) cross-product
+                tasks_list = list(iter_scored_tasks(filtered, manifest, state.models))
+
+                if state.incremental:
+                    plan = plan_incremental_run(tasks_list, manifest, all_reports)
+                    tasks_list = plan.rerun
+            # With prefix_cache each skill's cells run back to back to share the prefix
+            tasks_list, makespan_s = schedule_scored_tasks(
+                tasks_list,
+                state.schedule,
+                manifest,
+                all_reports,
+                state.concurrency,
+                prefix_cache=state.prefix_cache,
+            )
+            state.expected_makespan_s = round(makespan_s, 1)
+            prefix_gate = PrefixGate() if state.prefix_cache else None
+
+            # Init progress grid (a resumed run's finished cells first)
+            for scored in state.results:
+                scenario_progress = state.progress.setdefault(scored.scenario_id, {})
+                scenario_progress.setdefault(scored.skill, {})[scored.model] = "ok"
+            for scenario, skill_name, model in tasks_list:
+                scenario_progress = state.progress.setdefault(scenario.id, {})
+                scenario_progress.setdefault(skill_name, {})[model] = "pending"
 
             total = len(tasks_list)
+            metadata = {
+                "models": state.models,
+                "domains": state.domains,
+                "concurrency": state.concurrency,
+                "max_concurrency": state.max_concurrency,
+                "backend": state.backend,
+                "max_cost_usd": state.max_cost_usd,
+            }
+            if resume is not None:
+                # The snapshot describes the files as they were when the run started
+                metadata["snapshot"] = resume.metadata.get("snapshot")
+                journal = RunJournal.reopen(
+                    journal_path(state.run_id), sync_interval_s=JOURNAL_SYNC_INTERVAL_S
+                )
+            else:
+                # Hashes every input file and asks git for their revisions
+                snapshot = await asyncio.to_thread(
+                    create_run_snapshot,
+                    state.run_id,
+                    manifest,
+                    sorted({sk for _, sk, _ in tasks_list}),
+                    sorted({s.source_file for s, _, _ in tasks_list}),
+                    scenarios=[s for s, _, _ in tasks_list],
+                )
+                metadata["snapshot"] = snapshot_to_metadata(snapshot)
+                journal = start_run_journal(
+                    state.run_id,
+                    "scored",
+                    tasks_list,
+                    {
+                        "model": state.models,
+                        "domains": state.domains,
+                        "batch_size": state.batch_size,
+                        "comparative": state.comparative,
+                        "schedule": state.schedule,
+                        "prefix_cache": state.prefix_cache,
+                    },
+                    metadata,
+                    sync_interval_s=JOURNAL_SYNC_INTERVAL_S,
+                )
+            # The first open imports reports; keep it and every write off the loop
+            store = await asyncio.to_thread(open_store)
+            await asyncio.to_thread(store.add_run, state.run_id, metadata)
+            writer = ResultsWriter(store, state.run_id, on_commit=self._results_committed)
+
             await state.queue.put(
                 {
                     "event": "started",
                     "data": {
                         "run_id": state.run_id,
                         "total": total,
+                        "skipped": plan.skipped if plan else len(state.results),
+                        "resumed": resume is not None,
+                        "rerun_reasons": plan.reasons if plan else {},
+                        "schedule": state.schedule,
+                        "expected_makespan_s": state.expected_makespan_s,
                     },
                 }
             )
 
-            semaphore = asyncio.Semaphore(state.concurrency)
+            limiter = AdaptiveLimiter(
+                state.concurrency,
+                max_limit=state.max_concurrency,
+                rate_limiter=self.rate_limiter,
+                owner=state.run_id,
+            )
+            cache = self._cache if state.use_cache else ResponseCache(refresh=True)
+            if state.backend == FAKE:
+                cache = None  # simulated answers must not be served to real runs
+            retrier = Retrier(
+                RetryPolicy(max_attempts=state.max_attempts),
+                budget=(
+                    state.retry_budget
+                    if state.retry_budget is not None
+                    else default_retry_budget(total)
+                ),
+            )
 
-            async def run_one_scored(scenario: Scenario, skill_name: str, model: str):
-                state.progress[scenario.id][skill_name][model] = "running"
-                await state.queue.put(
-                    {
-                        "event": "progress",
-                        "data": {
-                            "scenario_id": scenario.id,
-                            "skill": skill_name,
-                            "model": model,
-                            "status": "running",
-                        },
-                    }
-                )
+            async def run_one_group(cells: list[tuple[Scenario, str]], model: str):
+                """Score cells sharing one call: a batch of scenarios of one
+                skill, or (comparative) one scenario against several skills."""
+                for scenario, skill_name in cells:
+                    state.progress[scenario.id][skill_name][model] = "running"
+                    await state.queue.put(
+                        {
+                            "event": "progress",
+                            "data": {
+                                "scenario_id": scenario.id,
+                                "skill": skill_name,
+                                "model": model,
+                                "status": "running",
+                            },
+                        }
+                    )
 
-                scored = await run_scored_scenario(
-                    scenario, skill_name, model, manifest, semaphore
-                )
-                state.results.append(scored)
+                def on_stream(monitor: StreamMonitor) -> None:
+                    for scenario, skill_name in cells:
+                        state.queue.put_nowait(
+                            {
+                                "event": "progress",
+                                "data": {
+                                    "scenario_id": scenario.id,
+                                    "skill": skill_name,
+                                    "model": model,
+                                    "status": "streaming",
+                                    "chars": monitor.chars,
+                                    "ttft_s": monitor.ttft_s,
+                                },
+                            }
+                        )
 
-                # Incremental save after each completed task
-                metadata = {
-                    "models": state.models,
-                    "domains": state.domains,
-                    "concurrency": state.concurrency,
-                }
-                async with state._save_lock:
-                    save_scored_report_incremental(
-                        state.run_id, state.results, metadata
+                options = dict(
+                    cache=cache,
+                    retrier=retrier,
+                    timeout_s=state.task_timeout_s,
+                    stream=state.stream,
+                    on_progress=on_stream,
+                    backend=self.backend(state.backend),
+                    prefix_gate=prefix_gate,
+                )
+                scenarios = [scenario for scenario, _ in cells]
+                skills = [skill_name for _, skill_name in cells]
+                if len(cells) == 1:
+                    results = [
+                        await run_scored_scenario(
+                            scenarios[0], skills[0], model, manifest, limiter, **options
+                        )
+                    ]
+                elif state.comparative:
+                    results = await run_scored_comparative(
+                        scenarios[0], skills, model, manifest, limiter, **options
+                    )
+                else:
+                    results = await run_scored_batch(
+                        scenarios, skills[0], model, manifest, limiter, **options
                     )
+                for scored in results:
+                    await record(scored)
 
-                cell_status = "error" if scored.error else "ok"
-                state.progress[scenario.id][skill_name][model] = cell_status
+            async def record(scored: ScoredRun):
+                # Append-only: the journal is the run's results log until it
+                # is compacted into the report at the end; the results store
+                # (what the heatmap reads) gets results in batches. Both write
+                # on worker threads, so a disk sync never stalls the loop.
+                await asyncio.to_thread(journal.append, scored_run_to_dict(scored))
+                writer.add(scored)
+                state.results.append(scored)
+                if not scored.cached:
+                    budget.add(scored.cost_usd)
+
+                if not scored.error:
+                    cell_status = "ok"
+                elif scored.error_kind == TIMEOUT:
+                    cell_status = "timeout"
+                else:
+                    cell_status = "error"
+                model = scored.model
+                state.progress[scored.scenario_id][scored.skill][model] = cell_status
                 await state.queue.put(
                     {
                         "event": "progress",
                         "data": {
-                            "scenario_id": scenario.id,
-                            "skill": skill_name,
+                            "scenario_id": scored.scenario_id,
+                            "skill": scored.skill,
                             "model": model,
                             "status": cell_status,
                             "duration_s": scored.duration_s,
+                            "ttft_s": scored.ttft_s,
+                            "generation_s": scored.generation_s,
+                            "cached": scored.cached,
+                            "cache_read_tokens": scored.cache_read_tokens,
+                            "cost_usd": scored.cost_usd,
+                            "spent_usd": round(budget.spent_usd, 4),
                             "error": scored.error,
+                            "error_kind": scored.error_kind,
+                            "retries": len(scored.retries),
+                            "concurrency": limiter.describe(model),
+                            "rate_limit": self.rate_limiter.describe(model),
                         },
                     }
                 )
 
-            coros = [run_one_scored(s, sk, m) for s, sk, m in tasks_list]
+            # Calls as (cells, model); each call's coroutine is only created
+            # once a pipeline worker picks it up
+            if state.comparative:
+                calls = (
+                    ([(s, sk) for sk in skills], m)
+                    for s, skills, m in comparative_scored_tasks(tasks_list)
+                )
+            else:
+                calls = (
+                    ([(s, sk) for s in batch], m)
+                    for batch, sk, m in batch_scored_tasks(tasks_list, state.batch_size)
+                )
+            budget = CostBudget(state.max_cost_usd)
             try:
-                await asyncio.gather(*coros)
-            except Exception as gather_exc:
-                # On partial failure: save whatever results we have so far
+                async with asyncio.timeout(state.run_timeout_s):
+                    stats = await run_pipeline(
+                        calls,
+                        lambda call: run_one_group(*call),
+                        workers=state.max_concurrency * len(state.models),
+                        stop=lambda: budget.exhausted,
+                    )
+            except BaseException:
+                # On partial failure / cancel / deadline: report what we have so far
+                await writer.aclose()
                 if state.results:
-                    metadata = {
-                        "models": state.models,
-                        "domains": state.domains,
-                        "concurrency": state.concurrency,
-                    }
                     async with state._save_lock:
-                        save_scored_report_incremental(
-                            state.run_id, state.results, metadata
-                        )
-                raise gather_exc
+                        await asyncio.to_thread(compact_scored_run, state.run_id, metadata)
+                raise
+            await writer.aclose()
+
+            stopped = None
+            if stats.stopped:
+                # Cost budget reached: the cells never started stay unscored
+                stopped = metadata["stopped"] = "budget"
+                self._cancel_unfinished_cells(state)
+            async with state._save_lock:
+                await asyncio.to_thread(compact_scored_run, state.run_id, metadata)
 
             state.status = ScoredRunStatus.COMPLETED
             state.completed_at = datetime.now().isoformat()
+            if not stopped:
+                # Every cell has a result: nothing left to resume
+                journal.remove()
+                journal = None
 
-            # Determine the final report filename (already saved incrementally)
+            # The final report, compacted from the journal above
             report_name = f"scored_run_{state.run_id}.json"
 
             await state.queue.put(
@@ -196,6 +604,27 @@ class RunManager:
                         "run_id": state.run_id,
                         "report_json": report_name,
                         "total_results": len(state.results),
+                        "retries_used": retrier.spent,
+                        "cost_usd": round(budget.spent_usd, 4),
+                        "stopped": stopped,
+                    },
+                }
+            )
+
+        except (asyncio.CancelledError, TimeoutError) as e:
+            cancelled = isinstance(e, asyncio.CancelledError)
+            state.status = (
+                ScoredRunStatus.CANCELLED if cancelled else ScoredRunStatus.TIMED_OUT
+            )
+            state.completed_at = datetime.now().isoformat()
+            self._cancel_unfinished_cells(state)
+            await state.queue.put(
+                {
+                    "event": "cancelled",
+                    "data": {
+                        "run_id": state.run_id,
+                        "reason": "cancelled" if cancelled else "run deadline reached",
+                        "total_results": len(state.results),
                     },
                 }
             )
@@ -214,6 +643,11 @@ class RunManager:
                 }
             )
 
+        if writer is not None and not writer.closed:
+            await writer.aclose()  # the run failed before its pipeline ran
+        if journal is not None:
+            journal.close()  # kept: the run can be resumed
+
         # Signal end of stream
         await state.queue.put(None)
 
@@ -7,9 +7,25 @@ Usage:
     python sim.py                           # Run all scenarios on all models
     python sim.py --scenario dc-1           # Run single scenario
     python sim.py --model sonnet            # Single model (overrides per-category defaults)
-    python sim.py --dry-run                 # Show what would run
+    python sim.py --dry-run                 # Show what would run, with cost/time estimate
+    python sim.py --scored --dry-run        # Estimate a scored run without calling anything
     python sim.py --list                    # List all scenarios
     python sim.py --concurrency 5           # Max parallel calls (default: 3)
+    python sim.py --rpm opus=20,sonnet=50   # Requests-per-minute budget per model
+    python sim.py --scored --incremental    # Re-run only changed or errored heatmap cells
+    python sim.py --scored --batch-size 4   # Score up to 4 scenarios of a skill per call
+    python sim.py --scored --comparative    # Score a scenario's target skills in one call
+    python sim.py --scored --schedule lpt   # Start the longest expected cells first
+    python sim.py --run-timeout 1800        # Stop after 30 min, keep finished results
+    python sim.py --scored --max-cost 5     # Start no new calls once $5 is spent
+    python sim.py --backend api             # Messages API instead of claude -p (ANTHROPIC_API_KEY)
+    python sim.py --scored --backend fake --fake-config seed=1,latency=0.1  # Offline simulation
+    python sim.py --resume 3f2a9c1b7d4e     # Finish an interrupted run from its journal
+
+Ctrl-C cancels in-flight calls (killing their claude processes) and still
+writes a report with the results finished so far. Every finished call is also
+journaled as it lands, so a run that was interrupted, stopped or killed
+outright can be finished with --resume.
 """
 
 import argparse
@@ -17,24 +33,68 @@ import asyncio
 import sys
 import uuid
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
 
+from backends import BACKENDS, CLI, DEFAULT_BACKEND, FAKE, Backend, make_backend
 from bp_linter import bp_checks_to_run_results, run_bp_checks
+from journal import RunJournal
+from limits import (
+    DEFAULT_MAX_CONCURRENCY,
+    AdaptiveLimiter,
+    CostBudget,
+    RateLimiter,
+    parse_rate_limits,
+)
 from sim_core import (
     DEFAULT_CONCURRENCY,
+    DEFAULT_TASK_TIMEOUT_S,
+    PrefixGate,
     Scenario,
+    batch_scored_tasks,
+    comparative_scored_tasks,
     create_run_snapshot,
+    estimate_scored_run,
+    estimate_standard_run,
+    format_incremental_plan,
+    format_usage,
     get_scenario_models,
-    get_target_skills,
+    iter_scored_tasks,
+    journal_path,
+    load_all_scored_reports,
+    load_all_standard_reports,
     load_domain_scenarios,
     load_manifest,
+    load_resume_plan,
     load_scenarios,
+    plan_incremental_run,
     read_skill,
+    result_to_dict,
     run_scenario,
-    run_scored_scenario,
+    run_scored_batch,
+    run_scored_comparative,
     save_reports,
     save_scored_report,
+    schedule_scored_tasks,
+    schedule_standard_tasks,
     snapshot_to_metadata,
+    start_run_journal,
+    summarize_usage,
+)
+from estimates import format_estimate
+from pipeline import PipelineStats, run_pipeline
+from response_cache import ResponseCache
+from results_store import ResultsWriter, open_store
+from scheduling import DEFAULT_POLICY, POLICIES, format_duration
+from retries import (
+    DEFAULT_MAX_ATTEMPTS,
+    ClaudeError,
+    Retrier,
+    RetryPolicy,
+    default_retry_budget,
 )
+from worker_pool import WarmProcessPool
+
+T = TypeVar("T")
 
 
 # --- CLI ---
@@ -53,8 +113,9 @@ def dry_run(
     scenarios: list[Scenario],
     cli_models: list[str] | None,
     manifest: dict,
+    concurrency: int,
 ) -> None:
-    """Print what would be executed."""
+    """Print what would be executed, with a cost and time estimate."""
     api_calls = 0
     bp_calls = 0
 
@@ -76,9 +137,219 @@ def dry_run(
     print(
         f"\nDry run: {len(scenarios)} scenarios + {bp_calls} BP checks = {total} total ({api_calls} API calls, {bp_calls} static)"
     )
-    est_low = api_calls * 0.05
-    est_high = api_calls * 0.15
-    print(f"Estimated cost: ${est_low:.2f} - ${est_high:.2f} (BP checks are free)")
+    estimate = estimate_standard_run(
+        [(s, m) for s in scenarios for m in get_scenario_models(s, cli_models) if m != "bp-linter"],
+        manifest,
+        load_all_standard_reports(),
+        concurrency,
+    )
+    print(f"{format_estimate(estimate)}; BP checks are free")
+
+
+def _make_backend(args: argparse.Namespace) -> Backend:
+    """Backend per --backend; the CLI one gets a warm pool unless --no-warm-pool."""
+    pool = None
+    if args.backend == CLI and not args.no_warm_pool:
+        pool = WarmProcessPool(size=args.concurrency)
+    try:
+        return make_backend(args.backend, pool, fake_config=args.fake_config)
+    except ClaudeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _make_cache(args: argparse.Namespace) -> ResponseCache | None:
+    """Response cache per --no-cache / --refresh (prunes stale entries up front).
+
+    Never with the fake backend: simulated answers must not reach real runs.
+    """
+    if args.no_cache or args.backend == FAKE:
+        return None
+    cache = ResponseCache(refresh=args.refresh)
+    cache.prune()
+    return cache
+
+
+def _cache_tag(cached: bool) -> str:
+    return ", cached" if cached else ""
+
+
+def _print_cache_stats(cache: ResponseCache | None) -> None:
+    if cache is None:
+        return
+    print(f"Response cache: {cache.hits} hits, {cache.misses} misses")
+
+
+def _print_prefix_cache_stats(results: list) -> None:
+    """Provider-side prompt cache usage, when the backend reports it."""
+    reported = [r for r in results if r.cache_read_tokens is not None and not r.cached]
+    if not reported:
+        return
+    hits = sum(1 for r in reported if r.cache_read_tokens)
+    tokens = sum(r.cache_read_tokens for r in reported)
+    print(f"Prompt cache: {hits}/{len(reported)} calls read {tokens:,} cached input tokens")
+
+
+def _print_schedule(policy: str, makespan_s: float, concurrency: int) -> None:
+    print(
+        f"Schedule: {policy}, expected makespan {format_duration(makespan_s)} "
+        f"at concurrency {concurrency}"
+    )
+
+
+def _make_limiter(args: argparse.Namespace) -> AdaptiveLimiter:
+    """Adaptive concurrency limiter, with RPM/TPM budgets when --rpm/--tpm are set."""
+    rate_limiter = None
+    if args.rpm or args.tpm:
+        rate_limiter = RateLimiter(parse_rate_limits(args.rpm, args.tpm))
+    return AdaptiveLimiter(
+        args.concurrency, max_limit=args.max_concurrency, rate_limiter=rate_limiter
+    )
+
+
+def _make_retrier(args: argparse.Namespace, total: int) -> Retrier:
+    """Retrier per --max-attempts, with --retry-budget (or a fifth of the tasks)."""
+    budget = args.retry_budget
+    if budget is None:
+        budget = default_retry_budget(total)
+    return Retrier(RetryPolicy(max_attempts=args.max_attempts), budget=budget)
+
+
+def _status_tag(result) -> str:
+    """'OK' / 'ERR[kind]', plus how many retries the call needed."""
+    status = f"ERR[{result.error_kind}]" if result.error else "OK"
+    if result.retries:
+        status += f" after {len(result.retries)} retries"
+    return status
+
+
+def _timing_tag(result) -> str:
+    """', ttft 2.1s' for streamed results."""
+    return f", ttft {result.ttft_s:.1f}s" if result.ttft_s is not None else ""
+
+
+def _cost_tag(result) -> str:
+    return f", ${result.cost_usd:.4f}" if result.cost_usd and not result.cached else ""
+
+
+def _print_retry_stats(retrier: Retrier) -> None:
+    print(f"Retries: {retrier.spent}/{retrier.budget} budget used")
+    if retrier.fatal is not None:
+        print(f"Aborted on {retrier.fatal.kind} error: {str(retrier.fatal)[:200]}")
+
+
+def _print_limits(limiter: AdaptiveLimiter) -> None:
+    """Print each model's concurrency limit trajectory and rate-limit waits."""
+    for model in limiter.models:
+        print(f"Concurrency {model}: {limiter.format_history(model)}")
+        budget = limiter.rate_limiter and limiter.rate_limiter.describe(model)
+        if budget:
+            print(
+                f"Rate limit {model}: rpm={budget['rpm']}, tpm={budget['tpm']}, "
+                f"waited {budget['waited_s']}s"
+            )
+
+
+async def _drain(
+    items: Iterable[T],
+    run: Callable[[T], Awaitable[Any]],
+    on_result: Callable[[Any], None],
+    run_timeout: float | None,
+    workers: int,
+    budget: CostBudget,
+) -> str | None:
+    """Run `run(item)` for every item on a bounded worker pool (see pipeline.py),
+    calling on_result as each one finishes.
+
+    Items are pulled lazily, so coroutines and prompts only exist for calls
+    that are about to start. Returns None when all finished, "budget" when
+    the --max-cost budget stopped new calls, "timeout" when the --run-timeout
+    deadline passed, or "cancelled" on Ctrl-C. In-flight calls are cancelled
+    (which kills their claude processes) before returning, so partial
+    results can be reported.
+    """
+    stats = PipelineStats()
+    try:
+        async with asyncio.timeout(run_timeout):
+            await run_pipeline(
+                items,
+                run,
+                workers,
+                on_result=on_result,
+                stats=stats,
+                stop=lambda: budget.exhausted,
+            )
+        if stats.stopped:
+            print(
+                f"\nCost budget reached: ${budget.spent_usd:.2f} of ${budget.max_usd:.2f} "
+                f"spent, remaining calls not started ({stats.completed} finished)"
+            )
+            return "budget"
+        return None
+    except TimeoutError:
+        stopped = "timeout"
+    except asyncio.CancelledError:
+        asyncio.current_task().uncancel()  # handled here: report, then exit 130
+        stopped = "cancelled"
+    reason = "run deadline reached" if stopped == "timeout" else "interrupted"
+    print(
+        f"\n{reason.capitalize()}: {stats.started - stats.completed} in-flight calls cancelled, "
+        f"{stats.completed} finished"
+    )
+    return stopped
+
+
+async def _close_backend(backend: Backend) -> None:
+    """Release the backend; for a warm pool, print how many calls skipped the cold start."""
+    await backend.aclose()
+    pool = getattr(backend, "pool", None)
+    if pool is None:
+        return
+    stats = pool.stats
+    print(
+        f"Warm pool: {stats.warm} warm, {stats.cold} cold starts, {stats.recycled} recycled, "
+        f"{stats.evicted} evicted"
+    )
+
+
+# Options that shape a run's cells and calls; a resumed run takes them from
+# its journal, everything else (concurrency, backend, limits) from the command line
+SCORED_RUN_OPTIONS = ("model", "domain", "batch_size", "comparative", "schedule", "prefix_cache")
+STANDARD_RUN_OPTIONS = ("model", "schedule", "prefix_cache", "output")
+
+
+def _load_resume(run_id: str):
+    """The run's ResumePlan; exits with an error if it cannot be resumed."""
+    try:
+        resume = load_resume_plan(run_id)
+    except FileNotFoundError:
+        print(f"Error: no journal for run '{run_id}' ({journal_path(run_id)})", file=sys.stderr)
+        sys.exit(1)
+    except (ValueError, KeyError) as e:
+        print(f"Error: cannot resume run '{run_id}': {e}", file=sys.stderr)
+        sys.exit(1)
+    if resume.mode == "scored" and len(resume.options.get("model") or []) > 1:
+        print(
+            f"Error: run '{run_id}' scores several models; resume it from the server",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    print(
+        f"Resuming {resume.mode} run {run_id}: {len(resume.done)} of "
+        f"{len(resume.cells)} cells done, {len(resume.remaining)} to run"
+    )
+    if resume.missing:
+        print(f"  Skipped (scenario no longer exists): {', '.join(resume.missing)}")
+    return resume
+
+
+def _finish_journal(journal: RunJournal, run_id: str, stopped: str | None) -> None:
+    """Keep the journal of an unfinished run (and say how to resume it), drop it otherwise."""
+    if stopped:
+        journal.close()
+        print(f"Resume with: python sim.py --resume {run_id}")
+    else:
+        journal.remove()
 
 
 async def main() -> None:
@@ -100,14 +371,128 @@ async def main() -> None:
         help="Model override (repeat for multiple). Overrides per-category defaults.",
     )
     parser.add_argument("--skill", help="Filter scenarios by target_skill")
-    parser.add_argument("--dry-run", action="store_true", help="Show what would run")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Show what would run, with a cost and time estimate"
+    )
     parser.add_argument("--list", action="store_true", help="List all scenarios")
     parser.add_argument(
         "--concurrency",
         "-c",
         type=int,
         default=DEFAULT_CONCURRENCY,
-        help=f"Max concurrent claude -p calls (default: {DEFAULT_CONCURRENCY})",
+        help=f"Initial concurrent claude -p calls per model (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help="Ceiling for the adaptive per-model concurrency limit "
+        f"(default: {DEFAULT_MAX_CONCURRENCY}; set to --concurrency for a fixed limit)",
+    )
+    parser.add_argument(
+        "--rpm",
+        metavar="BUDGET",
+        help="Requests per minute, for every model ('50') or per model ('opus=20,sonnet=50')",
+    )
+    parser.add_argument(
+        "--tpm",
+        metavar="BUDGET",
+        help="Tokens per minute (input + output), same syntax as --rpm",
+    )
+    parser.add_argument(
+        "--task-timeout",
+        type=float,
+        default=DEFAULT_TASK_TIMEOUT_S,
+        metavar="SECONDS",
+        help=f"Kill a claude -p call after this long (default: {DEFAULT_TASK_TIMEOUT_S:g}; 0 = no limit)",
+    )
+    parser.add_argument(
+        "--run-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Stop the whole run after this long; finished results are still saved",
+    )
+    parser.add_argument(
+        "--max-cost",
+        type=float,
+        metavar="USD",
+        help="Stop starting new calls once the run has spent this much (cost "
+        "reported by the CLI, or list price of the tokens); calls in flight finish",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help=f"Attempts per call for transient errors (default: {DEFAULT_MAX_ATTEMPTS}; 1 disables retries)",
+    )
+    parser.add_argument(
+        "--retry-budget",
+        type=int,
+        help="Max retries across the whole run (default: a fifth of the tasks, at least 5)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=DEFAULT_BACKEND,
+        help="How to call the models: the claude CLI (default, no API key needed), "
+        "the Messages API over pooled HTTP connections (needs ANTHROPIC_API_KEY) "
+        "or a local simulator for offline load tests (fake)",
+    )
+    parser.add_argument(
+        "--fake-config",
+        metavar="SPEC",
+        help="Fake backend behaviour, e.g. seed=7,latency=0.5,overload=0.02,malformed=0.05 "
+        "(default: FAKE_BACKEND)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        metavar="K",
+        help="Scored mode: score up to K scenarios of a skill in one call "
+        "(default: 1 = one call per scenario)",
+    )
+    parser.add_argument(
+        "--comparative",
+        action="store_true",
+        help="Scored mode: score all target skills of a scenario (specialist, "
+        "apify-mcpc, apify-ultimate-scraper) in one call",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=POLICIES,
+        default=DEFAULT_POLICY,
+        help="Order in which cells are started: plan (cross-product order, default), "
+        "lpt (longest expected duration first, from earlier runs), coverage (one "
+        "cell per domain/skill first, so the heatmap fills early)",
+    )
+    parser.add_argument(
+        "--prefix-cache",
+        action="store_true",
+        help="Cache-aware layout: put SKILL.md in the system prompt and run tasks "
+        "grouped by skill, so calls reuse the provider-side prompt cache",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream responses (stream-json): report time-to-first-token, abort "
+        "scoring answers that cannot contain the scoring JSON",
+    )
+    parser.add_argument(
+        "--no-warm-pool",
+        action="store_true",
+        help="Spawn a fresh claude process per call instead of keeping warm spares",
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the response cache (no lookups, nothing stored)",
+    )
+    cache_group.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached responses but store the fresh ones",
     )
     parser.add_argument(
         "--output",
@@ -124,70 +509,215 @@ async def main() -> None:
         "-d",
         help="Filter by domain (only with --scored)",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only run cells whose skill/scenario changed or that errored (only with --scored)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Finish an interrupted run: run only the cells its journal has no "
+        "result for (cells, model, batching and schedule come from the journal)",
+    )
     args = parser.parse_args()
+    try:
+        parse_rate_limits(args.rpm, args.tpm)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.max_attempts < 1:
+        parser.error("--max-attempts must be at least 1")
+    if args.max_cost is not None and args.max_cost <= 0:
+        parser.error("--max-cost must be positive")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.comparative and args.batch_size > 1:
+        parser.error("--comparative cannot be combined with --batch-size")
+    if args.fake_config is not None and args.backend != FAKE:
+        parser.error("--fake-config needs --backend fake")
+    if args.resume and (args.dry_run or args.list or args.incremental):
+        parser.error("--resume cannot be combined with --dry-run, --list or --incremental")
+    task_timeout = args.task_timeout or None
+
+    resume = None
+    if args.resume:
+        resume = _load_resume(args.resume)
+        args.scored = resume.mode == "scored"
+        for key, value in resume.options.items():
+            setattr(args, key, value)
 
     # --- Scored mode (domain-based heatmap) ---
     if args.scored:
         manifest = load_manifest()
-        domain_scenarios = load_domain_scenarios()
         model = args.model[0] if args.model else "sonnet"
+        all_reports = load_all_scored_reports()
+
+        if resume:
+            domains = resume.metadata.get("domains", [])
+            task_list = [(s, sk) for s, sk, _ in resume.remaining]
+        else:
+            domain_scenarios = load_domain_scenarios()
+            if args.domain:
+                if args.domain not in domain_scenarios:
+                    print(
+                        f"Error: domain '{args.domain}' not found. Available: {', '.join(sorted(domain_scenarios.keys()))}",
+                        file=sys.stderr,
+                    )
+                    sys.exit(1)
+                domain_scenarios = {args.domain: domain_scenarios[args.domain]}
+            domains = list(domain_scenarios.keys())
+
+            # Build task list
+            task_list = [
+                (s, sk) for s, sk, _ in iter_scored_tasks(domain_scenarios, manifest, [model])
+            ]
 
-        if args.domain:
-            if args.domain not in domain_scenarios:
-                print(
-                    f"Error: domain '{args.domain}' not found. Available: {', '.join(sorted(domain_scenarios.keys()))}",
-                    file=sys.stderr,
-                )
-                sys.exit(1)
-            domain_scenarios = {args.domain: domain_scenarios[args.domain]}
-
-        # Build task list
-        task_list: list[tuple[Scenario, str]] = []
-        for domain_id, scenarios_list in domain_scenarios.items():
-            for scenario in scenarios_list:
-                target_skills = get_target_skills(scenario, manifest)
-                for skill_name in target_skills:
-                    task_list.append((scenario, skill_name))
+        if args.incremental:
+            plan = plan_incremental_run(
+                [(s, sk, model) for s, sk in task_list],
+                manifest,
+                all_reports,
+            )
+            print(format_incremental_plan(plan))
+            task_list = [(s, sk) for s, sk, _ in plan.rerun]
+            if not task_list:
+                print("Nothing to run — all cells are up to date.")
+                return
 
         total = len(task_list)
-
-        # Create snapshot
-        run_id = uuid.uuid4().hex[:12]
-        skill_names_used = sorted({sk for _, sk in task_list})
-        scenario_files_used = sorted({s.source_file for s, _ in task_list})
-        snapshot = create_run_snapshot(
-            run_id, manifest, skill_names_used, scenario_files_used
+        scheduled, makespan_s = schedule_scored_tasks(
+            [(s, sk, model) for s, sk in task_list],
+            args.schedule,
+            manifest,
+            all_reports,
+            args.concurrency,
+            # Consecutive calls for a skill share the system + SKILL.md prefix
+            prefix_cache=args.prefix_cache,
         )
+        task_list = [(s, sk) for s, sk, _ in scheduled]
+
+        metadata = {
+            "model": model,
+            "domains": domains,
+            "concurrency": args.concurrency,
+            "backend": args.backend,
+            "max_cost_usd": args.max_cost,
+        }
+        if resume:
+            # The snapshot describes the files as they were when the run started
+            run_id = resume.run_id
+            metadata["snapshot"] = resume.metadata.get("snapshot")
+        else:
+            run_id = uuid.uuid4().hex[:12]
+            skill_names_used = sorted({sk for _, sk in task_list})
+            scenario_files_used = sorted({s.source_file for s, _ in task_list})
+            snapshot = create_run_snapshot(
+                run_id,
+                manifest,
+                skill_names_used,
+                scenario_files_used,
+                scenarios=[s for s, _ in task_list],
+            )
+            metadata["snapshot"] = snapshot_to_metadata(snapshot)
 
         print(
-            f"Scored run: {total} tasks, model={model}, concurrency={args.concurrency}"
+            f"Scored run {run_id}: {total} tasks, model={model}, concurrency={args.concurrency} (adaptive, max {args.max_concurrency})"
         )
-
-        semaphore = asyncio.Semaphore(args.concurrency)
-        scored_results = []
-        completed = 0
-        for coro in asyncio.as_completed(
-            [
-                run_scored_scenario(s, sk, model, manifest, semaphore)
-                for s, sk in task_list
-            ]
-        ):
-            result = await coro
-            completed += 1
-            status = "OK" if not result.error else "ERR"
-            print(
-                f"  [{completed}/{total}] {result.scenario_id} × {result.skill}: {status} ({result.duration_s:.1f}s)"
+        _print_schedule(args.schedule, makespan_s, args.concurrency)
+        cells = [(s, sk, model) for s, sk in task_list]
+        if args.comparative:
+            calls = comparative_scored_tasks(cells)
+            print(f"Comparative: {len(calls)} calls for {total} cells")
+        else:
+            calls = batch_scored_tasks(cells, args.batch_size)
+            if len(calls) < total:
+                print(f"Batched: {len(calls)} calls, up to {args.batch_size} scenarios each")
+        if args.dry_run:
+            estimate = estimate_scored_run(
+                cells,
+                manifest,
+                all_reports,
+                args.concurrency,
+                batch_size=args.batch_size,
+                comparative=args.comparative,
             )
+            print(format_estimate(estimate))
+            return
+
+        limiter = _make_limiter(args)
+        backend = _make_backend(args)
+        cache = _make_cache(args)
+        retrier = _make_retrier(args, total)
+        prefix_gate = PrefixGate() if args.prefix_cache else None
+        budget = CostBudget(args.max_cost)
+        if resume:
+            journal = RunJournal.reopen(journal_path(run_id))
+            scored_results = list(resume.done)
+        else:
+            journal = start_run_journal(
+                run_id,
+                "scored",
+                cells,
+                {key: getattr(args, key) for key in SCORED_RUN_OPTIONS},
+                metadata,
+            )
+            scored_results = []
+        total += len(scored_results)
+        store = open_store()
+        store.add_run(run_id, metadata)
+        writer = ResultsWriter(store, run_id)  # batched, off the event loop
+
+        def on_scored(result) -> None:
+            journal.append(result_to_dict(result))
+            writer.add(result)
             scored_results.append(result)
+            if not result.cached:
+                budget.add(result.cost_usd)
+            status = _status_tag(result)
+            print(
+                f"  [{len(scored_results)}/{total}] {result.scenario_id} × {result.skill}: {status} ({result.duration_s:.1f}s{_timing_tag(result)}{_cost_tag(result)}{_cache_tag(result.cached)}) [c={limiter.limit(model)}]"
+            )
 
-        metadata = {
-            "model": model,
-            "domains": list(domain_scenarios.keys()),
-            "concurrency": args.concurrency,
-            "snapshot": snapshot_to_metadata(snapshot),
-        }
+        def on_batch(results) -> None:
+            for result in results:
+                on_scored(result)
+
+        options = dict(
+            cache=cache,
+            retrier=retrier,
+            timeout_s=task_timeout,
+            stream=args.stream,
+            backend=backend,
+            prefix_gate=prefix_gate,
+        )
+
+        def run_call(call):
+            if args.comparative:
+                scenario, skills, _ = call
+                return run_scored_comparative(
+                    scenario, skills, model, manifest, limiter, **options
+                )
+            batch, skill_name, _ = call
+            return run_scored_batch(batch, skill_name, model, manifest, limiter, **options)
+
+        try:
+            stopped = await _drain(
+                calls, run_call, on_batch, args.run_timeout, args.max_concurrency, budget
+            )
+        finally:
+            await _close_backend(backend)
+            await writer.aclose()
+        print(format_usage(summarize_usage(scored_results)))
+        _print_cache_stats(cache)
+        _print_prefix_cache_stats(scored_results)
+        _print_retry_stats(retrier)
+        _print_limits(limiter)
+
+        if stopped:
+            metadata["stopped"] = stopped
         report_path = save_scored_report(scored_results, metadata)
         print(f"\nScored report saved: {report_path}")
+        _finish_journal(journal, run_id, stopped)
 
         # Summary
         pass_count = sum(
@@ -200,6 +730,8 @@ async def main() -> None:
             1 for r in scored_results for c in r.checks if c.result == "unclear"
         )
         print(f"Results: {pass_count} pass, {fail_count} fail, {unclear_count} unclear")
+        if stopped == "cancelled":
+            sys.exit(130)
         return
 
     # --- Standard mode ---
@@ -211,7 +743,10 @@ async def main() -> None:
 
     # Filter scenarios
     scenarios = all_scenarios
-    if args.skill:
+    if resume:
+        planned = {scenario_id for scenario_id, _ in resume.cells}
+        scenarios = [s for s in all_scenarios if s.id in planned]
+    elif args.skill:
         scenarios = [s for s in scenarios if s.target_skill == args.skill]
         if not scenarios:
             print(
@@ -219,7 +754,7 @@ async def main() -> None:
             )
             list_scenarios(all_scenarios)
             sys.exit(1)
-    if args.scenarios:
+    if args.scenarios and not resume:
         selected_ids = set(args.scenarios)
         scenarios = [s for s in scenarios if s.id in selected_ids]
         missing = selected_ids - {s.id for s in scenarios}
@@ -238,7 +773,7 @@ async def main() -> None:
 
     # Dry run
     if args.dry_run:
-        dry_run(scenarios, cli_models, manifest)
+        dry_run(scenarios, cli_models, manifest, args.concurrency)
         return
 
     # Validate skills exist
@@ -250,17 +785,64 @@ async def main() -> None:
             sys.exit(1)
 
     # Execute — each scenario runs on its own models
-    semaphore = asyncio.Semaphore(args.concurrency)
-    tasks = []
-    all_models_used = set()
-
-    for scenario in scenarios:
-        models = get_scenario_models(scenario, cli_models)
-        for model in models:
-            if model == "bp-linter":
-                continue  # Handled separately below
-            all_models_used.add(model)
-            tasks.append(run_scenario(scenario, model, manifest, semaphore))
+    limiter = _make_limiter(args)
+    backend = _make_backend(args)
+    cache = _make_cache(args)
+    retrier = _make_retrier(
+        args,
+        sum(
+            model != "bp-linter"
+            for s in scenarios
+            for model in get_scenario_models(s, cli_models)
+        ),
+    )
+    prefix_gate = PrefixGate() if args.prefix_cache else None
+    if resume:
+        pairs = list(resume.remaining)
+    else:
+        pairs = [
+            (scenario, model)
+            for scenario in scenarios
+            for model in get_scenario_models(scenario, cli_models)
+            if model != "bp-linter"  # Handled separately below
+        ]
+    pairs, makespan_s = schedule_standard_tasks(
+        pairs,
+        args.schedule,
+        manifest,
+        load_all_standard_reports(),
+        args.concurrency,
+        prefix_cache=args.prefix_cache,
+    )
+    if resume:
+        run_id = resume.run_id
+        all_models_used = {model for _, model in resume.cells}
+        journal = RunJournal.reopen(journal_path(run_id))
+    else:
+        run_id = uuid.uuid4().hex[:12]
+        all_models_used = {model for _, model in pairs}
+        journal = start_run_journal(
+            run_id,
+            "standard",
+            pairs,
+            {key: getattr(args, key) for key in STANDARD_RUN_OPTIONS},
+            {},
+        )
+
+    def run_pair(pair):
+        scenario, model = pair
+        return run_scenario(
+            scenario,
+            model,
+            manifest,
+            limiter,
+            cache=cache,
+            retrier=retrier,
+            timeout_s=task_timeout,
+            stream=args.stream,
+            backend=backend,
+            prefix_gate=prefix_gate,
+        )
 
     # Run BP linter per-skill (no API calls)
     skills_in_scenarios = {s.target_skill for s in scenarios}
@@ -270,28 +852,58 @@ async def main() -> None:
         checks = run_bp_checks(skill_content, skill_name)
         bp_results.extend(bp_checks_to_run_results(checks, skill_name))
 
-    total_api = len(tasks)
-    total = total_api + len(bp_results)
+    done = list(resume.done) if resume else []
+    total_api = len(pairs)
+    total = total_api + len(bp_results) + len(done)
     print(
-        f"Running {total} checks ({total_api} API calls + {len(bp_results)} BP linter, concurrency={args.concurrency})"
+        f"Run {run_id}: {total} checks ({total_api} API calls + {len(bp_results)} BP linter"
+        + (f" + {len(done)} done earlier" if resume else "")
+        + f", concurrency={args.concurrency} adaptive, max {args.max_concurrency})"
     )
+    _print_schedule(args.schedule, makespan_s, args.concurrency)
 
     # Print BP results immediately (they're instant)
     for r in bp_results:
         print(f"  [BP] {r.scenario_id} × bp-linter: OK (0.0s)")
 
     # Run API calls
-    completed = 0
-    results = list(bp_results)  # Start with BP results
+    results = bp_results + done  # Start with BP results (and a resumed run's)
     all_models_used.add("bp-linter")
-    for coro in asyncio.as_completed(tasks):
-        result = await coro
-        completed += 1
-        status = "OK" if not result.error else "ERR"
+    budget = CostBudget(args.max_cost)
+
+    def on_result(result) -> None:
+        journal.append(result_to_dict(result))
+        results.append(result)
+        if not result.cached:
+            budget.add(result.cost_usd)
+        status = _status_tag(result)
         print(
-            f"  [{completed + len(bp_results)}/{total}] {result.scenario_id} × {result.model}: {status} ({result.duration_s}s)"
+            f"  [{len(results)}/{total}] {result.scenario_id} × {result.model}: {status} ({result.duration_s}s{_timing_tag(result)}{_cost_tag(result)}{_cache_tag(result.cached)}) [c={limiter.limit(result.model)}]"
         )
-        results.append(result)
+
+    try:
+        stopped = await _drain(
+            pairs,
+            run_pair,
+            on_result,
+            args.run_timeout,
+            args.max_concurrency * max(1, len({m for _, m in pairs})),
+            budget,
+        )
+    finally:
+        await _close_backend(backend)
+    skills = {s.id: s.target_skill for s in scenarios}
+    print(
+        format_usage(
+            summarize_usage(
+                results[len(bp_results) :], skill_of=lambda r: skills.get(r.scenario_id, "")
+            )
+        )
+    )
+    _print_cache_stats(cache)
+    _print_prefix_cache_stats(results)
+    _print_retry_stats(retrier)
+    _print_limits(limiter)
 
     # Generate reports
     output_path = Path(args.output) if args.output else None
@@ -317,6 +929,7 @@ async def main() -> None:
     print("\nReports saved:")
     print(f"  Markdown: {md_path}")
     print(f"  JSON:     {json_path}")
+    _finish_journal(journal, run_id, stopped)
 
     # Summary
     errors = [r for r in results if r.error]
@@ -324,7 +937,12 @@ async def main() -> None:
         print(f"\n{len(errors)} errors:")
         for e in errors:
             print(f"  [{e.scenario_id}] {e.model}: {e.error[:100]}")
+    if stopped == "cancelled":
+        sys.exit(130)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:  # second Ctrl-C while shutting down
+        sys.exit(130)
@@ -7,27 +7,50 @@ All constants, data structures, loading, execution, and reporting functions.
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
+import logging
 import os
 import re
+import subprocess
+import textwrap
 import time
-from dataclasses import dataclass, field
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
 from pathlib import Path
-from typing import AsyncIterator, Callable
+from typing import AsyncContextManager, AsyncIterator, Callable, Iterator
 
 import yaml
 
+from backends import Backend, CliBackend, StreamMonitor
+from estimates import RunEstimate, UsageModel, UsageSample
+from journal import RunJournal, read_journal
+from limits import (
+    DEFAULT_OUTPUT_TOKENS,
+    AdaptiveLimiter,
+    estimate_cost_usd,
+    estimate_tokens,
+)
+from response_cache import ResponseCache
+from retries import FATAL_KINDS, TIMEOUT, TRUNCATED, ClaudeError, Retrier, classify_error
+from scheduling import DurationModel, expected_makespan, schedule
+from worker_pool import WarmProcessPool
+
+logger = logging.getLogger(__name__)
+
 
 # --- Constants ---
 
 ROOT = Path(__file__).parent
 MANIFEST_PATH = ROOT / "skills_manifest.yaml"
 SCENARIOS_DIR = ROOT / "scenarios"
-REPORTS_DIR = ROOT / "reports"
+# SKILL_CHECKER_REPORTS_DIR keeps e.g. load-test reports out of the real history
+REPORTS_DIR = Path(os.environ.get("SKILL_CHECKER_REPORTS_DIR") or ROOT / "reports")
 
 DEFAULT_MODELS = ["sonnet", "opus", "haiku"]
 DEFAULT_CONCURRENCY = 3
+DEFAULT_TASK_TIMEOUT_S = 600.0  # per claude -p call; a hung CLI is killed after this
 
 SEVERITY_ORDER = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
 SEVERITY_BADGE = {"CRITICAL": "🔴", "HIGH": "🟠", "MEDIUM": "🟡", "LOW": "🟢"}
@@ -473,6 +496,37 @@ def _build_scoring_check_reference() -> str:
     return "\n".join(lines)
 
 
+# Shared by the single-scenario, batched and comparative scoring prompts
+_SCORING_SECTIONS = """\
+## Approach
+How would an agent following this SKILL.md handle the prompt? Step by step.
+
+## Complexities Identified
+For each relevant check, explain what you found.
+
+## Risk Assessment
+Rate the overall risk: LOW / MEDIUM / HIGH / CRITICAL
+
+## Verdict
+One-paragraph summary.
+
+IMPORTANT: The SKILL.md references files and tools that are NOT available to you.
+Do not try to access them. Focus purely on analyzing the instructions as written."""
+
+_SCORING_CHECKS_EXAMPLE = """\
+    "WF-1": {"result": "pass", "evidence": "Skill provides step-by-step workflow", "summary": "Workflow present"},
+    "WF-2": {"result": "fail", "evidence": "No retry or fallback logic found", "summary": "Missing feedback loop"},
+    ..."""
+
+_SCORING_RULES = """\
+Rules for scoring:
+- **pass**: The SKILL.md adequately addresses this check for the given prompt
+- **fail**: The SKILL.md has a clear gap or issue for this check
+- **unclear**: Not enough information to determine, or partially addressed
+- You MUST include ALL 29 check IDs in the JSON (WF-1 through WF-6, DK-1 through DK-8, \
+APF-1 through APF-13, SEC-1, SEC-4)
+- The JSON block MUST be the last thing in your response"""
+
 SCORING_SYSTEM_PROMPT = f"""\
 You are a **skill quality auditor** performing structured scoring. You will receive:
 1. A SKILL.md file — instructions for an AI agent skill
@@ -491,20 +545,7 @@ Your job is to:
 
 First, provide your detailed analysis in markdown with these sections:
 
-## Approach
-How would an agent following this SKILL.md handle the prompt? Step by step.
-
-## Complexities Identified
-For each relevant check, explain what you found.
-
-## Risk Assessment
-Rate the overall risk: LOW / MEDIUM / HIGH / CRITICAL
-
-## Verdict
-One-paragraph summary.
-
-IMPORTANT: The SKILL.md references files and tools that are NOT available to you.
-Do not try to access them. Focus purely on analyzing the instructions as written.
+{_SCORING_SECTIONS}
 
 Then, at the very end of your response, output a structured JSON block wrapped in \
 ```json fences with your per-check scoring:
@@ -512,21 +553,96 @@ Then, at the very end of your response, output a structured JSON block wrapped i
 ```json
 {{
   "checks": {{
-    "WF-1": {{"result": "pass", "evidence": "Skill provides step-by-step workflow", "summary": "Workflow present"}},
-    "WF-2": {{"result": "fail", "evidence": "No retry or fallback logic found", "summary": "Missing feedback loop"}},
-    ...
+{_SCORING_CHECKS_EXAMPLE}
   }},
   "risk_level": "HIGH"
 }}
 ```
 
-Rules for scoring:
-- **pass**: The SKILL.md adequately addresses this check for the given prompt
-- **fail**: The SKILL.md has a clear gap or issue for this check
-- **unclear**: Not enough information to determine, or partially addressed
-- You MUST include ALL 29 check IDs in the JSON (WF-1 through WF-6, DK-1 through DK-8, \
-APF-1 through APF-13, SEC-1, SEC-4)
-- The JSON block MUST be the last thing in your response"""
+{_SCORING_RULES}"""
+
+BATCH_SCORING_SYSTEM_PROMPT = f"""\
+You are a **skill quality auditor** performing structured scoring. You will receive:
+1. A SKILL.md file — instructions for an AI agent skill
+2. Several user prompts, each under its scenario ID — tasks a user might ask the skill to handle
+
+Your job is to score every prompt independently, exactly as if it were the only one:
+1. Analyze how well the SKILL.md prepares the agent to handle this prompt
+2. Provide a detailed markdown analysis
+3. Score each check as pass/fail/unclear
+
+## Check Taxonomy (29 checks)
+
+{_build_scoring_check_reference()}
+
+## Output Format
+
+For each scenario, in the order given, start with a heading `# Scenario <scenario ID>` \
+and provide your detailed analysis in markdown with these sections:
+
+{_SCORING_SECTIONS}
+
+Then, at the very end of your response, output ONE structured JSON block wrapped in \
+```json fences with the per-check scoring of every scenario, keyed by scenario ID:
+
+```json
+{{
+  "scenarios": {{
+    "<scenario ID>": {{
+      "checks": {{
+{textwrap.indent(_SCORING_CHECKS_EXAMPLE, "    ")}
+      }},
+      "risk_level": "HIGH"
+    }},
+    ...
+  }}
+}}
+```
+
+{_SCORING_RULES}
+- The JSON MUST contain every scenario ID you were given"""
+
+COMPARATIVE_SCORING_SYSTEM_PROMPT = f"""\
+You are a **skill quality auditor** performing structured scoring. You will receive:
+1. Several SKILL.md files, each under its skill name — instructions for AI agent skills
+2. A user prompt — a task that a user might ask any of these skills to handle
+
+Your job is to score every skill on its own merits, applying the same standard to \
+each so the scores are comparable:
+1. Analyze how well each SKILL.md prepares the agent to handle this prompt
+2. Provide a detailed markdown analysis
+3. Score each check as pass/fail/unclear
+
+## Check Taxonomy (29 checks)
+
+{_build_scoring_check_reference()}
+
+## Output Format
+
+For each skill, in the order given, start with a heading `# Skill <skill name>` \
+and provide your detailed analysis in markdown with these sections:
+
+{_SCORING_SECTIONS}
+
+Then, at the very end of your response, output ONE structured JSON block wrapped in \
+```json fences with the per-check scoring of every skill, keyed by skill name:
+
+```json
+{{
+  "skills": {{
+    "<skill name>": {{
+      "checks": {{
+{textwrap.indent(_SCORING_CHECKS_EXAMPLE, "    ")}
+      }},
+      "risk_level": "HIGH"
+    }},
+    ...
+  }}
+}}
+```
+
+{_SCORING_RULES}
+- The JSON MUST contain every skill name you were given"""
 
 
 def parse_scoring_response(raw: str) -> tuple[str, dict[str, CheckResult], str]:
@@ -565,6 +681,12 @@ def parse_scoring_response(raw: str) -> tuple[str, dict[str, CheckResult], str]:
         }
         return raw, checks, "UNKNOWN"
 
+    checks, risk_level = _checks_from_json(data)
+    return markdown, checks, risk_level
+
+
+def _checks_from_json(data: dict) -> tuple[dict[str, CheckResult], str]:
+    """Per-check results + risk level from one scoring JSON object."""
     risk_level = data.get("risk_level", "UNKNOWN")
     raw_checks = data.get("checks", {})
     checks: dict[str, CheckResult] = {}
@@ -585,7 +707,97 @@ def parse_scoring_response(raw: str) -> tuple[str, dict[str, CheckResult], str]:
                 check_id=cid, result="unclear", evidence="Not scored by model"
             )
 
-    return markdown, checks, risk_level
+    return checks, risk_level
+
+
+_BATCH_HEADING_RE = re.compile(r"^#\s+Scenario\s+`?([^`\s]+)`?\s*$", re.MULTILINE)
+_COMPARATIVE_HEADING_RE = re.compile(r"^#\s+Skill\s+`?([^`\s]+)`?\s*$", re.MULTILINE)
+
+
+def _parse_keyed_scoring_response(
+    raw: str, keys: list[str], field_name: str, heading_re: re.Pattern
+) -> dict[str, tuple[str, dict[str, CheckResult], str]]:
+    """{key: (markdown, checks, risk_level)} from a multi-part scoring response.
+
+    The JSON block holds one scoring object per key under `field_name`; the
+    markdown is split on `heading_re` headings. Keys the JSON does not score
+    are left out — all of them if the JSON block is missing or malformed.
+    """
+    matches = list(re.finditer(r"```json\s*\n(.*?)\n\s*```", raw, re.DOTALL))
+    if not matches:
+        return {}
+    last_match = matches[-1]
+    try:
+        data = json.loads(last_match.group(1))
+    except json.JSONDecodeError:
+        return {}
+    entries = data.get(field_name) if isinstance(data, dict) else None
+    if not isinstance(entries, dict):
+        return {}
+
+    # Markdown sections: one heading up to the next one
+    markdown = raw[: last_match.start()].rstrip()
+    headings = list(heading_re.finditer(markdown))
+    sections = {
+        h.group(1): markdown[h.end() : nxt.start() if nxt else len(markdown)].strip()
+        for h, nxt in zip(headings, headings[1:] + [None])
+    }
+
+    parsed = {}
+    for key in keys:
+        entry = entries.get(key)
+        if isinstance(entry, dict) and isinstance(entry.get("checks"), dict):
+            checks, risk_level = _checks_from_json(entry)
+            parsed[key] = (sections.get(key, markdown), checks, risk_level)
+    return parsed
+
+
+def parse_batch_scoring_response(
+    raw: str, scenario_ids: list[str]
+) -> dict[str, tuple[str, dict[str, CheckResult], str]]:
+    """Split a batched scoring response into {scenario_id: (markdown, checks, risk_level)}.
+
+    Scenarios the JSON does not score are left out — all of them if the JSON
+    block is missing or malformed — so the caller can score them on their own.
+    """
+    return _parse_keyed_scoring_response(raw, scenario_ids, "scenarios", _BATCH_HEADING_RE)
+
+
+def parse_comparative_scoring_response(
+    raw: str, skill_names: list[str]
+) -> dict[str, tuple[str, dict[str, CheckResult], str]]:
+    """Split a comparative scoring response into {skill: (markdown, checks, risk_level)}.
+
+    Skills the JSON does not score are left out, as in parse_batch_scoring_response.
+    """
+    return _parse_keyed_scoring_response(
+        raw, skill_names, "skills", _COMPARATIVE_HEADING_RE
+    )
+
+
+# Early-abort limits for streamed scoring responses
+SCORING_PROBE_CHARS = 4000  # the scoring sections must have started by now
+SCORING_MAX_CHARS = 60000  # no JSON block by now: the answer is running away
+
+_SCORING_SECTION_RE = re.compile(
+    r"^#+\s*(approach|complexities|risk assessment|verdict)", re.IGNORECASE | re.MULTILINE
+)
+
+
+def scoring_abort_reason(text: str) -> str | None:
+    """Why a partial scoring response can no longer yield the scoring JSON.
+
+    Used as StreamMonitor.abort_check: the model is answering the user prompt
+    itself instead of auditing (no scoring section after SCORING_PROBE_CHARS),
+    or has produced SCORING_MAX_CHARS without opening the ```json block.
+    """
+    if "```json" in text:
+        return None
+    if len(text) >= SCORING_MAX_CHARS:
+        return f"no scoring JSON after {len(text)} chars"
+    if len(text) >= SCORING_PROBE_CHARS and not _SCORING_SECTION_RE.search(text):
+        return f"no scoring sections in the first {len(text)} chars"
+    return None
 
 
 # --- Data Structures ---
@@ -611,6 +823,23 @@ class RunResult:
     duration_s: float
     cost_info: str
     error: str | None = None
+    cached: bool = False
+    error_kind: str | None = None
+    # One entry per failed attempt that was retried (see retries.Retrier.call)
+    retries: list[dict] = field(default_factory=list)
+    # Streaming only: time to first text token / from first token to the end
+    ttft_s: float | None = None
+    generation_s: float | None = None
+    # Token usage and USD cost of the call (None = not reported); a call
+    # shared by several cells (batched / comparative) is split evenly
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    cache_read_tokens: int | None = None  # served from the provider-side prompt cache
+    cache_write_tokens: int | None = None
+    cost_usd: float | None = None
+
+
+_RUN_RESULT_FIELDS = {f.name for f in fields(RunResult)}
 
 
 @dataclass
@@ -632,6 +861,16 @@ class ScoredRun:
     duration_s: float
     cost_info: str
     error: str | None = None
+    cached: bool = False
+    error_kind: str | None = None
+    retries: list[dict] = field(default_factory=list)
+    ttft_s: float | None = None
+    generation_s: float | None = None
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    cache_read_tokens: int | None = None
+    cache_write_tokens: int | None = None
+    cost_usd: float | None = None
 
 
 # --- Loading ---
@@ -731,82 +970,319 @@ def build_system_prompt(category: str) -> str:
     return _CATEGORY_SYSTEM_PROMPTS.get(category, SYSTEM_PROMPT)
 
 
+def build_prompts(
+    system_prompt: str,
+    skill_content: str | dict[str, str],
+    prompt: str,
+    prefix_cache: bool = False,
+) -> tuple[str, str]:
+    """(system_prompt, user_prompt) for one SKILL.md × scenario call.
+
+    By default the SKILL.md leads the user prompt. In the cache-aware layout
+    (prefix_cache=True) it is appended to the system prompt instead, so every
+    call for a skill starts with the same system + SKILL.md prefix, which the
+    provider-side prompt cache can serve; the user prompt is just the scenario.
+    A {skill_name: content} dict sends several SKILL.md files, each under its
+    name (comparative scoring).
+    """
+    if isinstance(skill_content, dict):
+        skill_block = "# SKILL.md Files\n" + "".join(
+            f"""
+## Skill `{name}`
+
+```markdown
+{content}
+```
+"""
+            for name, content in skill_content.items()
+        )
+    else:
+        skill_block = f"""# SKILL.md Content
+
+```markdown
+{skill_content}
+```
+"""
+    user_prompt = f"""# User Prompt
+
+{prompt}
+"""
+    if prefix_cache:
+        return f"{system_prompt}\n\n{skill_block}", user_prompt
+    return system_prompt, f"{skill_block}\n{user_prompt}"
+
+
+class PrefixGate:
+    """Cache-aware mode: the first call for each (model, prompt prefix) goes first.
+
+    The provider only caches a prefix once a call carrying it has been
+    processed, so concurrent first calls for the same skill would all pay full
+    input price. Later calls for a prefix wait (without holding a concurrency
+    slot) until the first one has finished, then read the cached prefix.
+    """
+
+    def __init__(self):
+        self._done: dict[str, asyncio.Event] = {}
+
+    @asynccontextmanager
+    async def first(self, model: str, prefix: str) -> AsyncIterator[None]:
+        key = hashlib.sha256(f"{model}\0{prefix}".encode()).hexdigest()
+        done = self._done.get(key)
+        if done is not None:
+            await done.wait()
+            yield
+            return
+        self._done[key] = done = asyncio.Event()
+        try:
+            yield
+        finally:
+            done.set()
+
+
+_COST_FIELD_RE = re.compile(r"(\w+)=(\d+(?:\.\d+)?)")
+
+# cost_info keys → RunResult / ScoredRun usage fields
+_USAGE_FIELDS = {
+    "input": "input_tokens",
+    "output": "output_tokens",
+    "cache_read": "cache_read_tokens",
+    "cache_write": "cache_write_tokens",
+}
+USAGE_FIELD_NAMES = (*_USAGE_FIELDS.values(), "cost_usd")
+
+
+def parse_cost_info(cost_info: str) -> dict[str, int | float]:
+    """Numbers from a cost_info string ("input=10, output=20, cost_usd=0.0012")."""
+    return {
+        key: float(value) if "." in value else int(value)
+        for key, value in _COST_FIELD_RE.findall(cost_info or "")
+    }
+
+
+def usage_fields(model: str, cost_info: str, share: int = 1) -> dict:
+    """Structured usage for a RunResult / ScoredRun, from a call's cost_info.
+
+    cost_usd is the cost the backend reported (the CLI's total_cost_usd),
+    else the list price of the reported tokens (limits.estimate_cost_usd).
+    share > 1 splits a call made for several cells evenly between them.
+    """
+    info = parse_cost_info(cost_info)
+    usage = {
+        name: int(info[key]) // share if key in info else None
+        for key, name in _USAGE_FIELDS.items()
+    }
+    cost = info.get("cost_usd")
+    if cost is None and "input" in info:
+        cost = estimate_cost_usd(
+            model, info["input"], info.get("output"), info.get("cache_read"), info.get("cache_write")
+        )
+    usage["cost_usd"] = None if cost is None else round(cost / share, 6)
+    return usage
+
+
+def _usage_totals(results: list) -> dict:
+    paid = [r for r in results if not r.cached]
+    totals = {"results": len(results), "cached": len(results) - len(paid)}
+    for name in USAGE_FIELD_NAMES[:-1]:
+        totals[name] = sum(getattr(r, name) or 0 for r in paid)
+    totals["cost_usd"] = round(sum(r.cost_usd or 0 for r in paid), 4)
+    return totals
+
+
+def summarize_usage(
+    results: list[RunResult] | list[ScoredRun],
+    skill_of: Callable[[RunResult | ScoredRun], str] | None = None,
+) -> dict:
+    """Token and USD totals for a run: overall, per model and per skill.
+
+    Cached results cost nothing this run: they are counted, not summed.
+    skill_of maps a result to its skill (default: its .skill attribute).
+    """
+    skill_of = skill_of or (lambda r: r.skill)
+    by_model: dict[str, list] = {}
+    by_skill: dict[str, list] = {}
+    for r in results:
+        by_model.setdefault(r.model, []).append(r)
+        by_skill.setdefault(skill_of(r), []).append(r)
+    return {
+        "total": _usage_totals(results),
+        "by_model": {m: _usage_totals(rs) for m, rs in sorted(by_model.items())},
+        "by_skill": {sk: _usage_totals(rs) for sk, rs in sorted(by_skill.items())},
+    }
+
+
+def format_usage(usage: dict) -> str:
+    """One line per scope: tokens and USD of a summarize_usage() result."""
+
+    def line(label: str, t: dict) -> str:
+        cached = f", {t['cached']} cached" if t["cached"] else ""
+        return (
+            f"{label}: ${t['cost_usd']:.2f} — {t['input_tokens']:,} in, "
+            f"{t['output_tokens']:,} out, {t['cache_read_tokens']:,} cache read, "
+            f"{t['cache_write_tokens']:,} cache write ({t['results']} results{cached})"
+        )
+
+    lines = [line("Usage", usage["total"])]
+    lines += [line(f"  {m}", t) for m, t in usage["by_model"].items()]
+    return "\n".join(lines)
+
+
+def _concurrency_slot(
+    semaphore: asyncio.Semaphore | AdaptiveLimiter, model: str, tokens: int = 0
+) -> AsyncContextManager:
+    """Per-model slot for an AdaptiveLimiter, the semaphore itself otherwise."""
+    if isinstance(semaphore, AdaptiveLimiter):
+        return semaphore.slot(model, tokens)
+    return semaphore
+
+
 async def run_claude(
     model: str,
     system_prompt: str,
     user_prompt: str,
-    semaphore: asyncio.Semaphore,
+    semaphore: asyncio.Semaphore | AdaptiveLimiter,
+    pool: WarmProcessPool | None = None,
+    timeout_s: float | None = None,
+    stream: StreamMonitor | None = None,
+    backend: Backend | None = None,
 ) -> tuple[str, float, str]:
-    """Run claude -p and return (response, duration_s, cost_info)."""
-    async with semaphore:
-        cmd = [
-            "claude",
-            "-p",
-            "--model",
-            model,
-            "--system-prompt",
-            system_prompt,
-            "--output-format",
-            "json",
-            "--no-session-persistence",
-        ]
+    """Run one model call and return (response, duration_s, cost_info).
+
+    `backend` executes the call — by default `claude -p` (CliBackend), taking
+    processes from `pool` when given; see backends.py for the API backend.
 
+    `semaphore` is either a plain asyncio.Semaphore or an AdaptiveLimiter, in
+    which case the call holds a per-model slot and its outcome feeds the limit.
+    If the limiter carries a RateLimiter, the estimated prompt + response tokens
+    are reserved against the model's budget and settled with the real usage.
+
+    After timeout_s the call is stopped and a TIMEOUT ClaudeError is raised.
+    With a StreamMonitor the response is streamed: time-to-first-token and
+    generation time are recorded on the monitor, partial progress is reported
+    and the call can be aborted early (see StreamMonitor).
+    """
+    if backend is None:
+        backend = CliBackend(pool)
+    estimated = estimate_tokens(system_prompt + user_prompt) + DEFAULT_OUTPUT_TOKENS
+    async with _concurrency_slot(semaphore, model, estimated) as permit:
         start = time.monotonic()
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env={**os.environ, "CLAUDECODE": ""},  # unset to avoid nesting error
+        completion = await backend.complete(
+            model, system_prompt, user_prompt, timeout_s=timeout_s, stream=stream
         )
-        stdout, stderr = await proc.communicate(user_prompt.encode())
         duration = time.monotonic() - start
+        if permit is not None and completion.usage_tokens is not None:
+            permit.settle(completion.usage_tokens)
+        return completion.response, duration, completion.cost_info
 
-        if proc.returncode != 0:
-            raise RuntimeError(
-                f"claude -p exited with {proc.returncode}: {stderr.decode()[:500]}"
-            )
-
-        raw = stdout.decode()
-        try:
-            data = json.loads(raw)
-            response = data.get("result", raw)
-            cost_info = f"input={data.get('input_tokens', '?')}, output={data.get('output_tokens', '?')}"
-        except json.JSONDecodeError:
-            response = raw
-            cost_info = "unknown (non-JSON output)"
 
+async def _run_claude_cached(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    semaphore: asyncio.Semaphore | AdaptiveLimiter,
+    pool: WarmProcessPool | None,
+    cache: ResponseCache | None,
+    is_complete: Callable[[str], bool] | None = None,
+    retrier: Retrier | None = None,
+    timeout_s: float | None = None,
+    stream: StreamMonitor | None = None,
+    backend: Backend | None = None,
+    prefix_gate: PrefixGate | None = None,
+) -> tuple[str, float, str, bool, list[dict]]:
+    """run_claude behind the response cache and retrier.
+
+    Returns (response, duration_s, cost_info, cached, retries). Hits skip the
+    semaphore entirely; cache files are read and written on a worker thread. Responses rejected by `is_complete` (e.g. scoring output
+    without a JSON block) are never stored; with a retrier they count as a
+    truncated-output failure and are retried. Misses wait on `prefix_gate`
+    until the first call with the same system prompt has finished.
+    """
+    key = ""
+    if cache is not None:
+        key = cache.key(model, system_prompt, user_prompt)
+        entry = await asyncio.to_thread(cache.get, key)
+        if entry is not None:
+            return entry["response"], entry["duration_s"], entry["cost_info"], True, []
+
+    async def attempt() -> tuple[str, float, str]:
+        response, duration, cost_info = await run_claude(
+            model=model,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            semaphore=semaphore,
+            pool=pool,
+            timeout_s=timeout_s,
+            stream=stream,
+            backend=backend,
+        )
+        if retrier is not None and is_complete is not None and not is_complete(response):
+            raise ClaudeError("response has no scoring JSON block", TRUNCATED)
         return response, duration, cost_info
 
+    async def call() -> tuple[tuple[str, float, str], list[dict]]:
+        if retrier is None:
+            return await attempt(), []
+        return await retrier.call(attempt)
+
+    if prefix_gate is None:
+        (response, duration, cost_info), retries = await call()
+    else:
+        async with prefix_gate.first(model, system_prompt):
+            (response, duration, cost_info), retries = await call()
+
+    if cache is not None and (is_complete is None or is_complete(response)):
+        await asyncio.to_thread(
+            cache.put,
+            key,
+            {"response": response, "duration_s": duration, "cost_info": cost_info},
+        )
+    return response, duration, cost_info, False, retries
+
+
+def _round_timing(value: float | None) -> float | None:
+    return None if value is None else round(value, 2)
+
 
 async def run_scenario(
     scenario: Scenario,
     model: str,
     manifest: dict,
-    semaphore: asyncio.Semaphore,
+    semaphore: asyncio.Semaphore | AdaptiveLimiter,
     on_complete: Callable[[str, str, bool], None] | None = None,
+    pool: WarmProcessPool | None = None,
+    cache: ResponseCache | None = None,
+    retrier: Retrier | None = None,
+    timeout_s: float | None = DEFAULT_TASK_TIMEOUT_S,
+    stream: bool = False,
+    backend: Backend | None = None,
+    prefix_gate: PrefixGate | None = None,
 ) -> RunResult:
-    """Run a single scenario on a single model. Optional callback on_complete(scenario_id, model, success)."""
-    skill_content = read_skill(manifest, scenario.target_skill)
-
-    user_prompt = f"""# SKILL.md Content
+    """Run a single scenario on a single model. Optional callback on_complete(scenario_id, model, success).
 
-```markdown
-{skill_content}
-```
-
-# User Prompt
-
-{scenario.prompt}
-"""
+    With a prefix_gate the cache-aware prompt layout is used (see build_prompts).
+    """
+    monitor = StreamMonitor() if stream else None
+    skill_content = read_skill(manifest, scenario.target_skill)
 
     try:
-        system_prompt = build_system_prompt(scenario.category)
-        response, duration, cost_info = await run_claude(
-            model=model,
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            semaphore=semaphore,
+        system_prompt, user_prompt = build_prompts(
+            build_system_prompt(scenario.category),
+            skill_content,
+            scenario.prompt,
+            prefix_cache=prefix_gate is not None,
+        )
+        response, duration, cost_info, cached, retries = await _run_claude_cached(
+            model,
+            system_prompt,
+            user_prompt,
+            semaphore,
+            pool,
+            cache,
+            retrier=retrier,
+            timeout_s=timeout_s,
+            stream=monitor,
+            backend=backend,
+            prefix_gate=prefix_gate,
         )
         result = RunResult(
             scenario_id=scenario.id,
@@ -814,6 +1290,11 @@ async def run_scenario(
             response=response,
             duration_s=round(duration, 1),
             cost_info=cost_info,
+            cached=cached,
+            retries=retries,
+            ttft_s=_round_timing(monitor and monitor.ttft_s),
+            generation_s=_round_timing(monitor and monitor.generation_s),
+            **usage_fields(model, cost_info),
         )
         if on_complete:
             on_complete(scenario.id, model, True)
@@ -826,6 +1307,8 @@ async def run_scenario(
             duration_s=0,
             cost_info="",
             error=str(e),
+            error_kind=classify_error(e),
+            retries=getattr(e, "retries", []),
         )
         if on_complete:
             on_complete(scenario.id, model, False)
@@ -848,6 +1331,12 @@ def generate_markdown_report(
         f"Scenarios: {len(scenarios)}",
         "",
     ]
+    skills = {s.id: s.target_skill for s in scenarios}
+    usage = summarize_usage(
+        [r for r in results if r.model != "bp-linter"],
+        skill_of=lambda r: skills.get(r.scenario_id, ""),
+    )
+    lines[-1:-1] = [f"- {line.strip()}" for line in format_usage(usage).splitlines()]
 
     # Build lookup: (scenario_id, model) -> RunResult
     lookup = {(r.scenario_id, r.model): r for r in results}
@@ -876,7 +1365,11 @@ def generate_markdown_report(
                 lines.append(f"```\n{result.error}\n```\n")
                 continue
 
-            lines.append(f"### {model} ({result.duration_s}s, {result.cost_info})")
+            cached = ", cached" if result.cached else ""
+            retried = f", {len(result.retries)} retries" if result.retries else ""
+            lines.append(
+                f"### {model} ({result.duration_s}s, {result.cost_info}{cached}{retried})"
+            )
             lines.append("")
             lines.append(result.response)
             lines.append("")
@@ -891,10 +1384,15 @@ def generate_json_report(
 ) -> dict:
     """Generate a structured JSON report."""
     lookup = {(r.scenario_id, r.model): r for r in results}
+    skills = {s.id: s.target_skill for s in scenarios}
     return {
         "generated": datetime.now().isoformat(),
         "models": models,
         "scenario_count": len(scenarios),
+        "usage": summarize_usage(
+            [r for r in results if r.model != "bp-linter"],
+            skill_of=lambda r: skills.get(r.scenario_id, ""),
+        ),
         "results": [
             {
                 "scenario_id": s.id,
@@ -908,6 +1406,15 @@ def generate_json_report(
                         "duration_s": r.duration_s if r else None,
                         "cost_info": r.cost_info if r else None,
                         "error": r.error if r else None,
+                        "cached": r.cached if r else None,
+                        "error_kind": r.error_kind if r else None,
+                        "retries": r.retries if r else None,
+                        "ttft_s": r.ttft_s if r else None,
+                        "generation_s": r.generation_s if r else None,
+                        **{
+                            name: getattr(r, name) if r else None
+                            for name in USAGE_FIELD_NAMES
+                        },
                     }
                     for m in models
                     for r in [lookup.get((s.id, m))]
@@ -942,16 +1449,32 @@ def save_reports(
 
 # --- Domain-based scenario loading ---
 
+# path -> (mtime_ns, size, parsed YAML); heatmap requests re-load every domain
+# file, and parsing dominates their cost
+_yaml_memo: dict[str, tuple[int, int, dict]] = {}
+
+
+def _load_yaml_memo(path: Path) -> dict:
+    """yaml.safe_load a file, memoized on mtime + size. Don't mutate the result."""
+    stat = path.stat()
+    key = str(path.resolve())
+    memo = _yaml_memo.get(key)
+    if memo is not None and memo[:2] == (stat.st_mtime_ns, stat.st_size):
+        return memo[2]
+    with open(path) as f:
+        data = yaml.safe_load(f)
+    _yaml_memo[key] = (stat.st_mtime_ns, stat.st_size, data)
+    return data
+
 
 def load_domain_scenarios() -> dict[str, list[Scenario]]:
     """Load ONLY domain-based YAMLs (those with a 'domain' field).
 
-    Returns {domain: [scenarios]}.
+    Returns {domain: [scenarios]}. Unchanged files are not re-parsed.
     """
     result: dict[str, list[Scenario]] = {}
     for yaml_file in sorted(SCENARIOS_DIR.glob("*.yaml")):
-        with open(yaml_file) as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml_memo(yaml_file)
 
         domain = data.get("domain")
         if not domain:
@@ -1005,52 +1528,92 @@ def get_target_skills(scenario: Scenario, manifest: dict) -> list[str]:
     return skills
 
 
+def iter_scored_tasks(
+    domain_scenarios: dict[str, list[Scenario]], manifest: dict, models: list[str]
+) -> Iterator[tuple[Scenario, str, str]]:
+    """Yield the (scenario, skill, model) cells of a scored run in plan order.
+
+    Lazy: cells are produced as they are consumed, so a run can be fed to a
+    bounded worker pool (see pipeline.py) or counted without holding the
+    whole cross-product.
+    """
+    for scenarios in domain_scenarios.values():
+        for scenario in scenarios:
+            for skill_name in get_target_skills(scenario, manifest):
+                for model in models:
+                    yield scenario, skill_name, model
+
+
 # --- Scored execution ---
 
 
+def _mark_dev_excluded(scenario: Scenario, checks: dict[str, CheckResult]) -> None:
+    """Mark dev-excluded checks as "na" for dev domains."""
+    if scenario.domain in DEV_DOMAINS:
+        for cid in DEV_EXCLUDED_CHECKS:
+            if cid in checks:
+                checks[cid] = CheckResult(
+                    check_id=cid,
+                    result="na",
+                    evidence="Not applicable for dev skills",
+                )
+
+
 async def run_scored_scenario(
     scenario: Scenario,
     skill_name: str,
     model: str,
     manifest: dict,
-    semaphore: asyncio.Semaphore,
+    semaphore: asyncio.Semaphore | AdaptiveLimiter,
+    pool: WarmProcessPool | None = None,
+    cache: ResponseCache | None = None,
+    retrier: Retrier | None = None,
+    timeout_s: float | None = DEFAULT_TASK_TIMEOUT_S,
+    stream: bool = False,
+    on_progress: Callable[[StreamMonitor], None] | None = None,
+    backend: Backend | None = None,
+    prefix_gate: PrefixGate | None = None,
 ) -> ScoredRun:
     """Run a scenario with scoring system prompt against a specific skill.
 
+    With stream=True the response is streamed: on_progress gets the
+    StreamMonitor while text arrives, and the call is aborted early once
+    scoring_abort_reason() says the scoring JSON cannot follow. `backend`
+    defaults to the claude CLI (see run_claude). With a prefix_gate the
+    cache-aware prompt layout is used (see build_prompts).
+
     Returns ScoredRun with per-check results.
     """
+    monitor = None
+    if stream:
+        monitor = StreamMonitor(on_progress=on_progress, abort_check=scoring_abort_reason)
     try:
         skill_content = read_skill(manifest, skill_name)
+        system_prompt, user_prompt = build_prompts(
+            SCORING_SYSTEM_PROMPT,
+            skill_content,
+            scenario.prompt,
+            prefix_cache=prefix_gate is not None,
+        )
 
-        user_prompt = f"""# SKILL.md Content
-
-```markdown
-{skill_content}
-```
-
-# User Prompt
-
-{scenario.prompt}
-"""
-
-        response, duration, cost_info = await run_claude(
-            model=model,
-            system_prompt=SCORING_SYSTEM_PROMPT,
-            user_prompt=user_prompt,
-            semaphore=semaphore,
+        response, duration, cost_info, cached, retries = await _run_claude_cached(
+            model,
+            system_prompt,
+            user_prompt,
+            semaphore,
+            pool,
+            cache,
+            is_complete=lambda r: "```json" in r,
+            retrier=retrier,
+            timeout_s=timeout_s,
+            stream=monitor,
+            backend=backend,
+            prefix_gate=prefix_gate,
         )
 
         markdown, checks_dict, risk_level = parse_scoring_response(response)
 
-        # Mark dev-excluded checks as "na" for dev domains
-        if scenario.domain in DEV_DOMAINS:
-            for cid in DEV_EXCLUDED_CHECKS:
-                if cid in checks_dict:
-                    checks_dict[cid] = CheckResult(
-                        check_id=cid,
-                        result="na",
-                        evidence="Not applicable for dev skills",
-                    )
+        _mark_dev_excluded(scenario, checks_dict)
 
         return ScoredRun(
             scenario_id=scenario.id,
@@ -1061,30 +1624,543 @@ async def run_scored_scenario(
             markdown_response=markdown,
             duration_s=round(duration, 1),
             cost_info=cost_info,
+            cached=cached,
+            retries=retries,
+            ttft_s=_round_timing(monitor and monitor.ttft_s),
+            generation_s=_round_timing(monitor and monitor.generation_s),
+            **usage_fields(model, cost_info),
         )
 
     except Exception as e:
-        # On error, return ScoredRun with all checks unclear
-        checks = [
-            CheckResult(check_id=cid, result="unclear", evidence=f"Error: {e}")
-            for cid in LLM_CHECK_IDS
+        return _failed_scored_run(scenario.id, skill_name, model, e, getattr(e, "retries", []))
+
+
+def _failed_scored_run(
+    scenario_id: str, skill_name: str, model: str, error: Exception, retries: list[dict]
+) -> ScoredRun:
+    """The ScoredRun of a failed call: every check unclear, the error recorded."""
+    checks = [
+        CheckResult(check_id=cid, result="unclear", evidence=f"Error: {error}")
+        for cid in LLM_CHECK_IDS
+    ]
+    return ScoredRun(
+        scenario_id=scenario_id,
+        skill=skill_name,
+        model=model,
+        checks=checks,
+        risk_level="UNKNOWN",
+        markdown_response="",
+        duration_s=0,
+        cost_info="",
+        error=str(error),
+        error_kind=classify_error(error),
+        retries=retries,
+    )
+
+
+# A batched call failing with these would fail the same way split into single calls
+_FINAL_BATCH_ERROR_KINDS = FATAL_KINDS | {TIMEOUT}
+
+
+def batch_scored_tasks(
+    tasks: list[tuple[Scenario, str, str]], batch_size: int
+) -> list[tuple[list[Scenario], str, str]]:
+    """Group (scenario, skill, model) cells into batches for run_scored_batch.
+
+    A batch holds up to batch_size scenarios sharing skill and model; groups
+    keep the order in which their first cell appears.
+    """
+    groups: dict[tuple[str, str], list[Scenario]] = {}
+    for scenario, skill_name, model in tasks:
+        groups.setdefault((skill_name, model), []).append(scenario)
+    return [
+        (scenarios[i : i + batch_size], skill_name, model)
+        for (skill_name, model), scenarios in groups.items()
+        for i in range(0, len(scenarios), max(1, batch_size))
+    ]
+
+
+async def run_scored_batch(
+    scenarios: list[Scenario],
+    skill_name: str,
+    model: str,
+    manifest: dict,
+    semaphore: asyncio.Semaphore | AdaptiveLimiter,
+    pool: WarmProcessPool | None = None,
+    cache: ResponseCache | None = None,
+    retrier: Retrier | None = None,
+    timeout_s: float | None = DEFAULT_TASK_TIMEOUT_S,
+    stream: bool = False,
+    on_progress: Callable[[StreamMonitor], None] | None = None,
+    backend: Backend | None = None,
+    prefix_gate: PrefixGate | None = None,
+) -> list[ScoredRun]:
+    """Score several scenarios against one skill in a single call.
+
+    The SKILL.md is sent once with every scenario prompt and the answer holds
+    one JSON object keyed by scenario ID, split into a ScoredRun per scenario
+    (in input order). The call's duration and cache reads are shared evenly
+    and cost_info is tagged with batch=K; timeout_s applies per scenario.
+    Scenarios the batch answer does not score — all of them if the call fails
+    or its JSON is malformed — fall back to run_scored_scenario, one call each.
+    A timeout or an auth / config error fails the whole batch instead: single
+    calls would only repeat it, each with its own retries. The call's retries
+    are recorded on its first cell, so they are counted once.
+    """
+    options = dict(
+        pool=pool,
+        cache=cache,
+        retrier=retrier,
+        timeout_s=timeout_s,
+        stream=stream,
+        on_progress=on_progress,
+        backend=backend,
+        prefix_gate=prefix_gate,
+    )
+    if len(scenarios) == 1:
+        return [
+            await run_scored_scenario(
+                scenarios[0], skill_name, model, manifest, semaphore, **options
+            )
         ]
-        return ScoredRun(
+
+    k = len(scenarios)
+    ids = [s.id for s in scenarios]
+    monitor = StreamMonitor(on_progress=on_progress) if stream else None
+    runs: dict[str, ScoredRun] = {}
+    try:
+        skill_content = read_skill(manifest, skill_name)
+        prompts = "\n".join(f"## Scenario `{s.id}`\n\n{s.prompt}\n" for s in scenarios)
+        system_prompt, user_prompt = build_prompts(
+            BATCH_SCORING_SYSTEM_PROMPT,
+            skill_content,
+            prompts,
+            prefix_cache=prefix_gate is not None,
+        )
+        response, duration, cost_info, cached, retries = await _run_claude_cached(
+            model,
+            system_prompt,
+            user_prompt,
+            semaphore,
+            pool,
+            cache,
+            is_complete=lambda r: "```json" in r,
+            retrier=retrier,
+            timeout_s=timeout_s * k if timeout_s else None,
+            stream=monitor,
+            backend=backend,
+            prefix_gate=prefix_gate,
+        )
+        parsed = parse_batch_scoring_response(response, ids)
+        cause = "not scored by the batch answer"
+    except (ClaudeError, OSError, ValueError) as e:
+        kind = classify_error(e)
+        if kind in _FINAL_BATCH_ERROR_KINDS:
+            retries = getattr(e, "retries", [])
+            return [
+                _failed_scored_run(s.id, skill_name, model, e, retries if i == 0 else [])
+                for i, s in enumerate(scenarios)
+            ]
+        parsed = {}
+        cause = f"batch call failed ({kind}): {e}"
+
+    for scenario in scenarios:
+        if scenario.id not in parsed:
+            continue
+        markdown, checks_dict, risk_level = parsed[scenario.id]
+        _mark_dev_excluded(scenario, checks_dict)
+        runs[scenario.id] = ScoredRun(
             scenario_id=scenario.id,
             skill=skill_name,
             model=model,
-            checks=checks,
-            risk_level="UNKNOWN",
-            markdown_response="",
-            duration_s=0,
-            cost_info="",
-            error=str(e),
+            checks=list(checks_dict.values()),
+            risk_level=risk_level,
+            markdown_response=markdown,
+            duration_s=round(duration / k, 1),
+            cost_info=f"{cost_info}, batch={k}",
+            cached=cached,
+            retries=[] if runs else retries,  # the call's retries, counted once
+            ttft_s=_round_timing(monitor and monitor.ttft_s),
+            generation_s=_round_timing(monitor and monitor.generation_s),
+            **usage_fields(model, cost_info, share=k),
+        )
+
+    missing = [s for s in scenarios if s.id not in runs]
+    if missing:
+        logger.warning(
+            "Scoring %d of %d %s/%s cells one call each: %s",
+            len(missing),
+            k,
+            skill_name,
+            model,
+            cause,
+        )
+    fallback = await asyncio.gather(
+        *(
+            run_scored_scenario(s, skill_name, model, manifest, semaphore, **options)
+            for s in missing
+        )
+    )
+    runs.update((run.scenario_id, run) for run in fallback)
+    return [runs[s.id] for s in scenarios]
+
+
+def comparative_scored_tasks(
+    tasks: list[tuple[Scenario, str, str]],
+) -> list[tuple[Scenario, list[str], str]]:
+    """Group (scenario, skill, model) cells by scenario and model for run_scored_comparative.
+
+    Groups keep the order in which their first cell appears; skills keep task order.
+    """
+    groups: dict[tuple[str, str], tuple[Scenario, list[str]]] = {}
+    for scenario, skill_name, model in tasks:
+        groups.setdefault((scenario.id, model), (scenario, []))[1].append(skill_name)
+    return [(scenario, skills, model) for (_, model), (scenario, skills) in groups.items()]
+
+
+async def run_scored_comparative(
+    scenario: Scenario,
+    skill_names: list[str],
+    model: str,
+    manifest: dict,
+    semaphore: asyncio.Semaphore | AdaptiveLimiter,
+    pool: WarmProcessPool | None = None,
+    cache: ResponseCache | None = None,
+    retrier: Retrier | None = None,
+    timeout_s: float | None = DEFAULT_TASK_TIMEOUT_S,
+    stream: bool = False,
+    on_progress: Callable[[StreamMonitor], None] | None = None,
+    backend: Backend | None = None,
+    prefix_gate: PrefixGate | None = None,
+) -> list[ScoredRun]:
+    """Score one scenario against several skills in a single call.
+
+    Every SKILL.md is sent with the one prompt (typically the specialist /
+    apify-mcpc / apify-ultimate-scraper triple from get_target_skills) and the
+    answer holds one JSON object keyed by skill name, split into a ScoredRun
+    per skill (in input order) — the same cells separate calls would produce.
+    Duration and cache reads are shared evenly and cost_info is tagged with
+    compare=K; timeout_s applies per skill. Skills the answer does not score
+    fall back to run_scored_scenario, one call each; failures are handled as
+    in run_scored_batch.
+    """
+    options = dict(
+        pool=pool,
+        cache=cache,
+        retrier=retrier,
+        timeout_s=timeout_s,
+        stream=stream,
+        on_progress=on_progress,
+        backend=backend,
+        prefix_gate=prefix_gate,
+    )
+    if len(skill_names) == 1:
+        return [
+            await run_scored_scenario(
+                scenario, skill_names[0], model, manifest, semaphore, **options
+            )
+        ]
+
+    k = len(skill_names)
+    monitor = StreamMonitor(on_progress=on_progress) if stream else None
+    runs: dict[str, ScoredRun] = {}
+    try:
+        skills = {name: read_skill(manifest, name) for name in skill_names}
+        system_prompt, user_prompt = build_prompts(
+            COMPARATIVE_SCORING_SYSTEM_PROMPT,
+            skills,
+            scenario.prompt,
+            prefix_cache=prefix_gate is not None,
+        )
+        response, duration, cost_info, cached, retries = await _run_claude_cached(
+            model,
+            system_prompt,
+            user_prompt,
+            semaphore,
+            pool,
+            cache,
+            is_complete=lambda r: "```json" in r,
+            retrier=retrier,
+            timeout_s=timeout_s * k if timeout_s else None,
+            stream=monitor,
+            backend=backend,
+            prefix_gate=prefix_gate,
+        )
+        parsed = parse_comparative_scoring_response(response, skill_names)
+        cause = "not scored by the comparative answer"
+    except (ClaudeError, OSError, ValueError) as e:
+        kind = classify_error(e)
+        if kind in _FINAL_BATCH_ERROR_KINDS:
+            retries = getattr(e, "retries", [])
+            return [
+                _failed_scored_run(scenario.id, name, model, e, retries if i == 0 else [])
+                for i, name in enumerate(skill_names)
+            ]
+        parsed = {}
+        cause = f"comparative call failed ({kind}): {e}"
+
+    for skill_name in skill_names:
+        if skill_name not in parsed:
+            continue
+        markdown, checks_dict, risk_level = parsed[skill_name]
+        _mark_dev_excluded(scenario, checks_dict)
+        runs[skill_name] = ScoredRun(
+            scenario_id=scenario.id,
+            skill=skill_name,
+            model=model,
+            checks=list(checks_dict.values()),
+            risk_level=risk_level,
+            markdown_response=markdown,
+            duration_s=round(duration / k, 1),
+            cost_info=f"{cost_info}, compare={k}",
+            cached=cached,
+            retries=[] if runs else retries,  # the call's retries, counted once
+            ttft_s=_round_timing(monitor and monitor.ttft_s),
+            generation_s=_round_timing(monitor and monitor.generation_s),
+            **usage_fields(model, cost_info, share=k),
+        )
+
+    missing = [name for name in skill_names if name not in runs]
+    if missing:
+        logger.warning(
+            "Scoring %d of %d skills of %s/%s one call each: %s",
+            len(missing),
+            k,
+            scenario.id,
+            model,
+            cause,
+        )
+    fallback = await asyncio.gather(
+        *(
+            run_scored_scenario(scenario, name, model, manifest, semaphore, **options)
+            for name in missing
         )
+    )
+    runs.update((run.skill, run) for run in fallback)
+    return [runs[name] for name in skill_names]
+
+
+# --- Run snapshots ---
+
+
+@dataclass
+class FileSnapshot:
+    path: str
+    sha256: str | None  # None if the file was missing at snapshot time
+    size: int | None
+    git_revision: str | None  # last commit touching the file (None outside git)
+
+
+@dataclass
+class RunSnapshot:
+    run_id: str
+    created: str
+    checker_revision: str | None
+    scoring_prompt_sha256: str
+    skills: dict[str, FileSnapshot]  # skill name -> SKILL.md
+    scenario_files: dict[str, FileSnapshot]  # YAML file name -> file
+    prompts: dict[str, str] = field(default_factory=dict)  # scenario_id -> sha256
+
+
+# (path, mtime_ns, size) -> sha256; unchanged files are not re-read
+_hash_memo: dict[tuple[str, int, int], str] = {}
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def file_sha256(path: Path) -> tuple[str, int] | None:
+    """Return (sha256, size) of a file, memoized on mtime + size. None if missing."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if not path.is_file():
+        return None
+    memo_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    digest = _hash_memo.get(memo_key)
+    if digest is None:
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        _hash_memo[memo_key] = digest
+    return digest, stat.st_size
+
+
+def _git_root(directory: Path) -> Path | None:
+    """Nearest enclosing git work tree (a nested clone like skills/ wins)."""
+    for candidate in (directory, *directory.parents):
+        if (candidate / ".git").exists():
+            return candidate
+    return None
+
+
+def _git_revisions(paths: list[Path]) -> dict[Path, str | None]:
+    """Last commit that touched each path: one `git log` per repository.
+
+    Walks each repository's history once, newest first, and takes the first
+    commit that lists a path; uncommitted files and files outside a git
+    work tree get None.
+    """
+    revisions: dict[Path, str | None] = {path: None for path in paths}
+    pending_by_root: dict[Path, dict[str, Path]] = {}
+    for path in paths:
+        resolved = path.resolve()
+        root = _git_root(resolved.parent)
+        if root is not None:
+            pending_by_root.setdefault(root, {})[resolved.relative_to(root).as_posix()] = path
+    for root, pending in pending_by_root.items():
+        try:
+            proc = subprocess.run(
+                ["git", "-c", "core.quotePath=false", "log", "--format=%x00%H", "--name-only"]
+                + ["--", *pending],
+                cwd=root,
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        if proc.returncode != 0:
+            continue
+        for entry in proc.stdout.split("\0")[1:]:
+            revision, *names = entry.split("\n")
+            for name in names:
+                path = pending.pop(name, None)
+                if path is not None:
+                    revisions[path] = revision
+            if not pending:
+                break
+    return revisions
+
+
+def create_run_snapshot(
+    run_id: str,
+    manifest: dict,
+    skill_names: list[str],
+    scenario_files: list[str],
+    scenarios: list[Scenario] | None = None,
+) -> RunSnapshot:
+    """Record content hash, size and git revision of every input file of a run.
+
+    scenario_files are YAML names relative to SCENARIOS_DIR. Passing the
+    scenarios also records a per-prompt hash, so one edited prompt does not
+    mark its whole YAML file stale. Blocks on git: call it off the event loop.
+    """
+    # (key, path, label) of every input file
+    skill_paths = {name: manifest.get(name, {}).get("path", "") for name in skill_names}
+    skill_files = [(name, Path(path), path) for name, path in skill_paths.items()]
+    yaml_files = [
+        (name, SCENARIOS_DIR / name, f"{SCENARIOS_DIR.name}/{name}") for name in scenario_files
+    ]
+    hashes = {path: file_sha256(path) for _, path, _ in skill_files + yaml_files}
+    checker = Path(__file__)
+    revisions = _git_revisions([checker] + [path for path, hashed in hashes.items() if hashed])
+
+    def snapshot_file(path: Path, label: str) -> FileSnapshot:
+        hashed = hashes[path]
+        return FileSnapshot(
+            path=label,
+            sha256=hashed[0] if hashed else None,
+            size=hashed[1] if hashed else None,
+            git_revision=revisions.get(path) if hashed else None,
+        )
+
+    return RunSnapshot(
+        run_id=run_id,
+        created=datetime.now().isoformat(),
+        checker_revision=revisions[checker],
+        scoring_prompt_sha256=sha256_text(SCORING_SYSTEM_PROMPT),
+        skills={name: snapshot_file(path, label) for name, path, label in skill_files},
+        scenario_files={name: snapshot_file(path, label) for name, path, label in yaml_files},
+        prompts={s.id: sha256_text(s.prompt) for s in scenarios or []},
+    )
+
+
+def snapshot_to_metadata(snapshot: RunSnapshot) -> dict:
+    """Serialize a snapshot for the report's "snapshot" metadata key."""
+    return asdict(snapshot)
+
+
+def snapshot_from_metadata(metadata: dict) -> RunSnapshot | None:
+    """Inverse of snapshot_to_metadata; None for reports without a snapshot."""
+    data = metadata.get("snapshot")
+    if not data:
+        return None
+    return RunSnapshot(
+        run_id=data["run_id"],
+        created=data["created"],
+        checker_revision=data.get("checker_revision"),
+        scoring_prompt_sha256=data.get("scoring_prompt_sha256", ""),
+        skills={k: FileSnapshot(**v) for k, v in data.get("skills", {}).items()},
+        scenario_files={
+            k: FileSnapshot(**v) for k, v in data.get("scenario_files", {}).items()
+        },
+        prompts=data.get("prompts", {}),
+    )
 
 
 # --- Scored report save/load ---
 
 
+def scored_run_to_dict(r: ScoredRun) -> dict:
+    """One result as stored in scored reports and run journals."""
+    return {
+        "scenario_id": r.scenario_id,
+        "skill": r.skill,
+        "model": r.model,
+        "risk_level": r.risk_level,
+        "duration_s": r.duration_s,
+        "cost_info": r.cost_info,
+        "error": r.error,
+        "error_kind": r.error_kind,
+        "retries": r.retries,
+        "cached": r.cached,
+        "ttft_s": r.ttft_s,
+        "generation_s": r.generation_s,
+        **{name: getattr(r, name) for name in USAGE_FIELD_NAMES},
+        "markdown_response": r.markdown_response,
+        "checks": [
+            {
+                "check_id": c.check_id,
+                "result": c.result,
+                "evidence": c.evidence,
+                "summary": c.summary,
+            }
+            for c in r.checks
+        ],
+    }
+
+
+def scored_run_from_dict(r: dict) -> ScoredRun:
+    """Inverse of scored_run_to_dict; tolerates reports from older versions."""
+    checks = [
+        CheckResult(
+            check_id=c["check_id"],
+            result=c["result"],
+            evidence=c["evidence"],
+            summary=c.get("summary", ""),
+        )
+        for c in r.get("checks", [])
+    ]
+    return ScoredRun(
+        scenario_id=r["scenario_id"],
+        skill=r["skill"],
+        model=r["model"],
+        checks=checks,
+        risk_level=r["risk_level"],
+        markdown_response=r.get("markdown_response", ""),
+        duration_s=r["duration_s"],
+        cost_info=r["cost_info"],
+        error=r.get("error"),
+        cached=r.get("cached", False),
+        error_kind=r.get("error_kind"),
+        retries=r.get("retries", []),
+        ttft_s=r.get("ttft_s"),
+        generation_s=r.get("generation_s"),
+        **{name: r.get(name) for name in USAGE_FIELD_NAMES},
+    )
+
+
 def save_scored_report(results: list[ScoredRun], metadata: dict) -> Path:
     """Save scored run results to reports/scored_{timestamp}.json."""
     REPORTS_DIR.mkdir(exist_ok=True)
@@ -1095,62 +2171,49 @@ def save_scored_report(results: list[ScoredRun], metadata: dict) -> Path:
         "type": "scored",
         "generated": datetime.now().isoformat(),
         **metadata,
-        "results": [
-            {
-                "scenario_id": r.scenario_id,
-                "skill": r.skill,
-                "model": r.model,
-                "risk_level": r.risk_level,
-                "duration_s": r.duration_s,
-                "cost_info": r.cost_info,
-                "error": r.error,
-                "markdown_response": r.markdown_response,
-                "checks": [
-                    {
-                        "check_id": c.check_id,
-                        "result": c.result,
-                        "evidence": c.evidence,
-                        "summary": c.summary,
-                    }
-                    for c in r.checks
-                ],
-            }
-            for r in results
-        ],
+        "usage": summarize_usage(results),
+        "results": [scored_run_to_dict(r) for r in results],
     }
 
     path.write_text(json.dumps(data, indent=2, ensure_ascii=False))
     return path
 
 
+def _latest_per_cell(runs: list[ScoredRun]) -> list[ScoredRun]:
+    """The last result of each (scenario_id, skill, model), in first-run order."""
+    latest: dict[tuple[str, str, str], ScoredRun] = {}
+    for run in runs:
+        latest[(run.scenario_id, run.skill, run.model)] = run
+    return list(latest.values())
+
+
+def _load_scored_journal(path: Path) -> tuple[dict, list[ScoredRun]]:
+    plan, records = read_journal(path)
+    if plan.get("mode") != "scored":
+        raise ValueError(f"{path.name} is not the journal of a scored run")
+    runs = _latest_per_cell([scored_run_from_dict(r) for r in records])
+    metadata = {
+        "type": "scored",
+        "generated": plan.get("created"),
+        "run_id": plan["run_id"],
+        **plan.get("metadata", {}),
+        "result_count": len(runs),
+        "unfinished": True,
+    }
+    return metadata, runs
+
+
 def load_scored_report(path: Path) -> tuple[dict, list[ScoredRun]]:
-    """Load a scored report from JSON. Returns (metadata, runs)."""
-    data = json.loads(path.read_text())
-    runs = []
-    for r in data.get("results", []):
-        checks = [
-            CheckResult(
-                check_id=c["check_id"],
-                result=c["result"],
-                evidence=c["evidence"],
-                summary=c.get("summary", ""),
-            )
-            for c in r.get("checks", [])
-        ]
-        runs.append(
-            ScoredRun(
-                scenario_id=r["scenario_id"],
-                skill=r["skill"],
-                model=r["model"],
-                checks=checks,
-                risk_level=r["risk_level"],
-                markdown_response=r.get("markdown_response", ""),
-                duration_s=r["duration_s"],
-                cost_info=r["cost_info"],
-                error=r.get("error"),
-            )
-        )
+    """Load a scored report, from JSON or from a run's JSONL journal.
 
+    Returns (metadata, runs). A journal yields the latest result per cell and
+    metadata marked "unfinished". Raises ValueError for a journal of a
+    standard run.
+    """
+    if path.suffix == ".jsonl":
+        return _load_scored_journal(path)
+    data = json.loads(path.read_text())
+    runs = [scored_run_from_dict(r) for r in data.get("results", [])]
     metadata = {k: v for k, v in data.items() if k != "results"}
     return metadata, runs
 
@@ -1170,10 +2233,12 @@ def save_scored_report_incremental(
     results: list[ScoredRun],
     metadata: dict,
 ) -> Path:
-    """Overwrite the run's report file with current results (atomic).
+    """Overwrite the run's report file with the given results (atomic).
 
     Writes to reports/scored_run_{run_id}.json using a tmp file + os.rename()
-    to prevent partial reads if the process is interrupted mid-write.
+    to prevent partial reads if the process is interrupted mid-write. This
+    rewrites the whole file: call it once per run (see compact_scored_run),
+    not per result.
     """
     REPORTS_DIR.mkdir(exist_ok=True)
     path = REPORTS_DIR / f"scored_run_{run_id}.json"
@@ -1185,28 +2250,8 @@ def save_scored_report_incremental(
         "run_id": run_id,
         **metadata,
         "result_count": len(results),
-        "results": [
-            {
-                "scenario_id": r.scenario_id,
-                "skill": r.skill,
-                "model": r.model,
-                "risk_level": r.risk_level,
-                "duration_s": r.duration_s,
-                "cost_info": r.cost_info,
-                "error": r.error,
-                "markdown_response": r.markdown_response,
-                "checks": [
-                    {
-                        "check_id": c.check_id,
-                        "result": c.result,
-                        "evidence": c.evidence,
-                        "summary": c.summary,
-                    }
-                    for c in r.checks
-                ],
-            }
-            for r in results
-        ],
+        "usage": summarize_usage(results),
+        "results": [scored_run_to_dict(r) for r in results],
     }
 
     tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False))
@@ -1214,18 +2259,74 @@ def save_scored_report_incremental(
     return path
 
 
+def compact_scored_run(run_id: str, metadata: dict | None = None) -> Path:
+    """Write a run's journal out as reports/scored_run_{run_id}.json.
+
+    While a run goes, its journal is the append-only results log (one record
+    per result); this is the run's one whole-file write. Keeps the latest
+    result per cell; `metadata` is added to the journaled metadata.
+    """
+    plan, records = read_journal(journal_path(run_id))
+    runs = _latest_per_cell([scored_run_from_dict(r) for r in records])
+    return save_scored_report_incremental(
+        run_id, runs, {**plan.get("metadata", {}), **(metadata or {})}
+    )
+
+
+def _report_run_id(metadata: dict) -> str | None:
+    return metadata.get("run_id") or (metadata.get("snapshot") or {}).get("run_id")
+
+
 def load_all_scored_reports() -> list[tuple[dict, list[ScoredRun]]]:
-    """Load ALL scored_*.json reports, newest first."""
+    """Load ALL scored reports, newest first.
+
+    Scored runs that still have a journal (running, interrupted or crashed)
+    are read from the journal, which holds every result so far; their
+    scored_*.json report, if one was written, is skipped. Reports and
+    journals are ordered together by recency, as in the results store: a
+    report by its `generated` time (file mtime if it has none), a journal by
+    its last write. So a stale journal does not hide a newer finished run.
+    """
     if not REPORTS_DIR.exists():
         return []
-    scored_files = sorted(REPORTS_DIR.glob("scored_*.json"), reverse=True)
-    results = []
-    for f in scored_files:
+    dated = []
+    journaled = set()
+    for f in (REPORTS_DIR / "journals").glob("*.jsonl"):
+        try:
+            metadata, runs = load_scored_report(f)
+            written = datetime.fromtimestamp(f.stat().st_mtime).isoformat()
+        except (OSError, ValueError, KeyError):
+            continue  # standard run, or unreadable
+        dated.append((written, metadata, runs))
+        journaled.add(metadata["run_id"])
+    for f in REPORTS_DIR.glob("scored_*.json"):
         try:
-            results.append(load_scored_report(f))
-        except (json.JSONDecodeError, KeyError):
+            metadata, runs = load_scored_report(f)
+            generated = metadata.get("generated") or datetime.fromtimestamp(
+                f.stat().st_mtime
+            ).isoformat()
+        except (OSError, json.JSONDecodeError, KeyError):
             continue
-    return results
+        if _report_run_id(metadata) not in journaled:
+            dated.append((generated, metadata, runs))
+    dated.sort(key=lambda d: d[0], reverse=True)
+    return [(metadata, runs) for _, metadata, runs in dated]
+
+
+def latest_scored_cells(
+    all_reports: list[tuple[dict, list[ScoredRun]]],
+) -> dict[tuple[str, str, str], tuple[ScoredRun, dict]]:
+    """Newest run per (scenario_id, skill, model), with its report's metadata.
+
+    Reports are expected newest-first (as returned by load_all_scored_reports).
+    """
+    latest: dict[tuple[str, str, str], tuple[ScoredRun, dict]] = {}
+    for metadata, runs in all_reports:
+        for run in runs:
+            key = (run.scenario_id, run.skill, run.model)
+            if key not in latest:
+                latest[key] = (run, metadata)
+    return latest
 
 
 def merge_scored_runs(
@@ -1236,15 +2337,521 @@ def merge_scored_runs(
     For duplicates keeps newest (first in list since reports are newest-first).
     Returns (sorted_models, index).
     """
-    index: dict[tuple[str, str, str], ScoredRun] = {}
-    models_set: set[str] = set()
+    index = {key: run for key, (run, _) in latest_scored_cells(all_reports).items()}
+    models_set = {run.model for _metadata, runs in all_reports for run in runs}
+    return sorted(models_set), index
+
+
+# --- Incremental runs ---
+
 
-    for _metadata, runs in all_reports:
+@dataclass
+class IncrementalPlan:
+    rerun: list[tuple[Scenario, str, str]]  # (scenario, skill, model)
+    skipped: int
+    reasons: dict[str, int]  # reason -> number of cells re-run for it
+
+
+def _stale_reason(
+    scenario: Scenario,
+    skill: str,
+    manifest: dict,
+    previous: tuple[ScoredRun, dict] | None,
+    snapshots: dict[int, RunSnapshot | None],
+) -> str | None:
+    """Why a cell must be re-run, or None if its newest result is up to date."""
+    if previous is None:
+        return "new"
+    run, metadata = previous
+    if run.error:
+        return "timed out" if run.error_kind == TIMEOUT else "errored"
+
+    snap_key = id(metadata)
+    if snap_key not in snapshots:
+        snapshots[snap_key] = snapshot_from_metadata(metadata)
+    snapshot = snapshots[snap_key]
+    if snapshot is None:
+        return "no snapshot"
+
+    if snapshot.scoring_prompt_sha256 != sha256_text(SCORING_SYSTEM_PROMPT):
+        return "scoring prompt changed"
+
+    recorded_skill = snapshot.skills.get(skill)
+    current_skill = file_sha256(Path(manifest.get(skill, {}).get("path", "")))
+    if (
+        recorded_skill is None
+        or current_skill is None
+        or recorded_skill.sha256 != current_skill[0]
+    ):
+        return "skill changed"
+
+    if scenario.id in snapshot.prompts:
+        if snapshot.prompts[scenario.id] != sha256_text(scenario.prompt):
+            return "scenario changed"
+    else:
+        recorded_file = snapshot.scenario_files.get(scenario.source_file)
+        current_file = file_sha256(SCENARIOS_DIR / scenario.source_file)
+        if (
+            recorded_file is None
+            or current_file is None
+            or recorded_file.sha256 != current_file[0]
+        ):
+            return "scenario changed"
+    return None
+
+
+def plan_incremental_run(
+    tasks: list[tuple[Scenario, str, str]],
+    manifest: dict,
+    all_reports: list[tuple[dict, list[ScoredRun]]],
+) -> IncrementalPlan:
+    """Keep only the (scenario, skill, model) cells whose inputs changed or errored.
+
+    Each cell is compared against its newest result (same newest-wins rule as
+    merge_scored_runs) using the snapshot stored in that result's report.
+    """
+    latest = latest_scored_cells(all_reports)
+    snapshots: dict[int, RunSnapshot | None] = {}
+    rerun: list[tuple[Scenario, str, str]] = []
+    reasons: dict[str, int] = {}
+
+    for scenario, skill, model in tasks:
+        previous = latest.get((scenario.id, skill, model))
+        reason = _stale_reason(scenario, skill, manifest, previous, snapshots)
+        if reason is None:
+            continue
+        rerun.append((scenario, skill, model))
+        reasons[reason] = reasons.get(reason, 0) + 1
+
+    return IncrementalPlan(
+        rerun=rerun, skipped=len(tasks) - len(rerun), reasons=reasons
+    )
+
+
+def format_incremental_plan(plan: IncrementalPlan) -> str:
+    """Human-readable plan summary printed before an incremental run."""
+    lines = [
+        f"Incremental plan: {len(plan.rerun)} to run, {plan.skipped} up to date (skipped)"
+    ]
+    for reason, count in sorted(plan.reasons.items(), key=lambda x: -x[1]):
+        lines.append(f"  {reason}: {count}")
+    return "\n".join(lines)
+
+
+# --- Scheduling ---
+
+
+def skill_size(manifest: dict, skill_name: str) -> int:
+    """Current SKILL.md size in bytes (0 if unknown or missing)."""
+    path = manifest.get(skill_name, {}).get("path")
+    try:
+        return Path(path).stat().st_size if path else 0
+    except OSError:
+        return 0
+
+
+def duration_history(
+    all_reports: list[tuple[dict, list[ScoredRun]]],
+) -> list[tuple[str, int, float]]:
+    """(model, skill_size, duration_s) of every fresh, successful scored call.
+
+    The SKILL.md size is the one recorded in the report's snapshot; cached
+    and errored cells say nothing about call duration and are left out.
+    """
+    samples = []
+    for metadata, runs in all_reports:
+        skills = (metadata.get("snapshot") or {}).get("skills") or {}
         for run in runs:
-            key = (run.scenario_id, run.skill, run.model)
-            if key not in index:
-                index[key] = run
-            models_set.add(run.model)
+            size = (skills.get(run.skill) or {}).get("size")
+            if run.error or run.cached or not run.duration_s or size is None:
+                continue
+            samples.append((run.model, size, run.duration_s))
+    return samples
 
-    sorted_models = sorted(models_set)
-    return sorted_models, index
+
+def schedule_scored_tasks(
+    tasks: list[tuple[Scenario, str, str]],
+    policy: str,
+    manifest: dict,
+    all_reports: list[tuple[dict, list[ScoredRun]]],
+    concurrency: int,
+    prefix_cache: bool = False,
+) -> tuple[list[tuple[Scenario, str, str]], float]:
+    """Order (scenario, skill, model) cells by a scheduling policy.
+
+    Returns (ordered cells, expected makespan in seconds at `concurrency`
+    calls per model). Expected durations come from duration_history; the
+    coverage policy takes turns between (domain, skill) groups. With
+    prefix_cache, the cells of each (skill, model) then run back to back so
+    they share the cached prompt prefix.
+    """
+    durations = DurationModel.from_samples(duration_history(all_reports))
+    return _schedule_cells(tasks, policy, manifest, durations, concurrency, prefix_cache)
+
+
+def schedule_standard_tasks(
+    tasks: list[tuple[Scenario, str]],
+    policy: str,
+    manifest: dict,
+    reports: list[dict],
+    concurrency: int,
+    prefix_cache: bool = False,
+) -> tuple[list[tuple[Scenario, str]], float]:
+    """As schedule_scored_tasks, for standard (scenario, model) calls.
+
+    Durations come from earlier standard reports (see standard_history): a
+    free-form answer takes longer than a scored verdict.
+    """
+    _, duration_samples = standard_history(reports, manifest)
+    ordered, makespan = _schedule_cells(
+        [(s, s.target_skill, m) for s, m in tasks],
+        policy,
+        manifest,
+        DurationModel.from_samples(duration_samples),
+        concurrency,
+        prefix_cache,
+    )
+    return [(s, m) for s, _, m in ordered], makespan
+
+
+def _schedule_cells(
+    tasks: list[tuple[Scenario, str, str]],
+    policy: str,
+    manifest: dict,
+    durations: DurationModel,
+    concurrency: int,
+    prefix_cache: bool,
+) -> tuple[list[tuple[Scenario, str, str]], float]:
+    """(ordered cells, expected makespan) of (scenario, skill, model) cells."""
+    sizes = {sk: skill_size(manifest, sk) for sk in {sk for _, sk, _ in tasks}}
+
+    def estimate(task: tuple[Scenario, str, str]) -> float:
+        return durations.estimate(task[2], sizes[task[1]])
+
+    ordered = schedule(
+        tasks,
+        policy,
+        estimate,
+        group=lambda t: (t[0].domain, t[1]),
+        together=(lambda t: (t[1], t[2])) if prefix_cache else None,
+    )
+    makespan = expected_makespan(ordered, estimate, concurrency, lane=lambda t: t[2])
+    return ordered, makespan
+
+
+# --- Estimates ---
+
+
+def usage_history(
+    all_reports: list[tuple[dict, list[ScoredRun]]],
+    scenario_prompts: dict[str, str],
+) -> list[UsageSample]:
+    """UsageSample of every fresh, successful single-cell scored call with token counts.
+
+    The prompt size is rebuilt from the scoring system prompt, the SKILL.md
+    size in the report's snapshot and the scenario's current prompt. Batched
+    and comparative cells only carry a share of their call's tokens and are
+    left out, as are cached and errored cells.
+    """
+    samples = []
+    for metadata, runs in all_reports:
+        skills = (metadata.get("snapshot") or {}).get("skills") or {}
+        for run in runs:
+            size = (skills.get(run.skill) or {}).get("size")
+            if run.error or run.cached or run.input_tokens is None or size is None:
+                continue
+            if "batch=" in run.cost_info or "compare=" in run.cost_info:
+                continue
+            samples.append(
+                UsageSample(
+                    model=run.model,
+                    prompt_chars=len(SCORING_SYSTEM_PROMPT)
+                    + size
+                    + len(scenario_prompts.get(run.scenario_id, "")),
+                    prompt_tokens=run.input_tokens
+                    + (run.cache_read_tokens or 0)
+                    + (run.cache_write_tokens or 0),
+                    output_tokens=run.output_tokens or 0,
+                    cost_usd=run.cost_usd if "cost_usd=" in run.cost_info else None,
+                )
+            )
+    return samples
+
+
+def estimate_scored_run(
+    tasks: list[tuple[Scenario, str, str]],
+    manifest: dict,
+    all_reports: list[tuple[dict, list[ScoredRun]]],
+    concurrency: int,
+    batch_size: int = 1,
+    comparative: bool = False,
+) -> RunEstimate:
+    """Predict tokens, cost and wall time of running (scenario, skill, model) cells.
+
+    Cells are grouped into calls as the run would (batch_size / comparative)
+    and kept in the given (scheduled) order. Token rates and durations come
+    from earlier scored reports, prompt sizes from the current SKILL.md files;
+    a call's duration is the sum of its cells' expected durations, as
+    batched cells record an even share of their call's time.
+    """
+    scenario_prompts = {s.id: s.prompt for s, _, _ in tasks}
+    usage = UsageModel.from_samples(usage_history(all_reports, scenario_prompts))
+    durations = DurationModel.from_samples(duration_history(all_reports))
+    sizes = {sk: skill_size(manifest, sk) for sk in {sk for _, sk, _ in tasks}}
+
+    # (system prompt, scenarios, skills, model) per call
+    if comparative:
+        calls = [
+            (COMPARATIVE_SCORING_SYSTEM_PROMPT, [s], skills, m)
+            for s, skills, m in comparative_scored_tasks(tasks)
+        ]
+    elif batch_size > 1:
+        calls = [
+            (BATCH_SCORING_SYSTEM_PROMPT, ss, [sk], m)
+            for ss, sk, m in batch_scored_tasks(tasks, batch_size)
+        ]
+    else:
+        calls = [(SCORING_SYSTEM_PROMPT, [s], [sk], m) for s, sk, m in tasks]
+    return _estimate_calls(calls, usage, durations, sizes, concurrency)
+
+
+def load_all_standard_reports() -> list[dict]:
+    """Load every standard (report_*.json) report, newest first; unreadable ones are skipped."""
+    if not REPORTS_DIR.exists():
+        return []
+    reports = []
+    for f in sorted(REPORTS_DIR.glob("report_*.json"), reverse=True):
+        try:
+            data = json.loads(f.read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            reports.append(data)
+    return reports
+
+
+def standard_history(
+    reports: list[dict], manifest: dict
+) -> tuple[list[UsageSample], list[tuple[str, int, float]]]:
+    """(usage samples, duration samples) of every fresh, successful standard call.
+
+    Standard reports keep no SKILL.md snapshot, so the skill's current size
+    stands in for it; the prompt size is rebuilt from the category's system
+    prompt, that size and the scenario prompt the report recorded.
+    """
+    usage: list[UsageSample] = []
+    durations: list[tuple[str, int, float]] = []
+    sizes: dict[str, int] = {}
+    for report in reports:
+        for entry in report["results"]:
+            skill = entry.get("target_skill") or ""
+            if skill not in sizes:
+                sizes[skill] = skill_size(manifest, skill)
+            prompt_chars = (
+                len(build_system_prompt(entry.get("category") or ""))
+                + sizes[skill]
+                + len(entry.get("prompt") or "")
+            )
+            for model, r in (entry.get("models") or {}).items():
+                if model == "bp-linter" or not r or r.get("error") or r.get("cached"):
+                    continue
+                if r.get("duration_s"):
+                    durations.append((model, sizes[skill], r["duration_s"]))
+                if r.get("input_tokens") is None:
+                    continue
+                usage.append(
+                    UsageSample(
+                        model=model,
+                        prompt_chars=prompt_chars,
+                        prompt_tokens=r["input_tokens"]
+                        + (r.get("cache_read_tokens") or 0)
+                        + (r.get("cache_write_tokens") or 0),
+                        output_tokens=r.get("output_tokens") or 0,
+                        cost_usd=r.get("cost_usd")
+                        if "cost_usd=" in (r.get("cost_info") or "")
+                        else None,
+                    )
+                )
+    return usage, durations
+
+
+def estimate_standard_run(
+    tasks: list[tuple[Scenario, str]],
+    manifest: dict,
+    reports: list[dict],
+    concurrency: int,
+) -> RunEstimate:
+    """Predict tokens, cost and wall time of standard (scenario, model) calls.
+
+    As estimate_scored_run, but each call carries its category's system
+    prompt and the rates come from earlier standard reports: free-form
+    answers are longer than scored JSON verdicts.
+    """
+    usage_samples, duration_samples = standard_history(reports, manifest)
+    usage = UsageModel.from_samples(usage_samples)
+    durations = DurationModel.from_samples(duration_samples)
+    sizes = {s.target_skill: skill_size(manifest, s.target_skill) for s, _ in tasks}
+    calls = [(build_system_prompt(s.category), [s], [s.target_skill], m) for s, m in tasks]
+    return _estimate_calls(calls, usage, durations, sizes, concurrency)
+
+
+def _estimate_calls(
+    calls: list[tuple[str, list[Scenario], list[str], str]],
+    usage: UsageModel,
+    durations: DurationModel,
+    sizes: dict[str, int],
+    concurrency: int,
+) -> RunEstimate:
+    """RunEstimate of (system prompt, scenarios, skills, model) calls, in order."""
+    estimate = RunEstimate(concurrency=concurrency, history_samples=usage.samples)
+    call_durations = []
+    for system_prompt, scenarios, skills, model in calls:
+        cells = len(scenarios) * len(skills)
+        prompt_chars = (
+            len(system_prompt)
+            + sum(sizes[sk] for sk in skills)
+            + sum(len(s.prompt) for s in scenarios)
+        )
+        estimate.add_call(model, cells, *usage.estimate(model, prompt_chars, cells))
+        call_durations.append(
+            (model, sum(durations.estimate(model, sizes[sk]) for sk in skills) * len(scenarios))
+        )
+    estimate.makespan_s = expected_makespan(
+        call_durations, lambda c: c[1], concurrency, lane=lambda c: c[0]
+    )
+    return estimate
+
+
+# --- Run journals ---
+
+
+@dataclass
+class ResumePlan:
+    """What is left of an interrupted run, read back from its journal."""
+
+    run_id: str
+    mode: str  # "scored" | "standard"
+    options: dict  # the run's structural options (batch size, schedule, ...)
+    metadata: dict  # report metadata recorded at the start (snapshot, ...)
+    cells: list[tuple]  # every planned cell, as journaled
+    done: list  # ScoredRun / RunResult that finished without error
+    remaining: list[tuple]  # (Scenario, skill, model) / (Scenario, model) cells
+    missing: list[str] = field(default_factory=list)  # scenario IDs no longer defined
+
+
+def journal_path(run_id: str) -> Path:
+    return REPORTS_DIR / "journals" / f"{run_id}.jsonl"
+
+
+def result_to_dict(result: ScoredRun | RunResult) -> dict:
+    if isinstance(result, ScoredRun):
+        return scored_run_to_dict(result)
+    return asdict(result)
+
+
+def start_run_journal(
+    run_id: str,
+    mode: str,
+    cells: list[tuple],
+    options: dict,
+    metadata: dict,
+    sync_interval_s: float = 0.0,
+) -> RunJournal:
+    """Create the run's journal; cells are (Scenario, skill, model), or
+    (Scenario, model) for standard runs, and are journaled by scenario ID."""
+    return RunJournal.create(
+        journal_path(run_id),
+        {
+            "run_id": run_id,
+            "mode": mode,
+            "created": datetime.now().isoformat(),
+            "options": options,
+            "metadata": metadata,
+            "cells": [[cell[0].id, *cell[1:]] for cell in cells],
+        },
+        sync_interval_s=sync_interval_s,
+    )
+
+
+def load_resume_plan(run_id: str) -> ResumePlan:
+    """Read a run's journal and work out the cells still to run.
+
+    A cell counts as done when its latest journaled result has no error;
+    errored cells run again. Scenarios are loaded as they are now; cells
+    whose scenario no longer exists are dropped and listed in `missing`.
+    Raises FileNotFoundError if the run has no journal, ValueError if the
+    journal is unreadable.
+    """
+    plan, records = read_journal(journal_path(run_id))
+    mode = plan.get("mode")
+    if mode == "scored":
+        scenarios = [s for ss in load_domain_scenarios().values() for s in ss]
+    elif mode == "standard":
+        scenarios = load_scenarios()
+    else:
+        raise ValueError(f"journal of run {run_id} has unknown mode {mode!r}")
+    scenarios_by_id = {s.id: s for s in scenarios}
+    from_dict = (
+        scored_run_from_dict
+        if mode == "scored"
+        else lambda d: RunResult(**{k: v for k, v in d.items() if k in _RUN_RESULT_FIELDS})
+    )
+
+    latest: dict[tuple, ScoredRun | RunResult] = {}
+    for record in records:
+        result = from_dict(record)
+        key = (
+            (result.scenario_id, result.skill, result.model)
+            if mode == "scored"
+            else (result.scenario_id, result.model)
+        )
+        latest[key] = result
+
+    done, remaining, missing = [], [], []
+    for cell in plan["cells"]:
+        key = tuple(cell)
+        result = latest.get(key)
+        if result is not None and not result.error:
+            done.append(result)
+        elif key[0] not in scenarios_by_id:
+            missing.append(key[0])
+        else:
+            remaining.append((scenarios_by_id[key[0]], *key[1:]))
+    return ResumePlan(
+        run_id=plan["run_id"],
+        mode=mode,
+        options=plan.get("options", {}),
+        metadata=plan.get("metadata", {}),
+        cells=[tuple(cell) for cell in plan["cells"]],
+        done=done,
+        remaining=remaining,
+        missing=sorted(set(missing)),
+    )
+
+
+def list_run_journals() -> list[dict]:
+    """Summaries of the runs that left a journal behind, newest first."""
+    directory = REPORTS_DIR / "journals"
+    if not directory.exists():
+        return []
+    summaries = []
+    for path in directory.glob("*.jsonl"):
+        try:
+            plan, records = read_journal(path)
+        except (OSError, ValueError):
+            continue
+        finished = {
+            (r["scenario_id"], r.get("skill"), r["model"])
+            for r in records
+            if not r.get("error")
+        }
+        summaries.append(
+            {
+                "run_id": plan.get("run_id", path.stem),
+                "mode": plan.get("mode"),
+                "created": plan.get("created"),
+                "cells": len(plan.get("cells", [])),
+                "done": len(finished),
+            }
+        )
+    return sorted(summaries, key=lambda s: s["created"] or "", reverse=True)
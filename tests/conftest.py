@@ -0,0 +1,113 @@
+"""Shared factories for scenarios, scored results and manifests.
+
+Used across the suites (core, retries, response cache, scheduling,
+estimates, journal, results store, fake backend); a module's own defaults
+go in a thin fixture on top, in that module.
+"""
+
+import asyncio
+
+import pytest
+
+from sim_core import CheckResult, Scenario, ScoredRun, run_scored_scenario
+
+
+@pytest.fixture
+def make_scenario():
+    """Scenario factory: make_scenario("a", prompt=...) — unset fields get placeholders."""
+
+    def make(scenario_id: str = "s", **fields) -> Scenario:
+        defaults = {
+            "name": scenario_id,
+            "prompt": "p",
+            "target_skill": "",
+            "source_file": "",
+            "domain": "d",
+        }
+        return Scenario(id=scenario_id, **{**defaults, **fields})
+
+    return make
+
+
+@pytest.fixture
+def make_scored():
+    """ScoredRun factory: `checks` maps check IDs to results (default WF-1 passes)."""
+
+    def make(
+        scenario_id: str = "s",
+        skill: str = "big",
+        model: str = "sonnet",
+        checks: dict[str, str] | None = None,
+        **fields,
+    ) -> ScoredRun:
+        checks = {"WF-1": "pass"} if checks is None else checks
+        defaults = {
+            "risk_level": "LOW",
+            "markdown_response": f"answer {scenario_id}",
+            "duration_s": 1.0,
+            "cost_info": "",
+        }
+        return ScoredRun(
+            scenario_id=scenario_id,
+            skill=skill,
+            model=model,
+            checks=[CheckResult(check_id=c, result=r, evidence="e") for c, r in checks.items()],
+            **{**defaults, **fields},
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_manifest(tmp_path):
+    """Manifest factory: make_manifest(big="# Big ...") writes each SKILL.md under tmp_path."""
+
+    def make(**skills: str) -> dict:
+        manifest = {}
+        for name, content in skills.items():
+            path = tmp_path / f"{name}.md"
+            path.write_text(content)
+            manifest[name] = {"path": str(path)}
+        return manifest
+
+    return make
+
+
+@pytest.fixture
+def run_scored(make_scenario, make_manifest, monkeypatch):
+    """Score one cell (ci-1 × skill-a × sonnet) against canned model answers.
+
+    run_scored(responses, **kwargs) answers each model call with the next
+    response (exceptions are raised) and passes kwargs (cache, retrier, ...)
+    to run_scored_scenario. Returns the ScoredRun and the (system prompt,
+    user prompt) of every model call made.
+    """
+
+    def run(responses: list, **kwargs) -> tuple[ScoredRun, list[tuple[str, str]]]:
+        manifest = make_manifest(**{"skill-a": "# Skill A"})
+        scenario = make_scenario(
+            "ci-1",
+            name="Test",
+            prompt="Find competitors",
+            target_skill="skill-a",
+            source_file="test.yaml",
+            domain="competitive-intelligence",
+        )
+        calls = []
+
+        async def fake_run_claude(model, system_prompt, user_prompt, semaphore, **_):
+            calls.append((system_prompt, user_prompt))
+            item = responses.pop(0)
+            if isinstance(item, Exception):
+                raise item
+            return item, 3.0, "input=1, output=2"
+
+        monkeypatch.setattr("sim_core.run_claude", fake_run_claude)
+        scored = asyncio.run(
+            run_scored_scenario(
+                scenario, "skill-a", "sonnet", manifest, asyncio.Semaphore(1), **kwargs
+            )
+        )
+        return scored, calls
+
+    return run
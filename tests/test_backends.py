@@ -0,0 +1,274 @@
+"""Unit tests for backends.py — pluggable backends and the HTTP Messages API backend.
+
+The API backend is exercised against a local stand-in HTTP/1.1 server.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from backends import (  # noqa: E402
+    API_MODEL_IDS,
+    ApiBackend,
+    CliBackend,
+    StreamMonitor,
+    make_backend,
+)
+from limits import AdaptiveLimiter  # noqa: E402
+from retries import AUTH, CONFIG, OVERLOAD, TIMEOUT, ClaudeError, classify_error  # noqa: E402
+from sim_core import run_claude  # noqa: E402
+
+
+def _message(text: str, input_tokens: int = 12, output_tokens: int = 34) -> dict:
+    return {
+        "type": "message",
+        "role": "assistant",
+        "content": [{"type": "text", "text": text}],
+        "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+    }
+
+
+def _sse(*events: dict) -> list[bytes]:
+    return [
+        f"event: {e['type']}\ndata: {json.dumps(e)}\n\n".encode() for e in events
+    ]
+
+
+class StandInServer:
+    """Minimal keep-alive HTTP/1.1 server; `handler(request)` returns (status, body).
+
+    A bytes body is sent with Content-Length; a list of chunks is sent with
+    chunked encoding, one chunk every `chunk_delay_s`.
+    """
+
+    def __init__(self, handler, chunk_delay_s: float = 0.0):
+        self.handler = handler
+        self.chunk_delay_s = chunk_delay_s
+        self.requests: list[dict] = []
+        self.connections = 0
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        self.url = f"http://{host}:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        self.server.close_clients()
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode().split("\r\n")
+                headers = {
+                    k.strip().lower(): v.strip()
+                    for k, v in (line.split(":", 1) for line in header_lines if line)
+                }
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                request = {
+                    "path": request_line.split(" ")[1],
+                    "headers": headers,
+                    "json": json.loads(body),
+                }
+                self.requests.append(request)
+                status, payload = await self.handler(request)
+
+                if isinstance(payload, bytes):
+                    writer.write(
+                        f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n"
+                        f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+                    )
+                    await writer.drain()
+                    continue
+                writer.write(
+                    f"HTTP/1.1 {status} X\r\nContent-Type: text/event-stream\r\n"
+                    "Transfer-Encoding: chunked\r\n\r\n".encode()
+                )
+                for chunk in payload:
+                    writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    await writer.drain()
+                    await asyncio.sleep(self.chunk_delay_s)
+                writer.write(b"0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _ok(request):
+    prompt = request["json"]["messages"][0]["content"]
+    return 200, json.dumps(_message(f"echo: {prompt}")).encode()
+
+
+# --- Selection ---
+
+
+def test_make_backend(monkeypatch):
+    assert isinstance(make_backend("cli"), CliBackend)
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    with pytest.raises(ClaudeError) as exc_info:
+        make_backend("api")
+    assert exc_info.value.kind == CONFIG
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-test")
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", "http://127.0.0.1:1")
+    backend = make_backend("api")
+    assert isinstance(backend, ApiBackend)
+    assert backend.base_url == "http://127.0.0.1:1"
+    with pytest.raises(ValueError, match="unknown backend"):
+        make_backend("grpc")
+
+
+# --- API backend ---
+
+
+def test_api_backend_request_and_response():
+    async def _inner():
+        async with StandInServer(_ok) as server:
+            backend = ApiBackend("sk-test", server.url)
+            try:
+                completion = await backend.complete("sonnet", "be brief", "hello")
+            finally:
+                await backend.aclose()
+        return server, completion
+
+    server, completion = asyncio.run(_inner())
+
+    assert completion.response == "echo: hello"
+    assert completion.cost_info == "input=12, output=34"
+    assert completion.usage_tokens == 46
+    request = server.requests[0]
+    assert request["path"] == "/v1/messages"
+    assert request["headers"]["x-api-key"] == "sk-test"
+    assert request["headers"]["anthropic-version"]
+    assert request["json"]["model"] == API_MODEL_IDS["sonnet"]
+    assert request["json"]["system"] == [
+        {"type": "text", "text": "be brief", "cache_control": {"type": "ephemeral"}}
+    ]
+
+
+def test_api_backend_reuses_pooled_connections():
+    async def _inner():
+        async with StandInServer(_ok) as server:
+            backend = ApiBackend("sk-test", server.url, max_connections=2)
+            limiter = AdaptiveLimiter(2, max_limit=2)
+            try:
+                results = await asyncio.gather(
+                    *(
+                        run_claude("haiku", "sys", f"p{i}", limiter, backend=backend)
+                        for i in range(10)
+                    )
+                )
+            finally:
+                await backend.aclose()
+        return server, results
+
+    server, results = asyncio.run(_inner())
+
+    assert sorted(r[0] for r in results) == sorted(f"echo: p{i}" for i in range(10))
+    assert len(server.requests) == 10
+    assert server.connections <= 2
+
+
+def test_api_backend_streams_with_ttft():
+    async def handler(request):
+        assert request["json"]["stream"] is True
+        return 200, _sse(
+            {"type": "message_start", "message": {"usage": {"input_tokens": 7}}},
+            {"type": "content_block_start", "index": 0},
+            *(
+                {"type": "content_block_delta", "delta": {"type": "text_delta", "text": t}}
+                for t in ("Hel", "lo")
+            ),
+            {"type": "message_delta", "usage": {"output_tokens": 3}},
+            {"type": "message_stop"},
+        )
+
+    seen: list[int] = []
+    monitor = StreamMonitor(on_progress=lambda m: seen.append(m.chars), progress_interval_s=0)
+
+    async def _inner():
+        async with StandInServer(handler, chunk_delay_s=0.05) as server:
+            backend = ApiBackend("sk-test", server.url)
+            try:
+                return await backend.complete("opus", "sys", "hi", stream=monitor)
+            finally:
+                await backend.aclose()
+
+    completion = asyncio.run(_inner())
+
+    assert completion.response == "Hello"
+    assert completion.cost_info == "input=7, output=3"
+    assert seen == [3, 5]
+    assert monitor.ttft_s > 0
+    assert monitor.generation_s >= 0.05
+
+
+def test_api_backend_reports_prompt_cache_usage():
+    async def handler(request):
+        message = _message("ok")
+        message["usage"].update(
+            cache_read_input_tokens=3000, cache_creation_input_tokens=0
+        )
+        return 200, json.dumps(message).encode()
+
+    async def _inner():
+        async with StandInServer(handler) as server:
+            backend = ApiBackend("sk-test", server.url)
+            try:
+                return await backend.complete("sonnet", "sys", "hi")
+            finally:
+                await backend.aclose()
+
+    completion = asyncio.run(_inner())
+    assert completion.cost_info == "input=12, output=34, cache_read=3000, cache_write=0"
+
+
+@pytest.mark.parametrize(
+    "status, error_type, kind",
+    [
+        (529, "overloaded_error", OVERLOAD),
+        (429, "rate_limit_error", OVERLOAD),
+        (401, "authentication_error", AUTH),
+        (400, "invalid_request_error", CONFIG),
+    ],
+)
+def test_api_errors_are_classified(status, error_type, kind):
+    async def handler(request):
+        body = {"type": "error", "error": {"type": error_type, "message": "nope"}}
+        return status, json.dumps(body).encode()
+
+    async def _inner():
+        async with StandInServer(handler) as server:
+            backend = ApiBackend("sk-test", server.url)
+            try:
+                await backend.complete("sonnet", "sys", "hi")
+            finally:
+                await backend.aclose()
+
+    with pytest.raises(ClaudeError) as exc_info:
+        asyncio.run(_inner())
+    assert classify_error(exc_info.value) == kind
+
+
+def test_api_timeout():
+    async def handler(request):
+        await asyncio.sleep(10)
+
+    async def _inner():
+        async with StandInServer(handler) as server:
+            backend = ApiBackend("sk-test", server.url)
+            try:
+                await backend.complete("sonnet", "sys", "hi", timeout_s=0.2)
+            finally:
+                await backend.aclose()
+
+    with pytest.raises(ClaudeError) as exc_info:
+        asyncio.run(_inner())
+    assert exc_info.value.kind == TIMEOUT
@@ -0,0 +1,55 @@
+"""Unit tests for bench.py — the orchestrator benchmark on the fake backend.
+
+Only small sizes run here; `python bench.py` runs 100 / 1k / 10k cells.
+"""
+
+import json
+
+import pytest
+
+import bench
+
+
+@pytest.mark.parametrize(
+    "target, expected, files",
+    [(bench.SIM_SCORED, 102, 2), (bench.SIM_STANDARD, 100, 4)],  # 25 scenarios per file
+)
+def test_make_workspace_sizes(tmp_path, target, expected, files):
+    assert bench.make_workspace(tmp_path, target, 100) == expected
+    assert (tmp_path / "skills_manifest.yaml").exists()
+    assert len(list((tmp_path / "scenarios").glob("*.yaml"))) == files
+
+
+@pytest.mark.parametrize("target", bench.TARGETS)
+def test_run_benchmark_reports_metrics(target):
+    metrics = bench.run_benchmark(target, 30, concurrency=4)
+
+    assert metrics["target"] == target
+    assert metrics["cells"] == 30
+    assert metrics["tasks_per_s"] > 0
+    assert metrics["peak_rss_mb"] >= metrics["baseline_rss_mb"] > 0
+    json.dumps(metrics)
+    if target == bench.RUNNER:
+        assert metrics["saves"] == 31  # a journal append per cell + the compaction
+        # started + running/finished per cell + completed
+        assert metrics["sse_events"] == 2 + 2 * 30
+        assert metrics["sse_latency_ms"]["max"] >= metrics["sse_latency_ms"]["p50"]
+    else:
+        assert metrics["saves"] == 1
+        assert metrics["sse_latency_ms"] is None
+
+
+def test_unknown_target():
+    with pytest.raises(ValueError, match="unknown target"):
+        bench.run_benchmark("grpc", 10)
+
+
+def test_compare_against_baseline():
+    baseline = {"results": [{"target": "runner", "cells": 100, "tasks_per_s": 100.0, "peak_rss_mb": 50.0}]}
+    results = [
+        {"target": "runner", "cells": 100, "tasks_per_s": 150.0, "peak_rss_mb": 45.0},
+        {"target": "runner", "cells": 1000, "tasks_per_s": 10.0, "peak_rss_mb": 60.0},
+    ]
+    assert bench._compare(results, baseline) == [
+        "runner           100  tasks/s +50%  peak RSS -10%"
+    ]
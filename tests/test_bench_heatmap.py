@@ -0,0 +1,14 @@
+"""Smoke test for bench_heatmap.py: both paths agree on a small synthetic set."""
+
+import bench_heatmap
+
+
+def test_store_and_scan_agree():
+    # run_benchmark raises if any matrix or detail differs between the paths
+    result = bench_heatmap.run_benchmark(domains=2, reports=2, models=("sonnet",), seed=3)
+
+    assert result["results"] > 0
+    assert set(result["timings"]) == {"domain", "detail"}
+    assert result["timings"]["domain"]["requests"] == 2
+    assert result["timings"]["domain"]["cached_ms"] is not None
+    assert result["timings"]["detail"]["cached_ms"] is None
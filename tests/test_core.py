@@ -1,10 +1,12 @@
 """Smoke tests for sim_core — loading, data integrity, report generation."""
 
+import asyncio
 import json
 from pathlib import Path
 
 import pytest
 
+from retries import AUTH, TIMEOUT, ClaudeError, Retrier, RetryPolicy
 from sim_core import (
     ALL_CATEGORIES,
     APF_CATEGORIES,
@@ -16,14 +18,24 @@ from sim_core import (
     DOMAIN_SKILL_MAP,
     LLM_CHECK_IDS,
     SCENARIOS_DIR,
+    BATCH_SCORING_SYSTEM_PROMPT,
+    COMPARATIVE_SCORING_SYSTEM_PROMPT,
+    SCORING_SYSTEM_PROMPT,
     SEC_CATEGORIES,
     WF_CATEGORIES,
     CheckResult,
+    PrefixGate,
     RunResult,
     Scenario,
     ScoredRun,
+    create_run_snapshot,
+    file_sha256,
+    format_incremental_plan,
     generate_json_report,
     generate_markdown_report,
+    batch_scored_tasks,
+    build_prompts,
+    comparative_scored_tasks,
     get_category_type,
     get_scenario_models,
     get_target_skills,
@@ -32,8 +44,23 @@ from sim_core import (
     load_manifest,
     load_scored_report,
     load_scenarios,
+    merge_scored_runs,
+    parse_batch_scoring_response,
+    parse_comparative_scoring_response,
+    format_usage,
+    parse_cost_info,
     parse_scoring_response,
+    plan_incremental_run,
+    run_scored_batch,
+    run_scored_comparative,
+    run_scored_scenario,
+    save_scored_report,
     save_scored_report_incremental,
+    sha256_text,
+    snapshot_from_metadata,
+    snapshot_to_metadata,
+    summarize_usage,
+    usage_fields,
 )
 
 
@@ -349,6 +376,19 @@ def test_domain_scenario_ids_unique():
     )
 
 
+def test_load_domain_scenarios_sees_edited_files(tmp_path, monkeypatch):
+    monkeypatch.setattr("sim_core.SCENARIOS_DIR", tmp_path)
+    path = tmp_path / "d.yaml"
+    scenario = {"id": "d-1", "name": "One", "prompt": "p"}
+    path.write_text(json.dumps({"domain": "d", "target_skill": "s", "scenarios": [scenario]}))
+    assert [s.id for s in load_domain_scenarios()["d"]] == ["d-1"]
+    assert load_domain_scenarios()["d"][0] is not load_domain_scenarios()["d"][0]
+
+    scenario["id"] = "d-22"
+    path.write_text(json.dumps({"domain": "d", "target_skill": "s", "scenarios": [scenario]}))
+    assert [s.id for s in load_domain_scenarios()["d"]] == ["d-22"]
+
+
 def test_get_target_skills_non_dev():
     manifest = load_manifest()
     s = Scenario(
@@ -657,3 +697,606 @@ def test_save_scored_report_incremental_creates_reports_dir(tmp_path, monkeypatc
 
     assert new_dir.exists()
     assert (new_dir / "scored_run_dir_test.json").exists()
+
+
+# --- Run snapshots ---
+
+
+def _snapshot_fixture(tmp_path):
+    skill = tmp_path / "SKILL.md"
+    skill.write_text("# Skill\nDo things.\n")
+    manifest = {
+        "skill-a": {"path": str(skill), "category": "dispatcher"},
+        "skill-missing": {"path": str(tmp_path / "nope.md"), "category": "dispatcher"},
+    }
+    scenario = Scenario(
+        id="ec-1",
+        name="t",
+        prompt="Compare prices",
+        target_skill="skill-a",
+        source_file="ecommerce.yaml",
+        domain="ecommerce",
+    )
+    return skill, manifest, scenario
+
+
+def test_create_run_snapshot_hashes_inputs(tmp_path):
+    skill, manifest, scenario = _snapshot_fixture(tmp_path)
+    snapshot = create_run_snapshot(
+        "snap1",
+        manifest,
+        ["skill-a", "skill-missing"],
+        ["ecommerce.yaml"],
+        scenarios=[scenario],
+    )
+
+    assert snapshot.run_id == "snap1"
+    skill_snap = snapshot.skills["skill-a"]
+    assert skill_snap.sha256 == sha256_text(skill.read_text())
+    assert skill_snap.size == skill.stat().st_size
+    assert skill_snap.git_revision is None  # tmp_path is not a git repo
+
+    missing = snapshot.skills["skill-missing"]
+    assert missing.sha256 is None
+    assert missing.size is None
+
+    yaml_snap = snapshot.scenario_files["ecommerce.yaml"]
+    assert yaml_snap.path == "scenarios/ecommerce.yaml"
+    assert yaml_snap.sha256 == file_sha256(SCENARIOS_DIR / "ecommerce.yaml")[0]
+    assert snapshot.prompts == {"ec-1": sha256_text("Compare prices")}
+    assert snapshot.scoring_prompt_sha256 == sha256_text(SCORING_SYSTEM_PROMPT)
+
+
+def test_snapshot_asks_git_once_per_repository(tmp_path, monkeypatch):
+    import subprocess
+
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=tmp_path, check=True, capture_output=True,
+        )
+
+    git("init", "-q")
+    (tmp_path / "a").mkdir()
+    for name in ("a/SKILL.md", "b.md"):
+        (tmp_path / name).write_text(name)
+        git("add", name)
+        git("commit", "-q", "-m", name)
+    (tmp_path / "new.md").write_text("not committed")
+    head = subprocess.run(
+        ["git", "log", "--format=%H"], cwd=tmp_path, capture_output=True, text=True
+    ).stdout.split()
+    manifest = {name: {"path": str(tmp_path / name)} for name in ("a/SKILL.md", "b.md", "new.md")}
+    calls = []
+    run = subprocess.run
+    monkeypatch.setattr(subprocess, "run", lambda cmd, **kw: calls.append(cmd) or run(cmd, **kw))
+
+    snapshot = create_run_snapshot("snap", manifest, list(manifest), [])
+
+    revisions = {name: f.git_revision for name, f in snapshot.skills.items()}
+    assert revisions == {"a/SKILL.md": head[1], "b.md": head[0], "new.md": None}
+    # One git log for tmp_path, one for the checker's own repository
+    assert len([c for c in calls if c[0] == "git"]) <= 2
+
+
+def test_file_sha256_tracks_content_changes(tmp_path):
+    path = tmp_path / "f.md"
+    path.write_text("one")
+    first = file_sha256(path)
+    path.write_text("two!")
+    second = file_sha256(path)
+    assert first[0] != second[0]
+    assert second == (sha256_text("two!"), 4)
+    assert file_sha256(tmp_path / "missing.md") is None
+
+
+def test_snapshot_metadata_roundtrip(tmp_path):
+    _, manifest, scenario = _snapshot_fixture(tmp_path)
+    snapshot = create_run_snapshot(
+        "snap2", manifest, ["skill-a"], ["ecommerce.yaml"], scenarios=[scenario]
+    )
+    metadata = {"snapshot": snapshot_to_metadata(snapshot)}
+    json.dumps(metadata)
+    assert snapshot_from_metadata(metadata) == snapshot
+    assert snapshot_from_metadata({}) is None
+
+
+def test_save_scored_report_includes_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr("sim_core.REPORTS_DIR", tmp_path / "reports")
+    _, manifest, scenario = _snapshot_fixture(tmp_path)
+    snapshot = create_run_snapshot("snap3", manifest, ["skill-a"], ["ecommerce.yaml"])
+
+    path = save_scored_report(
+        [_make_scored_run()], {"snapshot": snapshot_to_metadata(snapshot)}
+    )
+
+    metadata, runs = load_scored_report(path)
+    assert snapshot_from_metadata(metadata) == snapshot
+    assert len(runs) == 1
+
+
+# --- Incremental runs ---
+
+
+def _report_for(snapshot, runs):
+    return ({"snapshot": snapshot_to_metadata(snapshot)}, runs)
+
+
+def test_plan_incremental_run_skips_unchanged_cells(tmp_path):
+    skill, manifest, scenario = _snapshot_fixture(tmp_path)
+    snapshot = create_run_snapshot(
+        "old", manifest, ["skill-a"], ["ecommerce.yaml"], scenarios=[scenario]
+    )
+    previous = _make_scored_run(scenario_id="ec-1", skill="skill-a", model="sonnet")
+    reports = [_report_for(snapshot, [previous])]
+    tasks = [(scenario, "skill-a", "sonnet"), (scenario, "skill-a", "opus")]
+
+    plan = plan_incremental_run(tasks, manifest, reports)
+    assert plan.skipped == 1
+    assert plan.rerun == [(scenario, "skill-a", "opus")]
+    assert plan.reasons == {"new": 1}
+
+    # Editing the skill makes the cached cell stale
+    skill.write_text("# Skill\nDo other things.\n")
+    plan = plan_incremental_run(tasks, manifest, reports)
+    assert plan.skipped == 0
+    assert plan.reasons == {"new": 1, "skill changed": 1}
+
+
+def test_plan_incremental_run_reruns_errored_and_changed_prompts(tmp_path):
+    _, manifest, scenario = _snapshot_fixture(tmp_path)
+    snapshot = create_run_snapshot(
+        "old", manifest, ["skill-a"], ["ecommerce.yaml"], scenarios=[scenario]
+    )
+    errored = _make_scored_run(scenario_id="ec-1", skill="skill-a", model="sonnet")
+    errored.error = "claude -p exited with 1"
+    reports = [_report_for(snapshot, [errored])]
+
+    plan = plan_incremental_run([(scenario, "skill-a", "sonnet")], manifest, reports)
+    assert plan.reasons == {"errored": 1}
+
+    errored.error_kind = "timeout"
+    plan = plan_incremental_run([(scenario, "skill-a", "sonnet")], manifest, reports)
+    assert plan.reasons == {"timed out": 1}
+
+    ok = _make_scored_run(scenario_id="ec-1", skill="skill-a", model="sonnet")
+    edited = Scenario(**{**scenario.__dict__, "prompt": "Compare prices weekly"})
+    plan = plan_incremental_run(
+        [(edited, "skill-a", "sonnet")], manifest, [_report_for(snapshot, [ok])]
+    )
+    assert plan.reasons == {"scenario changed": 1}
+
+
+def test_plan_incremental_run_uses_newest_result(tmp_path):
+    _, manifest, scenario = _snapshot_fixture(tmp_path)
+    snapshot = create_run_snapshot(
+        "new", manifest, ["skill-a"], ["ecommerce.yaml"], scenarios=[scenario]
+    )
+    newest = _make_scored_run(scenario_id="ec-1", skill="skill-a", model="sonnet")
+    older = _make_scored_run(scenario_id="ec-1", skill="skill-a", model="sonnet")
+    older.error = "timeout"
+    reports = [_report_for(snapshot, [newest]), ({}, [older])]
+
+    plan = plan_incremental_run([(scenario, "skill-a", "sonnet")], manifest, reports)
+    assert plan.rerun == []
+    assert "0 to run, 1 up to date" in format_incremental_plan(plan)
+
+    # Reports without a snapshot cannot be trusted
+    plan = plan_incremental_run(
+        [(scenario, "skill-a", "sonnet")], manifest, [({}, [newest])]
+    )
+    assert plan.reasons == {"no snapshot": 1}
+
+
+def test_merge_scored_runs_newest_wins():
+    newest = _make_scored_run()
+    older = _make_scored_run()
+    older.risk_level = "HIGH"
+    other_model = _make_scored_run(model="opus")
+    models, index = merge_scored_runs([({}, [newest]), ({}, [older, other_model])])
+    assert models == ["opus", "sonnet"]
+    assert index[("ci-1", "apify-competitor-intelligence", "sonnet")] is newest
+
+
+# --- Prompt-prefix caching ---
+
+
+def test_build_prompts_layouts():
+    system, user = build_prompts("SYS", "# Skill", "Find competitors")
+    assert system == "SYS"
+    assert user.startswith("# SKILL.md Content\n\n```markdown\n# Skill\n```\n\n# User Prompt")
+
+    system, user = build_prompts("SYS", "# Skill", "Find competitors", prefix_cache=True)
+    assert system.startswith("SYS\n\n# SKILL.md Content")
+    assert "# Skill" in system
+    assert user == "# User Prompt\n\nFind competitors\n"
+
+
+def test_parse_cost_info():
+    assert parse_cost_info("input=10, output=20, cache_read=300, cache_write=0") == {
+        "input": 10,
+        "output": 20,
+        "cache_read": 300,
+        "cache_write": 0,
+    }
+    assert parse_cost_info("unknown (non-JSON output)") == {}
+    assert parse_cost_info("input=10, output=20, cost_usd=0.012500")["cost_usd"] == 0.0125
+
+
+def test_usage_fields_prefers_reported_cost_and_splits_shared_calls():
+    reported = usage_fields("sonnet", "input=10, output=20, cache_read=300, cache_write=0, cost_usd=0.5")
+    assert reported == {
+        "input_tokens": 10,
+        "output_tokens": 20,
+        "cache_read_tokens": 300,
+        "cache_write_tokens": 0,
+        "cost_usd": 0.5,
+    }
+
+    # No reported cost: list price of the tokens, shared by 2 cells
+    estimated = usage_fields("sonnet", "input=1000000, output=0, batch=2", share=2)
+    assert estimated["input_tokens"] == 500_000
+    assert estimated["cache_read_tokens"] is None
+    assert estimated["cost_usd"] == 1.5
+
+    assert usage_fields("sonnet", "")["cost_usd"] is None
+
+
+def test_summarize_usage_per_model_and_skill():
+    def run(skill, model, cost, cached=False):
+        r = _make_scored_run("ci-1", skill, model)
+        r.input_tokens, r.output_tokens, r.cost_usd, r.cached = 100, 10, cost, cached
+        return r
+
+    usage = summarize_usage(
+        [run("a", "sonnet", 0.25), run("b", "sonnet", 0.5), run("a", "opus", 1.0), run("a", "opus", 1.0, cached=True)]
+    )
+
+    assert usage["total"]["cost_usd"] == 1.75
+    assert usage["total"]["input_tokens"] == 300
+    assert usage["total"]["cached"] == 1
+    assert usage["by_model"]["opus"] == {
+        "results": 2,
+        "cached": 1,
+        "input_tokens": 100,
+        "output_tokens": 10,
+        "cache_read_tokens": 0,
+        "cache_write_tokens": 0,
+        "cost_usd": 1.0,
+    }
+    assert usage["by_skill"]["a"]["cost_usd"] == 1.25
+    assert format_usage(usage).startswith("Usage: $1.75 — 300 in, 30 out")
+
+
+def test_prefix_gate_lets_first_call_per_prefix_go_first():
+    gate = PrefixGate()
+    order: list[str] = []
+
+    async def call(model: str, prefix: str, name: str):
+        async with gate.first(model, prefix):
+            order.append(f"start {name}")
+            await asyncio.sleep(0.01)
+            order.append(f"end {name}")
+
+    async def _inner():
+        await asyncio.gather(
+            call("sonnet", "skill-a", "a1"),
+            call("sonnet", "skill-a", "a2"),
+            call("sonnet", "skill-b", "b1"),
+        )
+
+    asyncio.run(_inner())
+    # a2 waits for a1; b1 has its own prefix and runs alongside a1
+    assert order.index("start a2") > order.index("end a1")
+    assert order.index("start b1") < order.index("end a1")
+
+
+def test_scored_run_prefix_cache_layout_records_cache_reads(tmp_path, monkeypatch):
+    skill_path = tmp_path / "SKILL.md"
+    skill_path.write_text("# Skill A")
+    manifest = {"skill-a": {"path": str(skill_path), "category": "dispatcher"}}
+    scenario = Scenario(
+        id="ci-1",
+        name="Test",
+        prompt="Find competitors",
+        target_skill="skill-a",
+        source_file="test.yaml",
+        domain="competitive-intelligence",
+    )
+    prompts: list[tuple[str, str]] = []
+
+    async def fake_run_claude(model, system_prompt, user_prompt, semaphore, **kwargs):
+        prompts.append((system_prompt, user_prompt))
+        response = '## Approach\n```json\n{"checks": {}, "risk_level": "LOW"}\n```'
+        return response, 1.0, "input=5, output=9, cache_read=2048, cache_write=0"
+
+    monkeypatch.setattr("sim_core.run_claude", fake_run_claude)
+    run = asyncio.run(
+        run_scored_scenario(
+            scenario,
+            "skill-a",
+            "sonnet",
+            manifest,
+            asyncio.Semaphore(1),
+            prefix_gate=PrefixGate(),
+        )
+    )
+
+    system_prompt, user_prompt = prompts[0]
+    assert system_prompt.startswith(SCORING_SYSTEM_PROMPT)
+    assert "# Skill A" in system_prompt
+    assert "# Skill A" not in user_prompt
+    assert run.cache_read_tokens == 2048
+
+
+# --- Batched scoring ---
+
+
+def _batch_response(scored: dict[str, str]) -> str:
+    """Batched answer: a markdown section per scenario + one JSON keyed by ID."""
+    sections = "\n\n".join(f"# Scenario {sid}\n\n## Approach\nAbout {sid}" for sid in scored)
+    data = {
+        "scenarios": {
+            sid: {"checks": {"WF-1": {"result": result}}, "risk_level": "LOW"}
+            for sid, result in scored.items()
+        }
+    }
+    return f"{sections}\n\n```json\n{json.dumps(data)}\n```"
+
+
+def test_parse_batch_scoring_response():
+    raw = _batch_response({"ec-1": "pass", "ec-2": "fail"})
+    parsed = parse_batch_scoring_response(raw, ["ec-1", "ec-2", "ec-3"])
+
+    assert set(parsed) == {"ec-1", "ec-2"}
+    markdown, checks, risk = parsed["ec-2"]
+    assert markdown == "## Approach\nAbout ec-2"
+    assert checks["WF-1"].result == "fail"
+    assert checks["WF-2"].result == "unclear"
+    assert risk == "LOW"
+    assert parse_batch_scoring_response("no json", ["ec-1"]) == {}
+    assert parse_batch_scoring_response('```json\n{"checks": {}}\n```', ["ec-1"]) == {}
+
+
+def test_batch_scored_tasks_groups_by_skill_and_model():
+    a, b, c = (Scenario(id=i, name=i, prompt="p", target_skill="", source_file="") for i in "abc")
+    tasks = [(a, "s1", "sonnet"), (a, "s2", "sonnet"), (b, "s1", "sonnet"), (c, "s1", "sonnet")]
+
+    batches = batch_scored_tasks(tasks, 2)
+
+    assert [([s.id for s in ss], sk, m) for ss, sk, m in batches] == [
+        (["a", "b"], "s1", "sonnet"),
+        (["c"], "s1", "sonnet"),
+        (["a"], "s2", "sonnet"),
+    ]
+
+
+def test_run_scored_batch_splits_and_falls_back(tmp_path, monkeypatch):
+    skill_path = tmp_path / "SKILL.md"
+    skill_path.write_text("# Skill A")
+    manifest = {"skill-a": {"path": str(skill_path), "category": "dispatcher"}}
+    scenarios = [
+        Scenario(
+            id=f"ec-{i}",
+            name="Test",
+            prompt=f"Prompt {i}",
+            target_skill="skill-a",
+            source_file="ecommerce.yaml",
+            domain="ecommerce",
+        )
+        for i in (1, 2, 3)
+    ]
+    calls: list[tuple[str, str]] = []
+
+    async def fake_run_claude(model, system_prompt, user_prompt, semaphore, **kwargs):
+        calls.append((system_prompt, user_prompt))
+        if system_prompt == BATCH_SCORING_SYSTEM_PROMPT:
+            # ec-3 is missing from the batch answer
+            return _batch_response({"ec-1": "pass", "ec-2": "fail"}), 6.0, "input=90, output=60"
+        response = '## Approach\n```json\n{"checks": {"WF-1": {"result": "pass"}}}\n```'
+        return response, 2.0, "input=50, output=30"
+
+    monkeypatch.setattr("sim_core.run_claude", fake_run_claude)
+    runs = asyncio.run(
+        run_scored_batch(scenarios, "skill-a", "sonnet", manifest, asyncio.Semaphore(2))
+    )
+
+    assert [r.scenario_id for r in runs] == ["ec-1", "ec-2", "ec-3"]
+    assert len(calls) == 2
+    assert "Prompt 1" in calls[0][1] and "Prompt 3" in calls[0][1]
+    assert calls[1][0] == SCORING_SYSTEM_PROMPT  # per-scenario fallback for ec-3
+    by_id = {r.scenario_id: r for r in runs}
+    assert {c.check_id: c.result for c in by_id["ec-2"].checks}["WF-1"] == "fail"
+    assert by_id["ec-1"].duration_s == 2.0
+    assert by_id["ec-1"].cost_info == "input=90, output=60, batch=3"
+    assert by_id["ec-3"].cost_info == "input=50, output=30"
+    assert by_id["ec-1"].input_tokens == 30  # the batch call's tokens, split 3 ways
+
+
+def test_run_scored_batch_failures(monkeypatch, make_scenario, make_manifest, caplog):
+    manifest = make_manifest(**{"skill-a": "# Skill A"})
+    scenarios = [make_scenario(f"ec-{i}", target_skill="skill-a") for i in (1, 2, 3)]
+    outcomes: list = []
+    calls: list[str] = []
+
+    async def fake_run_claude(model, system_prompt, user_prompt, semaphore, **kwargs):
+        calls.append(system_prompt)
+        item = outcomes.pop(0) if system_prompt == BATCH_SCORING_SYSTEM_PROMPT else None
+        if isinstance(item, Exception):
+            raise item
+        if item is not None:
+            return item, 6.0, "input=90, output=60"
+        return '```json\n{"checks": {"WF-1": {"result": "pass"}}}\n```', 2.0, ""
+
+    def run(retrier=None):
+        calls.clear()
+        return asyncio.run(
+            run_scored_batch(
+                scenarios, "skill-a", "sonnet", manifest, asyncio.Semaphore(2), retrier=retrier
+            )
+        )
+
+    monkeypatch.setattr("sim_core.run_claude", fake_run_claude)
+
+    # A timeout is final: no single calls re-pay it three times over
+    outcomes[:] = [ClaudeError("claude -p timed out", TIMEOUT)]
+    runs = run()
+    assert len(calls) == 1
+    assert [r.error_kind for r in runs] == [TIMEOUT] * 3
+
+    # Any other failure falls back to single calls, and says why
+    outcomes[:] = [ClaudeError("claude -p returned an error: boom")]
+    with caplog.at_level("WARNING", logger="sim_core"):
+        runs = run()
+    assert calls[1:] == [SCORING_SYSTEM_PROMPT] * 3
+    assert not any(r.error for r in runs)
+    assert "3 of 3 skill-a/sonnet cells" in caplog.text and "boom" in caplog.text
+
+    # A retried batch call records its retries once, not once per cell
+    outcomes[:] = [
+        ClaudeError("overloaded"),
+        _batch_response({"ec-1": "pass", "ec-2": "pass", "ec-3": "pass"}),
+    ]
+    runs = run(Retrier(RetryPolicy(base_delay_s=0, max_delay_s=0), budget=5))
+    assert [len(r.retries) for r in runs] == [1, 0, 0]
+
+
+# --- Comparative scoring ---
+
+
+def _comparative_response(scored: dict[str, str]) -> str:
+    """Comparative answer: a markdown section per skill + one JSON keyed by skill."""
+    sections = "\n\n".join(f"# Skill {sk}\n\n## Approach\nAbout {sk}" for sk in scored)
+    data = {
+        "skills": {
+            sk: {"checks": {"WF-1": {"result": result}}, "risk_level": "MEDIUM"}
+            for sk, result in scored.items()
+        }
+    }
+    return f"{sections}\n\n```json\n{json.dumps(data)}\n```"
+
+
+def test_parse_comparative_scoring_response():
+    raw = _comparative_response({"skill-a": "pass", "apify-mcpc": "fail"})
+    parsed = parse_comparative_scoring_response(raw, ["skill-a", "apify-mcpc"])
+
+    markdown, checks, risk = parsed["apify-mcpc"]
+    assert markdown == "## Approach\nAbout apify-mcpc"
+    assert checks["WF-1"].result == "fail"
+    assert risk == "MEDIUM"
+    # A batched answer is not a comparative one
+    assert parse_comparative_scoring_response(_batch_response({"skill-a": "pass"}), ["skill-a"]) == {}
+
+
+def test_build_prompts_with_several_skills():
+    _, user = build_prompts("SYS", {"skill-a": "# A", "skill-b": "# B"}, "Find shoes")
+
+    assert user.startswith("# SKILL.md Files\n\n## Skill `skill-a`\n\n```markdown\n# A\n```")
+    assert user.index("## Skill `skill-b`") < user.index("# User Prompt\n\nFind shoes")
+
+
+def test_comparative_scored_tasks_groups_by_scenario_and_model():
+    a, b = (Scenario(id=i, name=i, prompt="p", target_skill="", source_file="") for i in "ab")
+    tasks = [(a, "s1", "sonnet"), (a, "s2", "sonnet"), (b, "s1", "sonnet"), (a, "s1", "opus")]
+
+    groups = comparative_scored_tasks(tasks)
+
+    assert [(s.id, sks, m) for s, sks, m in groups] == [
+        ("a", ["s1", "s2"], "sonnet"),
+        ("b", ["s1"], "sonnet"),
+        ("a", ["s1"], "opus"),
+    ]
+
+
+def test_run_scored_comparative_splits_and_falls_back(tmp_path, monkeypatch):
+    manifest = {}
+    for name in ("skill-a", "apify-mcpc", "apify-ultimate-scraper"):
+        path = tmp_path / f"{name}.md"
+        path.write_text(f"# {name} instructions")
+        manifest[name] = {"path": str(path), "category": "dispatcher"}
+    scenario = Scenario(
+        id="ec-1",
+        name="Test",
+        prompt="Track prices",
+        target_skill="skill-a",
+        source_file="ecommerce.yaml",
+        domain="ecommerce",
+    )
+    skills = get_target_skills(scenario, manifest)
+    calls: list[tuple[str, str]] = []
+
+    async def fake_run_claude(model, system_prompt, user_prompt, semaphore, **kwargs):
+        calls.append((system_prompt, user_prompt))
+        if system_prompt == COMPARATIVE_SCORING_SYSTEM_PROMPT:
+            # apify-ultimate-scraper is missing from the comparative answer
+            scored = {"skill-a": "pass", "apify-mcpc": "fail"}
+            return _comparative_response(scored), 9.0, "input=300, output=90"
+        response = '## Approach\n```json\n{"checks": {"WF-1": {"result": "pass"}}}\n```'
+        return response, 2.0, "input=50, output=30"
+
+    monkeypatch.setattr("sim_core.run_claude", fake_run_claude)
+    runs = asyncio.run(
+        run_scored_comparative(scenario, skills, "sonnet", manifest, asyncio.Semaphore(2))
+    )
+
+    assert skills == ["skill-a", "apify-mcpc", "apify-ultimate-scraper"]
+    assert [(r.scenario_id, r.skill) for r in runs] == [("ec-1", sk) for sk in skills]
+    assert len(calls) == 2
+    assert all(f"# {sk} instructions" in calls[0][1] for sk in skills)
+    assert calls[0][1].count("Track prices") == 1
+    assert calls[1][0] == SCORING_SYSTEM_PROMPT  # per-skill fallback
+    by_skill = {r.skill: r for r in runs}
+    assert {c.check_id: c.result for c in by_skill["apify-mcpc"].checks}["WF-1"] == "fail"
+    assert by_skill["skill-a"].duration_s == 3.0
+    assert by_skill["skill-a"].cost_info == "input=300, output=90, compare=3"
+    assert by_skill["apify-ultimate-scraper"].cost_info == "input=50, output=30"
+
+
+def test_run_scored_comparative_failures(monkeypatch, make_scenario, make_manifest, caplog):
+    manifest = make_manifest(**{"skill-a": "# A", "skill-b": "# B"})
+    scenario = make_scenario("ec-1", target_skill="skill-a")
+    outcomes: list = []
+    calls: list[str] = []
+
+    async def fake_run_claude(model, system_prompt, user_prompt, semaphore, **kwargs):
+        calls.append(system_prompt)
+        item = outcomes.pop(0) if system_prompt == COMPARATIVE_SCORING_SYSTEM_PROMPT else None
+        if isinstance(item, Exception):
+            raise item
+        if item is not None:
+            return item, 6.0, "input=90, output=60"
+        return '```json\n{"checks": {"WF-1": {"result": "pass"}}}\n```', 2.0, ""
+
+    def run(retrier=None):
+        calls.clear()
+        return asyncio.run(
+            run_scored_comparative(
+                scenario,
+                ["skill-a", "skill-b"],
+                "sonnet",
+                manifest,
+                asyncio.Semaphore(2),
+                retrier=retrier,
+            )
+        )
+
+    monkeypatch.setattr("sim_core.run_claude", fake_run_claude)
+
+    # An auth error is final for the whole comparative call
+    outcomes[:] = [ClaudeError("Invalid API key", AUTH)]
+    runs = run()
+    assert len(calls) == 1
+    assert [r.error_kind for r in runs] == [AUTH, AUTH]
+
+    outcomes[:] = [ClaudeError("claude -p returned an error: boom")]
+    with caplog.at_level("WARNING", logger="sim_core"):
+        runs = run()
+    assert calls[1:] == [SCORING_SYSTEM_PROMPT] * 2
+    assert "2 of 2 skills of ec-1/sonnet" in caplog.text and "boom" in caplog.text
+
+    outcomes[:] = [
+        ClaudeError("overloaded"),
+        _comparative_response({"skill-a": "pass", "skill-b": "fail"}),
+    ]
+    runs = run(Retrier(RetryPolicy(base_delay_s=0, max_delay_s=0), budget=5))
+    assert [len(r.retries) for r in runs] == [1, 0]
@@ -0,0 +1,158 @@
+"""Unit tests for estimates.py — token, cost and wall-time estimates of a run."""
+
+import pytest
+
+from estimates import (
+    CHARS_PER_TOKEN,
+    DEFAULT_RESPONSE_TOKENS,
+    RunEstimate,
+    UsageModel,
+    UsageSample,
+    format_estimate,
+)
+from limits import estimate_cost_usd
+import sim_core
+from sim_core import (
+    SCORING_SYSTEM_PROMPT,
+    RunResult,
+    ScoredRun,
+    build_system_prompt,
+    estimate_scored_run,
+    estimate_standard_run,
+    load_all_standard_reports,
+    save_reports,
+    standard_history,
+    usage_history,
+)
+
+
+def test_usage_model_without_history_uses_defaults():
+    model = UsageModel()
+    input_tokens, output_tokens, cost = model.estimate("sonnet", 4000, cells=2)
+
+    assert input_tokens == 4000 / CHARS_PER_TOKEN
+    assert output_tokens == 2 * DEFAULT_RESPONSE_TOKENS["sonnet"]
+    assert cost == estimate_cost_usd("sonnet", input_tokens, output_tokens)
+    assert model.estimate("gpt-x", 4000)[2] is None
+
+
+def test_usage_model_learns_rates_and_cost_factor():
+    list_price = estimate_cost_usd("opus", 1000, 500)
+    model = UsageModel.from_samples(
+        [
+            UsageSample("opus", 2000, 1000, 500, list_price / 2),
+            UsageSample("opus", 4000, 2000, 700, None),
+            UsageSample("opus", 0, 10, 10, None),  # no prompt size: skipped
+        ]
+    )
+
+    assert model.samples == 2
+    assert model.tokens_per_char == {"opus": 0.5}
+    assert model.response_tokens == {"opus": 600}
+    assert model.cost_factor == {"opus": 0.5}
+    input_tokens, output_tokens, cost = model.estimate("opus", 10_000)
+    assert (input_tokens, output_tokens) == (5000, 600)
+    assert cost == pytest.approx(estimate_cost_usd("opus", 5000, 600) / 2)
+
+
+def test_run_estimate_totals_and_format():
+    estimate = RunEstimate(concurrency=3, makespan_s=725)
+    estimate.add_call("opus", 1, 1000, 500, 0.05)
+    estimate.add_call("opus", 3, 2000, 1500, 0.1)
+    estimate.add_call("haiku", 1, 1000, 500, None)
+
+    data = estimate.to_dict()
+    assert data["cells"] == 5
+    assert data["calls"] == 3
+    assert data["cost_usd"] == 0.15
+    assert data["by_model"]["opus"]["input_tokens"] == 3000
+    assert format_estimate(estimate) == (
+        "Estimate: $0.15, 4,000 in + 2,500 out tokens, ~12m 05s at concurrency 3 "
+        "(3 calls, no history, default rates)"
+    )
+
+
+# --- sim_core integration ---
+
+
+@pytest.fixture
+def call(make_scored):
+    """call(cost_info, **fields): a fresh 40s scored call, 1000 tokens in and 800 out."""
+
+    def make(cost_info: str, **fields) -> ScoredRun:
+        defaults = {"duration_s": 40.0, "input_tokens": 1000, "output_tokens": 800}
+        return make_scored("a", cost_info=cost_info, **{**defaults, **fields})
+
+    return make
+
+
+def test_usage_history_skips_shared_cached_and_unsized_calls(call):
+    metadata = {"snapshot": {"skills": {"big": {"size": 5000}}}}
+    runs = [
+        call("input=1000, output=800, cache_read=3000, cost_usd=0.01", cost_usd=0.01, cache_read_tokens=3000),
+        call("input=1000, output=800"),
+        call("input=1000, output=800, batch=2"),
+        call("input=1000, output=800", cached=True),
+        call("input=1000, output=800", error="boom"),
+        call("", input_tokens=None),
+    ]
+
+    samples = usage_history([(metadata, runs), ({}, [call("input=1, output=1")])], {"a": "p" * 50})
+
+    assert samples == [
+        UsageSample("sonnet", len(SCORING_SYSTEM_PROMPT) + 5050, 4000, 800, 0.01),
+        UsageSample("sonnet", len(SCORING_SYSTEM_PROMPT) + 5050, 1000, 800, None),
+    ]
+
+
+def test_estimate_scored_run_groups_calls_like_the_run(make_scenario, make_manifest, call):
+    manifest = make_manifest(big="x" * 5000, small="x" * 5000)
+    history = [({"snapshot": {"skills": {"big": {"size": 5000}}}}, [call("input=1000, output=800")])]
+    tasks = [(make_scenario(i, prompt="x" * 100), sk, "sonnet") for i in ("a", "b") for sk in ("big", "small")]
+
+    single = estimate_scored_run(tasks, manifest, history, concurrency=2)
+    batched = estimate_scored_run(tasks, manifest, history, concurrency=2, batch_size=2)
+    compared = estimate_scored_run(tasks, manifest, history, concurrency=2, comparative=True)
+
+    assert single.history_samples == 1
+    assert (single.cells, single.calls) == (4, 4)
+    assert single.output_tokens == 4 * 800
+    assert single.makespan_s == 80.0  # 4 × 40s on 2 slots
+    assert (batched.calls, compared.calls) == (2, 2)
+    assert batched.output_tokens == compared.output_tokens == 4 * 800
+    # One SKILL.md (batch) or one scenario prompt (comparative) fewer per call
+    assert batched.input_tokens < single.input_tokens
+    assert compared.input_tokens < single.input_tokens
+    assert batched.makespan_s == 80.0
+
+
+def test_estimate_standard_run_uses_standard_history_and_category_prompts(
+    tmp_path, monkeypatch, make_scenario, make_manifest
+):
+    monkeypatch.setattr(sim_core, "REPORTS_DIR", tmp_path)
+    manifest = make_manifest(big="x" * 5000)
+    wf = make_scenario("a", prompt="p" * 100, target_skill="big", category="WF")
+    results = [
+        RunResult(
+            "a", "sonnet", "answer", 30.0, "input=2000, output=3000",
+            input_tokens=2000, output_tokens=3000,
+        ),
+        RunResult("a", "opus", "", 0.0, "", error="boom"),
+    ]
+    save_reports([wf], results, ["sonnet", "opus"])
+
+    reports = load_all_standard_reports()
+    usage, durations = standard_history(reports, manifest)
+    assert len(usage) == 1 and usage[0].prompt_chars == len(build_system_prompt("WF")) + 5100
+    assert durations == [("sonnet", 5000, 30.0)]
+
+    generic = make_scenario("b", prompt="p" * 100, target_skill="big")
+    estimate = estimate_standard_run([(wf, "sonnet"), (generic, "sonnet")], manifest, reports, 1)
+
+    assert estimate.history_samples == 1
+    assert estimate.output_tokens == 2 * 3000  # a full answer, not a scored verdict
+    assert estimate.makespan_s == 60.0
+    wf_call = 2000  # same prompt as the recorded call
+    assert estimate.input_tokens - wf_call == round(
+        (len(build_system_prompt("")) + 5100) * 2000 / (len(build_system_prompt("WF")) + 5100)
+    )
@@ -0,0 +1,154 @@
+"""Unit tests for fake_backend.py — the simulated backend for offline load tests."""
+
+import asyncio
+
+import pytest
+
+from backends import FAKE, StreamMonitor, make_backend
+from fake_backend import FakeBackend, FakeConfig
+from limits import AdaptiveLimiter
+from retries import CONFIG, OVERLOAD, TIMEOUT, TRANSIENT, ClaudeError, Retrier, RetryPolicy, classify_error
+from sim_core import (
+    LLM_CHECK_IDS,
+    SCORING_SYSTEM_PROMPT,
+    parse_cost_info,
+    parse_scoring_response,
+    run_scored_batch,
+    run_scored_comparative,
+    run_scored_scenario,
+)
+
+INSTANT = "seed=1,latency=0"
+
+
+def _complete(backend: FakeBackend, system: str = SCORING_SYSTEM_PROMPT, user: str = "hi", **kwargs):
+    return asyncio.run(backend.complete("sonnet", system, user, **kwargs))
+
+
+@pytest.fixture
+def manifest(make_manifest):
+    return make_manifest(alpha="# alpha\nDo the thing.\n", beta="# beta\nDo the thing.\n")
+
+
+def test_config_parse():
+    config = FakeConfig.parse("seed=7, latency=0.5,overload=0.1,output_tokens=900")
+    assert (config.seed, config.latency, config.overload, config.output_tokens) == (7, 0.5, 0.1, 900)
+    assert FakeConfig.parse("") == FakeConfig()
+    for bad in ("speed=2", "latency", "seed=x", "overload=0.6,errors=0.6", "ttft=2"):
+        with pytest.raises(ValueError):
+            FakeConfig.parse(bad)
+
+
+def test_make_backend(monkeypatch):
+    monkeypatch.setenv("FAKE_BACKEND", "seed=3")
+    backend = make_backend(FAKE)
+    assert isinstance(backend, FakeBackend)
+    assert backend.config.seed == 3
+    assert make_backend(FAKE, fake_config="seed=4").config.seed == 4
+    with pytest.raises(ClaudeError) as exc_info:
+        make_backend(FAKE, fake_config="nope=1")
+    assert exc_info.value.kind == CONFIG
+
+
+def test_seeded_answers_are_reproducible_and_well_formed():
+    first = _complete(FakeBackend(FakeConfig.parse(INSTANT)))
+    again = _complete(FakeBackend(FakeConfig.parse(INSTANT)))
+    other = _complete(FakeBackend(FakeConfig.parse("seed=2,latency=0")))
+
+    assert first.response == again.response != other.response
+    markdown, checks, risk = parse_scoring_response(first.response)
+    assert set(checks) == set(LLM_CHECK_IDS)
+    assert risk in ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+    assert "## Verdict" in markdown
+
+
+def test_repeated_system_prompt_is_billed_as_cache_read():
+    backend = FakeBackend(FakeConfig.parse(INSTANT))
+    first = parse_cost_info(_complete(backend, user="a").cost_info)
+    second = parse_cost_info(_complete(backend, user="b").cost_info)
+
+    assert first["cache_read"] == 0 and first["cache_write"] > 0
+    assert second["cache_read"] == first["cache_write"]
+    assert second["input"] < first["input"]
+
+
+@pytest.mark.parametrize("setting, kind", [("overload=1", OVERLOAD), ("errors=1", TRANSIENT)])
+def test_injected_errors_are_classified(setting, kind):
+    with pytest.raises(ClaudeError) as exc_info:
+        _complete(FakeBackend(FakeConfig.parse(f"{INSTANT},{setting}")))
+    assert classify_error(exc_info.value) == kind
+
+
+def test_hang_runs_into_the_call_timeout():
+    with pytest.raises(ClaudeError) as exc_info:
+        _complete(FakeBackend(FakeConfig.parse(f"{INSTANT},hangs=1")), timeout_s=0.01)
+    assert exc_info.value.kind == TIMEOUT
+
+
+def test_malformed_answers_have_no_usable_json():
+    backend = FakeBackend(FakeConfig.parse(f"{INSTANT},malformed=1"))
+    for i in range(10):
+        _, checks, _ = parse_scoring_response(_complete(backend, user=str(i)).response)
+        assert {c.result for c in checks.values()} == {"unclear"}
+
+
+def test_streams_in_chunks():
+    monitor = StreamMonitor()
+    completion = _complete(
+        FakeBackend(FakeConfig.parse("seed=1,latency=0.05,jitter=0")), stream=monitor
+    )
+    assert monitor.chars == len(completion.response)
+    assert monitor.ttft_s >= 0.01
+    assert monitor.generation_s > 0
+
+
+# --- Through the scoring pipeline ---
+
+
+def test_scored_batch_and_comparative_calls(manifest, make_scenario):
+    backend = FakeBackend(FakeConfig.parse(INSTANT))
+    limiter = AdaptiveLimiter(4)
+    scenarios = [make_scenario("s1"), make_scenario("s2")]
+
+    async def _inner():
+        batch = await run_scored_batch(
+            scenarios, "alpha", "haiku", manifest, limiter, backend=backend
+        )
+        compared = await run_scored_comparative(
+            scenarios[0], ["alpha", "beta"], "opus", manifest, limiter, backend=backend
+        )
+        return batch, compared
+
+    batch, compared = asyncio.run(_inner())
+
+    assert backend.calls == 2  # no per-cell fallback calls were needed
+    assert [r.scenario_id for r in batch] == ["s1", "s2"]
+    assert [r.skill for r in compared] == ["alpha", "beta"]
+    for run in batch + compared:
+        assert run.error is None
+        assert len(run.checks) == len(LLM_CHECK_IDS)
+
+
+def test_retries_get_a_fresh_draw(manifest, make_scenario):
+    # With a 50% overload rate some cells fail on the first attempt, but a
+    # retry draws again, so every cell eventually scores
+    backend = FakeBackend(FakeConfig.parse(f"{INSTANT},overload=0.5"))
+    limiter = AdaptiveLimiter(8)
+
+    async def _inner():
+        retrier = Retrier(RetryPolicy(max_attempts=10, base_delay_s=0, max_delay_s=0), budget=100)
+        return await asyncio.gather(
+            *(
+                run_scored_scenario(
+                    make_scenario(f"s{i}"), "alpha", "sonnet", manifest, limiter,
+                    retrier=retrier, backend=backend,
+                )
+                for i in range(20)
+            )
+        )
+
+    runs = asyncio.run(_inner())
+
+    assert all(r.error is None for r in runs)
+    assert sum(len(r.retries) for r in runs) > 0
+    assert backend.calls == 20 + sum(len(r.retries) for r in runs)
@@ -0,0 +1,74 @@
+"""Tests for the heatmap router's query cache."""
+
+import pytest
+
+import sim_core
+from results_store import open_store
+from server.routers import heatmap
+from server.services.runner import run_manager
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(sim_core, "REPORTS_DIR", tmp_path / "reports")
+    monkeypatch.setattr(sim_core, "SCENARIOS_DIR", tmp_path / "scenarios")
+    (tmp_path / "reports").mkdir()
+    (tmp_path / "scenarios").mkdir()
+    open_store()  # creating results.db counts as a change
+    return tmp_path
+
+
+def _counting():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    return calls, compute
+
+
+def test_hits_until_the_data_changes(dirs):
+    cache = heatmap._QueryCache(8)
+    calls, compute = _counting()
+
+    assert cache.get(("skills",), compute) == 1
+    assert cache.get(("skills",), compute) == 1
+
+    (dirs / "reports" / "scored_run_x.json").write_text("{}")
+    assert cache.get(("skills",), compute) == 2
+    (dirs / "scenarios" / "d.yaml").write_text("domain: d")
+    assert cache.get(("skills",), compute) == 3
+    (dirs / "reports" / "notes.md").write_text("unrelated")
+    assert cache.get(("skills",), compute) == 3
+
+    run_manager.results_version += 1  # a web run recorded a result
+    assert cache.get(("skills",), compute) == 4
+
+
+def test_least_recently_used_entry_is_evicted(dirs):
+    cache = heatmap._QueryCache(2)
+    calls, compute = _counting()
+    cache.get(("a",), compute)
+    cache.get(("b",), compute)
+    cache.get(("a",), compute)
+    cache.get(("c",), compute)  # evicts b
+
+    cache.get(("a",), compute)
+    assert len(calls) == 3
+    cache.get(("b",), compute)
+    assert len(calls) == 4
+
+
+def test_endpoints_are_cached_per_argument(dirs, monkeypatch):
+    monkeypatch.setattr(heatmap, "_query_cache", heatmap._QueryCache(8))
+    domains = {"d": [], "e": []}
+    loads = []
+    monkeypatch.setattr(heatmap, "load_domain_scenarios", lambda: loads.append(1) or domains)
+
+    first = heatmap.get_domain_heatmap("d")
+    assert heatmap.get_domain_heatmap("d") is first
+    assert heatmap.get_domain_heatmap("e")["domain"] == "e"
+    assert len(loads) == 2
+    with pytest.raises(heatmap.HTTPException):
+        heatmap.get_domain_heatmap("missing")  # errors are not cached
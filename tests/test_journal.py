@@ -0,0 +1,235 @@
+"""Unit tests for journal.py — the append-only journal of a run in progress."""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import sim_core
+from journal import RunJournal, read_journal
+from sim_core import (
+    RunResult,
+    ScoredRun,
+    compact_scored_run,
+    journal_path,
+    latest_scored_cells,
+    list_run_journals,
+    load_all_scored_reports,
+    load_resume_plan,
+    load_scored_report,
+    result_to_dict,
+    start_run_journal,
+)
+
+
+def test_create_append_and_read(tmp_path):
+    path = tmp_path / "journals" / "run.jsonl"
+    with RunJournal.create(path, {"run_id": "run", "cells": [["a", "m"]]}) as journal:
+        journal.append({"scenario_id": "a"})
+        journal.append({"scenario_id": "b"})
+
+    plan, results = read_journal(path)
+    assert plan == {"run_id": "run", "cells": [["a", "m"]]}
+    assert results == [{"scenario_id": "a"}, {"scenario_id": "b"}]
+    with pytest.raises(FileExistsError):
+        RunJournal.create(path, {})
+
+
+def test_torn_last_line_is_ignored_and_cut_on_reopen(tmp_path):
+    path = tmp_path / "run.jsonl"
+    with RunJournal.create(path, {"run_id": "run"}, fsync=False) as journal:
+        journal.append({"n": 1})
+    with open(path, "a") as f:
+        f.write('{"type": "result", "result": {"n": ')  # killed mid-write
+
+    assert read_journal(path)[1] == [{"n": 1}]
+
+    with RunJournal.reopen(path, fsync=False) as journal:
+        journal.append({"n": 2})
+    assert read_journal(path)[1] == [{"n": 1}, {"n": 2}]
+
+
+def test_corrupt_journals_are_rejected(tmp_path):
+    path = tmp_path / "run.jsonl"
+    path.write_text('{"type": "result", "result": {}}\n')
+    with pytest.raises(ValueError, match="no plan"):
+        read_journal(path)
+    path.write_text('{"type": "plan"}\nnot json\n{"type": "result", "result": {}}\n')
+    with pytest.raises(ValueError, match="line 2"):
+        read_journal(path)
+
+
+def test_remove(tmp_path):
+    journal = RunJournal.create(tmp_path / "run.jsonl", {})
+    journal.remove()
+    assert not journal.path.exists()
+
+
+# --- Resume plans (sim_core) ---
+
+
+@pytest.fixture
+def reports_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(sim_core, "REPORTS_DIR", tmp_path / "reports")
+    return tmp_path / "reports"
+
+
+def test_scored_resume_plan(reports_dir, monkeypatch, make_scenario, make_scored):
+    scenarios = [make_scenario("a"), make_scenario("b"), make_scenario("gone")]
+    cells = [(s, sk, "sonnet") for s in scenarios for sk in ("big", "small")]
+    journal = start_run_journal(
+        "run1", "scored", cells, {"model": ["sonnet"], "batch_size": 2}, {"domains": ["d"]}
+    )
+    journal.append(result_to_dict(make_scored("a", "big")))
+    journal.append(result_to_dict(make_scored("a", "small", error="boom")))
+    journal.append(result_to_dict(make_scored("b", "big", error="boom")))
+    journal.append(result_to_dict(make_scored("b", "big")))  # retried by an earlier resume
+    journal.close()
+    monkeypatch.setattr(sim_core, "load_domain_scenarios", lambda: {"d": scenarios[:2]})
+
+    resume = load_resume_plan("run1")
+
+    assert resume.mode == "scored"
+    assert resume.options == {"model": ["sonnet"], "batch_size": 2}
+    assert resume.metadata == {"domains": ["d"]}
+    assert [(r.scenario_id, r.skill) for r in resume.done] == [("a", "big"), ("b", "big")]
+    assert resume.done[0] == make_scored("a", "big")
+    assert [(s.id, sk, m) for s, sk, m in resume.remaining] == [
+        ("a", "small", "sonnet"),
+        ("b", "small", "sonnet"),
+    ]
+    assert resume.missing == ["gone"]
+    assert list_run_journals()[0]["done"] == 2
+
+
+def test_standard_resume_plan(reports_dir, monkeypatch, make_scenario):
+    scenarios = [make_scenario("a"), make_scenario("b")]
+    journal = start_run_journal(
+        "run2", "standard", [(s, "opus") for s in scenarios], {"schedule": "plan"}, {}
+    )
+    done = RunResult(
+        scenario_id="a", model="opus", response="ok", duration_s=2.0, cost_info="",
+        retries=[{"attempt": 1, "kind": "overload"}],
+    )
+    journal.append(result_to_dict(done))
+    journal.close()
+    monkeypatch.setattr(sim_core, "load_scenarios", lambda: scenarios)
+
+    resume = load_resume_plan("run2")
+
+    assert resume.done == [done]
+    assert [(s.id, m) for s, m in resume.remaining] == [("b", "opus")]
+    lines = journal_path("run2").read_text().splitlines()
+    assert json.loads(lines[0])["cells"] == [["a", "opus"], ["b", "opus"]]
+
+
+def test_resume_plan_errors(reports_dir):
+    with pytest.raises(FileNotFoundError):
+        load_resume_plan("nope")
+    RunJournal.create(journal_path("odd"), {"run_id": "odd", "mode": "other", "cells": []}).close()
+    with pytest.raises(ValueError, match="unknown mode"):
+        load_resume_plan("odd")
+
+
+# --- Journal as the scored results log (sim_core) ---
+
+
+@pytest.fixture
+def journal_run(reports_dir, make_scenario):
+    """start(run_id, results): a scored run's journal holding these results."""
+
+    def start(run_id: str, results: list[ScoredRun]) -> RunJournal:
+        journal = start_run_journal(
+            run_id,
+            "scored",
+            [(make_scenario(r.scenario_id), r.skill, r.model) for r in results],
+            {},
+            {"models": ["sonnet"], "snapshot": {"run_id": run_id}},
+        )
+        for result in results:
+            journal.append(result_to_dict(result))
+        return journal
+
+    return start
+
+
+def test_load_scored_report_reads_journals(journal_run, make_scored):
+    journal_run("run3", [make_scored("a", "big", error="boom"), make_scored("a", "big")]).close()
+
+    metadata, runs = load_scored_report(journal_path("run3"))
+
+    assert runs == [make_scored("a", "big")]  # latest result per cell
+    assert metadata["run_id"] == "run3"
+    assert metadata["unfinished"] and metadata["models"] == ["sonnet"]
+
+
+def test_compact_scored_run(reports_dir, journal_run, make_scored):
+    journal_run("run4", [make_scored("a", "big"), make_scored("b", "big")]).close()
+
+    path = compact_scored_run("run4", {"stopped": "budget"})
+
+    assert path == reports_dir / "scored_run_run4.json"
+    metadata, runs = load_scored_report(path)
+    assert [r.scenario_id for r in runs] == ["a", "b"]
+    assert (metadata["run_id"], metadata["stopped"]) == ("run4", "budget")
+    assert metadata["models"] == ["sonnet"]
+
+
+def test_load_all_scored_reports_prefers_live_journals(journal_run, make_scored):
+    journal = journal_run("run5", [make_scored("a", "big")])
+    compact_scored_run("run5")
+    journal_run("old", [make_scored("c", "big")]).close()
+    compact_scored_run("old")
+    journal_path("old").unlink()  # finished run: only its report remains
+    journal.append(result_to_dict(make_scored("b", "big")))  # resumed after both reports
+    journal.close()
+    later = time.time() + 60
+    os.utime(journal_path("run5"), (later, later))
+
+    reports = load_all_scored_reports()
+
+    assert [(m["run_id"], len(runs)) for m, runs in reports] == [("run5", 2), ("old", 1)]
+    assert reports[0][0]["unfinished"] and "unfinished" not in reports[1][0]
+
+
+def test_stale_journal_does_not_hide_a_newer_report(journal_run, make_scored):
+    # An interrupted run whose journal was kept, then a finished run of the same cell
+    journal_run("stopped", [make_scored("a", "big", checks={"WF-1": "fail"})]).close()
+    earlier = time.time() - 3600
+    os.utime(journal_path("stopped"), (earlier, earlier))
+    journal_run("done", [make_scored("a", "big", checks={"WF-1": "pass"})]).close()
+    compact_scored_run("done")
+    journal_path("done").unlink()
+
+    reports = load_all_scored_reports()
+
+    assert [m["run_id"] for m, _ in reports] == ["done", "stopped"]
+    (run, metadata), = latest_scored_cells(reports).values()
+    assert metadata["run_id"] == "done"
+    assert run.checks[0].result == "pass"
+
+
+def test_grouped_syncs_and_threaded_appends(tmp_path, monkeypatch):
+    syncs = []
+    monkeypatch.setattr(os, "fsync", lambda fd: syncs.append(fd))
+    path = tmp_path / "run.jsonl"
+    journal = RunJournal.create(path, {"run_id": "run"}, sync_interval_s=60)
+    assert len(syncs) == 1  # the plan is synced at once
+
+    def append(t):
+        for n in range(50):
+            journal.append({"t": t, "n": n})
+
+    threads = [threading.Thread(target=append, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(syncs) == 1  # flushed, not yet synced
+    assert len(read_journal(path)[1]) == 400
+
+    journal.close()
+    assert len(syncs) == 2
+    journal.close()  # idempotent
@@ -0,0 +1,306 @@
+"""Unit tests for limits.py — adaptive concurrency and RPM/TPM rate limits."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from limits import (
+    AdaptiveLimiter,
+    CostBudget,
+    RateLimit,
+    RateLimiter,
+    TokenBucket,
+    estimate_cost_usd,
+    is_overload_error,
+    parse_rate_limits,
+)
+from sim_core import run_claude
+
+
+async def _complete(limiter: AdaptiveLimiter, model: str, n: int = 1) -> None:
+    for _ in range(n):
+        async with limiter.slot(model):
+            pass
+
+
+async def _fail(limiter: AdaptiveLimiter, model: str, message: str) -> None:
+    with pytest.raises(RuntimeError):
+        async with limiter.slot(model):
+            raise RuntimeError(message)
+
+
+def test_is_overload_error():
+    assert is_overload_error(RuntimeError("API Error: 429 Too Many Requests"))
+    assert is_overload_error(RuntimeError('{"type": "overloaded_error"}'))
+    assert is_overload_error(RuntimeError("rate_limit_error: slow down"))
+    assert not is_overload_error(RuntimeError("Invalid API key"))
+
+
+def test_additive_increase_after_full_window():
+    limiter = AdaptiveLimiter(2, max_limit=4)
+
+    async def _inner():
+        await _complete(limiter, "sonnet", 1)
+        assert limiter.limit("sonnet") == 2
+        await _complete(limiter, "sonnet", 1)  # window of 2 → +1
+        assert limiter.limit("sonnet") == 3
+        await _complete(limiter, "sonnet", 3)
+        assert limiter.limit("sonnet") == 4
+        await _complete(limiter, "sonnet", 10)  # capped at max_limit
+
+    asyncio.run(_inner())
+    assert limiter.limit("sonnet") == 4
+    assert limiter.format_history("sonnet") == "2 → 3 → 4"
+
+
+def test_multiplicative_decrease_on_overload():
+    limiter = AdaptiveLimiter(8, max_limit=8)
+
+    async def _inner():
+        await _fail(limiter, "opus", "claude -p exited with 1: 529 overloaded")
+
+    asyncio.run(_inner())
+    assert limiter.limit("opus") == 4
+    assert limiter.history("opus")[-1][1:] == (4, "overload")
+
+
+def test_concurrent_overloads_cut_once_per_window():
+    limiter = AdaptiveLimiter(8, max_limit=8)
+
+    async def _inner():
+        gate = asyncio.Event()
+
+        async def failing():
+            with pytest.raises(RuntimeError):
+                async with limiter.slot("opus"):
+                    await gate.wait()
+                    raise RuntimeError("429 rate limit")
+
+        tasks = [asyncio.create_task(failing()) for _ in range(4)]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(_inner())
+    assert limiter.limit("opus") == 4
+
+
+def test_decrease_respects_min_limit():
+    limiter = AdaptiveLimiter(1)
+
+    async def _inner():
+        await _fail(limiter, "haiku", "429")
+
+    asyncio.run(_inner())
+    assert limiter.limit("haiku") == 1
+
+
+def test_other_errors_do_not_change_limit_but_block_growth():
+    limiter = AdaptiveLimiter(1, max_limit=4, max_error_rate=0.2)
+
+    async def _inner():
+        await _fail(limiter, "sonnet", "Invalid API key")
+        await _complete(limiter, "sonnet", 1)  # error rate 50% → hold
+
+    asyncio.run(_inner())
+    assert limiter.limit("sonnet") == 1
+
+
+def test_limits_are_per_model():
+    limiter = AdaptiveLimiter(4, max_limit=8)
+
+    async def _inner():
+        await _fail(limiter, "opus", "overloaded")
+        await _complete(limiter, "haiku", 4)
+
+    asyncio.run(_inner())
+    assert limiter.limit("opus") == 2
+    assert limiter.limit("haiku") == 5
+    assert limiter.models == ["haiku", "opus"]
+
+
+def test_slot_enforces_current_limit():
+    limiter = AdaptiveLimiter(2, max_limit=2)
+    peak = 0
+    running = 0
+
+    async def worker():
+        nonlocal peak, running
+        async with limiter.slot("sonnet"):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def _inner():
+        await asyncio.gather(*(worker() for _ in range(6)))
+
+    asyncio.run(_inner())
+    assert peak == 2
+
+
+def test_describe_is_json_friendly():
+    limiter = AdaptiveLimiter(3)
+    state = limiter.describe("sonnet")
+    assert state == {
+        "limit": 3,
+        "in_flight": 0,
+        "history": [{"t": 0.0, "limit": 3, "reason": "start"}],
+    }
+
+
+def test_run_claude_is_error_result_shrinks_limit(tmp_path, monkeypatch):
+    """An is_error JSON result (e.g. 429) is raised and fed to the limiter."""
+    script = tmp_path / "claude"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys\n"
+        "sys.stdin.read()\n"
+        "print(json.dumps({'is_error': True, 'result': 'API Error: 429 rate_limit_error'}))\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    limiter = AdaptiveLimiter(4)
+
+    with pytest.raises(RuntimeError, match="429"):
+        asyncio.run(run_claude("sonnet", "sys", "prompt", limiter))
+    assert limiter.limit("sonnet") == 2
+
+
+# --- Rate limits (RPM / TPM) ---
+
+
+def test_parse_rate_limits():
+    limits = parse_rate_limits("opus=20, sonnet=50", "100000")
+    assert limits["opus"] == RateLimit(rpm=20, tpm=None)
+    assert limits["sonnet"] == RateLimit(rpm=50, tpm=None)
+    assert limits["*"] == RateLimit(rpm=None, tpm=100000)
+    assert parse_rate_limits(None, None) == {}
+    with pytest.raises(ValueError, match="rpm"):
+        parse_rate_limits("opus=fast")
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(60)  # 1 per second, burst of 60
+    now = bucket._updated
+    assert bucket.wait_time(60, now) == 0
+    bucket.take(60, now)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 0.5) == pytest.approx(0.5)
+    # Requests above capacity wait for a full bucket, not forever
+    assert bucket.wait_time(1000, now + 60) == 0
+
+
+def test_unlimited_model_is_admitted_immediately():
+    limiter = RateLimiter({"opus": RateLimit(rpm=1)})
+
+    async def _inner():
+        for _ in range(5):
+            await limiter.acquire("haiku", 10_000)
+
+    asyncio.run(_inner())
+    assert limiter.describe("haiku") is None
+
+
+def _drained(limits: dict) -> RateLimiter:
+    limiter = RateLimiter(limits)
+    budget = limiter._budget("sonnet")
+    for bucket in (budget.requests, budget.tokens):
+        if bucket is not None:
+            bucket.tokens = 0
+    return limiter
+
+
+def test_requests_are_served_round_robin_across_owners():
+    limiter = _drained({"sonnet": RateLimit(rpm=6000)})  # one every 10ms
+    order: list[str] = []
+
+    async def request(owner: str):
+        await limiter.acquire("sonnet", owner=owner)
+        order.append(owner)
+
+    async def _inner():
+        big = [asyncio.create_task(request("big")) for _ in range(4)]
+        await asyncio.sleep(0)
+        small = [asyncio.create_task(request("small")) for _ in range(2)]
+        await asyncio.gather(*big, *small)
+
+    asyncio.run(_inner())
+    assert order == ["big", "small", "big", "small", "big", "big"]
+    assert limiter.describe("sonnet")["granted"] == 6
+
+
+def test_tpm_budget_delays_large_requests():
+    limiter = _drained({"sonnet": RateLimit(tpm=60_000)})  # 1000 tokens/s
+
+    async def _inner():
+        start = time.monotonic()
+        await limiter.acquire("sonnet", 50)
+        return time.monotonic() - start
+
+    assert asyncio.run(_inner()) >= 0.04
+
+
+def test_settle_charges_actual_usage():
+    limiter = RateLimiter({"sonnet": RateLimit(tpm=10_000)})
+
+    async def _inner():
+        permit = await limiter.acquire("sonnet", 1_000)
+        permit.settle(4_000)
+
+    asyncio.run(_inner())
+    assert limiter._budget("sonnet").tokens.tokens == pytest.approx(6_000, abs=5)
+
+
+def test_cancelled_waiter_does_not_block_queue():
+    limiter = _drained({"sonnet": RateLimit(rpm=6000)})
+
+    async def _inner():
+        doomed = asyncio.create_task(limiter.acquire("sonnet", owner="a"))
+        await asyncio.sleep(0)
+        doomed.cancel()
+        await limiter.acquire("sonnet", owner="b")
+        return limiter.pending("sonnet")
+
+    assert asyncio.run(_inner()) == {}
+
+
+def test_adaptive_slot_waits_for_shared_rate_limiter():
+    shared = RateLimiter({"sonnet": RateLimit(rpm=6000, tpm=10**6)})
+    runs = [
+        AdaptiveLimiter(4, rate_limiter=shared, owner=owner) for owner in ("a", "b")
+    ]
+
+    async def _inner():
+        async def call(limiter):
+            async with limiter.slot("sonnet", tokens=100) as permit:
+                permit.settle(150)
+
+        await asyncio.gather(*(call(limiter) for limiter in runs for _ in range(3)))
+
+    asyncio.run(_inner())
+    assert shared.describe("sonnet")["granted"] == 6
+    assert shared._budget("sonnet").tokens.tokens <= 10**6 - 6 * 150 + 10
+
+
+# --- Cost budget ---
+
+
+def test_estimate_cost_usd_uses_list_prices():
+    # sonnet: $3 / $15 per MTok; cache writes 1.25x, reads 0.1x input
+    assert estimate_cost_usd("sonnet", 1_000_000, 100_000) == pytest.approx(4.5)
+    assert estimate_cost_usd("sonnet", 0, 0, 1_000_000, 1_000_000) == pytest.approx(0.3 + 3.75)
+    assert estimate_cost_usd("gpt-x", 100, 100) is None
+
+
+def test_cost_budget():
+    budget = CostBudget(max_usd=1.0)
+    budget.add(0.6)
+    budget.add(None)
+    assert not budget.exhausted
+    budget.add(0.4)
+    assert budget.exhausted
+    assert not CostBudget().exhausted
@@ -0,0 +1,111 @@
+"""Unit tests for pipeline.py — bounded, lazily fed worker pool."""
+
+import asyncio
+
+import pytest
+
+from pipeline import PipelineStats, run_pipeline
+from sim_core import Scenario, iter_scored_tasks
+
+
+def test_runs_every_item_with_bounded_concurrency():
+    results: list[int] = []
+
+    async def run(i: int) -> int:
+        await asyncio.sleep(0.001 * (i % 3))
+        return i * 2
+
+    stats = asyncio.run(run_pipeline(range(50), run, workers=4, on_result=results.append))
+
+    assert sorted(results) == [i * 2 for i in range(50)]
+    assert stats.produced == stats.started == stats.completed == 50
+    assert stats.max_in_flight == 4
+    assert stats.max_queued <= 4
+
+
+def test_items_are_pulled_lazily_with_backpressure():
+    pulled: list[int] = []
+    release = asyncio.Event()
+
+    def plan():
+        for i in range(1000):
+            pulled.append(i)
+            yield i
+
+    async def run(i: int) -> int:
+        await release.wait()
+        return i
+
+    async def _inner():
+        pipeline = asyncio.create_task(run_pipeline(plan(), run, workers=2, queue_size=3))
+        await asyncio.sleep(0.05)
+        # 2 running + 3 queued + 1 held by the blocked producer
+        ahead = len(pulled)
+        release.set()
+        stats = await pipeline
+        return ahead, stats
+
+    ahead, stats = asyncio.run(_inner())
+    assert ahead == 6
+    assert stats.completed == 1000
+
+
+def test_failure_cancels_other_workers_and_propagates():
+    cancelled: list[int] = []
+
+    async def run(i: int) -> int:
+        if i == 3:
+            raise RuntimeError("boom")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(i)
+            raise
+        return i
+
+    stats = PipelineStats()
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(run_pipeline(range(100), run, workers=4, stats=stats))
+    assert sorted(cancelled) == [0, 1, 2]
+    assert stats.completed == 0
+    assert stats.produced < 100
+
+
+def test_iter_scored_tasks_is_lazy_cross_product():
+    manifest = {"apify-mcpc": {}, "apify-ultimate-scraper": {}}
+    scenarios = [
+        Scenario(
+            id=f"ec-{i}",
+            name="",
+            prompt="",
+            target_skill="apify-ecommerce",
+            source_file="",
+            domain="ecommerce",
+        )
+        for i in (1, 2)
+    ]
+
+    cells = iter_scored_tasks({"ecommerce": scenarios}, manifest, ["sonnet", "opus"])
+
+    assert next(cells)[1:] == ("apify-ecommerce", "sonnet")
+    assert [(s.id, sk, m) for s, sk, m in cells][:3] == [
+        ("ec-1", "apify-ecommerce", "opus"),
+        ("ec-1", "apify-mcpc", "sonnet"),
+        ("ec-1", "apify-mcpc", "opus"),
+    ]
+
+
+def test_stop_ends_the_run_without_starting_more_items():
+    done: list[int] = []
+
+    async def run(i: int) -> int:
+        await asyncio.sleep(0)
+        return i
+
+    stats = asyncio.run(
+        run_pipeline(range(100), run, workers=2, on_result=done.append, stop=lambda: len(done) >= 5)
+    )
+
+    assert stats.stopped
+    assert 5 <= stats.completed < 10
+    assert stats.produced < 100
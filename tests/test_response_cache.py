@@ -0,0 +1,165 @@
+"""Unit tests for response_cache.py — content-addressed response cache."""
+
+import os
+import threading
+import time
+
+from response_cache import ResponseCache
+from sim_core import SCORING_SYSTEM_PROMPT
+
+VALID_RESPONSE = """## Analysis
+```json
+{"checks": {"WF-1": {"result": "pass", "evidence": "ok"}}, "risk_level": "LOW"}
+```"""
+
+
+def _entry(response: str = "answer") -> dict:
+    return {"response": response, "duration_s": 2.5, "cost_info": "input=1, output=2"}
+
+
+# --- Keys ---
+
+
+def test_key_is_stable():
+    assert ResponseCache.key("sonnet", "sys", "user") == ResponseCache.key(
+        "sonnet", "sys", "user"
+    )
+
+
+def test_key_changes_with_every_input():
+    base = ResponseCache.key("sonnet", "sys", "user")
+    assert ResponseCache.key("opus", "sys", "user") != base
+    assert ResponseCache.key("sonnet", "sys2", "user") != base
+    assert ResponseCache.key("sonnet", "sys", "user2") != base
+
+
+# --- get / put ---
+
+
+def test_put_then_get_roundtrip(tmp_path):
+    cache = ResponseCache(directory=tmp_path)
+    key = cache.key("sonnet", "sys", "user")
+    assert cache.get(key) is None
+    cache.put(key, _entry())
+
+    entry = cache.get(key)
+    assert entry["response"] == "answer"
+    assert entry["duration_s"] == 2.5
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+
+def test_refresh_skips_lookup_but_stores(tmp_path):
+    key = ResponseCache.key("sonnet", "sys", "user")
+    ResponseCache(directory=tmp_path).put(key, _entry("old"))
+
+    refreshing = ResponseCache(directory=tmp_path, refresh=True)
+    assert refreshing.get(key) is None
+    refreshing.put(key, _entry("new"))
+
+    assert ResponseCache(directory=tmp_path).get(key)["response"] == "new"
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = ResponseCache(directory=tmp_path, max_age_s=60)
+    key = cache.key("sonnet", "sys", "user")
+    cache.put(key, _entry())
+    path = tmp_path / key[:2] / f"{key}.json"
+    os.utime(path, (time.time(), time.time() - 120))
+
+    assert cache.get(key) is None
+    assert not path.exists()
+
+
+def test_hits_do_not_extend_an_entrys_age(tmp_path):
+    cache = ResponseCache(directory=tmp_path, max_age_s=60)
+    key = cache.key("sonnet", "sys", "user")
+    cache.put(key, _entry())
+    path = tmp_path / key[:2] / f"{key}.json"
+    written = int(time.time()) - 50
+    os.utime(path, (written, written))
+
+    assert cache.get(key) is not None
+    assert path.stat().st_mtime == written  # only the last use (atime) moved
+    assert path.stat().st_atime > written
+    os.utime(path, (time.time(), time.time() - 120))
+    assert cache.prune() == 1  # prune and get agree on the age
+
+
+# --- Eviction ---
+
+
+def test_prune_evicts_least_recently_used_over_size(tmp_path):
+    cache = ResponseCache(directory=tmp_path, max_bytes=10**9)
+    keys = [cache.key("sonnet", "sys", f"user-{i}") for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, _entry("x" * 1000))
+        path = tmp_path / key[:2] / f"{key}.json"
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+    # Touch the oldest entry so it becomes most recently used
+    cache.get(keys[0])
+    cache.max_bytes = sum(
+        (tmp_path / k[:2] / f"{k}.json").stat().st_size for k in (keys[0], keys[2])
+    )
+
+    assert cache.prune() == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+def test_prune_evicts_untouched_entries_past_max_age(tmp_path):
+    cache = ResponseCache(directory=tmp_path, max_age_s=60)
+    key = cache.key("sonnet", "sys", "user")
+    cache.put(key, _entry())
+    path = tmp_path / key[:2] / f"{key}.json"
+    os.utime(path, (time.time() - 120, time.time() - 120))
+
+    assert cache.prune() == 1
+    assert not path.exists()
+
+
+def test_prune_missing_directory(tmp_path):
+    assert ResponseCache(directory=tmp_path / "nope").prune() == 0
+
+
+# --- run_scored_scenario integration ---
+
+
+def test_scored_run_second_call_is_served_from_cache(tmp_path, run_scored):
+    cache = ResponseCache(directory=tmp_path / "cache")
+    first, calls1 = run_scored([VALID_RESPONSE], cache=cache)
+    second, calls2 = run_scored([VALID_RESPONSE], cache=cache)
+
+    assert [system for system, _ in calls1] == [SCORING_SYSTEM_PROMPT]
+    assert calls2 == []
+    assert not first.cached
+    assert second.cached
+    assert second.duration_s == first.duration_s
+    assert second.checks == first.checks
+
+
+def test_scored_run_without_scoring_json_is_not_cached(tmp_path, run_scored):
+    cache = ResponseCache(directory=tmp_path / "cache")
+    run_scored(["no json here"], cache=cache)
+    _, calls = run_scored(["no json here"], cache=cache)
+    assert len(calls) == 1
+
+
+def test_cache_files_are_read_and_written_off_the_event_loop(tmp_path, run_scored, monkeypatch):
+    cache = ResponseCache(directory=tmp_path / "cache")
+    threads = []
+    for name in ("get", "put"):
+        method = getattr(cache, name)
+
+        def recording(*args, method=method):
+            threads.append(threading.current_thread() is threading.main_thread())
+            return method(*args)
+
+        monkeypatch.setattr(cache, name, recording)
+
+    run_scored([VALID_RESPONSE], cache=cache)
+
+    assert threads == [False, False]
@@ -0,0 +1,231 @@
+"""Unit tests for results_store.py — the SQLite store behind the heatmap."""
+
+import os
+
+import pytest
+
+import sim_core
+from results_store import ResultsStore, open_store
+from sim_core import (
+    merge_scored_runs,
+    load_all_scored_reports,
+    save_scored_report_incremental,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(tmp_path / "results.db")
+    yield store
+    store.close()
+
+
+def test_newest_result_per_cell_wins(store, make_scored):
+    store.add_run("run1", {"models": ["sonnet"]})
+    store.add_results(
+        "run1",
+        [make_scored("a", checks={"WF1": "fail"}), make_scored("b", checks={"WF1": "pass"})],
+        "2026-01-01",
+    )
+    store.add_run("run2", {})
+    store.add_results(
+        "run2", [make_scored("a", checks={"WF1": "pass", "DK1": "fail"})], "2026-02-01"
+    )
+
+    rows = store.cell_checks(["a", "b"], ["big"])
+
+    assert sorted((r["scenario_id"], r["check_id"], r["result"]) for r in rows) == [
+        ("a", "DK1", "fail"),
+        ("a", "WF1", "pass"),
+        ("b", "WF1", "pass"),
+    ]
+    counts = {(r["check_id"], r["result"]): r["n"] for r in store.skill_check_counts()}
+    assert counts == {("WF1", "pass"): 2, ("DK1", "fail"): 1}
+    assert store.stats() == {"runs": 2, "scored_runs": 3, "check_results": 4, "cells": 2}
+
+
+def test_cell_detail_reports_missing_checks(store, make_scored):
+    store.add_run("run1", {})
+    store.add_results(
+        "run1", [make_scored("a", checks={"WF1": "fail"}), make_scored("a", model="opus", checks={})]
+    )
+
+    rows = {r["model"]: r for r in store.cell_detail("a", "WF1", ["big", "other"])}
+
+    assert rows["sonnet"]["result"] == "fail"
+    assert rows["opus"]["result"] is None
+    assert rows["opus"]["markdown_response"] == "answer a"
+    assert store.models() == ["opus", "sonnet"]
+    assert [tuple(r) for r in store.skill_models()] == [("big", "opus"), ("big", "sonnet")]
+
+
+def test_snapshot_hides_results_committed_meanwhile(store, make_scored):
+    store.add_run("run1", {})
+    store.add_results("run1", [make_scored("a", checks={"WF1": "pass"})])
+    writer = ResultsStore(store.path)  # another process's connection
+
+    with store.snapshot():
+        models = store.models()
+        writer.add_run("run2", {})
+        writer.add_results("run2", [make_scored("a", model="opus", checks={"WF1": "fail"})])
+        rows = store.cell_checks(["a"], ["big"])
+    writer.close()
+
+    assert models == ["sonnet"]
+    assert [r["model"] for r in rows] == ["sonnet"]
+    assert store.models() == ["opus", "sonnet"]
+
+
+def test_import_matches_report_merge(tmp_path, monkeypatch, make_scored):
+    monkeypatch.setattr(sim_core, "REPORTS_DIR", tmp_path)
+    old = save_scored_report_incremental(
+        "r1", [make_scored("a", checks={"WF1": "fail"}), make_scored("b", checks={})], {}
+    )
+    new = save_scored_report_incremental("r2", [make_scored("a", checks={"WF1": "pass"})], {})
+    os.utime(old, (1, 1))
+
+    store = open_store()
+
+    _, index = merge_scored_runs(load_all_scored_reports())
+    rows = store.cell_checks(["a", "b"], ["big"])
+    assert {(r["scenario_id"], r["result"]) for r in rows} == {
+        (run.scenario_id, c.result) for run in index.values() for c in run.checks
+    }
+    assert store.stats()["cells"] == len(index) == 2
+    assert open_store() is store
+
+    # Imported once: unchanged files are skipped, a touched one replaces its run
+    assert store.import_reports() == 0
+    os.utime(new, (2, 2))
+    assert store.import_reports() == 1
+    assert store.stats()["scored_runs"] == 3
+
+
+def test_report_rewritten_in_place_is_imported_again(tmp_path, monkeypatch, make_scored):
+    monkeypatch.setattr(sim_core, "REPORTS_DIR", tmp_path)
+    older = save_scored_report_incremental("r1", [make_scored("a", checks={"WF1": "pass"})], {})
+    os.utime(older, (1, 1))
+    report = save_scored_report_incremental(
+        "r2", [make_scored("a", checks={"WF1": "fail"}), make_scored("b", checks={"WF1": "fail"})], {}
+    )
+    os.utime(report, (2, 2))
+    store = open_store()
+    assert [r["result"] for r in store.cell_checks(["a"], ["big"])] == ["fail"]
+
+    # Corrected: a no longer in the report, b now passes
+    save_scored_report_incremental("r2", [make_scored("b", checks={"WF1": "pass"})], {})
+    os.utime(report, (3, 3))
+    open_store()
+
+    assert [r["result"] for r in store.cell_checks(["a"], ["big"])] == ["pass"]  # r1's again
+    assert [r["result"] for r in store.cell_checks(["b"], ["big"])] == ["pass"]
+    assert store.stats() == {"runs": 2, "scored_runs": 2, "check_results": 2, "cells": 2}
+
+
+def test_live_run_is_not_imported_again(tmp_path, monkeypatch, make_scored):
+    monkeypatch.setattr(sim_core, "REPORTS_DIR", tmp_path)
+    store = open_store()
+    store.add_run("live", {})
+    store.add_result("live", make_scored("a", checks={"WF1": "pass"}))
+    save_scored_report_incremental("live", [make_scored("a", checks={"WF1": "pass"})], {})
+
+    assert store.import_reports() == 0
+    assert store.stats()["scored_runs"] == 1
+
+    # Compacting the live run's report rewrites it; its results are already in
+    save_scored_report_incremental("live", [make_scored("a", checks={"WF1": "pass"})], {})
+    os.utime(tmp_path / "scored_run_live.json", (5, 5))
+    assert store.import_reports() == 0
+    assert store.stats()["scored_runs"] == 1
+
+
+def test_latest_cells_ignore_older_results_written_later(store, make_scored):
+    store.add_run("run1", {})
+    store.add_results("run1", [make_scored("a", checks={"WF1": "pass"})], "2026-02-01")
+    # An old report
+    store.add_results("run1", [make_scored("a", checks={"WF1": "fail"})], "2026-01-01")
+
+    assert [r["result"] for r in store.cell_checks(["a"], ["big"])] == ["pass"]
+
+
+def test_reports_added_or_deleted_out_of_band(tmp_path, monkeypatch, make_scored):
+    monkeypatch.setattr(sim_core, "REPORTS_DIR", tmp_path)
+    save_scored_report_incremental("r1", [make_scored("a", checks={"WF1": "fail"})], {})
+    store = open_store()
+    newer = save_scored_report_incremental(
+        "r2", [make_scored("a", checks={"WF1": "pass"}), make_scored("b", checks={})], {}
+    )
+
+    assert [r["result"] for r in open_store().cell_checks(["a"], ["big"])] == ["pass"]
+
+    newer.unlink()
+    open_store()
+
+    assert [r["result"] for r in store.cell_checks(["a"], ["big"])] == ["fail"]
+    assert store.stats() == {"runs": 1, "scored_runs": 1, "check_results": 1, "cells": 1}
+
+
+def test_old_database_gets_its_latest_cells_built(tmp_path, make_scored):
+    store = ResultsStore(tmp_path / "results.db")
+    store.add_run("run1", {})
+    store.add_results(
+        "run1", [make_scored("a", checks={"WF1": "pass"}), make_scored("b", checks={"WF1": "fail"})]
+    )
+    store._db.execute("DELETE FROM latest_cells")
+    store._db.execute("PRAGMA user_version = 0")
+    store.close()
+
+    reopened = ResultsStore(tmp_path / "results.db")
+
+    assert reopened.stats()["cells"] == 2
+    reopened.close()
+
+
+def test_version_1_database_marks_sourceless_runs_live(tmp_path):
+    store = ResultsStore(tmp_path / "results.db")
+    store.add_run("live", {})
+    store._db.execute("ALTER TABLE runs DROP COLUMN live")
+    store._db.execute("PRAGMA user_version = 1")
+    store.close()
+
+    reopened = ResultsStore(tmp_path / "results.db")
+
+    assert reopened._db.execute("SELECT live FROM runs").fetchone()[0] == 1
+    reopened.close()
+
+
+def test_writer_commits_batches_off_the_loop(store, monkeypatch, make_scored):
+    import asyncio
+    import threading
+
+    from results_store import ResultsWriter
+
+    batches = []
+    add_results = store.add_results
+
+    def recording(run_id, results, recorded=None):
+        batches.append((len(results), threading.current_thread() is threading.main_thread()))
+        add_results(run_id, results, recorded)
+
+    monkeypatch.setattr(store, "add_results", recording)
+    commits = []
+    store.add_run("run1", {})
+
+    async def _inner():
+        writer = ResultsWriter(
+            store, "run1", batch_size=3, interval_s=0.01, on_commit=lambda: commits.append(1)
+        )
+        writer.add(make_scored("a", checks={"WF1": "pass"}))
+        assert batches == []  # add() only queues
+        await asyncio.sleep(0.05)  # the interval elapses
+        assert batches == [(1, False)]
+        for i in "bcd":
+            writer.add(make_scored(i, checks={"WF1": "pass"}))
+        writer.add(make_scored("e", checks={"WF1": "pass"}))
+        await writer.aclose()
+
+    asyncio.run(_inner())
+
+    assert batches[1:] == [(4, False)]
+    assert len(commits) == 2
+    assert store.stats()["cells"] == 5
@@ -0,0 +1,174 @@
+"""Unit tests for retries.py — classified retries with backoff and a run budget."""
+
+import asyncio
+import json
+import random
+
+import pytest
+
+from retries import (
+    AUTH,
+    CONFIG,
+    OVERLOAD,
+    TIMEOUT,
+    TRANSIENT,
+    TRUNCATED,
+    ClaudeError,
+    Retrier,
+    RetryPolicy,
+    classify_error,
+    default_retry_budget,
+)
+from sim_core import load_scored_report, save_scored_report_incremental
+
+VALID_RESPONSE = """## Analysis
+```json
+{"checks": {"WF-1": {"result": "pass", "evidence": "ok"}}, "risk_level": "LOW"}
+```"""
+
+
+# --- Classification ---
+
+
+@pytest.mark.parametrize(
+    "exc, kind",
+    [
+        (ClaudeError("claude -p returned an error: Invalid API key"), AUTH),
+        (ClaudeError("claude -p exited with 1: 401 Unauthorized"), AUTH),
+        (ClaudeError("Credit balance is too low"), AUTH),
+        (FileNotFoundError("claude"), CONFIG),
+        (ClaudeError("error: unknown option '--bogus'"), CONFIG),
+        (ClaudeError("model: claude-nope not found"), CONFIG),
+        (ClaudeError("API Error: 529 overloaded_error"), OVERLOAD),
+        (ClaudeError("429 rate_limit_error"), OVERLOAD),
+        (asyncio.TimeoutError(), TIMEOUT),
+        (ClaudeError("Request timed out"), TIMEOUT),
+        (ClaudeError("no scoring JSON", TRUNCATED), TRUNCATED),
+        (json.JSONDecodeError("Expecting value", "{", 1), TRUNCATED),
+        (ClaudeError("claude -p exited with 1: ECONNRESET"), TRANSIENT),
+    ],
+)
+def test_classify_error(exc, kind):
+    assert classify_error(exc) == kind
+
+
+def test_backoff_is_exponential_with_full_jitter():
+    policy = RetryPolicy(base_delay_s=1.0, max_delay_s=5.0)
+    rng = random.Random(0)
+    for retry, cap in [(0, 1.0), (1, 2.0), (2, 4.0), (5, 5.0)]:
+        delays = [policy.delay(retry, rng) for _ in range(200)]
+        assert all(0 <= d <= cap for d in delays)
+        assert max(delays) > cap * 0.8
+
+
+def test_default_retry_budget():
+    assert default_retry_budget(3) == 5
+    assert default_retry_budget(100) == 20
+
+
+# --- Retrier.call ---
+
+
+def _retrier(max_attempts: int = 3, budget: int = 10) -> Retrier:
+    return Retrier(RetryPolicy(max_attempts, base_delay_s=0), budget=budget)
+
+
+def _flaky(*errors: Exception):
+    """Callable raising the given errors in turn, then returning 'ok'."""
+    remaining = list(errors)
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        if remaining:
+            raise remaining.pop(0)
+        return "ok"
+
+    return fn, calls
+
+
+def test_transient_errors_are_retried_and_recorded():
+    retrier = _retrier()
+    fn, calls = _flaky(ClaudeError("529 overloaded"), asyncio.TimeoutError())
+
+    result, retries = asyncio.run(retrier.call(fn))
+
+    assert result == "ok"
+    assert len(calls) == 3
+    assert [r["kind"] for r in retries] == [OVERLOAD, TIMEOUT]
+    assert [r["attempt"] for r in retries] == [1, 2]
+    assert retrier.spent == 2
+
+
+def test_gives_up_after_max_attempts():
+    retrier = _retrier(max_attempts=2)
+    fn, calls = _flaky(*[ClaudeError("ECONNRESET")] * 5)
+
+    with pytest.raises(ClaudeError) as exc_info:
+        asyncio.run(retrier.call(fn))
+    assert len(calls) == 2
+    assert exc_info.value.kind == TRANSIENT
+    assert len(exc_info.value.retries) == 1
+
+
+def test_auth_error_fails_fast_and_trips_the_run():
+    retrier = _retrier()
+    fn, calls = _flaky(ClaudeError("Invalid API key"))
+
+    with pytest.raises(ClaudeError) as exc_info:
+        asyncio.run(retrier.call(fn))
+    assert exc_info.value.kind == AUTH
+    assert len(calls) == 1
+
+    # Later tasks of the same run do not call the backend at all
+    fn2, calls2 = _flaky()
+    with pytest.raises(ClaudeError, match="Invalid API key"):
+        asyncio.run(retrier.call(fn2))
+    assert calls2 == []
+
+
+def test_run_budget_is_shared_across_tasks():
+    retrier = _retrier(max_attempts=5, budget=2)
+    fn1, calls1 = _flaky(ClaudeError("overloaded"), ClaudeError("overloaded"))
+    fn2, calls2 = _flaky(ClaudeError("overloaded"))
+
+    assert asyncio.run(retrier.call(fn1))[0] == "ok"
+    with pytest.raises(ClaudeError):
+        asyncio.run(retrier.call(fn2))
+    assert len(calls1) == 3
+    assert len(calls2) == 1
+    assert retrier.remaining == 0
+
+
+# --- run_scored_scenario integration ---
+
+
+def test_scored_run_records_retries(run_scored):
+    responses = [ClaudeError("529 overloaded"), "no json, cut off", VALID_RESPONSE]
+    run, _ = run_scored(responses, retrier=_retrier())
+
+    assert run.error is None
+    assert [r["kind"] for r in run.retries] == [OVERLOAD, TRUNCATED]
+    assert {c.check_id: c.result for c in run.checks}["WF-1"] == "pass"
+
+
+def test_scored_run_final_failure_keeps_kind_and_retries(run_scored):
+    responses = [ClaudeError("429 rate limit")] * 2
+    run, _ = run_scored(responses, retrier=_retrier(max_attempts=2))
+
+    assert run.error is not None
+    assert run.error_kind == OVERLOAD
+    assert len(run.retries) == 1
+    assert all(c.result == "unclear" for c in run.checks)
+
+
+def test_retries_roundtrip_through_scored_report(tmp_path, monkeypatch, run_scored):
+    monkeypatch.setattr("sim_core.REPORTS_DIR", tmp_path / "reports")
+    responses = [ClaudeError("ECONNRESET"), VALID_RESPONSE]
+    run, _ = run_scored(responses, retrier=_retrier())
+
+    path = save_scored_report_incremental("r1", [run], {})
+    _, loaded = load_scored_report(path)
+
+    assert loaded[0].retries == run.retries
+    assert loaded[0].error_kind is None
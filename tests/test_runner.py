@@ -11,6 +11,13 @@ from server.services.runner import RunManager, ScoredRunState, ScoredRunStatus
 from sim_core import CheckResult, Scenario, ScoredRun
 
 
+@pytest.fixture(autouse=True)
+def reports_dir(tmp_path, monkeypatch):
+    """Keep run journals and reports out of the repository."""
+    monkeypatch.setattr("sim_core.REPORTS_DIR", tmp_path / "reports")
+    return tmp_path / "reports"
+
+
 def _make_scored_run(
     scenario_id: str = "ci-1",
     skill: str = "apify-competitor-intelligence",
@@ -118,7 +125,8 @@ def test_run_manager_stores_state_with_models_list():
     """start_scored_run() stores state with correct models list."""
     manager = RunManager()
 
-    with patch("server.services.runner.asyncio.create_task"):
+    # The run is not executed here: close its coroutine instead of scheduling it
+    with patch("server.services.runner.asyncio.create_task", side_effect=lambda coro: coro.close()):
         run_id = manager.start_scored_run(
             domains=["competitive-intelligence"],
             models=["sonnet", "opus"],
@@ -157,7 +165,7 @@ def _run_execute_scored_with_mocks(
                 return_value=domain_scenarios,
             ),
             patch(
-                "server.services.runner.get_target_skills",
+                "sim_core.get_target_skills",
                 return_value=target_skills,
             ),
             patch(
@@ -165,7 +173,7 @@ def _run_execute_scored_with_mocks(
                 side_effect=side_effect_run,
             ),
             patch(
-                "server.services.runner.save_scored_report_incremental",
+                "sim_core.save_scored_report_incremental",
                 side_effect=side_effect_save,
             ),
         ):
@@ -199,7 +207,7 @@ def test_execute_scored_task_list_cross_product():
 
     calls_made: list[tuple[str, str, str]] = []
 
-    async def fake_run(s, skill, model, manifest, semaphore):
+    async def fake_run(s, skill, model, manifest, semaphore, **kwargs):
         calls_made.append((s.id, skill, model))
         return _make_scored_run(scenario_id=s.id, skill=skill, model=model)
 
@@ -223,11 +231,53 @@ def test_execute_scored_task_list_cross_product():
     assert "apify-mcpc" in skills_seen
 
 
-def test_execute_scored_incremental_save_called_per_task():
-    """save_scored_report_incremental is called once per completed task."""
+def test_execute_scored_comparative_groups_skills_per_scenario():
+    """comparative=True scores a scenario's target skills in one call per model."""
     manager = RunManager()
     scenario = _make_scenario()
 
+    state = ScoredRunState(
+        run_id="compare_test",
+        status=ScoredRunStatus.PENDING,
+        models=["sonnet", "haiku"],
+        domains=["competitive-intelligence"],
+        concurrency=2,
+        comparative=True,
+        started_at="",
+    )
+    manager._scored_runs["compare_test"] = state
+    skills = ["apify-competitor-intelligence", "apify-mcpc", "apify-ultimate-scraper"]
+    groups: list[tuple[str, list[str], str]] = []
+
+    async def fake_comparative(s, skill_names, model, manifest, semaphore, **kwargs):
+        groups.append((s.id, skill_names, model))
+        return [_make_scored_run(s.id, sk, model) for sk in skill_names]
+
+    with patch(
+        "server.services.runner.run_scored_comparative", side_effect=fake_comparative
+    ):
+        _run_execute_scored_with_mocks(
+            state=state,
+            manager=manager,
+            mock_manifest={sk: {"path": "/fake", "category": "dispatcher"} for sk in skills},
+            domain_scenarios={"competitive-intelligence": [scenario]},
+            target_skills=skills,
+            side_effect_save=lambda *a: None,
+        )
+
+    assert groups == [("ci-1", skills, "sonnet"), ("ci-1", skills, "haiku")]
+    assert len(state.results) == 6
+    assert state.progress["ci-1"]["apify-mcpc"] == {"sonnet": "ok", "haiku": "ok"}
+
+
+def test_execute_scored_journals_each_task_and_compacts_once():
+    """Each result is appended to the journal; the report is written once, at the end."""
+    from journal import read_journal
+    from sim_core import journal_path
+
+    manager = RunManager()
+    scenarios = [_make_scenario("ci-1"), _make_scenario("ci-2")]
+
     state = ScoredRunState(
         run_id="inc_save_test",
         status=ScoredRunStatus.PENDING,
@@ -245,26 +295,29 @@ def test_execute_scored_incremental_save_called_per_task():
         },
     }
     save_call_count: list[int] = []
+    journaled: list[int] = []
 
     def fake_save(run_id, results, metadata):
         save_call_count.append(len(results))
+        journaled.append(len(read_journal(journal_path(run_id))[1]))
 
-    async def fake_run(s, skill, model, manifest, semaphore):
+    async def fake_run(s, skill, model, manifest, semaphore, **kwargs):
         return _make_scored_run(scenario_id=s.id, skill=skill, model=model)
 
     _run_execute_scored_with_mocks(
         state=state,
         manager=manager,
         mock_manifest=mock_manifest,
-        domain_scenarios={"competitive-intelligence": [scenario]},
+        domain_scenarios={"competitive-intelligence": scenarios},
         target_skills=["apify-competitor-intelligence"],
         side_effect_run=fake_run,
         side_effect_save=fake_save,
     )
 
-    # 1 task → 1 incremental save call
-    assert len(save_call_count) == 1
-    assert save_call_count[0] == 1
+    # 2 tasks → 2 journal records, 1 compaction into the report
+    assert save_call_count == [2]
+    assert journaled == [2]
+    assert not journal_path("inc_save_test").exists()
 
 
 def test_execute_scored_metadata_uses_models_list():
@@ -293,7 +346,7 @@ def test_execute_scored_metadata_uses_models_list():
     def fake_save(run_id, results, metadata):
         captured_metadata.append(dict(metadata))
 
-    async def fake_run(s, skill, model, manifest, semaphore):
+    async def fake_run(s, skill, model, manifest, semaphore, **kwargs):
         return _make_scored_run(scenario_id=s.id, skill=skill, model=model)
 
     _run_execute_scored_with_mocks(
@@ -313,6 +366,10 @@ def test_execute_scored_metadata_uses_models_list():
         assert "sonnet" in meta["models"]
         assert "opus" in meta["models"]
         assert "model" not in meta, f"Old 'model' key found in metadata: {meta}"
+        # Snapshot of skill + scenario inputs is part of every save
+        assert meta["snapshot"]["run_id"] == "meta_test"
+        assert "apify-competitor-intelligence" in meta["snapshot"]["skills"]
+        assert "test.yaml" in meta["snapshot"]["scenario_files"]
 
 
 def test_execute_scored_sse_progress_includes_model():
@@ -337,7 +394,7 @@ def test_execute_scored_sse_progress_includes_model():
         },
     }
 
-    async def fake_run(s, skill, model, manifest, semaphore):
+    async def fake_run(s, skill, model, manifest, semaphore, **kwargs):
         return _make_scored_run(scenario_id=s.id, skill=skill, model=model)
 
     _run_execute_scored_with_mocks(
@@ -437,3 +494,247 @@ def test_scored_run_status_enum():
     assert ScoredRunStatus.RUNNING == "running"
     assert ScoredRunStatus.COMPLETED == "completed"
     assert ScoredRunStatus.FAILED == "failed"
+
+
+def test_execute_scored_incremental_runs_only_planned_cells():
+    """With incremental=True only the cells from plan_incremental_run execute."""
+    from sim_core import IncrementalPlan
+
+    manager = RunManager()
+    scenario = _make_scenario()
+    state = ScoredRunState(
+        run_id="incremental_test",
+        status=ScoredRunStatus.PENDING,
+        models=["sonnet", "haiku"],
+        domains=["competitive-intelligence"],
+        concurrency=1,
+        incremental=True,
+        started_at="",
+    )
+    manager._scored_runs["incremental_test"] = state
+    mock_manifest = {
+        "apify-competitor-intelligence": {"path": "/fake/path", "category": "x"},
+    }
+    calls_made: list[tuple[str, str, str]] = []
+
+    async def fake_run(s, skill, model, manifest, semaphore, **kwargs):
+        calls_made.append((s.id, skill, model))
+        return _make_scored_run(scenario_id=s.id, skill=skill, model=model)
+
+    def fake_plan(tasks, manifest, reports):
+        rerun = [t for t in tasks if t[2] == "haiku"]
+        return IncrementalPlan(
+            rerun=rerun, skipped=len(tasks) - len(rerun), reasons={"new": 1}
+        )
+
+    with (
+        patch("server.services.runner.plan_incremental_run", side_effect=fake_plan),
+        patch("server.services.runner.load_all_scored_reports", return_value=[]),
+    ):
+        _run_execute_scored_with_mocks(
+            state=state,
+            manager=manager,
+            mock_manifest=mock_manifest,
+            domain_scenarios={"competitive-intelligence": [scenario]},
+            target_skills=["apify-competitor-intelligence"],
+            side_effect_run=fake_run,
+            side_effect_save=lambda *a: None,
+        )
+
+    assert calls_made == [("ci-1", "apify-competitor-intelligence", "haiku")]
+    assert state.progress == {"ci-1": {"apify-competitor-intelligence": {"haiku": "ok"}}}
+    started = state.queue.get_nowait()
+    assert started["event"] == "started"
+    assert started["data"]["total"] == 1
+    assert started["data"]["skipped"] == 1
+
+
+def test_execute_scored_uses_shared_rate_limiter_per_run_owner():
+    """Each run's limiter draws from the manager-wide RateLimiter as its own owner."""
+    manager = RunManager()
+    scenario = _make_scenario()
+    limiters = []
+
+    async def fake_run(s, skill, model, manifest, semaphore, **kwargs):
+        limiters.append(semaphore)
+        return _make_scored_run(scenario_id=s.id, skill=skill, model=model)
+
+    for run_id in ("run_a", "run_b"):
+        state = ScoredRunState(
+            run_id=run_id,
+            status=ScoredRunStatus.PENDING,
+            models=["sonnet"],
+            domains=["competitive-intelligence"],
+            concurrency=1,
+            started_at="",
+        )
+        _run_execute_scored_with_mocks(
+            state=state,
+            manager=manager,
+            mock_manifest={"apify-competitor-intelligence": {"path": "/fake"}},
+            domain_scenarios={"competitive-intelligence": [scenario]},
+            target_skills=["apify-competitor-intelligence"],
+            side_effect_run=fake_run,
+            side_effect_save=lambda *a: None,
+        )
+
+    assert [lim.owner for lim in limiters] == ["run_a", "run_b"]
+    assert all(lim.rate_limiter is manager.rate_limiter for lim in limiters)
+
+
+# ---------------------------------------------------------------------------
+# Cancellation and deadlines
+# ---------------------------------------------------------------------------
+
+
+def _drain_events(state: ScoredRunState) -> list[dict]:
+    events = []
+    while not state.queue.empty():
+        msg = state.queue.get_nowait()
+        if msg is not None:
+            events.append(msg)
+    return events
+
+
+def _hanging_run_setup(manager: RunManager, run_timeout_s: float | None = None):
+    """Start a run with 2 cells: the haiku cell finishes, the sonnet cell hangs."""
+    scenario = _make_scenario()
+    saved: list[int] = []
+
+    async def fake_run(s, skill, model, manifest, semaphore, **kwargs):
+        if model == "sonnet":
+            await asyncio.sleep(3600)
+        return _make_scored_run(scenario_id=s.id, skill=skill, model=model)
+
+    patches = (
+        patch("server.services.runner.load_manifest", return_value={}),
+        patch(
+            "server.services.runner.load_domain_scenarios",
+            return_value={"competitive-intelligence": [scenario]},
+        ),
+        patch(
+            "sim_core.get_target_skills",
+            return_value=["apify-competitor-intelligence"],
+        ),
+        patch("server.services.runner.run_scored_scenario", side_effect=fake_run),
+        patch(
+            "sim_core.save_scored_report_incremental",
+            side_effect=lambda run_id, results, metadata: saved.append(len(results)),
+        ),
+    )
+    run_id = manager.start_scored_run(
+        domains=None, models=["haiku", "sonnet"], run_timeout_s=run_timeout_s
+    )
+    return run_id, patches, saved
+
+
+def test_cancel_scored_run_stops_run_and_keeps_finished_results():
+    manager = RunManager()
+
+    async def _inner():
+        run_id, patches, saved = _hanging_run_setup(manager)
+        with patches[0], patches[1], patches[2], patches[3], patches[4]:
+            state = manager.get_scored_run(run_id)
+            while not state.results:
+                assert state.status != ScoredRunStatus.FAILED, state.error
+                await asyncio.sleep(0.01)
+            assert manager.cancel_scored_run(run_id)
+            await state._task
+        return state, saved
+
+    state, saved = asyncio.run(_inner())
+
+    assert state.status == ScoredRunStatus.CANCELLED
+    assert state.progress["ci-1"]["apify-competitor-intelligence"] == {
+        "haiku": "ok",
+        "sonnet": "cancelled",
+    }
+    assert saved[-1] == 1
+    events = _drain_events(state)
+    assert events[-1]["event"] == "cancelled"
+    assert not manager.cancel_scored_run(state.run_id)
+
+
+def test_run_timeout_marks_run_timed_out():
+    manager = RunManager()
+
+    async def _inner():
+        run_id, patches, _saved = _hanging_run_setup(manager, run_timeout_s=0.2)
+        with patches[0], patches[1], patches[2], patches[3], patches[4]:
+            state = manager.get_scored_run(run_id)
+            await state._task
+        return state
+
+    state = asyncio.run(_inner())
+
+    assert state.status == ScoredRunStatus.TIMED_OUT
+    cancelled = _drain_events(state)[-1]
+    assert cancelled["event"] == "cancelled"
+    assert cancelled["data"]["reason"] == "run deadline reached"
+
+
+def test_cancel_unknown_run_returns_false():
+    assert not RunManager().cancel_scored_run("nope")
+
+
+# ---------------------------------------------------------------------------
+# Journal and resume
+# ---------------------------------------------------------------------------
+
+
+def test_cancelled_run_resumes_only_unfinished_cells(reports_dir):
+    from sim_core import journal_path, list_run_journals
+
+    manager = RunManager()
+    scenario = _make_scenario()
+    resumed_calls: list[str] = []
+
+    async def fake_run(s, skill, model, manifest, semaphore, **kwargs):
+        resumed_calls.append(model)
+        return _make_scored_run(scenario_id=s.id, skill=skill, model=model)
+
+    async def _inner():
+        run_id, patches, _saved = _hanging_run_setup(manager)
+        with patches[0], patches[1], patches[2], patches[3], patches[4]:
+            state = manager.get_scored_run(run_id)
+            while not state.results:
+                await asyncio.sleep(0.01)
+            manager.cancel_scored_run(run_id)
+            await state._task
+        assert journal_path(run_id).exists()
+        assert [(r["run_id"], r["cells"], r["done"]) for r in list_run_journals()] == [
+            (run_id, 2, 1)
+        ]
+
+        with (
+            patch("server.services.runner.load_manifest", return_value={}),
+            patch(
+                "sim_core.load_domain_scenarios",
+                return_value={"competitive-intelligence": [scenario]},
+            ),
+            patch("server.services.runner.run_scored_scenario", side_effect=fake_run),
+            patch("sim_core.save_scored_report_incremental"),
+        ):
+            resume = manager.resume_scored_run(run_id)
+            state = manager.get_scored_run(run_id)
+            await state._task
+        return run_id, resume, state
+
+    run_id, resume, state = asyncio.run(_inner())
+
+    assert (len(resume.done), len(resume.remaining)) == (1, 1)
+    assert resumed_calls == ["sonnet"]
+    assert state.status == ScoredRunStatus.COMPLETED
+    assert sorted(r.model for r in state.results) == ["haiku", "sonnet"]
+    assert state.progress["ci-1"]["apify-competitor-intelligence"] == {
+        "haiku": "ok",
+        "sonnet": "ok",
+    }
+    started = _drain_events(state)[0]
+    assert started["data"]["resumed"] and started["data"]["skipped"] == 1
+    assert not journal_path(run_id).exists()  # finished: nothing left to resume
+
+
+def test_resume_without_journal_raises():
+    with pytest.raises(FileNotFoundError):
+        RunManager().resume_scored_run("nope")
@@ -0,0 +1,170 @@
+"""Unit tests for scheduling.py — LPT / coverage policies and makespan estimates."""
+
+import pytest
+
+from scheduling import (
+    COVERAGE,
+    DEFAULT_DURATION_S,
+    LPT,
+    PLAN,
+    DurationModel,
+    expected_makespan,
+    format_duration,
+    group_together,
+    order_coverage,
+    order_lpt,
+    schedule,
+    size_bucket,
+)
+from sim_core import duration_history, schedule_scored_tasks, schedule_standard_tasks
+
+
+def test_size_bucket_doubles():
+    assert [size_bucket(n) for n in (0, 1023, 1024, 2047, 2048, 8192)] == [0, 0, 1, 1, 2, 4]
+
+
+def test_duration_model_falls_back_from_bucket_to_model_to_default():
+    model = DurationModel.from_samples(
+        [("opus", 3000, 100.0), ("opus", 3500, 120.0), ("opus", 3900, 140.0), ("opus", 500, 20.0)]
+    )
+
+    assert model.samples == 4
+    assert model.estimate("opus", 3000) == 120.0  # median of the 2-4 KiB class
+    assert model.estimate("opus", 100_000) == 110.0  # no such size: opus median
+    assert model.estimate("haiku", 4000) == DEFAULT_DURATION_S["haiku"]
+
+
+def test_order_lpt_is_longest_first_and_stable():
+    items = [("a", 1), ("b", 5), ("c", 1), ("d", 3)]
+    assert [k for k, _ in order_lpt(items, lambda i: i[1])] == ["b", "d", "a", "c"]
+
+
+def test_order_coverage_round_robins_groups():
+    items = ["x1", "x2", "x3", "y1", "z1", "z2"]
+    assert order_coverage(items, lambda i: i[0]) == ["x1", "y1", "z1", "x2", "z2", "x3"]
+
+
+def test_group_together_keeps_group_and_item_order():
+    items = ["x1", "y1", "x2", "z1", "y2"]
+    assert group_together(items, lambda i: i[0]) == ["x1", "x2", "y1", "y2", "z1"]
+    assert schedule([1, 9, 2, 8], LPT, float, str, together=lambda i: i % 2) == [9, 1, 8, 2]
+
+
+def test_schedule_rejects_unknown_policy():
+    assert schedule([3, 1], PLAN, float, str) == [3, 1]
+    with pytest.raises(ValueError, match="unknown scheduling policy"):
+        schedule([3, 1], "random", float, str)
+
+
+def test_lpt_shortens_makespan_when_a_long_cell_comes_last():
+    durations = [10.0] * 6 + [60.0]
+    plan = expected_makespan(durations, float, workers=3)
+    lpt = expected_makespan(order_lpt(durations, float), float, workers=3)
+
+    assert plan == 80.0  # the 60s cell starts after two rounds of short ones
+    assert lpt == 60.0
+
+
+def test_makespan_lanes_run_side_by_side():
+    items = [("opus", 30.0), ("opus", 30.0), ("haiku", 50.0)]
+    assert expected_makespan(items, lambda i: i[1], workers=1, lane=lambda i: i[0]) == 60.0
+    assert expected_makespan([], float, workers=3) == 0.0
+
+
+def test_format_duration():
+    assert format_duration(45) == "45s"
+    assert format_duration(725) == "12m 05s"
+    assert format_duration(7380) == "2h 03m"
+
+
+# --- sim_core integration ---
+
+
+def test_duration_history_uses_snapshot_sizes_and_skips_cached_and_errors(make_scored):
+    metadata = {"snapshot": {"skills": {"big": {"size": 9000}, "small": {"size": 800}}}}
+    runs = [
+        make_scored(skill="big", model="opus", duration_s=80.0),
+        make_scored(skill="small", model="opus", duration_s=15.0),
+        make_scored(skill="big", model="opus", duration_s=0.1, cached=True),
+        make_scored(skill="big", model="opus", duration_s=3.0, error="boom"),
+        make_scored(skill="unknown", model="opus", duration_s=50.0),
+    ]
+
+    assert duration_history([(metadata, runs)]) == [("opus", 9000, 80.0), ("opus", 800, 15.0)]
+
+
+def test_schedule_scored_tasks(make_scenario, make_scored, make_manifest):
+    manifest = make_manifest(big="x" * 9000, small="x" * 800)
+    history = [
+        (
+            {"snapshot": {"skills": {"big": {"size": 9000}, "small": {"size": 800}}}},
+            [
+                make_scored(skill="big", model="opus", duration_s=80.0),
+                make_scored(skill="small", model="opus", duration_s=10.0),
+            ],
+        )
+    ]
+    a, b = (
+        make_scenario(i, domain=d)
+        for i, d in (("a", "ecommerce"), ("b", "travel"))
+    )
+    tasks = [(a, "small", "opus"), (a, "small", "opus"), (b, "small", "opus"), (b, "big", "opus")]
+
+    lpt, lpt_makespan = schedule_scored_tasks(tasks, LPT, manifest, history, concurrency=2)
+    plan, plan_makespan = schedule_scored_tasks(tasks, PLAN, manifest, history, concurrency=2)
+    coverage, _ = schedule_scored_tasks(tasks, COVERAGE, manifest, history, concurrency=2)
+
+    assert lpt[0] == (b, "big", "opus")
+    assert lpt_makespan == 80.0 < plan_makespan == 90.0
+    assert [(s.id, sk) for s, sk, _ in coverage] == [
+        ("a", "small"),
+        ("b", "small"),
+        ("b", "big"),
+        ("a", "small"),
+    ]
+
+
+def test_prefix_cache_groups_skills_in_policy_order(make_scenario, make_scored, make_manifest):
+    manifest = make_manifest(big="x" * 9000, small="x" * 800)
+    history = [
+        (
+            {"snapshot": {"skills": {"big": {"size": 9000}, "small": {"size": 800}}}},
+            [
+                make_scored(skill="big", model="opus", duration_s=80.0),
+                make_scored(skill="small", model="opus", duration_s=10.0),
+            ],
+        )
+    ]
+    a, b = make_scenario("a"), make_scenario("b")
+    tasks = [(a, "small", "opus"), (a, "big", "opus"), (b, "small", "opus"), (b, "big", "opus")]
+
+    ordered, _ = schedule_scored_tasks(tasks, LPT, manifest, history, 2, prefix_cache=True)
+
+    # The longest skill still starts first, and each skill's cells run back to back
+    assert [(s.id, sk) for s, sk, _ in ordered] == [
+        ("a", "big"),
+        ("b", "big"),
+        ("a", "small"),
+        ("b", "small"),
+    ]
+
+
+def test_schedule_standard_tasks_uses_standard_history(make_scenario, make_manifest):
+    manifest = make_manifest(big="x" * 9000, small="x" * 800)
+    reports = [
+        {
+            "results": [
+                {"target_skill": "big", "models": {"opus": {"duration_s": 30.0}}},
+                {"target_skill": "small", "models": {"opus": {"duration_s": 200.0}}},
+            ]
+        }
+    ]
+    a = make_scenario("a", target_skill="big")
+    b = make_scenario("b", target_skill="small")
+
+    ordered, makespan = schedule_standard_tasks(
+        [(a, "opus"), (b, "opus")], LPT, manifest, reports, concurrency=1
+    )
+
+    assert ordered == [(b, "opus"), (a, "opus")]  # free-form answers on small took longer
+    assert makespan == 230.0
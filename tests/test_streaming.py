@@ -0,0 +1,137 @@
+"""Tests for streamed claude -p calls — TTFT, partial progress, early abort."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from retries import MALFORMED, TRUNCATED, ClaudeError
+from sim_core import (
+    SCORING_PROBE_CHARS,
+    Scenario,
+    StreamMonitor,
+    run_claude,
+    run_scored_scenario,
+    scoring_abort_reason,
+)
+
+VALID_RESPONSE = """## Approach
+Looks fine.
+```json
+{"checks": {"WF-1": {"result": "pass", "evidence": "ok"}}, "risk_level": "LOW"}
+```"""
+
+
+def _fake_stream_claude(tmp_path, monkeypatch, chunks: list[str], delay_s=0.05, result=True):
+    """Put a `claude` on PATH that streams `chunks` as stream-json text deltas."""
+    script = tmp_path / "claude"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys, time\n"
+        "assert 'stream-json' in sys.argv, sys.argv\n"
+        "sys.stdin.read()\n"
+        f"chunks = {chunks!r}\n"
+        "print(json.dumps({'type': 'system', 'subtype': 'init'}), flush=True)\n"
+        f"time.sleep({delay_s})\n"
+        "for chunk in chunks:\n"
+        "    delta = {'type': 'text_delta', 'text': chunk}\n"
+        "    event = {'type': 'content_block_delta', 'delta': delta}\n"
+        "    print(json.dumps({'type': 'stream_event', 'event': event}), flush=True)\n"
+        f"    time.sleep({delay_s})\n"
+        "text = ''.join(chunks)\n"
+        "print(json.dumps({'type': 'assistant', 'message': {'content': [{'type': 'text', 'text': text}]}}), flush=True)\n"
+        f"if {result!r}:\n"
+        "    print(json.dumps({'type': 'result', 'result': text, 'input_tokens': 10, 'output_tokens': 20}), flush=True)\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+
+
+def test_scoring_abort_reason():
+    assert scoring_abort_reason("## Approach\n" + "x" * 10_000) is None
+    assert scoring_abort_reason("x" * 100) is None
+    assert "no scoring sections" in scoring_abort_reason("x" * SCORING_PROBE_CHARS)
+    assert scoring_abort_reason("x" * 5_000 + "```json\n{") is None
+
+
+def test_stream_records_ttft_and_progress(tmp_path, monkeypatch):
+    _fake_stream_claude(tmp_path, monkeypatch, ["Hel", "lo ", "world"])
+    seen: list[int] = []
+    monitor = StreamMonitor(
+        on_progress=lambda m: seen.append(m.chars), progress_interval_s=0
+    )
+
+    response, duration, cost_info = asyncio.run(
+        run_claude("sonnet", "sys", "prompt", asyncio.Semaphore(1), stream=monitor)
+    )
+
+    assert response == "Hello world"
+    assert cost_info == "input=10, output=20"
+    assert seen == [3, 6, 11]  # deltas only, the whole assistant message is skipped
+    assert 0 < monitor.ttft_s < duration
+    assert monitor.generation_s >= 0.1
+
+
+def test_stream_without_result_event_is_truncated(tmp_path, monkeypatch):
+    _fake_stream_claude(tmp_path, monkeypatch, ["partial"], delay_s=0, result=False)
+
+    with pytest.raises(ClaudeError) as exc_info:
+        asyncio.run(
+            run_claude(
+                "sonnet", "sys", "prompt", asyncio.Semaphore(1), stream=StreamMonitor()
+            )
+        )
+    assert exc_info.value.kind == TRUNCATED
+
+
+def test_stream_abort_kills_process_early(tmp_path, monkeypatch):
+    # 20 chunks of 500 chars, 0.5s apart: the check at 4000 chars aborts long before the end
+    _fake_stream_claude(tmp_path, monkeypatch, ["x" * 500] * 20, delay_s=0.5)
+    monitor = StreamMonitor(abort_check=scoring_abort_reason)
+
+    async def _inner():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with pytest.raises(ClaudeError) as exc_info:
+            await run_claude("sonnet", "sys", "prompt", asyncio.Semaphore(1), stream=monitor)
+        return exc_info.value, loop.time() - start
+
+    error, elapsed = asyncio.run(_inner())
+    assert error.kind == MALFORMED
+    assert monitor.chars == SCORING_PROBE_CHARS
+    assert elapsed < 6
+
+
+def test_scored_scenario_streams_and_records_timings(tmp_path, monkeypatch):
+    _fake_stream_claude(tmp_path, monkeypatch, [VALID_RESPONSE[:20], VALID_RESPONSE[20:]])
+    skill_path = tmp_path / "SKILL.md"
+    skill_path.write_text("# Skill A")
+    manifest = {"skill-a": {"path": str(skill_path), "category": "dispatcher"}}
+    scenario = Scenario(
+        id="ci-1",
+        name="Test",
+        prompt="Find competitors",
+        target_skill="skill-a",
+        source_file="test.yaml",
+        domain="competitive-intelligence",
+    )
+    progress: list[int] = []
+
+    run = asyncio.run(
+        run_scored_scenario(
+            scenario,
+            "skill-a",
+            "sonnet",
+            manifest,
+            asyncio.Semaphore(1),
+            stream=True,
+            on_progress=lambda m: progress.append(m.chars),
+        )
+    )
+
+    assert run.error is None
+    assert {c.check_id: c.result for c in run.checks}["WF-1"] == "pass"
+    assert run.ttft_s is not None and run.ttft_s > 0
+    assert run.generation_s is not None
+    assert progress and progress[0] == 20
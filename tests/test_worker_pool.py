@@ -0,0 +1,262 @@
+"""Unit tests for worker_pool.py — warm claude process pool."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from retries import TIMEOUT, ClaudeError
+from sim_core import run_claude
+from worker_pool import WarmProcessPool
+
+# Echoes stdin upper-cased — stands in for a CLI blocked on its prompt
+ECHO_CMD = [sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"]
+
+
+async def _settle(pool: WarmProcessPool) -> None:
+    """Wait until all background refills have finished spawning."""
+    while pool._refills:
+        await asyncio.gather(*list(pool._refills))
+
+
+def test_first_acquire_is_cold_then_warm():
+    async def _inner():
+        async with WarmProcessPool(size=1) as pool:
+            proc = await pool.acquire(ECHO_CMD)
+            out, _ = await proc.communicate(b"one")
+            assert out.strip() == b"ONE"
+            await _settle(pool)
+
+            proc = await pool.acquire(ECHO_CMD)
+            out, _ = await proc.communicate(b"two")
+            assert out.strip() == b"TWO"
+            return pool.stats
+
+    stats = asyncio.run(_inner())
+    assert stats.cold == 1
+    assert stats.warm == 1
+
+
+def test_refill_keeps_size_spares_per_command():
+    other_cmd = ECHO_CMD + ["--other"]
+
+    async def _inner():
+        async with WarmProcessPool(size=2) as pool:
+            for cmd in (ECHO_CMD, other_cmd):
+                proc = await pool.acquire(cmd)
+                await proc.communicate(b"")
+            await _settle(pool)
+            return {k: len(v) for k, v in pool._spares.items()}
+
+    spare_counts = asyncio.run(_inner())
+    assert spare_counts == {tuple(ECHO_CMD): 2, tuple(other_cmd): 2}
+
+
+def test_spares_stay_bounded_across_command_lines():
+    # One command line per skill, as in the cache-aware layout
+    skill_cmds = [ECHO_CMD + [f"--skill-{i}"] for i in range(6)]
+
+    async def _inner():
+        async with WarmProcessPool(size=2) as pool:
+            spawned = []
+            for cmd in skill_cmds:
+                proc = await pool.acquire(cmd)
+                await proc.communicate(b"")
+                await _settle(pool)
+                spawned += [s.proc for spares in pool._spares.values() for s in spares]
+            idle = [s.proc for spares in pool._spares.values() for s in spares]
+            return pool, set(spawned), idle, len(pool._spares[tuple(skill_cmds[-1])])
+
+    pool, spawned, idle, last_skill_spares = asyncio.run(_inner())
+    assert pool.max_spares == 4
+    assert len(idle) <= 4
+    assert last_skill_spares == 2
+    assert pool.stats.evicted == len(spawned) - len(idle) > 0
+    assert all(p.returncode is not None for p in spawned)  # evicted, then closed
+
+
+def test_dead_spare_is_recycled():
+    async def _inner():
+        async with WarmProcessPool(size=1) as pool:
+            proc = await pool.acquire(ECHO_CMD)
+            await proc.communicate(b"")
+            await _settle(pool)
+
+            spare = pool._spares[tuple(ECHO_CMD)][0]
+            spare.proc.kill()
+            await spare.proc.wait()
+
+            proc = await pool.acquire(ECHO_CMD)
+            out, _ = await proc.communicate(b"fresh")
+            assert out.strip() == b"FRESH"
+            return pool.stats
+
+    stats = asyncio.run(_inner())
+    assert stats.recycled == 1
+    assert stats.cold == 2
+    assert stats.warm == 0
+
+
+def test_idle_spare_is_recycled():
+    async def _inner():
+        async with WarmProcessPool(size=1, max_idle_s=0) as pool:
+            proc = await pool.acquire(ECHO_CMD)
+            await proc.communicate(b"")
+            await _settle(pool)
+            proc = await pool.acquire(ECHO_CMD)
+            await proc.communicate(b"")
+            return pool.stats
+
+    stats = asyncio.run(_inner())
+    assert stats.recycled == 1
+    assert stats.warm == 0
+
+
+def test_close_kills_spares():
+    async def _inner():
+        pool = WarmProcessPool(size=2)
+        proc = await pool.acquire(ECHO_CMD)
+        await proc.communicate(b"")
+        await _settle(pool)
+        spares = [s.proc for s in pool._spares[tuple(ECHO_CMD)]]
+        await pool.close()
+        return spares, pool
+
+    spares, pool = asyncio.run(_inner())
+    assert len(spares) == 2
+    assert all(p.returncode is not None for p in spares)
+    assert not pool._spares[tuple(ECHO_CMD)]
+
+
+def test_missing_executable_falls_back_to_cold_error():
+    async def _inner():
+        async with WarmProcessPool(size=1) as pool:
+            await pool.acquire(["definitely-not-a-real-binary-xyz"])
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(_inner())
+
+
+# ---------------------------------------------------------------------------
+# run_claude with a pool — fake `claude` executable on PATH
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def fake_claude(tmp_path, monkeypatch):
+    script = tmp_path / "claude"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys\n"
+        "prompt = sys.stdin.read()\n"
+        "print(json.dumps({'result': 'echo: ' + prompt}))\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    return script
+
+
+def test_run_claude_uses_pool(fake_claude):
+    async def _inner():
+        semaphore = asyncio.Semaphore(1)
+        async with WarmProcessPool(size=1) as pool:
+            first = await run_claude("haiku", "sys", "hello", semaphore, pool=pool)
+            await _settle(pool)
+            second = await run_claude("haiku", "sys", "again", semaphore, pool=pool)
+            return first, second, pool.stats
+
+    first, second, stats = asyncio.run(_inner())
+    assert first[0] == "echo: hello"
+    assert second[0] == "echo: again"
+    assert stats.cold == 1
+    assert stats.warm == 1
+
+
+def test_run_claude_passes_system_prompt_as_a_file(tmp_path, monkeypatch):
+    script = tmp_path / "claude"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys\n"
+        "sys.stdin.read()\n"
+        "path = sys.argv[sys.argv.index('--system-prompt-file') + 1]\n"
+        "longest = max(len(a) for a in sys.argv)\n"
+        "print(json.dumps({'result': f'{len(open(path).read())} {longest}'}))\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    skill = "x" * 300_000  # three SKILL.md files over the argv limit
+
+    response, _duration, _cost = asyncio.run(
+        run_claude("haiku", skill, "hello", asyncio.Semaphore(1))
+    )
+
+    prompt_len, longest_arg = map(int, response.split())
+    assert prompt_len == len(skill)
+    assert longest_arg < 1000
+
+
+def test_run_claude_without_pool(fake_claude):
+    response, _duration, _cost = asyncio.run(
+        run_claude("haiku", "sys", "plain", asyncio.Semaphore(1))
+    )
+    assert response == "echo: plain"
+
+
+# ---------------------------------------------------------------------------
+# Timeouts and cancellation — the whole process group is killed
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def hung_claude(tmp_path, monkeypatch):
+    """Fake `claude` that starts a grandchild, records its pid, then hangs."""
+    pid_file = tmp_path / "child.pid"
+    script = tmp_path / "claude"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import subprocess, sys, time\n"
+        f"child = subprocess.Popen([{sys.executable!r}, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+        "time.sleep(60)\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    return pid_file
+
+
+def _wait_gone(pid: int, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_run_claude_timeout_kills_process_group(hung_claude):
+    async def _inner():
+        await run_claude("haiku", "sys", "hello", asyncio.Semaphore(1), timeout_s=1.0)
+
+    with pytest.raises(ClaudeError) as exc_info:
+        asyncio.run(_inner())
+    assert exc_info.value.kind == TIMEOUT
+    assert _wait_gone(int(hung_claude.read_text()))
+
+
+def test_run_claude_cancel_kills_process_group(hung_claude):
+    async def _inner():
+        task = asyncio.create_task(
+            run_claude("haiku", "sys", "hello", asyncio.Semaphore(1))
+        )
+        while not hung_claude.exists():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_inner())
+    assert _wait_gone(int(hung_claude.read_text()))
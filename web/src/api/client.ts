@@ -142,9 +142,41 @@ export interface CellDetail {
 	>;
 }
 
+export interface RunEstimateTotals {
+	cells: number;
+	calls: number;
+	input_tokens: number;
+	output_tokens: number;
+	cost_usd: number;
+}
+
+export interface RunEstimate extends RunEstimateTotals {
+	makespan_s: number;
+	concurrency: number;
+	history_samples: number;
+	by_model: Record<string, RunEstimateTotals>;
+}
+
 export interface ScoredRunStartResponse {
 	run_id: string;
 	total: number;
+	skipped: number;
+	estimate: RunEstimate;
+}
+
+export interface ResumableRun {
+	run_id: string;
+	mode: "scored" | "standard";
+	created: string | null;
+	cells: number;
+	done: number;
+}
+
+export interface ScoredRunResumeResponse {
+	run_id: string;
+	total: number;
+	skipped: number;
+	missing: string[];
 }
 
 // --- API functions ---
@@ -205,9 +237,49 @@ export const api = {
 		domains?: string[];
 		models?: string[];
 		concurrency?: number;
+		max_concurrency?: number;
+		use_cache?: boolean;
+		incremental?: boolean;
+		max_attempts?: number;
+		retry_budget?: number | null;
+		task_timeout_s?: number | null;
+		run_timeout_s?: number | null;
+		stream?: boolean;
+		backend?: "cli" | "api" | "fake";
+		prefix_cache?: boolean;
+		batch_size?: number;
+		comparative?: boolean;
+		schedule?: "plan" | "lpt" | "coverage";
+		max_cost_usd?: number | null;
 	}) =>
 		request<ScoredRunStartResponse>("/heatmap/run", {
 			method: "POST",
 			body: JSON.stringify(opts),
 		}),
+
+	cancelScoredRun: (runId: string) =>
+		request<{ run_id: string; status: string }>(`/heatmap/run/${runId}/cancel`, {
+			method: "POST",
+		}),
+
+	getResumableRuns: () => request<ResumableRun[]>("/heatmap/runs/resumable"),
+	resumeScoredRun: (
+		runId: string,
+		opts: {
+			concurrency?: number;
+			max_concurrency?: number;
+			use_cache?: boolean;
+			max_attempts?: number;
+			retry_budget?: number | null;
+			task_timeout_s?: number | null;
+			run_timeout_s?: number | null;
+			stream?: boolean;
+			backend?: "cli" | "api" | "fake";
+			max_cost_usd?: number | null;
+		} = {},
+	) =>
+		request<ScoredRunResumeResponse>(`/heatmap/run/${runId}/resume`, {
+			method: "POST",
+			body: JSON.stringify(opts),
+		}),
 };
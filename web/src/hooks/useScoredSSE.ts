@@ -37,7 +37,7 @@ export function useScoredSSE(): UseScoredSSEReturn {
 			const handleEvent = (type: string) => (e: MessageEvent) => {
 				const data = JSON.parse(e.data);
 				setEvents((prev) => [...prev, { event: type, data }]);
-				if (type === "completed" || type === "error") {
+				if (type === "completed" || type === "error" || type === "cancelled") {
 					disconnect();
 				}
 			};
@@ -46,6 +46,7 @@ export function useScoredSSE(): UseScoredSSEReturn {
 			source.addEventListener("progress", handleEvent("progress"));
 			source.addEventListener("completed", handleEvent("completed"));
 			source.addEventListener("error", handleEvent("error"));
+			source.addEventListener("cancelled", handleEvent("cancelled"));
 
 			source.onerror = () => {
 				disconnect();
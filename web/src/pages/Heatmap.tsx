@@ -13,6 +13,10 @@ import { useScoredSSE } from "../hooks/useScoredSSE";
 
 const AVAILABLE_MODELS = ["sonnet", "opus", "haiku"];
 
+// "running" / "streaming" progress events are in-flight updates, not finished cells
+const isCellFinished = (status: unknown) =>
+	status !== "running" && status !== "streaming";
+
 // --- Styled components ---
 
 const PageHeader = styled.div`
@@ -300,14 +304,18 @@ export function Heatmap() {
 	// SSE progress tracking
 	const progressInfo = useMemo(() => {
 		const started = events.find((e) => e.event === "started");
+		const runId = started?.data?.run_id as string | undefined;
 		const total = (started?.data?.total as number) ?? 0;
 		const completed = events.filter(
-			(e) => e.event === "progress" && e.data?.status !== "running",
+			(e) => e.event === "progress" && isCellFinished(e.data?.status),
 		).length;
 		const isDone = events.some(
-			(e) => e.event === "completed" || e.event === "error",
+			(e) =>
+				e.event === "completed" ||
+				e.event === "error" ||
+				e.event === "cancelled",
 		);
-		return { total, completed, isDone };
+		return { total, completed, isDone, runId };
 	}, [events]);
 
 	// Throttled invalidation: refresh heatmap every ~5s while run is in progress
@@ -316,7 +324,7 @@ export function Heatmap() {
 		if (!lastEvent) return;
 		if (
 			lastEvent.event === "progress" &&
-			lastEvent.data?.status !== "running"
+			isCellFinished(lastEvent.data?.status)
 		) {
 			const now = Date.now();
 			if (now - lastInvalidationRef.current >= INVALIDATION_THROTTLE_MS) {
@@ -341,6 +349,7 @@ export function Heatmap() {
 			domains: selectedDomains !== null ? selectedDomains : undefined,
 			models: selectedModels,
 			concurrency,
+			stream: true,
 		});
 		connect(result.run_id);
 	}, [connect, selectedDomains, selectedModels, concurrency]);
@@ -350,10 +359,17 @@ export function Heatmap() {
 			domains: undefined,
 			models: AVAILABLE_MODELS,
 			concurrency,
+			stream: true,
 		});
 		connect(result.run_id);
 	}, [connect, concurrency]);
 
+	const handleCancelRun = useCallback(async () => {
+		if (progressInfo.runId) {
+			await api.cancelScoredRun(progressInfo.runId);
+		}
+	}, [progressInfo.runId]);
+
 	const toggleModel = (model: string) => {
 		setSelectedModels((prev) =>
 			prev.includes(model) ? prev.filter((m) => m !== model) : [...prev, model],
@@ -586,6 +602,14 @@ export function Heatmap() {
 							}
 						/>
 					</ProgressBar>
+					<Button
+						size="small"
+						variant="secondary"
+						onClick={handleCancelRun}
+						disabled={!progressInfo.runId}
+					>
+						Cancel run
+					</Button>
 				</ProgressSection>
 			)}
 
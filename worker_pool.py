@@ -0,0 +1,189 @@
+"""
+Warm process pool for `claude -p` — hides CLI cold start behind running tasks.
+
+`claude -p` boots a Node runtime, loads its config and then blocks reading the
+prompt from stdin until EOF. The pool spawns processes for a command line ahead
+of time, so that boot overlaps with other in-flight tasks; a task then only
+writes its prompt and reads the answer.
+
+Each process still answers exactly one prompt. Keeping a process alive across
+tasks (e.g. via `--input-format stream-json`) would carry the previous cell's
+SKILL.md and answer into the next evaluation, so "recycling" here means
+replacing a spare once it has been used, has died, or has idled too long.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass
+
+DEFAULT_POOL_SIZE = 3
+DEFAULT_MAX_IDLE_S = 300.0
+# Idle spares across all command lines, in multiples of the pool size
+DEFAULT_MAX_SPARES_FACTOR = 2
+
+
+async def spawn_claude(cmd: list[str]) -> asyncio.subprocess.Process:
+    """Spawn a CLI process with piped stdio (the cold-start path).
+
+    The process leads its own session / process group, so kill_process() also
+    takes down any helpers it started (node workers, MCP servers, ...).
+    """
+    return await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env={**os.environ, "CLAUDECODE": ""},  # unset to avoid nesting error
+        start_new_session=True,
+    )
+
+
+async def kill_process(proc: asyncio.subprocess.Process) -> None:
+    """Kill a process and its process group (if still running) and reap it."""
+    if proc.returncode is None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+    await proc.wait()
+
+
+@dataclass
+class _Spare:
+    proc: asyncio.subprocess.Process
+    spawned_at: float
+
+
+@dataclass
+class PoolStats:
+    warm: int = 0  # tasks served by a pre-spawned process
+    cold: int = 0  # tasks that had to spawn (no healthy spare available)
+    recycled: int = 0  # spares discarded because they died or idled too long
+    evicted: int = 0  # spares killed to stay under max_spares
+
+
+class WarmProcessPool:
+    """Keeps up to `size` pre-spawned processes per distinct command line.
+
+    The command line includes model and system prompt, so in scored mode this
+    is effectively N warm workers per model — and in the cache-aware layout,
+    where the system prompt carries the SKILL.md, per skill and model. A
+    command line is not used again once its cells are done, so at most
+    `max_spares` (default 2 × size) spares are kept in all: refilling one
+    command line evicts the oldest spares of the others. Use as an async
+    context manager (or call close()) so that unused spares are killed at the
+    end of a run.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        max_idle_s: float = DEFAULT_MAX_IDLE_S,
+        max_spares: int | None = None,
+    ):
+        self.size = size
+        self.max_idle_s = max_idle_s
+        self.max_spares = size * DEFAULT_MAX_SPARES_FACTOR if max_spares is None else max_spares
+        self.stats = PoolStats()
+        self._spares: dict[tuple[str, ...], deque[_Spare]] = {}
+        self._spawning: dict[tuple[str, ...], int] = {}
+        self._refills: set[asyncio.Task] = set()
+        self._closed = False
+
+    async def __aenter__(self) -> WarmProcessPool:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _is_healthy(self, spare: _Spare) -> bool:
+        """Health check: still running and not idle past max_idle_s."""
+        if spare.proc.returncode is not None:
+            return False
+        return time.monotonic() - spare.spawned_at < self.max_idle_s
+
+    async def acquire(self, cmd: list[str]) -> asyncio.subprocess.Process:
+        """Return a warm process for cmd, falling back to a cold spawn.
+
+        The caller owns the returned process (writes stdin, reads stdout).
+        A replacement spare is spawned in the background.
+        """
+        key = tuple(cmd)
+        spares = self._spares.setdefault(key, deque())
+        proc = None
+        while spares:
+            spare = spares.popleft()
+            if self._is_healthy(spare):
+                proc = spare.proc
+                break
+            self.stats.recycled += 1
+            await kill_process(spare.proc)
+
+        await self._refill(key)
+
+        if proc is not None:
+            self.stats.warm += 1
+            return proc
+        self.stats.cold += 1
+        return await spawn_claude(cmd)
+
+    def _spare_count(self) -> int:
+        """Idle and spawning spares across all command lines."""
+        return sum(len(s) for s in self._spares.values()) + sum(self._spawning.values())
+
+    def _missing(self, key: tuple[str, ...]) -> int:
+        return self.size - len(self._spares[key]) - self._spawning.get(key, 0)
+
+    async def _refill(self, key: tuple[str, ...]) -> None:
+        """Schedule background spawns until the key has `size` spares.
+
+        Over max_spares, the oldest spares of other command lines make room;
+        without any left to evict, fewer spares are spawned.
+        """
+        if self._closed:
+            return
+        while 0 < self._missing(key) and self.max_spares < self._spare_count() + self._missing(key):
+            others = [s for k, s in self._spares.items() if k != key and s]
+            if not others:
+                break
+            spares = min(others, key=lambda s: s[0].spawned_at)
+            self.stats.evicted += 1
+            await kill_process(spares.popleft().proc)
+        missing = min(self._missing(key), self.max_spares - self._spare_count())
+        for _ in range(missing):
+            self._spawning[key] = self._spawning.get(key, 0) + 1
+            task = asyncio.create_task(self._spawn_spare(key))
+            self._refills.add(task)
+            task.add_done_callback(self._refills.discard)
+
+    async def _spawn_spare(self, key: tuple[str, ...]) -> None:
+        try:
+            proc = await spawn_claude(list(key))
+        except OSError:
+            # Spawn failed (e.g. CLI missing) — the cold path will surface the error
+            return
+        finally:
+            self._spawning[key] -= 1
+
+        if self._closed:
+            await kill_process(proc)
+            return
+        self._spares[key].append(_Spare(proc=proc, spawned_at=time.monotonic()))
+
+    async def close(self) -> None:
+        """Cancel pending spawns and kill all idle spares."""
+        self._closed = True
+        for task in list(self._refills):
+            task.cancel()
+        await asyncio.gather(*self._refills, return_exceptions=True)
+        for spares in self._spares.values():
+            while spares:
+                await kill_process(spares.popleft().proc)